@@ -0,0 +1,138 @@
+#!/bin/python3
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+""" Metagraph sync microbenchmark: builds the metagraph from synthetic neurons, as Metagraph.sync does
+once the neurons are queried from the chain.
+
+The dense and the sparse (--metagraph.sparse) weights and bonds are timed with their memory.
+The previous construction, which converts each weight and bond row to a nested Python list and each endpoint
+to a list of ints before a single torch.tensor call, is timed alongside for reference up to --reference_max_n neurons.
+
+Example:
+    $ python3 benchmarks/metagraph_sync.py --n_neurons 1024 4096 16384 --n_validators 128
+
+"""
+import argparse
+import dataclasses
+import time
+import torch
+import bittensor
+import bittensor.utils.weight_utils as weight_utils
+from rich.console import Console
+from rich.table import Table
+
+def make_neurons( n_neurons: int, n_validators: int, weights_per_validator: int ):
+    r""" Returns n_neurons neurons, of which the first n_validators set weights and bonds on weights_per_validator uids
+        while the others only set a self weight.
+    """
+    null_neuron = bittensor.NeuronInfo._null_neuron()
+    axon_info = bittensor.AxonInfo( block = 0, version = bittensor.__version_as_int__, ip = 2130706433, port = 8091, ip_type = 4, protocol = 0, placeholder1 = 0, placeholder2 = 0 )
+    neurons = []
+    for uid in range( n_neurons ):
+        if uid < n_validators:
+            targets = torch.randperm( n_neurons )[ :weights_per_validator ].tolist()
+            weights = [ [ target, int( value ) ] for target, value in zip( targets, torch.randint( 0, 65535, ( len( targets ), ) ).tolist() ) ]
+            bonds = [ [ target, int( value ) ] for target, value in zip( targets, torch.randint( 0, 65535, ( len( targets ), ) ).tolist() ) ]
+        else:
+            weights = [ [ uid, 65535 ] ]
+            bonds = []
+        neurons.append( dataclasses.replace( 
+            null_neuron,
+            uid = uid,
+            hotkey = '5' + str( uid ).rjust( 47, 'H' ),
+            coldkey = '5' + str( uid ).rjust( 47, 'C' ),
+            axon_info = axon_info,
+            weights = weights,
+            bonds = bonds,
+            is_null = False,
+        ) )
+    return neurons
+
+def reference_from_neurons( neurons ):
+    r""" Weights, bonds and endpoints as built by the previous from_neurons, through nested Python lists.
+    """
+    n_total = len( neurons )
+    endpoints = [ [ -1 for _ in range( 250 ) ] for _ in range( n_total ) ]
+    weights = [ [ 0 for _ in range( n_total ) ] for _ in range( n_total ) ]
+    bonds = [ [ 0 for _ in range( n_total ) ] for _ in range( n_total ) ]
+    for n in neurons:
+        endpoints[ n.uid ] = bittensor.endpoint.from_neuron( n ).to_tensor().tolist()
+        if len( n.weights ) > 0:
+            w_uids, w_weights = zip( *n.weights )
+            weights[ n.uid ] = weight_utils.convert_weight_uids_and_vals_to_tensor( n_total, w_uids, w_weights ).tolist()
+        if len( n.bonds ) > 0:
+            b_uids, b_bonds = zip( *n.bonds )
+            bonds[ n.uid ] = weight_utils.convert_bond_uids_and_vals_to_tensor( n_total, b_uids, b_bonds ).tolist()
+    tbonds = torch.tensor( bonds, dtype = torch.int64 )
+    tweights = torch.tensor( weights, dtype = torch.float32 )
+    tendpoints = torch.tensor( endpoints, dtype = torch.int64 )
+    tbonds = torch.nn.functional.normalize( tbonds.float(), p = 1, dim = 0, eps = 1e-12 ) * 0.5 + torch.eye( n_total ) * 0.5
+    return tweights, tbonds, tendpoints
+
+def matrix_bytes( matrix: torch.Tensor ) -> int:
+    r""" Bytes held by a dense or sparse COO matrix.
+    """
+    if matrix.is_sparse:
+        return matrix.indices().nelement() * matrix.indices().element_size() + matrix.values().nelement() * matrix.values().element_size()
+    return matrix.nelement() * matrix.element_size()
+
+def main( config ):
+    console = Console()
+    table = Table( title = 'Metagraph.from_neurons with {} validators'.format( config.n_validators ) )
+    table.add_column( 'neurons', justify = 'right' )
+    table.add_column( 'weights', justify = 'right' )
+    table.add_column( 'from_neurons (s)', justify = 'right' )
+    table.add_column( 'reference (s)', justify = 'right' )
+    table.add_column( 'W+B (MB)', justify = 'right' )
+    table.add_column( 'sparse from_neurons (s)', justify = 'right' )
+    table.add_column( 'sparse W+B (MB)', justify = 'right' )
+    for n_neurons in config.n_neurons:
+        weights_per_validator = n_neurons if config.weights_per_validator <= 0 else min( n_neurons, config.weights_per_validator )
+        neurons = make_neurons( n_neurons, min( n_neurons, config.n_validators ), weights_per_validator )
+        n_weights = sum( len( neuron.weights ) for neuron in neurons )
+
+        start_time = time.perf_counter()
+        metagraph = bittensor.metagraph.from_neurons( network = 'mock', netuid = -1, info = None, neurons = neurons, block = 0 )
+        from_neurons_time = time.perf_counter() - start_time
+
+        reference_time = '-'
+        if n_neurons <= config.reference_max_n:
+            start_time = time.perf_counter()
+            weights, bonds, endpoints = reference_from_neurons( neurons )
+            reference_time = '{:.3f}'.format( time.perf_counter() - start_time )
+            assert torch.equal( weights, metagraph.W ) and torch.allclose( bonds, metagraph.B ) and torch.equal( endpoints, metagraph.endpoints )
+            del weights, bonds, endpoints
+        dense_bytes = matrix_bytes( metagraph.weights ) + matrix_bytes( metagraph.bonds )
+        del metagraph
+
+        start_time = time.perf_counter()
+        metagraph = bittensor.metagraph.from_neurons( network = 'mock', netuid = -1, info = None, neurons = neurons, block = 0, sparse = True )
+        sparse_time = time.perf_counter() - start_time
+        sparse_bytes = matrix_bytes( metagraph.weights ) + matrix_bytes( metagraph.bonds )
+        del metagraph
+
+        table.add_row( str( n_neurons ), str( n_weights ), '{:.3f}'.format( from_neurons_time ), reference_time, 
+            '{:.1f}'.format( dense_bytes / 2**20 ), '{:.3f}'.format( sparse_time ), '{:.1f}'.format( sparse_bytes / 2**20 ) )
+    console.print( table )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_neurons', type=int, nargs='+', help='Metagraph sizes to build.', default=[1024, 4096, 16384])
+    parser.add_argument('--n_validators', type=int, help='Neurons setting weights and bonds, the others only set a self weight.', default=128)
+    parser.add_argument('--weights_per_validator', type=int, help='Weights set by each validator, 0 for all uids.', default=0)
+    parser.add_argument('--reference_max_n', type=int, help='Largest metagraph also built the previous way.', default=4096)
+    main( parser.parse_args() )
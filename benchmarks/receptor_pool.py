@@ -0,0 +1,116 @@
+#!/bin/python3
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+""" Receptor pool microbenchmark: receptor lookup and eviction over max_active_receptors.
+
+The previous eviction, which scans every receptor for the minimum forward qps per evicted receptor,
+is timed alongside for reference.
+
+Example:
+    $ python3 benchmarks/receptor_pool.py --n_endpoints 1024 4096 16384 --max_active_fraction 0.5
+
+"""
+import argparse
+import math
+import time
+import bittensor
+from rich.console import Console
+from rich.table import Table
+
+def make_endpoints( n_endpoints: int ):
+    r""" Returns n_endpoints endpoints with distinct hotkeys.
+    """
+    return [ 
+        bittensor.endpoint(
+            version = bittensor.__version_as_int__,
+            uid = uid,
+            ip = '0.0.0.0',
+            ip_type = 4,
+            port = 8091,
+            hotkey = str( uid ).rjust( 48, 'X' ),
+            coldkey = str( uid ).rjust( 48, 'Y' ),
+            protocol = 0
+        ) for uid in range( n_endpoints ) 
+    ]
+
+def scan_destroy_receptors_over_max_allowed( pool: 'bittensor.ReceptorPool' ):
+    r""" The previous eviction, removes the receptor with the minimum forward qps one at a time.
+    """
+    with pool.cull_mutex:
+        while len(pool.receptors) > pool.max_active_receptors:
+            min_receptor_qps = math.inf
+            receptor_to_remove = None
+            for next_receptor in pool.receptors.values():
+                next_qps = next_receptor.stats.forward_qps.value
+                sema_value = next_receptor.semaphore._value
+                if (min_receptor_qps > next_qps) and (sema_value == pool.max_processes):
+                    receptor_to_remove = next_receptor
+                    min_receptor_qps = next_receptor.stats.forward_qps.value
+            if receptor_to_remove == None:
+                break
+            pool.receptors[ receptor_to_remove.endpoint.hotkey ].close()
+            del pool.receptors[ receptor_to_remove.endpoint.hotkey ]
+
+def benchmark_pool( endpoints, max_active_receptors: int, destroy ):
+    r""" Returns the lookup time of all endpoints in a full pool and the time to cull the pool to max_active_receptors.
+    """
+    wallet = bittensor.wallet.mock()
+    pool = bittensor.receptor_pool( wallet = wallet, max_active_receptors = len( endpoints ) )
+    for endpoint in endpoints:
+        pool._get_or_create_receptor_for_endpoint( endpoint )
+
+    start_time = time.perf_counter()
+    for endpoint in endpoints:
+        pool._get_or_create_receptor_for_endpoint( endpoint )
+    lookup_time = time.perf_counter() - start_time
+
+    pool.max_active_receptors = max_active_receptors
+    start_time = time.perf_counter()
+    destroy( pool )
+    destroy_time = time.perf_counter() - start_time
+    assert len( pool.receptors ) == max_active_receptors
+    return lookup_time, destroy_time
+
+def main( config ):
+    console = Console()
+    table = Table( title = 'Receptor pool, culled to {} of the endpoints'.format( config.max_active_fraction ) )
+    table.add_column( 'endpoints', justify = 'right' )
+    table.add_column( 'lookup (us/endpoint)', justify = 'right' )
+    table.add_column( 'lru cull (ms)', justify = 'right' )
+    table.add_column( 'qps scan cull (ms)', justify = 'right' )
+    for n_endpoints in config.n_endpoints:
+        endpoints = make_endpoints( n_endpoints )
+        max_active_receptors = int( n_endpoints * config.max_active_fraction )
+        lookup_time, lru_time = benchmark_pool( endpoints, max_active_receptors, lambda pool: pool._destroy_receptors_over_max_allowed() )
+        scan_time = None
+        if n_endpoints <= config.max_scan_endpoints:
+            _, scan_time = benchmark_pool( endpoints, max_active_receptors, scan_destroy_receptors_over_max_allowed )
+        table.add_row( 
+            str( n_endpoints ), 
+            '{:.2f}'.format( 1e6 * lookup_time / n_endpoints ), 
+            '{:.2f}'.format( 1e3 * lru_time ), 
+            '{:.2f}'.format( 1e3 * scan_time ) if scan_time != None else 'skipped'
+        )
+    console.print( table )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument( '--n_endpoints', type = int, nargs = '+', default = [ 1024, 4096, 16384 ], help = 'Number of endpoints in the pool.' )
+    parser.add_argument( '--max_active_fraction', type = float, default = 0.5, help = 'Fraction of the endpoints kept by the cull.' )
+    parser.add_argument( '--max_scan_endpoints', type = int, default = 4096, help = 'Largest pool on which the quadratic qps scan is timed.' )
+    config = parser.parse_args()
+    main( config )
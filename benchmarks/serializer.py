@@ -0,0 +1,96 @@
+#!/bin/python3
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+""" Serializer microbenchmark, with an error/bandwidth report for the quantized serializers.
+
+Example:
+    $ python3 benchmarks/serializer.py --batch_size 10 --sequence_len 20 --n_calls 20
+    $ python3 benchmarks/serializer.py --hidden_size 1024 --block_sizes 0 32 64 128 256
+
+"""
+import argparse
+import time
+import torch
+import bittensor
+from rich.console import Console
+from rich.table import Table
+
+def benchmark_serializer( serializer_type: int, tensor: torch.Tensor, n_calls: int, block_size: int = None ):
+    r""" Returns the mean serialize time, mean deserialize time and wire bytes for the passed serializer.
+    """
+    serializer = bittensor.serializer( serializer_type = serializer_type, block_size = block_size )
+    serialize_time = 0
+    deserialize_time = 0
+    for _ in range( n_calls ):
+        start_time = time.perf_counter()
+        proto = serializer.serialize( tensor, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH )
+        wire = proto.SerializeToString()
+        serialize_time += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        received = bittensor.proto.Tensor()
+        received.ParseFromString( wire )
+        serializer.deserialize( received, to_type = bittensor.proto.TensorType.TORCH )
+        deserialize_time += time.perf_counter() - start_time
+    return serialize_time / n_calls, deserialize_time / n_calls, len( wire )
+
+def main( config ):
+    console = Console()
+    tensor = torch.rand( [ config.batch_size, config.sequence_len, config.hidden_size ] )
+    table = Table( title = 'Serializers on float32 tensor of shape {}'.format( list( tensor.shape ) ) )
+    table.add_column( 'serializer' )
+    table.add_column( 'serialize (ms)', justify = 'right' )
+    table.add_column( 'deserialize (ms)', justify = 'right' )
+    table.add_column( 'wire bytes', justify = 'right' )
+    for name in [ 'MSGPACK', 'CMPPACK', 'RAW', 'QINT8', 'QINT4' ]:
+        serialize_time, deserialize_time, n_bytes = benchmark_serializer( bittensor.proto.Serializer.Value( name ), tensor, config.n_calls )
+        table.add_row( name, '{:.2f}'.format( serialize_time * 1000 ), '{:.2f}'.format( deserialize_time * 1000 ), str( n_bytes ) )
+    console.print( table )
+
+    # Quantization error against bandwidth, on normally distributed activations.
+    tensor = torch.randn( [ config.batch_size, config.sequence_len, config.hidden_size ] )
+    raw_bytes = tensor.element_size() * tensor.nelement()
+    table = Table( title = 'Quantized serializers on float32 activations of shape {}'.format( list( tensor.shape ) ) )
+    table.add_column( 'serializer' )
+    table.add_column( 'block size', justify = 'right' )
+    table.add_column( 'wire bytes', justify = 'right' )
+    table.add_column( 'of float32', justify = 'right' )
+    table.add_column( 'max abs error', justify = 'right' )
+    table.add_column( 'relative rmse', justify = 'right' )
+    for name in [ 'QINT8', 'QINT4' ]:
+        for block_size in config.block_sizes:
+            serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.Value( name ), block_size = block_size )
+            proto = serializer.serialize( tensor, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH )
+            error = serializer.deserialize( proto, to_type = bittensor.proto.TensorType.TORCH ) - tensor
+            table.add_row( 
+                name, 
+                'row' if block_size == 0 else str( block_size ),
+                str( proto.ByteSize() ), 
+                '{:.1f}%'.format( 100 * proto.ByteSize() / raw_bytes ),
+                '{:.4f}'.format( error.abs().max().item() ),
+                '{:.4f}'.format( ( error.pow(2).mean().sqrt() / tensor.pow(2).mean().sqrt() ).item() )
+            )
+    console.print( table )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n_calls', type=int, help='Number of serialize/deserialize round trips per serializer.', default=20)
+    parser.add_argument('--batch_size', type=int, help='Batch size', default=10)
+    parser.add_argument('--sequence_len', type=int, help='Sequence length', default=20)
+    parser.add_argument('--hidden_size', type=int, help='Last dimension, defaults to the vocab size of TextCausalLM logits.', default=bittensor.__vocab_size__)
+    parser.add_argument('--block_sizes', type=int, nargs='+', help='Quantization block sizes to report on, 0 for one scale per row.', default=[0, 32, 64, 128, 256, 1024])
+    main( parser.parse_args() )
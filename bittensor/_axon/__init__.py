@@ -21,8 +21,11 @@
 import argparse
 import os
 import copy
+import asyncio
 import inspect
+import threading
 import time
+from collections import OrderedDict
 from concurrent import futures
 from typing import Dict, List, Callable, Optional, Tuple, Union
 from bittensor._threadpool import prioritythreadpool
@@ -33,6 +36,13 @@ from substrateinterface import Keypair
 
 import bittensor
 from . import axon_impl
+from .micro_batcher_impl import MicroBatcher
+from .response_cache_impl import ResponseCache
+from .admission_control_impl import AdmissionControl
+from .latency_stats_impl import LatencyHistograms
+from .workers_impl import AxonWorkers
+from .nonce_table_impl import NonceTable
+from bittensor._receptor.event_loop_thread_impl import EventLoopThread
 
 class axon:
     """ The factory class for bittensor.Axon object
@@ -79,6 +89,8 @@ class axon:
             forward_timeout: Optional[int] = None,
             backward_timeout: Optional[int] = None,
             compression:Optional[str] = None,
+            async_server: Optional[bool] = None,
+            metagraph: Optional['bittensor.Metagraph'] = None,
         ) -> 'bittensor.Axon':
         r""" Creates a new bittensor.Axon object from passed arguments.
             Args:
@@ -128,6 +140,11 @@ class axon:
                     timeout on the forward requests. 
                 backward_timeout (:type:`Optional[int]`, `optional`):
                     timeout on the backward requests.              
+                async_server (:type:`Optional[bool]`, `optional`):
+                    If true, serves with a grpc.aio server whose requests wait on an event loop instead of worker threads.
+                metagraph (:obj:`Optional[bittensor.Metagraph]`, `optional`):
+                    If set, requests from hotkeys not in the metagraph are rejected before their signature is verified.
+                    Only its hotkey_to_uid method is called.
         """   
         if config == None: 
             config = axon.config()
@@ -146,6 +163,7 @@ class axon:
         config.axon.causallm_timeout = synapse_causallm_timeout if synapse_causallm_timeout != None else config.axon.causallm_timeout
         config.axon.causallmnext_timeout = synapse_causallmnext_timeout if synapse_causallmnext_timeout is not None else config.axon.causallmnext_timeout
         config.axon.seq2seq_timeout = synapse_seq2seq_timeout if synapse_seq2seq_timeout != None else config.axon.seq2seq_timeout
+        config.axon.async_server = async_server if async_server != None else config.axon.async_server
         axon.check_config( config )
 
         # Determine the grpc compression algorithm
@@ -160,15 +178,39 @@ class axon:
             wallet = bittensor.wallet( config = config )
         if thread_pool == None:
             thread_pool = futures.ThreadPoolExecutor( max_workers = config.axon.max_workers )
+        interceptor_kwargs = dict(
+            blacklist = blacklist,
+            metagraph = metagraph,
+            keypair_cache_size = config.axon.auth.keypair_cache_size,
+            max_endpoints_per_hotkey = config.axon.auth.max_endpoints_per_hotkey,
+            verify_workers = config.axon.auth.verify_workers,
+        )
+        server_options = [('grpc.keepalive_time_ms', 100000),
+                          ('grpc.keepalive_timeout_ms', 500000),
+                          ('grpc.max_receive_message_length', config.axon.maximum_message_length)
+                          ]
+        if config.axon.workers > 1:
+            # The axon workers bind the same port, the kernel balances the connections between them.
+            server_options.append(('grpc.so_reuseport', 1))
+        event_loop_thread = None
+        if config.axon.async_server:
+            # The aio server lives on its own loop thread, the thread pool only runs callbacks without priority.
+            event_loop_thread = EventLoopThread( name = 'bittensor-axon' )
+            if server == None:
+                receiver_hotkey = wallet.hotkey.ss58_address
+                async def create_server():
+                    return grpc.aio.server( 
+                        interceptors = (AsyncAuthInterceptor(receiver_hotkey=receiver_hotkey, **interceptor_kwargs),),
+                        maximum_concurrent_rpcs = config.axon.maximum_concurrent_rpcs,
+                        options = server_options,
+                    )
+                server = event_loop_thread.run( create_server() )
         if server == None:
             receiver_hotkey = wallet.hotkey.ss58_address
             server = grpc.server( thread_pool,
-                                  interceptors=(AuthInterceptor(receiver_hotkey=receiver_hotkey, blacklist=blacklist),),
+                                  interceptors=(AuthInterceptor(receiver_hotkey=receiver_hotkey, **interceptor_kwargs),),
                                   maximum_concurrent_rpcs = config.axon.maximum_concurrent_rpcs,
-                                  options = [('grpc.keepalive_time_ms', 100000),
-                                             ('grpc.keepalive_timeout_ms', 500000),
-                                             ('grpc.max_receive_message_length', config.axon.maximum_message_length)
-                                             ]
+                                  options = server_options,
                                 )
 
         synapses = {}
@@ -208,8 +250,19 @@ class axon:
             backward_timeout = config.axon.backward_timeout,
             prometheus_level = config.axon.prometheus.level,
             netuid = netuid,
+            thread_pool = thread_pool,
+            event_loop_thread = event_loop_thread,
+            micro_batcher = MicroBatcher( config.axon.batching.max_delay, config.axon.batching.max_batch_size ) if config.axon.batching.max_delay > 0 else None,
+            response_cache = ResponseCache( config.axon.cache.max_bytes, config.axon.cache.ttl ) if config.axon.cache.max_bytes > 0 else None,
+            admission_control = AdmissionControl() if config.axon.admission_control else None,
+            latency_histograms = LatencyHistograms() if config.axon.prometheus.level != bittensor.prometheus.level.OFF.name else None,
+            stats_ip = config.axon.stats.ip,
+            stats_port = config.axon.stats.port,
         )
-        bittensor.grpc.add_BittensorServicer_to_server( axon_instance, server )
+        if event_loop_thread != None:
+            bittensor.grpc.add_BittensorServicer_to_server( axon_impl.AsyncAxonServicer( axon_instance ), server )
+        else:
+            bittensor.grpc.add_BittensorServicer_to_server( axon_instance, server )
         full_address = str( config.axon.ip ) + ":" + str( config.axon.port )
         server.add_insecure_port( full_address )
         return axon_instance 
@@ -261,6 +314,9 @@ class axon:
                 help='''maximum number of threads in thread pool''', default = bittensor.defaults.axon.priority.max_workers)
             parser.add_argument('--' + prefix_str + 'axon.priority.maxsize', type=int, 
                 help='''maximum size of tasks in priority queue''', default = bittensor.defaults.axon.priority.maxsize)
+            parser.add_argument('--' + prefix_str + 'axon.priority.scheduling', type=str, choices=['priority', 'fair'],
+                help='''priority: highest priority first, fair: earliest deadline first within a hotkey, weighted fair queueing across hotkeys''', 
+                default = bittensor.defaults.axon.priority.scheduling)
             parser.add_argument('--' + prefix_str + 'axon.compression', type=str, 
                 help='''Which compression algorithm to use for compression (gzip, deflate, NoCompression) ''', default = bittensor.defaults.axon.compression)
             parser.add_argument('--' +  prefix_str + 'axon.lasthidden_timeout', type = int, 
@@ -273,12 +329,44 @@ class axon:
             help='Timeout for seq2seq synapse', default= 3*bittensor.__blocktime__)
             parser.add_argument('--' +  prefix_str + 'axon.maximum_message_length', type = int, 
             help='Maximum message length for requestion', default= 4*1024*1024)
+            parser.add_argument('--' + prefix_str + 'axon.async', dest = prefix_str + 'axon.async_server', action='store_true',
+                help='''If set, the axon is served by a grpc.aio server. Requests are deserialized, authenticated and prioritized on an event loop 
+                        and only the model calls use threads, so that in-flight requests cost no worker thread.''', default = bittensor.defaults.axon.async_server)
+            parser.add_argument('--' + prefix_str + 'axon.batching.max_delay', type = float,
+                help='''Maximum seconds a forward request waits for concurrent requests with the same synapses and input shape, 
+                        to run their synapse callbacks as one batch. 0 disables micro-batching.''', default = bittensor.defaults.axon.batching.max_delay)
+            parser.add_argument('--' + prefix_str + 'axon.batching.max_batch_size', type = int,
+                help='''Number of batched rows after which a micro-batch runs without waiting.''', default = bittensor.defaults.axon.batching.max_batch_size)
+            parser.add_argument('--' + prefix_str + 'axon.cache.max_bytes', type = int,
+                help='''Maximum bytes of serialized forward responses cached and served again for identical synapse arguments and inputs. 
+                        0 disables the response cache.''', default = bittensor.defaults.axon.cache.max_bytes)
+            parser.add_argument('--' + prefix_str + 'axon.cache.ttl', type = float,
+                help='''Seconds a cached forward response is served.''', default = bittensor.defaults.axon.cache.ttl)
+            parser.add_argument('--' + prefix_str + 'axon.admission_control', action='store_true',
+                help='''If set, prioritized forward requests whose estimated queue wait and service time exceed their timeout 
+                        are rejected on arrival with NucleusFull.''', default = bittensor.defaults.axon.admission_control)
+            parser.add_argument('--' + prefix_str + 'axon.auth.keypair_cache_size', type = int,
+                help='''Number of sender hotkeys whose decoded public keys are kept for signature verification.''', default = bittensor.defaults.axon.auth.keypair_cache_size)
+            parser.add_argument('--' + prefix_str + 'axon.auth.max_endpoints_per_hotkey', type = int,
+                help='''Maximum number of endpoints (receptors) signing requests with the same hotkey, requests from further 
+                        endpoints of the hotkey are rejected.''', default = bittensor.defaults.axon.auth.max_endpoints_per_hotkey)
+            parser.add_argument('--' + prefix_str + 'axon.auth.verify_workers', type = int,
+                help='''Number of threads verifying request signatures, requests beyond a few per thread are rejected 
+                        instead of waiting. 0 verifies on the request thread.''', default = bittensor.defaults.axon.auth.verify_workers)
             parser.add_argument('--' + prefix_str + 'axon.prometheus.level', 
                 required = False, 
                 type = str, 
                 choices = [l.name for l in list(bittensor.prometheus.level)], 
                 default = bittensor.defaults.axon.prometheus.level, 
                 help = '''Prometheus logging level axon. <OFF | INFO | DEBUG>''')
+            parser.add_argument('--' + prefix_str + 'axon.workers', type = int,
+                help='''Number of processes serving the axon port with SO_REUSEPORT, the main process included. 
+                        Neurons attach the extra processes with axon.attach_workers.''', default = bittensor.defaults.axon.workers)
+            parser.add_argument('--' + prefix_str + 'axon.stats.port', type = int,
+                help='''If non zero, the axon counters and per-stage latency histograms are served as JSON over HTTP on this port. 
+                        The latency histograms are only recorded when axon.prometheus.level is not OFF.''', default = bittensor.defaults.axon.stats.port)
+            parser.add_argument('--' + prefix_str + 'axon.stats.ip', type = str,
+                help='''The local ip the stats endpoint binds to.''', default = bittensor.defaults.axon.stats.ip)
         except argparse.ArgumentError:
             # re-parsing arguments.
             pass
@@ -301,19 +389,52 @@ class axon:
         defaults.axon.priority = bittensor.Config()
         defaults.axon.priority.max_workers = os.getenv('BT_AXON_PRIORITY_MAX_WORKERS') if os.getenv('BT_AXON_PRIORITY_MAX_WORKERS') != None else 10
         defaults.axon.priority.maxsize = os.getenv('BT_AXON_PRIORITY_MAXSIZE') if os.getenv('BT_AXON_PRIORITY_MAXSIZE') != None else -1
+        defaults.axon.priority.scheduling = os.getenv('BT_AXON_PRIORITY_SCHEDULING') if os.getenv('BT_AXON_PRIORITY_SCHEDULING') != None else 'priority'
+
+        defaults.axon.batching = bittensor.Config()
+        defaults.axon.batching.max_delay = float(os.getenv('BT_AXON_BATCHING_MAX_DELAY')) if os.getenv('BT_AXON_BATCHING_MAX_DELAY') != None else 0
+        defaults.axon.batching.max_batch_size = int(os.getenv('BT_AXON_BATCHING_MAX_BATCH_SIZE')) if os.getenv('BT_AXON_BATCHING_MAX_BATCH_SIZE') != None else 64
+
+        defaults.axon.cache = bittensor.Config()
+        defaults.axon.cache.max_bytes = int(os.getenv('BT_AXON_CACHE_MAX_BYTES')) if os.getenv('BT_AXON_CACHE_MAX_BYTES') != None else 0
+        defaults.axon.cache.ttl = float(os.getenv('BT_AXON_CACHE_TTL')) if os.getenv('BT_AXON_CACHE_TTL') != None else 60
+
+        defaults.axon.auth = bittensor.Config()
+        defaults.axon.auth.keypair_cache_size = int(os.getenv('BT_AXON_AUTH_KEYPAIR_CACHE_SIZE')) if os.getenv('BT_AXON_AUTH_KEYPAIR_CACHE_SIZE') != None else 4096
+        defaults.axon.auth.max_endpoints_per_hotkey = int(os.getenv('BT_AXON_AUTH_MAX_ENDPOINTS_PER_HOTKEY')) if os.getenv('BT_AXON_AUTH_MAX_ENDPOINTS_PER_HOTKEY') != None else 1024
+        defaults.axon.auth.verify_workers = int(os.getenv('BT_AXON_AUTH_VERIFY_WORKERS')) if os.getenv('BT_AXON_AUTH_VERIFY_WORKERS') != None else 0
+
+        defaults.axon.admission_control = os.getenv('BT_AXON_ADMISSION_CONTROL') == 'True' if os.getenv('BT_AXON_ADMISSION_CONTROL') != None else False
+
+        defaults.axon.workers = int(os.getenv('BT_AXON_WORKERS')) if os.getenv('BT_AXON_WORKERS') != None else 1
 
         defaults.axon.compression = 'NoCompression'
+        defaults.axon.async_server = os.getenv('BT_AXON_ASYNC') == 'True' if os.getenv('BT_AXON_ASYNC') != None else False
 
         # Prometheus
         defaults.axon.prometheus = bittensor.config()
         defaults.axon.prometheus.level = os.getenv('BT_AXON_PROMETHEUS_LEVEL') if os.getenv('BT_AXON_PROMETHEUS_LEVEL') != None else bittensor.prometheus.level.DEBUG.name
 
+        # Stats endpoint
+        defaults.axon.stats = bittensor.Config()
+        defaults.axon.stats.port = int(os.getenv('BT_AXON_STATS_PORT')) if os.getenv('BT_AXON_STATS_PORT') != None else 0
+        defaults.axon.stats.ip = os.getenv('BT_AXON_STATS_IP') if os.getenv('BT_AXON_STATS_IP') != None else '127.0.0.1'
+
     @classmethod   
     def check_config(cls, config: 'bittensor.Config' ):
         """ Check config for axon port and wallet
         """
         assert config.axon.port > 1024 and config.axon.port < 65535, 'port must be in range [1024, 65535]'
         assert config.axon.external_port is None or (config.axon.external_port > 1024 and config.axon.external_port < 65535), 'external port must be in range [1024, 65535]'
+        assert config.axon.batching.max_delay >= 0, 'axon.batching.max_delay must be larger or eq to 0'
+        assert config.axon.batching.max_batch_size > 0, 'axon.batching.max_batch_size must be larger than 0'
+        assert config.axon.cache.max_bytes >= 0, 'axon.cache.max_bytes must be larger or eq to 0'
+        assert config.axon.cache.ttl > 0, 'axon.cache.ttl must be larger than 0'
+        assert config.axon.auth.keypair_cache_size > 0, 'axon.auth.keypair_cache_size must be larger than 0'
+        assert config.axon.auth.max_endpoints_per_hotkey > 0, 'axon.auth.max_endpoints_per_hotkey must be larger than 0'
+        assert config.axon.auth.verify_workers >= 0, 'axon.auth.verify_workers must be larger or eq to 0'
+        assert config.axon.workers > 0, 'axon.workers must be larger than 0'
+        assert config.axon.stats.port >= 0 and config.axon.stats.port < 65535, 'axon.stats.port must be in range [0, 65535]'
         assert config.axon.prometheus.level in [l.name for l in list(bittensor.prometheus.level)], "axon.prometheus.level must be in: {}".format([l.name for l in list(bittensor.prometheus.level)])
         bittensor.wallet.check_config( config )
 
@@ -357,10 +478,17 @@ class axon:
 class AuthInterceptor(grpc.ServerInterceptor):
     """Creates a new server interceptor that authenticates incoming messages from passed arguments."""
 
+    # Pending verifications per verify worker, beyond which requests are rejected.
+    verify_queue_per_worker = 4
+
     def __init__(
         self,
         receiver_hotkey: str,
         blacklist: Callable = None,
+        metagraph: 'bittensor.Metagraph' = None,
+        keypair_cache_size: int = 4096,
+        max_endpoints_per_hotkey: int = 1024,
+        verify_workers: int = 0,
     ):
         r"""Creates a new server interceptor that authenticates incoming messages from passed arguments.
         Args:
@@ -368,11 +496,28 @@ class AuthInterceptor(grpc.ServerInterceptor):
                 the SS58 address of the hotkey which should be targeted by RPCs
             black_list (Function, `optional`):
                 black list function that prevents certain pubkeys from sending messages
+            metagraph (bittensor.Metagraph, `optional`):
+                if set, hotkeys not in the metagraph are rejected before verifying their signature
+            keypair_cache_size (int, `optional`):
+                number of sender hotkeys whose keypairs are kept
+            max_endpoints_per_hotkey (int, `optional`):
+                maximum number of endpoints of a sender hotkey whose last nonce is kept, further endpoints are rejected
+            verify_workers (int, `optional`):
+                if larger than 0, signatures are verified on a pool of this many threads
         """
         super().__init__()
-        self.nonces = {}
+        self.nonces = NonceTable( max_endpoints_per_hotkey = max_endpoints_per_hotkey )
         self.blacklist = blacklist
         self.receiver_hotkey = receiver_hotkey
+        self.metagraph = metagraph
+        # Sender hotkey to keypair, ordered from least to most recently used.
+        self.keypairs = OrderedDict()
+        self.keypair_cache_size = keypair_cache_size
+        self.keypairs_lock = threading.Lock()
+        self.verify_pool = None
+        if verify_workers > 0:
+            self.verify_pool = futures.ThreadPoolExecutor( max_workers = verify_workers, thread_name_prefix = 'bittensor-verify' )
+            self.verify_slots = threading.BoundedSemaphore( verify_workers * self.verify_queue_per_worker )
 
     def parse_legacy_signature(
         self, signature: str
@@ -429,7 +574,6 @@ class AuthInterceptor(grpc.ServerInterceptor):
         format: int,
     ):
         r"""verification of signature in metadata. Uses the pubkey and nonce"""
-        keypair = Keypair(ss58_address=sender_hotkey)
         # Build the expected message which was used to build the signature.
         if format == 2:
             message = f"{nonce}.{sender_hotkey}.{self.receiver_hotkey}.{receptor_uuid}"
@@ -437,19 +581,42 @@ class AuthInterceptor(grpc.ServerInterceptor):
             message = f"{nonce}{sender_hotkey}{receptor_uuid}"
         else:
             raise Exception("Invalid signature version")
-        # Build the key which uniquely identifies the endpoint that has signed
-        # the message.
-        endpoint_key = f"{sender_hotkey}:{receptor_uuid}"
-
-        if endpoint_key in self.nonces.keys():
-            previous_nonce = self.nonces[endpoint_key]
-            # Nonces must be strictly monotonic over time.
-            if nonce <= previous_nonce:
-                raise Exception("Nonce is too small")
-
-        if not keypair.verify(message, signature):
+        # Replays are rejected before paying for the verify, and checked again when storing the nonce.
+        self.nonces.check(sender_hotkey, receptor_uuid, nonce)
+        if not self.get_keypair(sender_hotkey).verify(message, signature):
             raise Exception("Signature mismatch")
-        self.nonces[endpoint_key] = nonce
+        self.nonces.update(sender_hotkey, receptor_uuid, nonce)
+
+    def get_keypair(self, hotkey: str) -> Keypair:
+        r"""Returns the keypair of the hotkey, decoding its ss58 address once while it is in the cache"""
+        with self.keypairs_lock:
+            keypair = self.keypairs.get(hotkey)
+            if keypair is not None:
+                self.keypairs.move_to_end(hotkey)
+                return keypair
+        keypair = Keypair(ss58_address=hotkey)
+        with self.keypairs_lock:
+            self.keypairs[hotkey] = keypair
+            while len(self.keypairs) > self.keypair_cache_size:
+                self.keypairs.popitem(last=False)
+        return keypair
+
+    def submit_check_signature(self, *args) -> futures.Future:
+        r"""Runs check_signature on the verify pool, or raises if too many verifications are pending"""
+        if not self.verify_slots.acquire(blocking=False):
+            raise Exception("Too many pending signature verifications")
+        try:
+            future = self.verify_pool.submit(self.check_signature, *args)
+        except BaseException:
+            self.verify_slots.release()
+            raise
+        future.add_done_callback(lambda _: self.verify_slots.release())
+        return future
+
+    def registration_checking(self, hotkey: str):
+        r"""Rejects hotkeys which are not in the metagraph, if the interceptor has one"""
+        if self.metagraph is not None and self.metagraph.hotkey_to_uid(hotkey) == -1:
+            raise Exception("Hotkey is not registered")
 
     def black_list_checking(self, hotkey: str, method: str):
         r"""Tries to call to blacklist function in the miner and checks if it should blacklist the pubkey"""
@@ -480,10 +647,18 @@ class AuthInterceptor(grpc.ServerInterceptor):
                 signature_format,
             ) = self.parse_signature(metadata)
 
+            # registration checking, before the costly signature verification
+            self.registration_checking(sender_hotkey)
+
             # signature checking
-            self.check_signature(
-                nonce, sender_hotkey, signature, receptor_uuid, signature_format
-            )
+            if self.verify_pool is None:
+                self.check_signature(
+                    nonce, sender_hotkey, signature, receptor_uuid, signature_format
+                )
+            else:
+                self.submit_check_signature(
+                    nonce, sender_hotkey, signature, receptor_uuid, signature_format
+                ).result()
 
             # blacklist checking
             self.black_list_checking(sender_hotkey, method)
@@ -494,3 +669,45 @@ class AuthInterceptor(grpc.ServerInterceptor):
             message = str(e)
             abort = lambda _, ctx: ctx.abort(grpc.StatusCode.UNAUTHENTICATED, message)
             return grpc.unary_unary_rpc_method_handler(abort)
+
+
+class AsyncAuthInterceptor(AuthInterceptor, grpc.aio.ServerInterceptor):
+    """Authenticates the incoming messages of a grpc.aio server, see AuthInterceptor."""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        r"""Authentication between bittensor nodes. Intercepts messages and checks them on the event loop"""
+        method = handler_call_details.method
+        metadata = dict(handler_call_details.invocation_metadata)
+
+        try:
+            (
+                nonce,
+                sender_hotkey,
+                signature,
+                receptor_uuid,
+                signature_format,
+            ) = self.parse_signature(metadata)
+
+            # registration checking, before the costly signature verification
+            self.registration_checking(sender_hotkey)
+
+            # signature checking, off the event loop if there is a verify pool
+            if self.verify_pool is None:
+                self.check_signature(
+                    nonce, sender_hotkey, signature, receptor_uuid, signature_format
+                )
+            else:
+                await asyncio.wrap_future(self.submit_check_signature(
+                    nonce, sender_hotkey, signature, receptor_uuid, signature_format
+                ))
+
+            # blacklist checking
+            self.black_list_checking(sender_hotkey, method)
+
+            return await continuation(handler_call_details)
+
+        except Exception as e:
+            message = str(e)
+            async def abort(_, ctx):
+                await ctx.abort(grpc.StatusCode.UNAUTHENTICATED, message)
+            return grpc.unary_unary_rpc_method_handler(abort)
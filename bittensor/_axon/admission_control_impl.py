@@ -0,0 +1,101 @@
+""" Admission control of axon forward requests from queue depth and service time estimates.
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+# Copyright © 2022 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import math
+import time as clock
+from threading import Lock
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Tuple
+
+import bittensor
+
+class AdmissionControl:
+    r""" Estimates when a forward request queued on the priority threadpool would finish, so that requests
+        which cannot finish before their deadline are rejected on arrival instead of timing out in the queue.
+
+        The service time of the forward callback is a moving average per combination of synapse types,
+        the synapses of a request share the model output. The wait is the number of queued requests which run
+        before the new one, spread over the pool workers, times the mean service time.
+
+        Args:
+            alpha (:obj:`float`, `optional`):
+                Weight of a new service time sample in the moving averages.
+            min_samples (:obj:`int`, `optional`):
+                Samples of a synapse combination before its requests can be rejected.
+    """
+    def __init__( self, alpha: float = 0.1, min_samples: int = 5 ):
+        self.alpha = alpha
+        self.min_samples = min_samples
+        # Moving average and sample count of the service time, per synapse combination.
+        self.service_times = {}
+        self.lock = Lock()
+
+    def __str__( self ):
+        return "AdmissionControl({})".format( { key: round( stat.mean, 3 ) for key, stat in self.service_times.items() } )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    @staticmethod
+    def key( synapses: List['bittensor.Synapse'] ) -> Tuple:
+        r""" Returns the service time key of a request, its sorted synapse types.
+        """
+        return tuple( sorted( synapse.synapse_type for synapse in synapses ) )
+
+    def observe( self, key: Tuple, service_time: float ):
+        r""" Adds a service time sample of the synapse combination.
+        """
+        with self.lock:
+            stat = self.service_times.get( key )
+            if stat == None:
+                self.service_times[ key ] = SimpleNamespace( mean = service_time, count = 1 )
+            else:
+                stat.mean = ( 1 - self.alpha ) * stat.mean + self.alpha * service_time
+                stat.count += 1
+
+    def timed( self, function: Callable, key: Tuple ) -> Callable:
+        r""" Returns the function observing its own run time as a service time sample of key.
+        """
+        def timed_function( *args, **kwargs ):
+            start_time = clock.time()
+            try:
+                return function( *args, **kwargs )
+            finally:
+                self.observe( key, clock.time() - start_time )
+        return timed_function
+
+    def estimate( self, key: Tuple, queued_ahead: int, workers: int ) -> Optional[float]:
+        r""" Returns the estimated seconds until a new request of the synapse combination finishes,
+            or None until the combination has min_samples samples.
+
+            Args:
+                key (:obj:`Tuple`, `required`):
+                    Synapse combination of the request.
+                queued_ahead (:obj:`int`, `required`):
+                    Number of queued requests which run before this one.
+                workers (:obj:`int`, `required`):
+                    Number of threads serving the queue.
+        """
+        with self.lock:
+            stat = self.service_times.get( key )
+            if stat == None or stat.count < self.min_samples:
+                return None
+            mean_service_time = sum( s.mean for s in self.service_times.values() ) / len( self.service_times )
+            return math.ceil( queued_ahead / workers ) * mean_service_time + stat.mean
@@ -19,9 +19,11 @@
 # DEALINGS IN THE SOFTWARE.
 
 import sys
+import asyncio
+import functools
 import time as clock
 from types import SimpleNamespace
-from typing import List, Tuple, Callable
+from typing import List, Tuple, Callable, Generator
 
 import torch
 import grpc
@@ -36,10 +38,12 @@ import concurrent
 import bittensor
 import bittensor.utils.stats as stat_utils
 from datetime import datetime
+from .latency_stats_impl import LATENCY_BUCKETS, LatencyHistograms, StatsServer, null_stage_timer
+from .workers_impl import merge_stats
 
 logger = logger.opt(colors=True)
 
-from prometheus_client import Counter, Histogram, Enum, CollectorRegistry
+from prometheus_client import Counter, Gauge, Histogram, Enum, CollectorRegistry
 PROM_axon_is_started = Enum('axon_is_started', 'is_started', states=['stopped', 'started'])
 PROM_total_forward = Counter('axon_total_forward', 'total_forward', ['wallet', 'identifier'])
 PROM_total_backward = Counter('axon_total_backward', 'total_backward', ['wallet', 'identifier'])
@@ -53,6 +57,11 @@ PROM_forward_hotkeys = Counter('axon_forward_hotkeys', 'forward_hotkeys', ['wall
 PROM_backward_hotkeys = Counter('axon_backward_hotkeys', 'backward_hotkeys', ['wallet', 'identifier', "hotkey"])
 PROM_forward_bytes = Counter('axon_forward_bytes', 'forward_bytes', ['wallet', 'identifier', "hotkey"])
 PROM_backward_bytes = Counter('axon_backward_bytes', 'backward_bytes', ['wallet', 'identifier', "hotkey"])
+PROM_response_cache = Counter('axon_response_cache', 'response_cache', ['wallet', 'identifier', "result"])
+PROM_response_cache_bytes = Gauge('axon_response_cache_bytes', 'response_cache_bytes', ['wallet', 'identifier'])
+PROM_worker_requests = Gauge('axon_worker_requests', 'worker_requests', ['wallet', 'identifier', 'worker'])
+PROM_worker_codes = Gauge('axon_worker_codes', 'worker_codes', ['wallet', 'identifier', 'worker', 'code'])
+PROM_stage_latency = Histogram('axon_stage_latency', 'stage_latency', ['wallet', 'identifier', 'direction', 'stage', 'synapse', 'code'], buckets=LATENCY_BUCKETS)
 
 class Axon( bittensor.grpc.BittensorServicer ):
     r""" Services Forward and Backward requests from other neurons.
@@ -77,6 +86,14 @@ class Axon( bittensor.grpc.BittensorServicer ):
         priority_threadpool: 'bittensor.prioritythreadpool' = None,
         forward_timeout: int = None,
         backward_timeout: int = None,
+        thread_pool: 'concurrent.futures.ThreadPoolExecutor' = None,
+        event_loop_thread: 'EventLoopThread' = None,
+        micro_batcher: 'MicroBatcher' = None,
+        response_cache: 'ResponseCache' = None,
+        admission_control: 'AdmissionControl' = None,
+        latency_histograms: 'LatencyHistograms' = None,
+        stats_ip: str = '127.0.0.1',
+        stats_port: int = 0,
     ):
         r""" Initializes a new Axon tensor processing endpoint.
             
@@ -99,6 +116,22 @@ class Axon( bittensor.grpc.BittensorServicer ):
                     function to assign priority on requests.
                 priority_threadpool (:obj:`bittensor.prioritythreadpool`, `optional`):
                     bittensor priority_threadpool.
+                thread_pool (:obj:`concurrent.futures.ThreadPoolExecutor`, `optional`):
+                    Threadpool running the callbacks of an async server without priority.
+                event_loop_thread (:obj:`EventLoopThread`, `optional`):
+                    Loop thread of the grpc.aio server, None for a grpc thread pool server.
+                micro_batcher (:obj:`MicroBatcher`, `optional`):
+                    If set, concurrent requests with the same synapses and input shape share synapse callback calls.
+                response_cache (:obj:`ResponseCache`, `optional`):
+                    If set, forward responses are cached and served again for the same synapse arguments and inputs.
+                admission_control (:obj:`AdmissionControl`, `optional`):
+                    If set, prioritized forward requests which cannot finish before their timeout are rejected with NucleusFull.
+                latency_histograms (:obj:`LatencyHistograms`, `optional`):
+                    If set, the latency of each request stage is recorded per synapse and return code.
+                stats_ip (:obj:`str`, `optional`):
+                    Binding ip of the local stats endpoint.
+                stats_port (:obj:`int`, `optional`):
+                    If non zero, the stats are served as JSON over HTTP on this port while the axon is started.
         """
         self.ip = ip
         self.port = port
@@ -121,6 +154,16 @@ class Axon( bittensor.grpc.BittensorServicer ):
         # -- Priority 
         self.priority = priority 
         self.priority_threadpool = priority_threadpool
+        self.thread_pool = thread_pool
+        self.event_loop_thread = event_loop_thread
+        self.micro_batcher = micro_batcher
+        self.response_cache = response_cache
+        self.admission_control = admission_control
+        self.latency_histograms = latency_histograms
+        self.stats_ip = stats_ip
+        self.stats_port = stats_port
+        self.stats_server = None
+        self.workers = None
         self._prometheus_uuid = uuid.uuid1()
 
         self.netuid = netuid 
@@ -148,15 +191,7 @@ class Axon( bittensor.grpc.BittensorServicer ):
                     proto response carring the nucleus forward output or None under failure.
         """
         forward_response_tensors, code, synapses = self._forward( request )
-        response = bittensor.proto.TensorMessage(
-            version = bittensor.__version_as_int__, 
-            hotkey = self.wallet.hotkey.ss58_address, 
-            return_code = code,
-            tensors = forward_response_tensors if forward_response_tensors is not None else [],
-            requires_grad = request.requires_grad,
-            synapses = synapses,
-        )
-        return response
+        return self._forward_response( request, forward_response_tensors, code, synapses )
 
     def Backward( self, request: bittensor.proto.TensorMessage, context: grpc.ServicerContext ) -> bittensor.proto.TensorMessage:
         r""" The function called by remote GRPC Backward requests from other neurons.
@@ -175,7 +210,24 @@ class Axon( bittensor.grpc.BittensorServicer ):
                     proto response carring the nucleus backward output or None under failure.
         """
         backward_response_tensors, code, synapses = self._backward( request )
-        response = bittensor.proto.TensorMessage(
+        return self._backward_response( request, backward_response_tensors, code, synapses )
+
+    def _forward_response( self, request, forward_response_tensors, code, synapses ) -> bittensor.proto.TensorMessage:
+        r""" Builds the proto response of a forward request.
+        """
+        return bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__, 
+            hotkey = self.wallet.hotkey.ss58_address, 
+            return_code = code,
+            tensors = forward_response_tensors if forward_response_tensors is not None else [],
+            requires_grad = request.requires_grad,
+            synapses = synapses,
+        )
+
+    def _backward_response( self, request, backward_response_tensors, code, synapses ) -> bittensor.proto.TensorMessage:
+        r""" Builds the proto response of a backward request.
+        """
+        return bittensor.proto.TensorMessage(
             version = bittensor.__version_as_int__, 
             hotkey = self.wallet.hotkey.ss58_address, 
             return_code = code,
@@ -183,7 +235,6 @@ class Axon( bittensor.grpc.BittensorServicer ):
             requires_grad = request.requires_grad,
             synapses = synapses
         )
-        return response
 
     def _forward(self, request):
         r""" Performs validity checks on the grpc request before passing the tensors to the forward queue.
@@ -201,6 +252,106 @@ class Axon( bittensor.grpc.BittensorServicer ):
                 synapses (:obj:`List[ 'bittensor.proto.Synapse' ]` of shape :obj:`(num_synapses)`, `required`):
                     Synapse wire protos with return codes from forward request.
         """
+        return self._run_call_steps( self._forward_steps( request ) )
+
+    async def _async_forward(self, request):
+        r""" Async version of _forward, the checks run on the event loop and the forward callback on a pool thread.
+        """
+        return await self._async_run_call_steps( self._forward_steps( request ) )
+
+    def _backward(self, request):
+        r""" Performs validity checks on the grpc request before piping the request to the backend queue.
+            Returns the outputs and synapses (with codes and messages from the backward call.)
+            Args:
+                request (:obj:`bittensor.proto`, `required`): 
+                    Tensor request proto.
+            Returns:
+                response: (:obj:`bittensor.proto.Tensor, `required`): 
+                    serialized tensor gradient responses. This is always an empty vector until gradients are allowed.
+                code (:obj:`bittensor.proto.ReturnCode`, `required`):
+                    Code from the call. This specifies if the overall function call was a success. 
+                    This is separate from the synapse returns codes which relate to the individual synapse call. 
+                synapses (:obj:`List[ 'bittensor.proto.Synapse' ]` of shape :obj:`(num_synapses)`, `required`):
+                    Synapse wire protos with return codes from forward request.
+        """
+        return self._run_call_steps( self._backward_steps( request ) )
+
+    async def _async_backward(self, request):
+        r""" Async version of _backward, the checks run on the event loop and the backward callback on a pool thread.
+        """
+        return await self._async_run_call_steps( self._backward_steps( request ) )
+
+    def _run_call_steps( self, steps: Generator ):
+        r""" Runs the steps of a forward or backward request, making the callback calls they yield on this thread.
+            Errors raised by a callback call are thrown back into the steps.
+        """
+        try:
+            call = next( steps )
+            while True:
+                try:
+                    result = self._make_call( call )
+                except Exception as e:
+                    call = steps.throw( e )
+                else:
+                    call = steps.send( result )
+        except StopIteration as stop:
+            return stop.value
+
+    async def _async_run_call_steps( self, steps: Generator ):
+        r""" Runs the steps of a forward or backward request on the event loop, awaiting the callback calls they yield.
+        """
+        try:
+            call = next( steps )
+            while True:
+                try:
+                    result = await self._async_make_call( call )
+                except Exception as e:
+                    call = steps.throw( e )
+                else:
+                    call = steps.send( result )
+        except StopIteration as stop:
+            return stop.value
+
+    def _make_call( self, call: SimpleNamespace ):
+        r""" Calls the callback in place, or through the priority threadpool if the call has a priority.
+        """
+        if call.priority == None:
+            return call.function( *call.args, **call.kwargs )
+        future = self._submit_call( call )
+        if not call.wait:
+            return None
+        try:
+            return future.result( timeout = call.timeout )
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _submit_call( self, call: SimpleNamespace ) -> concurrent.futures.Future:
+        r""" Queues the call on the priority threadpool, the call is dropped if it has not started before its timeout.
+        """
+        deadline = clock.time() + call.timeout if call.timeout != None else None
+        return self.priority_threadpool.submit( call.function, *call.args, priority = call.priority, priority_hotkey = call.hotkey, priority_deadline = deadline, **call.kwargs )
+
+    async def _async_make_call( self, call: SimpleNamespace ):
+        r""" Awaits the callback running on the priority threadpool, or on the axon thread pool if the call has no priority.
+        """
+        if call.priority == None:
+            return await asyncio.get_running_loop().run_in_executor( self.thread_pool, functools.partial( call.function, *call.args, **call.kwargs ) )
+        future = self._submit_call( call )
+        if not call.wait:
+            return None
+        try:
+            # The wrapped future cancels the pool future on timeout.
+            return await asyncio.wait_for( asyncio.wrap_future( future ), timeout = call.timeout )
+        except asyncio.TimeoutError:
+            raise concurrent.futures.TimeoutError()
+
+    def _forward_steps(self, request) -> Generator:
+        r""" Steps of _forward. Yields the forward callback call, as a SimpleNamespace with function, args, kwargs, 
+            priority, hotkey, timeout and wait, which is sent back its result, then returns the outputs of _forward.
+        """
+        timer = self.latency_histograms.timer() if self.latency_histograms != None else null_stage_timer
+
         # ===================================================================
         # ==== First deserialize synapse wire protos to instance objects ====        
         # ===================================================================
@@ -236,7 +387,11 @@ class Axon( bittensor.grpc.BittensorServicer ):
         # ==============================================================
         # ==== Function which prints all log statements per synapse ====
         # ==============================================================
-        def finalize_codes_stats_and_logs( message = None):
+        def finalize_codes_stats_and_logs( message = None, final = True ):
+            # === Latency histograms
+            if final and self.latency_histograms != None:
+                self.observe_latencies( 'forward', synapses, synapse_codes, timer )
+
             # === Prometheus
             if self.prometheus_level != bittensor.prometheus.level.OFF.name:
                 PROM_total_forward.labels( wallet = self.wallet.hotkey.ss58_address, identifier = self._prometheus_uuid ).inc()
@@ -256,18 +411,19 @@ class Axon( bittensor.grpc.BittensorServicer ):
                 request.synapses [ index ].message = synapse_messages[ index ] # Set synapse wire proto message
                 if synapse_is_response [index]:
                     self.update_stats_for_request(request,synapse_codes[ index ])
-                bittensor.logging.rpc_log ( 
-                    axon = True, 
-                    forward = True, 
-                    is_response = synapse_is_response [index], 
-                    code = synapse_codes[ index ], 
-                    call_time = synapse_call_times[ index ], 
-                    pubkey = request.hotkey, 
-                    inputs = deserialized_forward_tensors [index].shape if deserialized_forward_tensors [index] != None else None , 
-                    outputs = None if synapse_responses[index] == None else list( synapse_responses[index].shape ), 
-                    message = synapse_messages[ index ] if message == None else message,
-                    synapse = synapse.synapse_type
-                )
+                if bittensor.logging.rpc_log_on():
+                    bittensor.logging.rpc_log ( 
+                        axon = True, 
+                        forward = True, 
+                        is_response = synapse_is_response [index], 
+                        code = synapse_codes[ index ], 
+                        call_time = synapse_call_times[ index ], 
+                        pubkey = request.hotkey, 
+                        inputs = deserialized_forward_tensors [index].shape if deserialized_forward_tensors [index] != None else None , 
+                        outputs = None if synapse_responses[index] == None else list( synapse_responses[index].shape ), 
+                        message = synapse_messages[ index ] if message == None else message,
+                        synapse = synapse.synapse_type
+                    )
 
         # ======================================
         # ==== Check Empty request ====
@@ -315,47 +471,91 @@ class Axon( bittensor.grpc.BittensorServicer ):
                 synapse_codes [index] = bittensor.proto.ReturnCode.RequestDeserializationException
                 synapse_call_times [index] = clock.time() - start_time
                 synapse_messages [index] = 'Input deserialization exception with error:{}'.format(str(e))
+        timer.mark( 'deserialize' )
         # Check if the call can stop here.
         if check_if_should_return():
             finalize_codes_stats_and_logs()
             return [], synapse_codes[0] , request.synapses
 
 
+        # =====================================
+        # ==== Look up cached responses =======
+        # =====================================
+        cache_keys = [ None for _ in synapses ]
+        cached_responses = [ None for _ in synapses ]
+        if self.response_cache != None:
+            for index, synapse in enumerate( synapses ):
+                if synapse_codes[index] != bittensor.proto.ReturnCode.Success:
+                    continue
+                cache_keys[index] = self.response_cache.key( synapse, deserialized_forward_tensors[index] )
+                cached_responses[index] = self.response_cache.get( cache_keys[index] )
+                # A cached response is only served to requests passing the synapse checks.
+                if cached_responses[index] != None:
+                    try:
+                        if not self.synapse_checks( synapse, request.hotkey, deserialized_forward_tensors ):
+                            cached_responses[index] = None
+                    except Exception:
+                        cached_responses[index] = None
+                if self.prometheus_level != bittensor.prometheus.level.OFF.name:
+                    PROM_response_cache.labels( wallet = self.wallet.hotkey.ss58_address, identifier = self._prometheus_uuid, result = 'miss' if cached_responses[index] == None else 'hit' ).inc()
+            timer.mark( 'cache' )
+        # Synapses without cached response are passed to the forward callback.
+        call_indices = [ index for index, _ in enumerate( synapses ) if cached_responses[index] == None ]
+
         # ===================================
         # ==== Make forward calls. =========
         # ===================================
         try:
-            finalize_codes_stats_and_logs()
-            if self.priority != None:
-                priority = self.priority( request.hotkey, inputs_x = deserialized_forward_tensors, request_type = bittensor.proto.RequestType.FORWARD )
-                future = self.priority_threadpool.submit (
-                    self.forward_callback,
-                    inputs_x = deserialized_forward_tensors, 
-                    synapses = synapses,
+            finalize_codes_stats_and_logs( final = False )
+            forward_response_tensors = [ None for _ in synapses ]
+            if len( call_indices ) > 0:
+                call_inputs = [ deserialized_forward_tensors[index] for index in call_indices ]
+                call_synapses = [ synapses[index] for index in call_indices ]
+                priority = None
+                if self.priority != None:
+                    priority = self.priority( request.hotkey, inputs_x = call_inputs, request_type = bittensor.proto.RequestType.FORWARD )
+                forward_function = self.forward_callback
+
+                # ============================
+                # ==== Admission control =====
+                # ============================
+                if self.admission_control != None and priority != None:
+                    admission_key = self.admission_control.key( call_synapses )
+                    forward_function = self.admission_control.timed( self.forward_callback, admission_key )
+                    estimate = self.admission_control.estimate( admission_key, self.priority_threadpool.queued_ahead( priority, request.hotkey ), self.priority_threadpool.max_workers )
+                    if estimate != None and clock.time() - start_time + estimate > synapse_timeout:
+                        # Rejected now rather than timing out in the queue.
+                        code = bittensor.proto.ReturnCode.NucleusFull
+                        call_time = clock.time() - start_time
+                        message = "Nucleus full, request estimated to finish in {:.2f}s".format( estimate )
+                        synapse_codes = [code for _ in synapses ]
+                        synapse_call_times = [call_time for _ in synapses ]
+                        synapse_messages = [ message for _ in synapses ]
+                        finalize_codes_stats_and_logs()
+                        return [], code, request.synapses
+                timer.mark( 'priority' )
+
+                call_response_tensors, forward_codes, forward_messages = yield SimpleNamespace(
+                    function = timer.timed( forward_function, 'queue', 'model' ),
+                    args = (),
+                    kwargs = dict( inputs_x = call_inputs, synapses = call_synapses, hotkey = request.hotkey ),
                     priority = priority,
-                    hotkey = request.hotkey
-                )
-                forward_response_tensors, forward_codes, forward_messages = future.result( timeout = synapse_timeout - (clock.time() - start_time) )
-            else:
-                
-                forward_response_tensors, forward_codes, forward_messages = self.forward_callback(
-                    inputs_x = deserialized_forward_tensors,
-                    synapses = synapses,
-                    hotkey= request.hotkey
+                    hotkey = request.hotkey,
+                    timeout = synapse_timeout - (clock.time() - start_time),
+                    wait = True,
                 )
             synapse_is_response = [ True for _ in synapses ]
             # ========================================
             # ==== Fill codes from forward calls ====
             # ========================================
-            for index, synapse in enumerate(synapses):
-                synapse_codes [ index ] = forward_codes [ index ]
-                synapse_messages [index] = forward_messages [ index ]
+            for position, index in enumerate( call_indices ):
+                forward_response_tensors [ index ] = call_response_tensors [ position ]
+                synapse_codes [ index ] = forward_codes [ position ]
+                synapse_messages [index] = forward_messages [ position ]
         # ========================================
         # ==== Catch forward request timeouts ====
         # ========================================
         except concurrent.futures.TimeoutError:
-            if self.priority != None:
-                future.cancel()
             code = bittensor.proto.ReturnCode.Timeout
             call_time = clock.time() - start_time
             message = "Request reached timeout"
@@ -383,8 +583,12 @@ class Axon( bittensor.grpc.BittensorServicer ):
         response_synapses = []
         for index, synapse in enumerate( synapses ):
             try:
-                if synapse_codes[index] == bittensor.proto.ReturnCode.Success:
+                if cached_responses[index] != None:
+                    synapse_responses [ index ] = bittensor.proto.Tensor.FromString( cached_responses[index] )
+                elif synapse_codes[index] == bittensor.proto.ReturnCode.Success:
                     synapse_responses [ index ] = synapse.serialize_forward_response_tensor( deserialized_forward_tensors[ index ], forward_response_tensors [ index ] )
+                    if cache_keys[index] != None:
+                        self.response_cache.put( cache_keys[index], synapse_responses[ index ].SerializeToString() )
                 else:
                     synapse_responses [ index ] = synapse.empty()
 
@@ -405,7 +609,7 @@ class Axon( bittensor.grpc.BittensorServicer ):
                 synapse_responses [ index ] = synapse.empty()
 
             response_synapses.append(synapse.serialize_to_wire_proto(code = synapse_codes[index], message= synapse_messages[index] ))
-
+        timer.mark( 'serialize' )
             
         # Check if the call can stop here.
         if check_if_should_return():
@@ -419,24 +623,16 @@ class Axon( bittensor.grpc.BittensorServicer ):
             if synapse_codes[index] == bittensor.proto.ReturnCode.Success:
                 synapse_call_times[index] = clock.time() - start_time
 
+        if self.response_cache != None and self.prometheus_level != bittensor.prometheus.level.OFF.name:
+            PROM_response_cache_bytes.labels( wallet = self.wallet.hotkey.ss58_address, identifier = self._prometheus_uuid ).set( self.response_cache.nbytes )
         finalize_codes_stats_and_logs()
         return synapse_responses, bittensor.proto.ReturnCode.Success, response_synapses
  
-    def _backward(self, request):
-        r""" Performs validity checks on the grpc request before piping the request to the backend queue.
-            Returns the outputs and synapses (with codes and messages from the backward call.)
-            Args:
-                request (:obj:`bittensor.proto`, `required`): 
-                    Tensor request proto.
-            Returns:
-                response: (:obj:`bittensor.proto.Tensor, `required`): 
-                    serialized tensor gradient responses. This is always an empty vector until gradients are allowed.
-                code (:obj:`bittensor.proto.ReturnCode`, `required`):
-                    Code from the call. This specifies if the overall function call was a success. 
-                    This is separate from the synapse returns codes which relate to the individual synapse call. 
-                synapses (:obj:`List[ 'bittensor.proto.Synapse' ]` of shape :obj:`(num_synapses)`, `required`):
-                    Synapse wire protos with return codes from forward request.
+    def _backward_steps(self, request) -> Generator:
+        r""" Steps of _backward. Yields the backward callback call, which is sent back its result, 
+            then returns the outputs of _backward.
         """
+        timer = self.latency_histograms.timer() if self.latency_histograms != None else null_stage_timer
 
         # ===================================================================
         # ==== First deserialize synapse wire protos to instance objects ====        
@@ -470,7 +666,11 @@ class Axon( bittensor.grpc.BittensorServicer ):
         # ==============================================================
         # ==== Function which prints all log statements per synapse ====
         # ==============================================================
-        def finalize_codes_stats_and_logs():
+        def finalize_codes_stats_and_logs( final = True ):
+            # === Latency histograms
+            if final and self.latency_histograms != None:
+                self.observe_latencies( 'backward', synapses, synapse_codes, timer )
+
             # === Prometheus
             if self.prometheus_level != bittensor.prometheus.level.OFF.name:
                 PROM_total_backward.labels( wallet = self.wallet.hotkey.ss58_address, identifier = self._prometheus_uuid ).inc()
@@ -489,18 +689,19 @@ class Axon( bittensor.grpc.BittensorServicer ):
                 request.synapses [ index ].return_code = synapse_codes[ index ] # Set synapse wire proto codes.
                 request.synapses [ index ].message = synapse_messages[ index ] # Set synapse wire proto message
 
-                bittensor.logging.rpc_log ( 
-                    axon = True, 
-                    forward = False, 
-                    is_response = synapse_is_response [index], 
-                    code = synapse_codes[ index ], 
-                    call_time = synapse_call_times[ index ], 
-                    pubkey = request.hotkey, 
-                    inputs = None if deserialized_forward_gradients[index] == None else deserialized_forward_gradients[index].shape  , 
-                    outputs = None, # we never return from backward. 
-                    message = synapse_messages[ index ],
-                    synapse = synapse.synapse_type
-                )
+                if bittensor.logging.rpc_log_on():
+                    bittensor.logging.rpc_log ( 
+                        axon = True, 
+                        forward = False, 
+                        is_response = synapse_is_response [index], 
+                        code = synapse_codes[ index ], 
+                        call_time = synapse_call_times[ index ], 
+                        pubkey = request.hotkey, 
+                        inputs = None if deserialized_forward_gradients[index] == None else deserialized_forward_gradients[index].shape  , 
+                        outputs = None, # we never return from backward. 
+                        message = synapse_messages[ index ],
+                        synapse = synapse.synapse_type
+                    )
 
         # ======================================
         # ==== Check Empty request ====
@@ -559,6 +760,7 @@ class Axon( bittensor.grpc.BittensorServicer ):
                 synapse_codes [index] = bittensor.proto.ReturnCode.RequestDeserializationException
                 synapse_call_times [index] = clock.time() - start_time
                 synapse_messages [index] = 'Input deserialization exception with error:{}'.format(str(e))
+        timer.mark( 'deserialize' )
         # Check if the call can stop here.
         if check_if_should_return():
             finalize_codes_stats_and_logs()
@@ -569,22 +771,33 @@ class Axon( bittensor.grpc.BittensorServicer ):
         # ==== Make backward calls. =========
         # ===================================
         try:
-            finalize_codes_stats_and_logs()
+            finalize_codes_stats_and_logs( final = False )
             synapse_is_response = [ True for _ in synapses ]
             if self.priority != None:
-                # No wait on backward calls.
+                # No wait on backward calls, so the queue and model stages are not timed.
                 priority = self.priority( request.hotkey, inputs_x = deserialized_forward_tensors, request_type = bittensor.proto.RequestType.BACKWARD )
-                self.priority_threadpool.submit(
-                    self.backward_callback, 
-                    inputs_x = deserialized_forward_tensors, 
-                    grads_dy = deserialized_forward_gradients,
-                    synapses = synapses,
-                    priority = priority
+                timer.mark( 'priority' )
+                yield SimpleNamespace(
+                    function = self.backward_callback,
+                    args = (),
+                    kwargs = dict( inputs_x = deserialized_forward_tensors, grads_dy = deserialized_forward_gradients, synapses = synapses ),
+                    priority = priority,
+                    hotkey = request.hotkey,
+                    timeout = None,
+                    wait = False,
                 )
 
             else:
                 # Calling default
-                backward_response_tensors, backward_codes, backward_messages = self.backward_callback ( deserialized_forward_tensors, deserialized_forward_gradients, synapses = synapses )
+                backward_response_tensors, backward_codes, backward_messages = yield SimpleNamespace(
+                    function = timer.timed( self.backward_callback, 'queue', 'model' ),
+                    args = ( deserialized_forward_tensors, deserialized_forward_gradients ),
+                    kwargs = dict( synapses = synapses ),
+                    priority = None,
+                    hotkey = request.hotkey,
+                    timeout = None,
+                    wait = True,
+                )
             
                 # ========================================
                 # ==== Fill codes from forward calls ====
@@ -657,10 +870,15 @@ class Axon( bittensor.grpc.BittensorServicer ):
                     return message associated with synapse call
         """
         # --- initialize response variables --- 
-        response_tensors = []
-        response_codes = []
-        response_messages = []
+        response_tensors = [ None for _ in synapses ]
+        response_codes = [ None for _ in synapses ]
+        response_messages = [ None for _ in synapses ]
         model_output = None
+
+        # --- requests whose synapses can all be split back per request are micro-batched ---
+        use_micro_batcher = self.micro_batcher != None and self.micro_batcher.can_batch( synapses ) \
+            and len( set( inputs.shape[0] for inputs in inputs_x ) ) == 1
+        batched_indices = []
         
         # --- calling attached synapses ---
         for index, synapse in enumerate(synapses):
@@ -668,29 +886,78 @@ class Axon( bittensor.grpc.BittensorServicer ):
                 synapse_check =  self.synapse_checks(synapse, hotkey, inputs_x)
 
                 if synapse.synapse_type in self.synapse_callbacks and self.synapse_callbacks[synapse.synapse_type] != None and synapse_check:
+                    if use_micro_batcher:
+                        batched_indices.append( index )
+                        continue
                     message, model_output, response_tensor = self.synapse_callbacks[synapse.synapse_type](inputs_x[index], synapse, model_output)
-                    response_tensors.append(response_tensor)
-                    response_codes.append(bittensor.proto.ReturnCode.Success)
-                    response_messages.append('Success' if message is None else message)
+                    response_tensors[index] = response_tensor
+                    response_codes[index] = bittensor.proto.ReturnCode.Success
+                    response_messages[index] = 'Success' if message is None else message
                 
                 elif not synapse_check:
-                    response_tensors.append(None)
-                    response_codes.append(bittensor.proto.ReturnCode.UnknownException)
-                    response_messages.append('Synapse Check Failed')
+                    response_codes[index] = bittensor.proto.ReturnCode.UnknownException
+                    response_messages[index] = 'Synapse Check Failed'
 
                 else:
-                    response_tensors.append(None)
-                    response_codes.append(bittensor.proto.ReturnCode.NotImplemented)
-                    response_messages.append('Not Implemented')
+                    response_codes[index] = bittensor.proto.ReturnCode.NotImplemented
+                    response_messages[index] = 'Not Implemented'
 
             except Exception as e: 
                 # --- Exception Hit in Synapse ---
-                response_tensors.append(None)
-                response_codes.append(bittensor.proto.ReturnCode.UnknownException)
-                response_messages.append(str(e))
+                response_codes[index] = bittensor.proto.ReturnCode.UnknownException
+                response_messages[index] = str(e)
+
+        # --- calling the micro-batched synapses ---
+        if len( batched_indices ) > 0:
+            batched_synapses = [ synapses[index] for index in batched_indices ]
+            batched_inputs = [ inputs_x[index] for index in batched_indices ]
+            key = tuple( ( synapse.synapse_type, synapse.serialize_to_instance_proto().SerializeToString(), tuple( inputs.shape[1:] ) ) for synapse, inputs in zip( batched_synapses, batched_inputs ) )
+            try:
+                results = self.micro_batcher.call( 
+                    key = key, 
+                    item = batched_inputs, 
+                    rows = batched_inputs[0].shape[0], 
+                    run_batch = lambda requests_inputs: self.forward_synapse_batch( batched_synapses, requests_inputs ) 
+                )
+                for index, ( response_tensor, code, message ) in zip( batched_indices, results ):
+                    response_tensors[index] = response_tensor
+                    response_codes[index] = code
+                    response_messages[index] = message
+            except Exception as e:
+                for index in batched_indices:
+                    response_codes[index] = bittensor.proto.ReturnCode.UnknownException
+                    response_messages[index] = str(e)
         
         return response_tensors, response_codes, response_messages
 
+    def forward_synapse_batch( self, synapses: List['bittensor.Synapse'], requests_inputs: List[List[torch.Tensor]] ) -> List[List[Tuple]]:
+        r""" Calls each synapse callback once on the concatenated inputs of several requests and splits the responses back.
+            The model output is shared between the synapses as in default_forward_callback.
+
+            Args:
+                synapses (:obj:`List[bittensor.Synapse]`, `required`):
+                    Synapses of the batched requests, with equal arguments.
+                requests_inputs (:obj:`List[List[torch.Tensor]]`, `required`):
+                    Inputs per request and per synapse, with equal shapes but for the batch size.
+
+            Returns:
+                results (:obj:`List[List[Tuple]]`, `required`):
+                    Per request and per synapse, the response tensor, return code and message.
+        """
+        sizes = [ inputs[0].shape[0] for inputs in requests_inputs ]
+        results = [ [] for _ in requests_inputs ]
+        model_output = None
+        for index, synapse in enumerate( synapses ):
+            try:
+                inputs = torch.cat( [ request_inputs[index] for request_inputs in requests_inputs ], dim = 0 )
+                message, model_output, response_tensor = self.synapse_callbacks[synapse.synapse_type]( inputs, synapse, model_output )
+                for result, response_part in zip( results, self.micro_batcher.split( synapse, response_tensor, sizes ) ):
+                    result.append( ( response_part, bittensor.proto.ReturnCode.Success, 'Success' if message is None else message ) )
+            except Exception as e:
+                for result in results:
+                    result.append( ( None, bittensor.proto.ReturnCode.UnknownException, str(e) ) )
+        return results
+
     def default_backward_callback(self, inputs_x:torch.FloatTensor, grads_dy:torch.FloatTensor, synapses=[] ):
         raise Exception('No Backward Function Attached')
 
@@ -760,14 +1027,26 @@ class Axon( bittensor.grpc.BittensorServicer ):
     def start(self) -> 'Axon':
         r""" Starts the standalone axon GRPC server thread.
         """
-        if self.server != None:
-            self.server.stop( grace = 1 )  
-            logger.success("Axon Stopped:".ljust(20) + "<blue>{}</blue>", self.ip + ':' + str(self.port))
-
-        self.server.start()
+        if self.event_loop_thread != None:
+            # A grpc.aio server is started on its loop and cannot be restarted.
+            self.event_loop_thread.run( self.server.start() )
+        else:
+            if self.server != None:
+                self.server.stop( grace = 1 )  
+                logger.success("Axon Stopped:".ljust(20) + "<blue>{}</blue>", self.ip + ':' + str(self.port))
+            self.server.start()
         logger.success("Axon Started:".ljust(20) + "<blue>{}</blue>", self.ip + ':' + str(self.port))
         self.started = True
 
+        # Extra axon processes on the same port.
+        if self.workers != None:
+            self.workers.start()
+
+        # Local stats endpoint.
+        if self.stats_port != 0 and self.stats_server == None:
+            self.stats_server = StatsServer( self, self.stats_ip, self.stats_port ).start()
+            logger.success("Axon Stats:".ljust(20) + "<blue>http://{}:{}/stats</blue>", self.stats_server.ip, self.stats_server.port)
+
         # Switch prometheus ENUM.
         if self.prometheus_level != bittensor.prometheus.level.OFF.name:
             PROM_axon_is_started.state('started')
@@ -777,11 +1056,26 @@ class Axon( bittensor.grpc.BittensorServicer ):
     def stop(self) -> 'Axon':
         r""" Stop the axon grpc server.
         """
-        if self.server != None:
+        if self.server != None and self.event_loop_thread != None:
+            if self.started and self.event_loop_thread.loop.is_running():
+                # Bounded wait, the loop thread may be gone at interpreter exit.
+                try:
+                    self.event_loop_thread.submit( self.server.stop( grace = 1 ) ).result( timeout = 5 )
+                except concurrent.futures.TimeoutError:
+                    pass
+                logger.success("Axon Stopped:".ljust(20) + "<blue>{}</blue>", self.ip + ':' + str(self.port))
+        elif self.server != None:
             self.server.stop( grace = 1 )
             logger.success("Axon Stopped:".ljust(20) + "<blue>{}</blue>", self.ip + ':' + str(self.port))
         self.started = False
 
+        if getattr( self, 'stats_server', None ) != None:
+            self.stats_server.stop()
+            self.stats_server = None
+
+        if getattr( self, 'workers', None ) != None:
+            self.workers.stop()
+
         # Switch prometheus ENUM.
         if self.prometheus_level != bittensor.prometheus.level.OFF.name:
             PROM_axon_is_started.state('stopped')
@@ -834,10 +1128,110 @@ class Axon( bittensor.grpc.BittensorServicer ):
         self.stats.codes_per_pubkey[ pubkey ][bittensor.proto.ReturnCode.Name( code )] += 1
         self.stats.total_codes[bittensor.proto.ReturnCode.Name( code )] += 1
 
+    def observe_latencies( self, direction: str, synapses: List['bittensor.Synapse'], codes: List[int], timer: 'StageTimer' ):
+        r""" Records the stage latencies of a finished request in the latency histograms and prometheus, 
+            per synapse and return code, with the total latency as the total stage.
+            Args:
+                direction (:type:`str`, `required`):
+                    forward or backward.
+                synapses (:obj:`List[bittensor.Synapse]`, `required`):
+                    Synapses of the request.
+                codes (:obj:`List[bittensor.proto.ReturnCode]`, `required`):
+                    Return codes of the synapses.
+                timer (:obj:`StageTimer`, `required`):
+                    Stage timer of the request.
+        """
+        stages = dict( timer.stages, total = clock.time() - timer.start )
+        for synapse, code in zip( synapses, codes ):
+            synapse_name = bittensor.proto.Synapse.SynapseType.Name( synapse.synapse_type )
+            code_name = bittensor.proto.ReturnCode.Name( code )
+            self.latency_histograms.observe( direction, synapse_name, code_name, stages )
+            if self.prometheus_level != bittensor.prometheus.level.OFF.name:
+                for stage, seconds in stages.items():
+                    PROM_stage_latency.labels( wallet = self.wallet.hotkey.ss58_address, identifier = self._prometheus_uuid, direction = direction, stage = stage, synapse = synapse_name, code = code_name ).observe( seconds )
+
+    def attach_workers( self, workers: 'AxonWorkers' ):
+        r""" Attaches extra axon processes serving the same port, started and stopped with this axon.
+            Their request stats are merged into the stats of this axon, see aggregated_stats.
+
+            Args:
+                workers (:obj:`AxonWorkers`, `required`):
+                    Unstarted axon worker processes.
+        """
+        workers.on_stats = self._on_worker_stats
+        self.workers = workers
+
+    def _on_worker_stats( self, index: int, snapshot: dict ):
+        r""" Exports the request counters of an axon worker to prometheus.
+        """
+        if self.prometheus_level != bittensor.prometheus.level.OFF.name:
+            PROM_worker_requests.labels( wallet = self.wallet.hotkey.ss58_address, identifier = self._prometheus_uuid, worker = index ).set( snapshot['total_requests'] )
+            for code, count in snapshot['total_codes'].items():
+                PROM_worker_codes.labels( wallet = self.wallet.hotkey.ss58_address, identifier = self._prometheus_uuid, worker = index, code = code ).set( count )
+
+    def stats_snapshot( self ) -> dict:
+        r""" Returns the request counters and the raw latency histograms of this axon as a picklable dict,
+            which can be summed with the snapshots of other axon workers by merge_stats.
+        """
+        return {
+            'total_requests': self.stats.total_requests,
+            'total_successes': self.stats.total_successes,
+            'total_codes': dict( self.stats.total_codes ),
+            'requests_per_pubkey': dict( self.stats.requests_per_pubkey ),
+            'successes_per_pubkey': dict( self.stats.successes_per_pubkey ),
+            'codes_per_pubkey': { pubkey: dict( codes ) for pubkey, codes in list( self.stats.codes_per_pubkey.items() ) },
+            'latency': self.latency_histograms.snapshot() if self.latency_histograms != None else {},
+        }
+
+    def aggregated_stats( self ) -> dict:
+        r""" Returns the stats snapshot of this axon summed with the latest snapshots of its axon workers.
+        """
+        stats = self.stats_snapshot()
+        if self.workers != None:
+            for snapshot in self.workers.snapshots().values():
+                stats = merge_stats( stats, snapshot )
+        return stats
+
+    def stats_to_dict( self ) -> dict:
+        r""" Returns the request counters, the response cache counters and the latency histograms as a JSON serializable dict.
+            Request counters and latency histograms are aggregated across the axon workers.
+        """
+        stats = self.aggregated_stats()
+        latency_histograms = LatencyHistograms( self.latency_histograms.buckets ) if self.latency_histograms != None else LatencyHistograms()
+        latency_histograms.merge( stats['latency'] )
+        stats['latency'] = latency_histograms.to_dict()
+        stats['hotkey'] = self.wallet.hotkey.ss58_address
+        stats['started'] = bool( self.started )
+        stats['workers'] = 1 + ( self.workers.alive() if self.workers != None else 0 )
+        if self.response_cache != None:
+            stats['response_cache'] = { 'hits': self.response_cache.hits, 'misses': self.response_cache.misses, 'bytes': self.response_cache.nbytes }
+        return stats
+
         
 
+    def to_wandb( self ):
+        r""" Return a dictionary of axon stats, aggregated across the axon workers, as wandb logging info.
+            Return:
+                wandb_info (:obj:`Dict`)
+        """
+        try:
+            stats = self.aggregated_stats()
+            wandb_info = {
+                'axon/workers': 1 + ( self.workers.alive() if self.workers != None else 0 ),
+                'axon/total_requests': stats['total_requests'],
+                'axon/total_successes': stats['total_successes'],
+                'axon/Total unique queries': len( stats['requests_per_pubkey'].keys() ),
+            }
+            for code, count in stats['total_codes'].items():
+                wandb_info[ 'axon/codes/' + code ] = count
+            return wandb_info
+        except Exception as e:
+            bittensor.logging.error( prefix='failed axon.to_wandb()', sufix = str(e))
+            return {}
+
     def to_dataframe ( self, metagraph ):
         r""" Return a stats info as a pandas dataframe indexed by the metagraph or pubkey if not existend.
+            The request counts are aggregated across the axon workers.
             Args:
                 metagraph: (bittensor.Metagraph):
                     Indexes the stats data using uids.
@@ -846,19 +1240,40 @@ class Axon( bittensor.grpc.BittensorServicer ):
         """
         # Reindex the pubkey to uid if metagraph is present.
         try:
-            index = [ metagraph.hotkeys.index(pubkey) for pubkey in self.stats.requests_per_pubkey.keys() if pubkey in metagraph.hotkeys ]
+            stats = self.aggregated_stats()
+            index = [ metagraph.hotkey_to_uid(pubkey) for pubkey in stats['requests_per_pubkey'].keys() if metagraph.hotkey_to_uid(pubkey) != -1 ]
             columns = [ 'axon_n_requested', 'axon_n_success' ]
             dataframe = pandas.DataFrame(columns = columns, index = index)
-            for pubkey in self.stats.requests_per_pubkey.keys():
-                if pubkey in metagraph.hotkeys:
-                    uid = metagraph.hotkeys.index(pubkey)
+            for pubkey in stats['requests_per_pubkey'].keys():
+                uid = metagraph.hotkey_to_uid(pubkey)
+                if uid != -1:
                     dataframe.loc[ uid ] = pandas.Series( {
-                        'axon_n_requested': int(self.stats.requests_per_pubkey[pubkey]),
-                        'axon_n_success': int(self.stats.requests_per_pubkey[pubkey]),
+                        'axon_n_requested': int(stats['requests_per_pubkey'][pubkey]),
+                        'axon_n_success': int(stats['successes_per_pubkey'][pubkey]),
                     } )
             dataframe['uid'] = dataframe.index
             return dataframe
 
         except Exception as e:
             bittensor.logging.error(prefix='failed axon.to_dataframe()', sufix=str(e))
-            return pandas.DataFrame()
\ No newline at end of file
+            return pandas.DataFrame()
+
+
+class AsyncAxonServicer( bittensor.grpc.BittensorServicer ):
+    r""" Async Forward and Backward handlers of an Axon served by a grpc.aio server.
+        Thousands of requests can be in flight on the event loop while only the callbacks use threads.
+    """
+    def __init__( self, axon: 'Axon' ):
+        self.axon = axon
+
+    async def Forward(self, request: bittensor.proto.TensorMessage, context: 'grpc.aio.ServicerContext') -> bittensor.proto.TensorMessage:
+        r""" The function called by remote GRPC Forward requests, see Axon.Forward.
+        """
+        forward_response_tensors, code, synapses = await self.axon._async_forward( request )
+        return self.axon._forward_response( request, forward_response_tensors, code, synapses )
+
+    async def Backward(self, request: bittensor.proto.TensorMessage, context: 'grpc.aio.ServicerContext') -> bittensor.proto.TensorMessage:
+        r""" The function called by remote GRPC Backward requests, see Axon.Backward.
+        """
+        backward_response_tensors, code, synapses = await self.axon._async_backward( request )
+        return self.axon._backward_response( request, backward_response_tensors, code, synapses )
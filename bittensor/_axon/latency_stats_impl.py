@@ -0,0 +1,209 @@
+""" Per-stage latency histograms of axon requests and the local HTTP/JSON stats endpoint.
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+# Copyright © 2022 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import json
+import threading
+import time as clock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+from typing import Callable, Dict, List
+
+import bittensor
+import bittensor.utils.stats as stat_utils
+
+# Upper bounds in seconds of the histogram buckets, from 1ms doubling up to 30s, the last bucket also counts the larger latencies.
+LATENCY_BUCKETS = stat_utils.geometric_bounds( min_value = 0.001, max_value = 30.0, growth = 2.0 )
+
+class StageTimer:
+    r""" Times the consecutive stages of one request. Each mark closes the stage started by the previous mark.
+    """
+    def __init__( self ):
+        self.start = clock.time()
+        self.last = self.start
+        self.stages = {}
+
+    def mark( self, stage: str ):
+        r""" Adds the seconds since the previous mark to the stage.
+        """
+        now = clock.time()
+        self.stages[ stage ] = self.stages.get( stage, 0.0 ) + now - self.last
+        self.last = now
+
+    def timed( self, function: Callable, wait_stage: str, run_stage: str ) -> Callable:
+        r""" Returns the function marking wait_stage when it starts and run_stage when it returns,
+            i.e. the time spent queued and the time spent running on a pool thread.
+        """
+        def timed_function( *args, **kwargs ):
+            self.mark( wait_stage )
+            try:
+                return function( *args, **kwargs )
+            finally:
+                self.mark( run_stage )
+        return timed_function
+
+class NullStageTimer:
+    r""" Stage timer of requests while latency histograms are off, records nothing.
+    """
+    start = 0.0
+    stages = {}
+
+    def mark( self, stage: str ):
+        pass
+
+    def timed( self, function: Callable, wait_stage: str, run_stage: str ) -> Callable:
+        return function
+
+null_stage_timer = NullStageTimer()
+
+class LatencyHistograms:
+    r""" Latency histograms of the request stages, per direction, stage, synapse and return code.
+
+        Args:
+            buckets (:obj:`List[float]`, `optional`):
+                Increasing upper bounds of the buckets in seconds, the last bucket also counts the larger latencies.
+    """
+    def __init__( self, buckets: List[float] = LATENCY_BUCKETS ):
+        self.buckets = list( buckets )
+        # (direction, stage, synapse, code) to bittensor.utils.stats.LatencyHistogram.
+        self.histograms = {}
+        self.lock = Lock()
+
+    def __str__( self ):
+        return "LatencyHistograms({} histograms)".format( len( self.histograms ) )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def __len__( self ):
+        return len( self.histograms )
+
+    def timer( self ) -> StageTimer:
+        r""" Returns a new stage timer started now.
+        """
+        return StageTimer()
+
+    def observe( self, direction: str, synapse: str, code: str, stages: Dict[str, float] ):
+        r""" Adds the stage latencies of a request synapse to the histograms.
+
+            Args:
+                direction (:obj:`str`, `required`):
+                    forward or backward.
+                synapse (:obj:`str`, `required`):
+                    Synapse type name.
+                code (:obj:`str`, `required`):
+                    Return code name of the synapse.
+                stages (:obj:`Dict[str, float]`, `required`):
+                    Seconds spent per stage.
+        """
+        with self.lock:
+            for stage, seconds in stages.items():
+                self._histogram( ( direction, stage, synapse, code ) ).observe( seconds )
+
+    def _histogram( self, key: tuple ) -> 'stat_utils.LatencyHistogram':
+        # Called with the lock held. The histograms keep all observations, they are cumulative counters.
+        histogram = self.histograms.get( key )
+        if histogram == None:
+            histogram = stat_utils.LatencyHistogram( bounds = self.buckets, max_count = None )
+            self.histograms[ key ] = histogram
+        return histogram
+
+    def snapshot( self ) -> dict:
+        r""" Returns the raw histograms as a picklable dict of key to ( counts, sum, count ), see merge.
+        """
+        with self.lock:
+            return { key: histogram.snapshot() for key, histogram in self.histograms.items() }
+
+    def merge( self, snapshot: dict ):
+        r""" Adds the histograms of a snapshot, e.g. of another axon worker, taken with the same buckets.
+        """
+        with self.lock:
+            for key, histogram_snapshot in snapshot.items():
+                self._histogram( key ).merge( histogram_snapshot )
+
+    def to_dict( self ) -> dict:
+        r""" Returns the histograms as nested dicts of direction, synapse, code and stage, with count, sum,
+            mean, p50, p90, p99 and the cumulative bucket counts keyed by their upper bound, +Inf for the last bucket.
+        """
+        bounds = [ str( bound ) for bound in self.buckets[:-1] ] + [ '+Inf' ]
+        stats = {}
+        for ( direction, stage, synapse, code ), histogram_snapshot in self.snapshot().items():
+            histogram = stat_utils.LatencyHistogram( bounds = self.buckets, max_count = None )
+            histogram.merge( histogram_snapshot )
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip( bounds, histogram.counts ):
+                cumulative += bucket_count
+                buckets[ bound ] = cumulative
+            stats.setdefault( direction, {} ).setdefault( synapse, {} ).setdefault( code, {} )[ stage ] = {
+                'count': histogram.count,
+                'sum': histogram.sum,
+                'mean': histogram.sum / histogram.count,
+                'p50': histogram.quantile( 0.5 ),
+                'p90': histogram.quantile( 0.9 ),
+                'p99': histogram.quantile( 0.99 ),
+                'buckets': buckets,
+            }
+        return stats
+
+class StatsServer:
+    r""" Serves the stats of an axon as JSON over HTTP on a daemon thread, on GET / and GET /stats.
+
+        Args:
+            axon (:obj:`bittensor.Axon`, `required`):
+                Axon whose stats_to_dict is served.
+            ip (:obj:`str`, `required`):
+                Binding ip, local by default as the stats include sender hotkeys.
+            port (:obj:`int`, `required`):
+                Binding port, 0 binds a free port.
+    """
+    def __init__( self, axon: 'bittensor.Axon', ip: str, port: int ):
+        class Handler( BaseHTTPRequestHandler ):
+            def do_GET( handler ):
+                if handler.path.split('?')[0] not in ( '/', '/stats' ):
+                    handler.send_error( 404 )
+                    return
+                body = json.dumps( axon.stats_to_dict() ).encode()
+                handler.send_response( 200 )
+                handler.send_header( 'Content-Type', 'application/json' )
+                handler.send_header( 'Content-Length', str( len( body ) ) )
+                handler.end_headers()
+                handler.wfile.write( body )
+
+            def log_message( handler, format, *args ):
+                pass
+
+        self.server = ThreadingHTTPServer( ( ip, port ), Handler )
+        self.server.daemon_threads = True
+        self.ip, self.port = self.server.server_address[:2]
+        self.thread = threading.Thread( target = self.server.serve_forever, name = 'bittensor-axon-stats', daemon = True )
+
+    def __str__( self ):
+        return "StatsServer({}:{})".format( self.ip, self.port )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def start( self ) -> 'StatsServer':
+        self.thread.start()
+        return self
+
+    def stop( self ):
+        self.server.shutdown()
+        self.server.server_close()
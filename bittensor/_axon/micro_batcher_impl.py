@@ -0,0 +1,145 @@
+""" Micro-batching of concurrent axon requests into single synapse callback calls.
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+# Copyright © 2022 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, Hashable, List
+
+import torch
+
+import bittensor
+import bittensor.utils.stats as stat_utils
+
+def split_batch_major( response_tensor: torch.Tensor, sizes: List[int], synapse: 'bittensor.Synapse' ) -> List[torch.Tensor]:
+    r""" Splits a [batch_size, ...] response, i.e. last hidden states or causal lm logits, along the batch.
+    """
+    return list( torch.split( response_tensor, sizes, dim = 0 ) )
+
+def split_topk_token_phrases( compact_topk: torch.Tensor, sizes: List[int], synapse: 'bittensor.Synapse' ) -> List[torch.Tensor]:
+    r""" Splits a compacted 1-D topk token phrases response (see compact_topk_token_phrases) along the batch.
+        Each batch item starts at its first probability marker, marker values are in [0, 1] and token ids are offset to >= 2.
+    """
+    atol = 1e-6
+    prob_idx = torch.where( (-atol < compact_topk) & (compact_topk < 1 + atol) )[0]
+    item_starts = prob_idx[ :: synapse.topk + 1 ].tolist() + [ len( compact_topk ) ]
+    parts = []
+    start = 0
+    for size in sizes:
+        parts.append( compact_topk[ item_starts[ start ] : item_starts[ start + size ] ] )
+        start += size
+    return parts
+
+class MicroBatcher:
+    r""" Collects concurrent requests with the same key and runs them as one batch.
+
+        The first request of a key leads the batch: it waits up to max_delay seconds, or until the batch holds
+        max_batch_size rows, then runs the batch on its own thread while the other requests wait for their results.
+        No thread is added, the requests are already served by the axon thread pools.
+
+        Args:
+            max_delay (:obj:`float`, `required`):
+                Maximum seconds the first request of a batch waits for other requests.
+            max_batch_size (:obj:`int`, `required`):
+                Number of rows after which a batch runs without waiting.
+    """
+    # Splits the batched response of a synapse type back per request.
+    splitters = {
+        bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE: split_batch_major,
+        bittensor.proto.Synapse.SynapseType.TEXT_CAUSAL_LM: split_batch_major,
+        bittensor.proto.Synapse.SynapseType.TEXT_CAUSAL_LM_NEXT: split_topk_token_phrases,
+    }
+
+    def __init__( self, max_delay: float, max_batch_size: int ):
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self.lock = threading.Lock()
+        # Batches still open to new requests, per key.
+        self.batches = {}
+        self.stats = SimpleNamespace(
+            batch_requests = stat_utils.timed_rolling_avg(0.0, 0.01),
+            batch_rows = stat_utils.timed_rolling_avg(0.0, 0.01),
+        )
+
+    def __str__( self ):
+        return "MicroBatcher({}, {})".format( self.max_delay, self.max_batch_size )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def can_batch( self, synapses: List['bittensor.Synapse'] ) -> bool:
+        r""" Returns true if the responses of all synapses can be split back per request.
+        """
+        return len( synapses ) > 0 and all( synapse.synapse_type in self.splitters for synapse in synapses )
+
+    def split( self, synapse: 'bittensor.Synapse', response_tensor: torch.Tensor, sizes: List[int] ) -> List[torch.Tensor]:
+        r""" Splits the batched response of the synapse into the responses of requests with sizes rows.
+        """
+        return self.splitters[ synapse.synapse_type ]( response_tensor, sizes, synapse )
+
+    def call( self, key: Hashable, item: Any, rows: int, run_batch: Callable[ [List[Any]], List[Any] ] ) -> Any:
+        r""" Adds the item to the open batch of the key and returns its result once the batch ran.
+
+            Args:
+                key (:obj:`Hashable`, `required`):
+                    Only items with equal keys are batched together.
+                item (:obj:`Any`, `required`):
+                    Request item passed to run_batch.
+                rows (:obj:`int`, `required`):
+                    Rows of the item, counted against max_batch_size.
+                run_batch (:obj:`Callable`, `required`):
+                    Called by the leader with the batch items, returns one result per item.
+
+            Returns:
+                result (:obj:`Any`, `required`):
+                    Result of the item, exceptions of run_batch are raised to every request of the batch.
+        """
+        with self.lock:
+            batch = self.batches.get( key )
+            is_leader = batch == None
+            if is_leader:
+                batch = SimpleNamespace( items = [], rows = 0, full = threading.Event(), done = threading.Event(), results = None, error = None )
+                self.batches[ key ] = batch
+            index = len( batch.items )
+            batch.items.append( item )
+            batch.rows += rows
+            if batch.rows >= self.max_batch_size:
+                # Closed to new requests.
+                del self.batches[ key ]
+                batch.full.set()
+
+        if is_leader:
+            batch.full.wait( self.max_delay )
+            with self.lock:
+                if self.batches.get( key ) is batch:
+                    del self.batches[ key ]
+            try:
+                self.stats.batch_requests.update( len( batch.items ) )
+                self.stats.batch_rows.update( batch.rows )
+                batch.results = run_batch( batch.items )
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error != None:
+            raise batch.error
+        return batch.results[ index ]
@@ -0,0 +1,73 @@
+""" Table of the last nonce of each endpoint signing axon requests, with a bounded number of endpoints per sender hotkey.
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+# Copyright © 2022 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+from threading import Lock
+
+class NonceTable:
+    r""" Last nonce of each endpoint (sender hotkey and receptor uuid), which must strictly increase
+        between the requests of the endpoint so that signed requests can not be replayed.
+
+        Endpoints are never forgotten, as an endpoint starting over would accept the replay of its
+        past requests. Instead each sender hotkey may sign with at most max_endpoints_per_hotkey
+        endpoints, further endpoints of the hotkey are rejected without affecting the others.
+
+        Args:
+            max_endpoints_per_hotkey (:obj:`int`, `required`):
+                Maximum number of endpoints of a sender hotkey.
+    """
+    def __init__( self, max_endpoints_per_hotkey: int ):
+        self.max_endpoints_per_hotkey = max_endpoints_per_hotkey
+        # Sender hotkey to the last nonce of each of its receptor uuids.
+        self.nonces = {}
+        self.lock = Lock()
+
+    def __str__( self ):
+        return "NonceTable({} hotkeys, {} endpoints)".format( len( self.nonces ), len( self ) )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def __len__( self ):
+        return sum( len( endpoints ) for endpoints in list( self.nonces.values() ) )
+
+    def __contains__( self, endpoint: tuple ):
+        sender_hotkey, receptor_uuid = endpoint
+        return receptor_uuid in self.nonces.get( sender_hotkey, {} )
+
+    def check( self, sender_hotkey: str, receptor_uuid: str, nonce: int ):
+        r""" Raises if the nonce is not larger than the last nonce of the endpoint,
+            or if the endpoint is new and the hotkey has reached its maximum number of endpoints.
+        """
+        endpoints = self.nonces.get( sender_hotkey, {} )
+        last_nonce = endpoints.get( receptor_uuid )
+        if last_nonce == None:
+            if len( endpoints ) >= self.max_endpoints_per_hotkey:
+                raise Exception("Too many endpoints for hotkey")
+        # Nonces must be strictly monotonic over time.
+        elif nonce <= last_nonce:
+            raise Exception("Nonce is too small")
+
+    def update( self, sender_hotkey: str, receptor_uuid: str, nonce: int ):
+        r""" Checks the nonce again and stores it as the last nonce of the endpoint, atomically with respect
+            to concurrent requests of the endpoint.
+        """
+        with self.lock:
+            self.check( sender_hotkey, receptor_uuid, nonce )
+            self.nonces.setdefault( sender_hotkey, {} )[ receptor_uuid ] = nonce
@@ -0,0 +1,100 @@
+""" Bounded LRU cache of serialized axon forward responses.
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+# Copyright © 2022 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import hashlib
+import time as clock
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+import torch
+
+import bittensor
+
+class ResponseCache:
+    r""" Least recently used cache of serialized forward response protos, keyed by synapse arguments and inputs.
+        Entries expire after ttl seconds and the least recently used entries are evicted once the cached
+        responses exceed max_bytes.
+
+        Args:
+            max_bytes (:obj:`int`, `required`):
+                Maximum total size of the cached responses in bytes.
+            ttl (:obj:`float`, `required`):
+                Seconds an entry is served after being cached.
+    """
+    def __init__( self, max_bytes: int, ttl: float ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # Key to (response bytes, expiry time), ordered from least to most recently used.
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def __str__( self ):
+        return "ResponseCache({}/{} bytes, {} hits, {} misses)".format( self.nbytes, self.max_bytes, self.hits, self.misses )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def __len__( self ):
+        return len( self.entries )
+
+    @staticmethod
+    def key( synapse: 'bittensor.Synapse', inputs: torch.Tensor ) -> Tuple:
+        r""" Returns the cache key of a synapse called on inputs: the synapse type and arguments
+            with the dtype, shape and a blake2b digest of the input tensor.
+        """
+        inputs = inputs.detach().cpu().contiguous()
+        digest = hashlib.blake2b( inputs.numpy().tobytes(), digest_size = 16 ).digest()
+        return ( synapse.synapse_type, synapse.serialize_to_instance_proto().SerializeToString(), str( inputs.dtype ), tuple( inputs.shape ), digest )
+
+    def get( self, key: Tuple ) -> Optional[bytes]:
+        r""" Returns the cached response bytes of the key or None if missing or expired.
+        """
+        with self.lock:
+            entry = self.entries.get( key )
+            if entry != None and entry[1] < clock.time():
+                self._remove( key )
+                entry = None
+            if entry == None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end( key )
+            self.hits += 1
+            return entry[0]
+
+    def put( self, key: Tuple, response: bytes ):
+        r""" Caches the response bytes, evicting the least recently used entries over max_bytes.
+        """
+        if len( response ) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove( key )
+            self.entries[ key ] = ( response, clock.time() + self.ttl )
+            self.nbytes += len( response )
+            while self.nbytes > self.max_bytes:
+                self._remove( next( iter( self.entries ) ) )
+
+    def _remove( self, key: Tuple ):
+        response, _ = self.entries.pop( key )
+        self.nbytes -= len( response )
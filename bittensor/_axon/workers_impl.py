@@ -0,0 +1,148 @@
+""" Extra axon processes bound to the same port with SO_REUSEPORT, with their request stats collected by the main process.
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+# Copyright © 2022 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import threading
+from threading import Lock
+from typing import Any, Callable, Dict
+
+import torch.multiprocessing
+
+def merge_stats( a: Any, b: Any ) -> Any:
+    r""" Sums two stats snapshots of Axon.stats_snapshot, recursively through dicts, lists and tuples.
+    """
+    if isinstance( a, dict ):
+        merged = dict( a )
+        for key, value in b.items():
+            merged[ key ] = merge_stats( merged[ key ], value ) if key in merged else value
+        return merged
+    if isinstance( a, ( list, tuple ) ):
+        return type( a )( merge_stats( x, y ) for x, y in zip( a, b ) )
+    return a + b
+
+def run_worker( index: int, target: Callable, args: tuple, stats_queue: 'multiprocessing.Queue', stop_event: 'multiprocessing.Event', interval: float ):
+    r""" Main of an axon worker process: builds the worker axon with target( *args ), starts it
+        and sends its stats snapshot to the main process every interval seconds until stopped.
+    """
+    axon = target( *args )
+    axon.start()
+    try:
+        while not stop_event.wait( interval ):
+            stats_queue.put( ( index, axon.stats_snapshot() ) )
+    finally:
+        stats_queue.put( ( index, axon.stats_snapshot() ) )
+        axon.stop()
+
+class AxonWorkers:
+    r""" Runs axons in extra processes, which bind the port of the main axon with SO_REUSEPORT
+        so that the kernel spreads the incoming connections over the processes and their GILs.
+
+        The processes are spawned, each builds its own axon by calling target( *args ): the target and 
+        its arguments are pickled, tensors in shared memory (see torch.nn.Module.share_memory) are shared 
+        instead of copied, so the workers can serve the model of the main process.
+        Their request stats are sent back every interval seconds and merged into the stats of the main axon.
+
+        Args:
+            workers (:obj:`int`, `required`):
+                Number of extra axon processes.
+            target (:obj:`Callable`, `required`):
+                Picklable function building the unstarted axon of a worker, with axon.workers larger than 1.
+            args (:obj:`tuple`, `optional`):
+                Picklable arguments of target.
+            interval (:obj:`float`, `optional`):
+                Seconds between the stats updates of the workers.
+    """
+    def __init__( self, workers: int, target: Callable, args: tuple = (), interval: float = 5.0 ):
+        self.workers = workers
+        self.target = target
+        self.args = args
+        self.interval = interval
+        self.context = torch.multiprocessing.get_context( 'spawn' )
+        self.processes = []
+        self.stats_queue = None
+        self.stop_event = None
+        self.collector = None
+        # Latest stats snapshot per worker index, the main axon is worker 0.
+        self.latest = {}
+        self.lock = Lock()
+        # Called with the worker index and snapshot on each stats update.
+        self.on_stats = None
+
+    def __str__( self ):
+        return "AxonWorkers({}/{} alive)".format( self.alive(), self.workers )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def alive( self ) -> int:
+        r""" Returns the number of running worker processes.
+        """
+        return sum( process.is_alive() for process in self.processes )
+
+    def start( self ) -> 'AxonWorkers':
+        r""" Spawns the worker processes, if not already running.
+        """
+        if len( self.processes ) > 0:
+            return self
+        self.stats_queue = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.collector = threading.Thread( target = self._collect, args = ( self.stats_queue, ), name = 'bittensor-axon-workers', daemon = True )
+        self.collector.start()
+        for index in range( 1, self.workers + 1 ):
+            process = self.context.Process( 
+                target = run_worker, 
+                args = ( index, self.target, self.args, self.stats_queue, self.stop_event, self.interval ),
+                name = 'bittensor-axon-worker-{}'.format( index ),
+                daemon = True,
+            )
+            process.start()
+            self.processes.append( process )
+        return self
+
+    def stop( self, timeout: float = 10 ):
+        r""" Stops the worker processes, killing those which do not stop within timeout seconds.
+            The last stats of the workers are kept.
+        """
+        if len( self.processes ) == 0:
+            return
+        self.stop_event.set()
+        for process in self.processes:
+            process.join( timeout )
+            if process.is_alive():
+                process.terminate()
+        self.stats_queue.put( None )
+        self.collector.join( timeout )
+        self.processes = []
+
+    def _collect( self, stats_queue: 'multiprocessing.Queue' ):
+        while True:
+            item = stats_queue.get()
+            if item == None:
+                return
+            index, snapshot = item
+            with self.lock:
+                self.latest[ index ] = snapshot
+            if self.on_stats != None:
+                self.on_stats( index, snapshot )
+
+    def snapshots( self ) -> Dict[ int, dict ]:
+        r""" Returns the latest stats snapshot of each worker which sent one, by worker index.
+        """
+        with self.lock:
+            return dict( self.latest )
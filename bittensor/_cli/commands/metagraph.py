@@ -26,15 +26,23 @@ console = bittensor.__console__
 class MetagraphCommand:
     @staticmethod
     def run (cli):
-        r""" Prints an entire metagraph."""
+        r""" Prints an entire metagraph, synced from the chain or read offline from a snapshot."""
         console = bittensor.__console__
-        subtensor = bittensor.subtensor( config = cli.config )
-        console.print(":satellite: Syncing with chain: [white]{}[/white] ...".format(cli.config.subtensor.network))
-        metagraph = subtensor.metagraph( netuid = cli.config.netuid )
-        metagraph.save()
-        difficulty = subtensor.difficulty( cli.config.netuid )
-        subnet_emission = bittensor.Balance.from_tao(subtensor.get_emission_value_by_subnet(cli.config.netuid))
-        total_issuance = bittensor.Balance.from_tao(subtensor.total_issuance())
+        if cli.config.get('snapshot') != None:
+            console.print(":floppy_disk: Reading snapshot: [white]{}[/white] ...".format(cli.config.snapshot))
+            metagraph = bittensor.Metagraph( network = cli.config.subtensor.network, netuid = None ).load_snapshot( cli.config.snapshot )
+            network = metagraph.network
+            difficulty = metagraph.info.difficulty if metagraph.info != None else '-'
+            total_issuance = '-'
+        else:
+            subtensor = bittensor.subtensor( config = cli.config )
+            console.print(":satellite: Syncing with chain: [white]{}[/white] ...".format(cli.config.subtensor.network))
+            metagraph = subtensor.metagraph( netuid = cli.config.netuid, lite = True )
+            metagraph.save()
+            metagraph.save_snapshot()
+            network = subtensor.network
+            difficulty = subtensor.difficulty( cli.config.netuid )
+            total_issuance = bittensor.Balance.from_tao(subtensor.total_issuance())
 
         TABLE_DATA = [] 
         total_stake = 0.0
@@ -76,7 +84,7 @@ class MetagraphCommand:
         total_neurons = len(metagraph.uids)                
         table = Table(show_footer=False)
         table.title = (
-            "[white]Metagraph: net: {}:{}, block: {}, N: {}/{}, tau: {}/block, stake: {}, issuance: {}, difficulty: {}".format(subtensor.network, metagraph.netuid, metagraph.block.item(), sum(metagraph.active.tolist()), metagraph.n.item(), bittensor.Balance.from_tao(metagraph.tau.item()), bittensor.Balance.from_tao(total_stake), total_issuance, difficulty )
+            "[white]Metagraph: net: {}:{}, block: {}, N: {}/{}, tau: {}/block, stake: {}, issuance: {}, difficulty: {}".format(network, metagraph.netuid, metagraph.block.item(), sum(metagraph.active.tolist()), metagraph.n.item(), bittensor.Balance.from_tao(metagraph.tau.item()), bittensor.Balance.from_tao(total_stake), total_issuance, difficulty )
         )
         table.add_column("[overline white]UID",  str(total_neurons), footer_style = "overline white", style='yellow')
         table.add_column("[overline white]STAKE(\u03C4)", '\u03C4{:.5f}'.format(total_stake), footer_style = "overline white", justify='right', style='green', no_wrap=True)
@@ -104,7 +112,9 @@ class MetagraphCommand:
 
     @staticmethod
     def check_config( config: 'bittensor.Config' ):
-        check_netuid_set( config, subtensor = bittensor.subtensor( config = config ) )
+        # A snapshot is read offline, with its own netuid.
+        if config.get('snapshot') == None:
+            check_netuid_set( config, subtensor = bittensor.subtensor( config = config ) )
 
     @staticmethod
     def add_args( parser: argparse.ArgumentParser ):
@@ -120,4 +130,10 @@ class MetagraphCommand:
             default=False,
         )
         metagraph_parser.add_argument( '--no_version_checking', action='store_true', help='''Set false to stop cli version checking''', default = False )
+        metagraph_parser.add_argument( 
+            '--snapshot', 
+            type=str, 
+            help='''Read the metagraph offline from a snapshot file, i.e. ~/.bittensor/finney_3_lite.snapshot as saved by btcli metagraph.''', 
+            default=None 
+        )
         bittensor.subtensor.add_args( metagraph_parser )
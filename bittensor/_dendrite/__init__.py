@@ -85,6 +85,10 @@ class dendrite:
                 wallet = wallet,
                 max_active_receptors = config.dendrite.max_active_receptors,
                 compression = config.dendrite.compression,
+                circuit_breaker_threshold = config.dendrite.circuit_breaker.threshold,
+                circuit_breaker_backoff = config.dendrite.circuit_breaker.backoff,
+                io_thread = config.dendrite.io_thread,
+                coalesce_window = config.dendrite.coalesce_window,
             )
         if config.dendrite._mock:
             return dendrite_mock.DendriteMock ( 
@@ -126,6 +130,10 @@ class dendrite:
             parser.add_argument('--' + prefix_str + 'dendrite.requires_grad', action='store_true', help='''If true, the dendrite passes gradients on the wire.''', default = bittensor.defaults.dendrite.requires_grad)
             parser.add_argument('--' + prefix_str + 'dendrite.no_requires_grad', dest = prefix_str + 'dendrite.requires_grad', action='store_false', help='''If set, the dendrite will not passes gradients on the wire.''')
             parser.add_argument('--' + prefix_str + 'dendrite.compression', type=str, help='''Which compression algorithm to use for compression (gzip, deflate, NoCompression) ''', default = bittensor.defaults.dendrite.compression)
+            parser.add_argument('--' + prefix_str + 'dendrite.circuit_breaker.threshold', type=int, help='''Number of consecutive Unavailable, Timeout or BadEndpoint calls after which an endpoint returns Backoff without being called. 0 disables circuit breaking.''', default = bittensor.defaults.dendrite.circuit_breaker.threshold)
+            parser.add_argument('--' + prefix_str + 'dendrite.circuit_breaker.backoff', type=float, help='''Seconds before an endpoint with an open circuit is probed again, doubled after each failed probe.''', default = bittensor.defaults.dendrite.circuit_breaker.backoff)
+            parser.add_argument('--' + prefix_str + 'dendrite.io_thread', action='store_true', help='''If set, the dendrite runs its network I/O on a long-lived event loop thread shared by all calling threads.''', default = bittensor.defaults.dendrite.io_thread)
+            parser.add_argument('--' + prefix_str + 'dendrite.coalesce_window', type=float, help='''Seconds, typically 0.001 to 0.005, during which concurrent forward requests with identical inputs to the same endpoint are merged into one request. 0 disables coalescing.''', default = bittensor.defaults.dendrite.coalesce_window)
             parser.add_argument('--' + prefix_str + 'dendrite._mock', action='store_true', help='To turn on dendrite mocking for testing purposes.', default=False)
             parser.add_argument('--' + prefix_str + 'dendrite.prometheus.level', 
                 required = False, 
@@ -147,6 +155,12 @@ class dendrite:
         defaults.dendrite.timeout = os.getenv('BT_DENDRITE_TIMEOUT') if os.getenv('BT_DENDRITE_TIMEOUT') != None else bittensor.__blocktime__ + 2
         defaults.dendrite.requires_grad = os.getenv('BT_DENDRITE_REQUIRES_GRAD') if os.getenv('BT_DENDRITE_REQUIRES_GRAD') != None else True
         defaults.dendrite.compression = os.getenv('BT_DENDRITE_COMPRESSION') if os.getenv('BT_DENDRITE_COMPRESSION') != None else 'NoCompression'
+        defaults.dendrite.io_thread = os.getenv('BT_DENDRITE_IO_THREAD') == 'True' if os.getenv('BT_DENDRITE_IO_THREAD') != None else False
+        defaults.dendrite.coalesce_window = float(os.getenv('BT_DENDRITE_COALESCE_WINDOW')) if os.getenv('BT_DENDRITE_COALESCE_WINDOW') != None else 0
+        # Circuit breaker
+        defaults.dendrite.circuit_breaker = bittensor.config()
+        defaults.dendrite.circuit_breaker.threshold = int(os.getenv('BT_DENDRITE_CIRCUIT_BREAKER_THRESHOLD')) if os.getenv('BT_DENDRITE_CIRCUIT_BREAKER_THRESHOLD') != None else 0
+        defaults.dendrite.circuit_breaker.backoff = float(os.getenv('BT_DENDRITE_CIRCUIT_BREAKER_BACKOFF')) if os.getenv('BT_DENDRITE_CIRCUIT_BREAKER_BACKOFF') != None else 60
         # Prometheus
         defaults.dendrite.prometheus = bittensor.config()
         defaults.dendrite.prometheus.level = os.getenv('BT_DENDRITE_PROMETHEUS_LEVEL') if os.getenv('BT_DENDRITE_PROMETHEUS_LEVEL') != None else bittensor.prometheus.level.DEBUG.name
@@ -160,5 +174,7 @@ class dendrite:
         assert 'timeout' in config.dendrite
         assert 'requires_grad' in config.dendrite
         assert config.dendrite.max_active_receptors >= 0, 'max_active_receptors must be larger or eq to 0'
+        assert config.dendrite.circuit_breaker.threshold >= 0, 'circuit_breaker.threshold must be larger or eq to 0'
+        assert config.dendrite.coalesce_window >= 0, 'coalesce_window must be larger or eq to 0'
         assert config.dendrite.prometheus.level in [l.name for l in list(bittensor.prometheus.level)], "dendrite.prometheus.level must be in: {}".format([l.name for l in list(bittensor.prometheus.level)])        
         bittensor.wallet.check_config( config )
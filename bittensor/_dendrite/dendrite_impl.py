@@ -18,7 +18,7 @@
 # DEALINGS IN THE SOFTWARE.
 
 from types import SimpleNamespace
-from typing import Tuple, List, Union, Optional
+from typing import Tuple, List, Union, Optional, AsyncIterator
 
 import sys
 import torch
@@ -115,8 +115,10 @@ class Dendrite(torch.autograd.Function):
             dummy: torch.Tensor,
             endpoints: List['bittensor.Endpoint'],
             synapses: List[ 'bittensor.Synapse' ],
-            timeout: int,
+            timeout: Union[ int, str ],
             requires_grad: bool,
+            quorum: Union[ int, float ],
+            soft_timeout: float,
             *inputs: torch.Tensor
     ) -> Tuple[torch.Tensor, ...]:
         """ Internal autograd-friendly Forward RPC call to a list of neuron endpoints.
@@ -139,12 +141,18 @@ class Dendrite(torch.autograd.Function):
                     Bittensor synapse objects with arguments. Each corresponds to a synapse function on the axon.
                     Responses are packed in this ordering. 
 
-                timeout (int):
-                    request timeout.
+                timeout (:obj:`Union[int, str]`, `required`):
+                    request timeout, or 'adaptive' for per endpoint timeouts capped by dendrite.timeout.
 
                 requires_grad (int, default = dendrite.requires_grad, `optional`):
                     If true, the backward pass triggers passing gradients on the wire.
 
+                quorum (:obj:`Union[int, float]`, `optional`):
+                    Number or fraction of endpoints with a success response after which the call returns.
+
+                soft_timeout (float, `optional`):
+                    Seconds after which the call returns with the responses received so far.
+
                 inputs (:obj:`List[torch.Tensor]` of shape :obj:`(n_endpoints)`, `required`):
                     List of torch tensors to be sent to the associated endpoints.
 
@@ -160,7 +168,15 @@ class Dendrite(torch.autograd.Function):
         """
         ctx.receptor_pool = dendrite.receptor_pool
         ctx.endpoints, ctx.synapses, ctx.inputs, ctx.timeout, ctx.does_requires_grad = endpoints, synapses, inputs, timeout, requires_grad
-        inputs:List[torch.Tensor] = [x.cpu().clone().detach() for x in inputs]
+        # Adaptive timeouts are capped by the dendrite timeout, which is also used for the backward call.
+        if timeout == 'adaptive':
+            ctx.timeout = dendrite.config.dendrite.timeout
+        # Inputs repeated across endpoints are cloned once, so the pool serializes them once.
+        cloned_inputs = {}
+        for x in inputs:
+            if id(x) not in cloned_inputs:
+                cloned_inputs[ id(x) ] = x.cpu().clone().detach()
+        inputs:List[torch.Tensor] = [ cloned_inputs[ id(x) ] for x in inputs ]
 
         # Ouputs are list of lists where the outer list corresponds to the endpoints and the 
         # inner list corresponds to the synapses.
@@ -169,6 +185,9 @@ class Dendrite(torch.autograd.Function):
             synapses = synapses,
             inputs = inputs,
             timeout = timeout,
+            quorum = quorum,
+            soft_timeout = soft_timeout,
+            max_timeout = ctx.timeout,
         )
         ctx.forward_codes = forward_codes
 
@@ -213,7 +232,7 @@ class Dendrite(torch.autograd.Function):
                     This is a list item of size num_endpoints * num_synapses.
             
             Returns:
-                DUMMY, None, None, None,
+                DUMMY, None, None, None, None, None, None, None,
                 outputs (:obj:`List[torch.FloatTensor], `optional`):
                     Gradient results for each input.
 
@@ -234,19 +253,21 @@ class Dendrite(torch.autograd.Function):
             def flatten(t):
                 return [item for sublist in t for item in sublist]
             flattened_input_grads: List[torch.FloatTensor]  = flatten( input_grads )
-            return (None, None, None, None, None, None, *flattened_input_grads)
+            return (None, None, None, None, None, None, None, None, *flattened_input_grads)
         else:
             # Create nill responses for each input and each synapse.
             input_grads = [ syn.nill_backward_response_tensor ( inp ) for inp in ctx.inputs for syn in ctx.synapses ]
-            return (None, None, None, None, None, None, *input_grads)
+            return (None, None, None, None, None, None, None, None, *input_grads)
 
     def _forward(
             self,
             endpoints: List [ 'bittensor.Endpoint' ],
             synapses: List[ 'bittensor.Synapse' ],
             inputs: List [ torch.Tensor ],
-            timeout: Optional [ int ]  = None,
+            timeout: Optional [ Union[ int, str ] ]  = None,
             requires_grad: Optional [ bool ] = None,
+            quorum: Optional [ Union[ int, float ] ] = None,
+            soft_timeout: Optional [ float ] = None,
     ) -> Tuple [ List[ torch.Tensor ], List[ torch.LongTensor ], List [ torch.FloatTensor ]]:
         r""" Internal Forward tensor inputs to a list of neuron endpoints.
 
@@ -262,12 +283,19 @@ class Dendrite(torch.autograd.Function):
                     List of tensors to send to corresponding endpoints. Tensors are of arbitrary type and shape depending on the
                     synapse.
 
-                timeout (int, default = dendrite.timeout, `optional`):
-                    request timeout.
+                timeout (:obj:`Union[int, str]`, default = dendrite.timeout, `optional`):
+                    request timeout, or 'adaptive' for per endpoint timeouts from their observed latencies capped by dendrite.timeout.
 
                 requires_grad (int, default = dendrite.requires_grad, `optional`):
                     If true, the backward pass triggers passing gradients on the wire.
 
+                quorum (:obj:`Union[int, float]`, `optional`):
+                    If set, returns once this many endpoints (int) or this fraction of the endpoints (float) responded with a success.
+                    Endpoints still in flight are cancelled and returned as Timeout.
+
+                soft_timeout (float, `optional`):
+                    If set, returns after this many seconds. Endpoints still in flight are cancelled and returned as Timeout.
+
             Returns:
                 outputs (:obj:`List[torch.FloatTensor]` of shape :obj:`(batch_size, sequence_len, bittensor.__network_dim__)`, `required`):
                     Output encodings of inputs produced by the remote endpoints. Non-responses are zeroes of common shape.
@@ -279,7 +307,7 @@ class Dendrite(torch.autograd.Function):
                     Call times per endpoint per synapse.
 
         """
-        timeout:int = timeout if timeout is not None else self.config.dendrite.timeout
+        timeout:Union[int, str] = timeout if timeout is not None else self.config.dendrite.timeout
         requires_grad:bool = requires_grad if requires_grad is not None else self.config.dendrite.requires_grad
 
         # The forwarnd response is a tuple with shape (flattened_torch_codes, flattened_torch_times, *flattened_forward_outputs)
@@ -292,6 +320,8 @@ class Dendrite(torch.autograd.Function):
             synapses,
             timeout,
             requires_grad,
+            quorum,
+            soft_timeout,
             *inputs
         )
 
@@ -468,8 +498,10 @@ class Dendrite(torch.autograd.Function):
         endpoints: Union[ torch.LongTensor, List[torch.LongTensor], List['bittensor.Endpoint'], 'bittensor.Endpoint' ],
         synapses: List[ 'bittensor.Synapse' ],
         inputs: Union[str, List[str], List[torch.LongTensor], torch.LongTensor],
-        timeout: int = None,
+        timeout: Union[ int, str ] = None,
         requires_grad: bool = None,
+        quorum: Union[ int, float ] = None,
+        soft_timeout: float = None,
     ) -> Tuple[ Union[List[torch.FloatTensor], torch.FloatTensor], torch.LongTensor, torch.FloatTensor]:
         r""" Forward text inputs to a list of neuron endpoints and returns logit encodings or timeout.
 
@@ -495,12 +527,20 @@ class Dendrite(torch.autograd.Function):
                             - a list of tensors of type long each representing a tokenized sentence to be sent to each endpoint.
                         If inputs are tensors they will be cast to int64 format before sending on the wire.
 
-                    timeout (:type:`int`, default = dendrite.timeout `optional`):
+                    timeout (:type:`Union[int, str]`, default = dendrite.timeout `optional`):
                         Request timeout. Queries that do not respond will be replaced by zeros.
+                        If 'adaptive', each endpoint gets a timeout from its observed latencies capped by dendrite.timeout.
 
                     requires_grad (:type:`int`, default = dendrite.requires_grad, `optional`):
                         If true, the backward pass triggers passing gradients on the wire.
 
+                    quorum (:type:`Union[int, float]`, `optional`):
+                        If set, returns once this many endpoints (int) or this fraction of the endpoints (float) responded with a success.
+                        Endpoints still in flight are cancelled and returned as Timeout.
+
+                    soft_timeout (:type:`float`, `optional`):
+                        If set, returns after this many seconds. Endpoints still in flight are cancelled and returned as Timeout.
+
                 Returns:
                     outputs (:obj:`List[ List[ torch.FloatTensor ] ]` of shape :obj:`num_synapses * ( num_endpoints * ( -1, -1, -1 ) )`, `required`):
                         List of outputs from synapses, each a list of size num_endpoints of tensors with relevant size. Non-responses are zeroes of relevant 
@@ -522,11 +562,73 @@ class Dendrite(torch.autograd.Function):
             inputs = formatted_inputs,
             timeout = timeout,
             requires_grad = requires_grad,
+            quorum = quorum,
+            soft_timeout = soft_timeout,
         )
         # Return.
         self.update_stats( formatted_endpoints, synapses, formatted_inputs, outputs, codes, times )
         return outputs, codes, times
 
+    async def text_stream (
+        self,
+        endpoints: Union[ torch.LongTensor, List[torch.LongTensor], List['bittensor.Endpoint'], 'bittensor.Endpoint' ],
+        synapses: List[ 'bittensor.Synapse' ],
+        inputs: Union[str, List[str], List[torch.LongTensor], torch.LongTensor],
+        timeout: Union[ int, str ] = None,
+    ) -> AsyncIterator[ Tuple[ int, List[torch.FloatTensor], torch.LongTensor, torch.FloatTensor ] ]:
+        r""" Forward text inputs to a list of neuron endpoints and yields the responses of each endpoint as they complete.
+            The responses are not part of a torch graph, i.e. no gradients are passed back to the endpoints.
+            Endpoints still in flight are cancelled when the iteration is stopped.
+
+                Args:
+                    endpoints (:obj:`Union[torch.LongTensor, List[torch.LongTensor], List[bittensor.Endpoint], bittensor.Endpoint]` of shape :obj:`(num_endpoints)`, `required`):
+                        Endpoints to send inputs to, see dendrite.text.
+
+                    synapses (:obj:`List[ 'bittensor.Synapse' ]` of shape :obj:`(num_synapses)`, `required`):
+                        Bittensor synapse objects with arguments. Each corresponds to a synapse function on the axon.
+                        Responses are packed in this ordering. 
+
+                    inputs (:obj:`Union[str,  List[str], List[torch.LongTensor], torch.LongTensor]` of shape :obj:`(num_endpoints * [batch_size, sequence_len])`, `required`):
+                        Tokenized sentences to send on the wire, see dendrite.text.
+
+                    timeout (:type:`Union[int, str]`, default = dendrite.timeout `optional`):
+                        Request timeout. Queries that do not respond will be replaced by zeros.
+                        If 'adaptive', each endpoint gets a timeout from its observed latencies capped by dendrite.timeout.
+
+                Yields:
+                    uid (int):
+                        Uid of the endpoint.
+
+                    outputs (:obj:`List[ torch.FloatTensor ]` of shape :obj:`num_synapses * ( -1, -1, -1 )`, `required`):
+                        Outputs of the endpoint per synapse. Non-responses are zeroes of relevant synapse shape.
+
+                    codes (:obj:`torch.LongTensor` of shape :obj:`[ num_synapses ]`, `required`):
+                        Return code per synapse.
+
+                    times (:obj:`torch.FloatTensor` of shape :obj:`[ num_synapses ]`, `required`):
+                        Times per synapse.
+            """
+        timeout:Union[int, str] = timeout if timeout is not None else self.config.dendrite.timeout
+        formatted_endpoints, formatted_inputs = self.format_text_inputs ( 
+            endpoints = endpoints, 
+            inputs = inputs
+        )
+        stream = self.receptor_pool.async_forward_stream (
+            endpoints = formatted_endpoints,
+            synapses = synapses,
+            inputs = formatted_inputs,
+            timeout = timeout,
+            max_timeout = self.config.dendrite.timeout,
+        )
+        try:
+            async for index, outputs, codes, times in stream:
+                codes = torch.tensor( codes, dtype = torch.int64 )
+                times = torch.tensor( times, dtype = torch.float32 )
+                self.update_stats( [ formatted_endpoints[index] ], synapses, [ formatted_inputs[index] ], [ outputs ], [ codes ], [ times ] )
+                yield formatted_endpoints[index].uid, outputs, codes, times
+        finally:
+            await stream.aclose()
+
     def text_causal_lm (
         self,
         endpoints: Union [ torch.LongTensor, List [ torch.LongTensor ], List[ 'bittensor.Endpoint' ], 'bittensor.Endpoint' ],
@@ -1004,12 +1106,12 @@ class Dendrite(torch.autograd.Function):
                 dataframe (:obj:`pandas.Dataframe`)
         """
         try:
-            index = [ metagraph.hotkeys.index(pubkey) for pubkey in self.stats.requests_per_pubkey.keys() if pubkey in metagraph.hotkeys]
+            index = [ metagraph.hotkey_to_uid(pubkey) for pubkey in self.stats.requests_per_pubkey.keys() if metagraph.hotkey_to_uid(pubkey) != -1]
             columns = [ 'dendrite_n_requested', 'dendrite_n_success', 'dendrite_query_time', 'dendrite_avg_inbytes', 'dendrite_avg_outbytes', 'dendrite_qps' ]
             dataframe = pandas.DataFrame(columns = columns, index = index)
             for pubkey in self.stats.requests_per_pubkey.keys():
-                if pubkey in metagraph.hotkeys:
-                    uid = metagraph.hotkeys.index(pubkey)
+                uid = metagraph.hotkey_to_uid(pubkey)
+                if uid != -1:
                     dataframe.loc[ uid ] = pandas.Series( {
                         'dendrite_n_requested': int(self.stats.requests_per_pubkey[pubkey]),
                         'dendrite_n_success': int(self.stats.successes_per_pubkey[pubkey]),
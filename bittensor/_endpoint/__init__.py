@@ -19,6 +19,7 @@
 
 import json
 from types import SimpleNamespace
+from typing import List
 import torch
 import bittensor
 
@@ -154,6 +155,27 @@ class endpoint:
             endpoint_dict = json.loads( endpoint_string )
             return endpoint.from_dict(endpoint_dict)
 
+    @staticmethod
+    def to_tensors( endpoints: List['bittensor.Endpoint'] ) -> torch.LongTensor:
+        """ Return the specs of the endpoints as a [ len(endpoints), ENDPOINT_BUFFER_SIZE ] tensor, 
+            with rows equal to Endpoint.to_tensor, filled with a single scatter.
+        """
+        encoded = [ bytes( e.dumps(), 'utf-8' ) for e in endpoints ]
+        for e, endpoint_bytes in zip( endpoints, encoded ):
+            if len( endpoint_bytes ) > ENDPOINT_BUFFER_SIZE:
+                raise ValueError('Endpoint {} representation is too large, got size {} should be less than {}'.format(e, len(endpoint_bytes), ENDPOINT_BUFFER_SIZE))
+        tensor = torch.full( [ len( endpoints ), ENDPOINT_BUFFER_SIZE ], -1, dtype=torch.int64 )
+        if len( endpoints ) == 0:
+            return tensor
+        lengths = torch.tensor( [ len( endpoint_bytes ) for endpoint_bytes in encoded ], dtype=torch.int64 )
+        values = torch.frombuffer( bytearray( b''.join( encoded ) ), dtype=torch.uint8 ).to( torch.int64 )
+        rows = torch.repeat_interleave( torch.arange( len( endpoints ) ), lengths )
+        # Position of each byte within its endpoint.
+        starts = torch.cumsum( lengths, dim=0 ) - lengths
+        cols = torch.arange( len( values ) ) - torch.repeat_interleave( starts, lengths )
+        tensor.index_put_( ( rows, cols ), values )
+        return tensor
+
     @staticmethod
     def dummy():
         return endpoint_impl.Endpoint(uid=0, version=0, hotkey = "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX", ip_type = 4, ip = '0.0.0.0', port = 0, protocol= 0, coldkey = "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX")
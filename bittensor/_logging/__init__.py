@@ -19,9 +19,12 @@
 
 import os
 import sys
+import random
 
 import argparse
+import atexit
 import copy
+import threading
 
 from loguru import logger
 
@@ -44,6 +47,13 @@ class logging:
     __trace_on__:bool = False
     __std_sink__:int = None
     __file_sink__:int = None
+    __rpc_mode__:str = 'all'
+    # Set by set_rpc_mode, from bittensor.defaults.logging.rpc unless given.
+    __rpc_sample_rate__:float = None
+    __rpc_interval__:float = None
+    __rpc_summaries__:dict = {}
+    __rpc_flush_timer__:threading.Timer = None
+    __rpc_lock__ = threading.Lock()
 
     def __new__(
             cls,
@@ -102,6 +112,7 @@ class logging:
 
         cls.set_debug(config.logging.debug)
         cls.set_trace(config.logging.trace)
+        cls.set_rpc_mode(config.logging.rpc.mode, config.logging.rpc.sample_rate, config.logging.rpc.interval)
 
         # ---- Setup logging to root ----
         if config.logging.record_log:
@@ -145,6 +156,11 @@ class logging:
             parser.add_argument('--' + prefix_str + 'logging.trace', action='store_true', help='''Turn on bittensor trace level information''', default = bittensor.defaults.logging.trace )
             parser.add_argument('--' + prefix_str + 'logging.record_log', action='store_true', help='''Turns on logging to file.''', default = bittensor.defaults.logging.record_log )
             parser.add_argument('--' + prefix_str + 'logging.logging_dir', type=str, help='Logging default root directory.', default = bittensor.defaults.logging.logging_dir )
+            parser.add_argument('--' + prefix_str + 'logging.rpc.mode', type=str, choices=['all', 'sample', 'aggregate'], 
+                help='''Debug logging of axon and dendrite calls, all: one line per synapse call, sample: a random sample of the calls, 
+                        aggregate: one summary line per interval per call direction, return code and synapse.''', default = bittensor.defaults.logging.rpc.mode )
+            parser.add_argument('--' + prefix_str + 'logging.rpc.sample_rate', type=float, help='''Fraction of the calls logged in sample mode.''', default = bittensor.defaults.logging.rpc.sample_rate )
+            parser.add_argument('--' + prefix_str + 'logging.rpc.interval', type=float, help='''Seconds between the summary lines of aggregate mode.''', default = bittensor.defaults.logging.rpc.interval )
         except argparse.ArgumentError:
             # re-parsing arguments.
             pass
@@ -158,12 +174,19 @@ class logging:
         defaults.logging.trace = os.getenv('BT_LOGGING_TRACE') if os.getenv('BT_LOGGING_DEBUG') != None else False
         defaults.logging.record_log = os.getenv('BT_LOGGING_RECORD_LOG') if os.getenv('BT_LOGGING_RECORD_LOG') != None else False
         defaults.logging.logging_dir = os.getenv('BT_LOGGING_LOGGING_DIR') if os.getenv('BT_LOGGING_LOGGING_DIR') != None else '~/.bittensor/miners'
+        defaults.logging.rpc = bittensor.Config()
+        defaults.logging.rpc.mode = os.getenv('BT_LOGGING_RPC_MODE') if os.getenv('BT_LOGGING_RPC_MODE') != None else 'all'
+        defaults.logging.rpc.sample_rate = float(os.getenv('BT_LOGGING_RPC_SAMPLE_RATE')) if os.getenv('BT_LOGGING_RPC_SAMPLE_RATE') != None else 0.01
+        defaults.logging.rpc.interval = float(os.getenv('BT_LOGGING_RPC_INTERVAL')) if os.getenv('BT_LOGGING_RPC_INTERVAL') != None else 1.0
 
     @classmethod
     def check_config( cls, config: 'bittensor.Config' ):
         """ Check config
         """
         assert config.logging
+        assert config.logging.rpc.mode in ['all', 'sample', 'aggregate'], 'logging.rpc.mode must be in: all, sample, aggregate'
+        assert config.logging.rpc.sample_rate >= 0 and config.logging.rpc.sample_rate <= 1, 'logging.rpc.sample_rate must be in range [0, 1]'
+        assert config.logging.rpc.interval > 0, 'logging.rpc.interval must be larger than 0'
 
     @classmethod
     def set_debug(cls, debug_on: bool = True ):
@@ -181,6 +204,24 @@ class logging:
             cls()
         cls.__trace_on__ = trace_on
 
+    @classmethod
+    def set_rpc_mode(cls, mode: str = 'all', sample_rate: float = None, interval: float = None ):
+        """ Set how axon and dendrite calls are logged, see rpc_log. The summaries of the previous mode are logged first.
+            The sample rate and interval default to bittensor.defaults.logging.rpc.
+        """
+        cls.flush_rpc_summaries()
+        with cls.__rpc_lock__:
+            cls.__rpc_mode__ = mode
+            cls.__rpc_sample_rate__ = sample_rate if sample_rate != None else bittensor.defaults.logging.rpc.sample_rate
+            cls.__rpc_interval__ = interval if interval != None else bittensor.defaults.logging.rpc.interval
+
+    @classmethod
+    def rpc_log_on(cls) -> bool:
+        """ Returns true if rpc logs are emitted, i.e. if debug or trace is on. 
+            Callers skip building the rpc_log arguments otherwise.
+        """
+        return cls.__debug_on__ or cls.__trace_on__
+
     @classmethod
     def log_filter(cls, record ):
         """ Filter out debug log if debug is not on
@@ -203,6 +244,7 @@ class logging:
         """
         extra = record['extra']
         if 'rpc' in extra:
+            cls.format_rpc( extra )
             log_format = "<blue>{time:YYYY-MM-DD HH:mm:ss.SSS}</blue> | " + extra['code_str'] + " | {extra[prefix]} | {extra[direction]} | {extra[arrow]} | {extra[uid_str]} | {extra[inputs]} | {extra[call_time]} | {extra[key_str]} | {extra[rpc_message]} | {extra[synapse]} \n"
             return log_format
         elif 'receptor' in extra:
@@ -219,6 +261,7 @@ class logging:
     def log_save_formatter(cls, record):
         extra = record['extra']
         if 'rpc' in extra:
+            cls.format_rpc( extra )
             log_format = "{time:YYYY-MM-DD HH:mm:ss.SSS} | " + extra['code_str'] + " | {extra[prefix]} | {extra[direction]} | {extra[arrow]} | {extra[uid_str]} | {extra[inputs]} | {extra[call_time]} | {extra[key_str]} | {extra[rpc_message]} \n"
             return log_format
         if 'receptor' in extra:
@@ -246,63 +289,102 @@ class logging:
                  message:str = '',
                  synapse:'bittensor.Synapse' = None
         ):
-        """ Debug logging for the communication between endpoints with axon/dendrite 
+        """ Debug logging for the communication between endpoints with axon/dendrite.
+            Nothing is done unless debug or trace is on, the log line is only formatted by the sinks which print it.
+            In sample mode, a random sample of the calls is logged and in aggregate mode, the calls are 
+            summed into one line per interval per direction, return code and synapse.
         """
+        if not ( cls.__debug_on__ or cls.__trace_on__ ):
+            return
 
-        if axon:
-            prefix = "Axon"
-        else:
-            prefix = "Dendrite"
-        prefix = prefix.center(len('Dendrite'))
-
-        if forward:
-            direction = "Forward"
-        else:
-            direction = "Backward"
-        direction = direction.center(len('Backward'))
+        if cls.__rpc_mode__ == 'sample':
+            if random.random() >= cls.__rpc_sample_rate__:
+                return
+        elif cls.__rpc_mode__ == 'aggregate':
+            cls.aggregate_rpc( axon, forward, is_response, code, call_time, pubkey, synapse )
+            return
 
-        if is_response:
-            arrow = "<---"
-        else:
-            arrow = "--->"
-        
-        key_str = "{}".format( pubkey )
-        call_time_str = "{:.2f}s".format(call_time).center(6)
+        logger.debug( 
+                    'rpc', 
+                    rpc=True, 
+                    rpc_axon = axon, 
+                    rpc_forward = forward, 
+                    rpc_is_response = is_response, 
+                    rpc_code = code, 
+                    rpc_call_time = call_time, 
+                    rpc_pubkey = pubkey, 
+                    rpc_uid = uid, 
+                    rpc_shape = outputs if is_response else inputs, 
+                    rpc_message = message if message != None else 'None',
+                    rpc_synapse = synapse
+        )
 
-        if uid != None:
-            uid_str = str(uid).center(5)
-        else:
-            uid_str = "-".center(5)
+    @classmethod
+    def aggregate_rpc( cls, axon: bool, forward: bool, is_response: bool, code: int, call_time: float, pubkey: str, synapse: int ):
+        """ Adds a call to the rpc summaries. The first call of an interval starts a timer which logs the summaries 
+            at the end of the interval, also when no call follows.
+        """
+        key = ( axon, forward, is_response, code, synapse )
+        with cls.__rpc_lock__:
+            if cls.__rpc_flush_timer__ == None:
+                cls.__rpc_flush_timer__ = threading.Timer( cls.__rpc_interval__, cls.flush_rpc_summaries )
+                cls.__rpc_flush_timer__.daemon = True
+                cls.__rpc_flush_timer__.start()
+            summary = cls.__rpc_summaries__.get( key )
+            if summary == None:
+                # Calls, total call time and hotkeys.
+                summary = [ 0, 0.0, set() ]
+                cls.__rpc_summaries__[ key ] = summary
+            summary[0] += 1
+            summary[1] += call_time
+            summary[2].add( pubkey )
 
-        code_color = codes.code_to_loguru_color( code )
-        code_string = codes.code_to_string( code )
-        code_string = code_string.center(16)
-        code_str = "<" + code_color + ">" + code_string + "</" + code_color + ">"
+    @classmethod
+    def flush_rpc_summaries( cls ):
+        """ Logs the rpc summaries summed since the last flush, see aggregate_rpc.
+        """
+        with cls.__rpc_lock__:
+            if cls.__rpc_flush_timer__ != None:
+                cls.__rpc_flush_timer__.cancel()
+                cls.__rpc_flush_timer__ = None
+            summaries = cls.__rpc_summaries__
+            cls.__rpc_summaries__ = {}
+
+        for ( axon, forward, is_response, code, synapse ), ( calls, total_call_time, pubkeys ) in summaries.items():
+            logger.debug( 
+                        'rpc', 
+                        rpc=True, 
+                        rpc_axon = axon, 
+                        rpc_forward = forward, 
+                        rpc_is_response = is_response, 
+                        rpc_code = code, 
+                        rpc_call_time = total_call_time / calls, 
+                        rpc_pubkey = None, 
+                        rpc_uid = None, 
+                        rpc_shape = None, 
+                        rpc_message = '{} calls from {} hotkeys'.format( calls, len( pubkeys ) ),
+                        rpc_synapse = synapse
+            )
 
-        if is_response:
-            inputs = str(list(outputs)) if outputs != None else '[x]'
-        else:
-            inputs = str(list(inputs)) if inputs != None else '[x]'
-        inputs = inputs.center(15)
+    @classmethod
+    def format_rpc( cls, extra: dict ):
+        """ Fills the printed fields of an rpc log record from the call values passed by rpc_log.
+        """
+        if 'code_str' in extra:
+            return
+        extra['prefix'] = ( "Axon" if extra['rpc_axon'] else "Dendrite" ).center(len('Dendrite'))
+        extra['direction'] = ( "Forward" if extra['rpc_forward'] else "Backward" ).center(len('Backward'))
+        extra['arrow'] = "<---" if extra['rpc_is_response'] else "--->"
+        extra['key_str'] = "{}".format( extra['rpc_pubkey'] ) if extra['rpc_pubkey'] != None else '-'
+        extra['call_time'] = "{:.2f}s".format( extra['rpc_call_time'] ).center(6)
+        extra['uid_str'] = ( str( extra['rpc_uid'] ) if extra['rpc_uid'] != None else "-" ).center(5)
 
-        if synapse != None:
-            synapse = codes.code_to_synapse(synapse)
+        code_color = codes.code_to_loguru_color( extra['rpc_code'] )
+        code_string = codes.code_to_string( extra['rpc_code'] ).center(16)
+        extra['code_str'] = "<" + code_color + ">" + code_string + "</" + code_color + ">"
 
-        rpc_message = message if message != None else 'None'
-        logger.debug( 
-                    'rpc', 
-                    rpc=True, 
-                    prefix=prefix, 
-                    direction=direction, 
-                    arrow=arrow, 
-                    call_time = call_time_str, 
-                    uid_str=uid_str, 
-                    key_str=key_str, 
-                    code_str=code_str, 
-                    inputs = inputs, 
-                    rpc_message = rpc_message,
-                    synapse = synapse
-        )
+        extra['inputs'] = ( str( list( extra['rpc_shape'] ) ) if extra['rpc_shape'] != None else '[x]' ).center(15)
+        extra['synapse'] = codes.code_to_synapse( extra['rpc_synapse'] ) if extra['rpc_synapse'] != None else None
 
 
     @classmethod
@@ -366,3 +448,6 @@ class logging:
         prefix = prefix.ljust(20)
         log_msg = prefix + sufix
         logger.info( log_msg )
+
+# Log the rpc summaries of the last interval on shutdown.
+atexit.register( logging.flush_rpc_summaries )
@@ -45,6 +45,9 @@ class metagraph:
             network: str = None,
             netuid: Optional[int] = None,
             subtensor: 'bittensor.Subtensor' = None,
+            sparse: bool = None,
+            incremental: bool = None,
+            lite: bool = None,
             _mock:bool=None
         ) -> 'bittensor.Metagraph':
         r""" Creates a new bittensor.Metagraph object from passed arguments.
@@ -61,6 +64,15 @@ class metagraph:
                 netuid (default=None, type=int)
                     The subnet netuid. If set, overrides config.netuid.
                     This option allows you to load a metagraph from a local file.
+                sparse (:obj:`bool`, `optional`):
+                    If true, the weights and bonds are stored as sparse tensors.
+                    If set, overrides config.metagraph.sparse.
+                incremental (:obj:`bool`, `optional`):
+                    If true, sync only refetches the neurons which changed since the last sync.
+                    If set, overrides config.metagraph.incremental.
+                lite (:obj:`bool`, `optional`):
+                    If true, sync builds the metagraph from the lite neurons, the weights and bonds are fetched on first access.
+                    If set, overrides config.metagraph.lite.
                 _mock (:obj:`bool`, `optional`):
                     For testing, if true the metagraph returns mocked outputs.
         """      
@@ -68,6 +80,9 @@ class metagraph:
             config = metagraph.config()
         config = copy.deepcopy(config)
         config.metagraph._mock = _mock if _mock != None else config.metagraph._mock
+        config.metagraph.sparse = sparse if sparse != None else config.metagraph.get('sparse', False)
+        config.metagraph.incremental = incremental if incremental != None else config.metagraph.get('incremental', False)
+        config.metagraph.lite = lite if lite != None else config.metagraph.get('lite', False)
         if config.metagraph._mock:
             return metagraph_mock.MockMetagraph()
         if subtensor != None:
@@ -78,7 +93,7 @@ class metagraph:
             network = config.subtensor.get('network', bittensor.defaults.subtensor.network)
 
         if network =='finney':
-            return metagraph_impl.Metagraph( network = network, netuid = netuid )
+            return metagraph_impl.Metagraph( network = network, netuid = netuid, sparse = config.metagraph.sparse, incremental = config.metagraph.incremental, lite = config.metagraph.lite )
         elif network =='nakamoto':
             config.subtensor.network = 'nakamoto'
             return naka_metagraph(config = config, subtensor = subtensor)
@@ -109,6 +124,9 @@ class metagraph:
         prefix_str = '' if prefix == None else prefix + '.'
         try:
             parser.add_argument('--' + prefix_str + 'metagraph._mock', action='store_true', help='To turn on metagraph mocking for testing purposes.', default=False)
+            parser.add_argument('--' + prefix_str + 'metagraph.sparse', action='store_true', help='''If set, the metagraph stores the weights and bonds as sparse tensors, which saves memory on large subnets.''', default=False)
+            parser.add_argument('--' + prefix_str + 'metagraph.incremental', action='store_true', help='''If set, metagraph.sync only refetches the neurons which changed since the last sync.''', default=False)
+            parser.add_argument('--' + prefix_str + 'metagraph.lite', action='store_true', help='''If set, the metagraph is synced without the weights and bonds, which are fetched on first access.''', default=False)
             bittensor.subtensor.add_args( parser )
         except argparse.ArgumentError:
             # re-parsing arguments.
@@ -123,7 +141,7 @@ class metagraph:
         pass
 
     @staticmethod
-    def from_neurons( network: str, netuid: int, info: 'bittensor.SubnetInfo', neurons: List['bittensor.NeuronInfo'], block: int ) -> 'bittensor.Metagraph':
+    def from_neurons( network: str, netuid: int, info: 'bittensor.SubnetInfo', neurons: List['bittensor.NeuronInfo'], block: int, sparse: bool = False, lite: bool = False ) -> 'bittensor.Metagraph':
         r""" Creates a metagraph from a list of neurons.
             Args: 
                 network: (:obj:`str`, required):
@@ -133,16 +151,20 @@ class metagraph:
                 info: (:obj:`SubnetInfo`, required):
                     SubnetInfo object for the metagraph, including the subnet's hyperparameters.
                 neurons: (:obj:`List[NeuronInfo]`, required):
-                    List of neurons to create metagraph from.
+                    List of neurons to create metagraph from, NeuronInfoLite if lite.
                 block: (:obj:`int`, required):
                     Block number at time of the metagraph.
+                sparse: (:obj:`bool`, optional):
+                    If true, the weights and bonds are stored as sparse COO tensors.
+                lite: (:obj:`bool`, optional):
+                    If true, the neurons have no weights and bonds, which are left empty until fetched.
         """
-        metagraph = metagraph_impl.Metagraph( network = network, netuid = netuid )
+        metagraph = metagraph_impl.Metagraph( network = network, netuid = netuid, sparse = sparse, lite = lite )
         metagraph.info = info
 
         n_total = len(neurons)
 
-        # Fill arrays.
+        # Fill columns.
         uids = [ i for i in range(n_total) ]
         active = [ 0 for _ in range(n_total) ]
         stake = [ {} for _ in range(n_total) ]
@@ -156,9 +178,6 @@ class metagraph:
         dividends = [ 0 for _ in range(n_total) ]
         last_updates = [ -1 for _ in range(n_total) ]
         validator_permit = [ False for _ in range(n_total) ]
-        endpoints = [ [-1 for _ in range(250) ]  for _ in range(n_total) ]
-        weights = [ [ 0 for _ in range(n_total) ] for _ in range(n_total) ]
-        bonds = [ [0 for _ in range(n_total) ] for _ in range(n_total) ]
         metagraph._endpoint_objs = [ bittensor.endpoint.dummy() for _ in range(n_total) ]
         metagraph.neurons = [None for _ in range(n_total)]
         for n in neurons:
@@ -176,19 +195,7 @@ class metagraph:
             emission[n.uid] = n.emission
             last_updates[n.uid] = n.last_update
             validator_permit[n.uid] = n.validator_permit
-            endpoint =  bittensor.endpoint.from_neuron(n)
-            metagraph._endpoint_objs[n.uid] = endpoint 
-            endpoints[n.uid] = endpoint.to_tensor().tolist()
-            if len(n.weights) > 0:
-                w_uids, w_weights = zip(*n.weights)
-                weights[n.uid] = weight_utils.convert_weight_uids_and_vals_to_tensor( n_total, w_uids, w_weights ).tolist()
-            else:
-                weights[n.uid] = [0] * n_total
-            if len(n.bonds) > 0:
-                b_uids, b_bonds = zip(*n.bonds)
-                bonds[n.uid] = weight_utils.convert_bond_uids_and_vals_to_tensor( n_total, b_uids, b_bonds ).tolist()
-            else:
-                bonds[n.uid] = [0] * n_total
+            metagraph._endpoint_objs[n.uid] = bittensor.endpoint.from_neuron(n)
 
         # Set tensors.
         tn = torch.tensor( n_total, dtype=torch.int64 )
@@ -207,12 +214,16 @@ class metagraph:
         tdividends = torch.tensor( dividends, dtype=torch.float32 )
         tlast_update = torch.tensor( last_updates, dtype=torch.int64 )
         tvalidator_permit = torch.tensor( validator_permit, dtype=torch.bool )
-        tbonds = torch.tensor( bonds, dtype=torch.int64 )
-        tweights = torch.tensor( weights, dtype=torch.float32 )
-        tendpoints = torch.tensor( endpoints, dtype=torch.int64 )
+        if lite:
+            tweights = torch.tensor( [], dtype=torch.float32 )
+            tbonds = torch.tensor( [], dtype=torch.float32 )
+        else:
+            tweights, tbonds = metagraph_impl.Metagraph.weights_and_bonds_from_neurons( n_total, neurons, sparse = sparse )
 
-        # Normalize bond ownership.
-        tbonds = torch.nn.functional.normalize( tbonds.float(), p=1, dim=0, eps=1e-12 ) * 0.5 + torch.eye( tn ) * 0.5
+        # Rows of uids without neuron are left empty.
+        tendpoints = torch.full( [ n_total, bittensor._endpoint.ENDPOINT_BUFFER_SIZE ], -1, dtype=torch.int64 )
+        neuron_uids = [ n.uid for n in neurons ]
+        tendpoints[ neuron_uids ] = bittensor.endpoint.to_tensors( [ metagraph._endpoint_objs[uid] for uid in neuron_uids ] )
 
         # Set params.
         metagraph.n = torch.nn.Parameter( tn, requires_grad=False )
@@ -235,5 +246,6 @@ class metagraph:
         metagraph.weights = torch.nn.Parameter( tweights, requires_grad=False )
         metagraph.bonds = torch.nn.Parameter( tbonds, requires_grad=False )
         metagraph.endpoints = torch.nn.Parameter( tendpoints, requires_grad=False )
+        metagraph._build_index()
 
         return metagraph
\ No newline at end of file
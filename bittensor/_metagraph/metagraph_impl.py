@@ -18,8 +18,9 @@
 # DEALINGS IN THE SOFTWARE.
 
 import os
+import dataclasses
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from loguru import logger
 
 import pandas
@@ -28,7 +29,10 @@ import torch
 
 import bittensor
 import bittensor.utils.networking as net
+import bittensor.utils.weight_utils as weight_utils
 from bittensor import Balance
+from .sparse_impl import SparseMatrix
+from . import snapshot_impl
 
 class Metagraph( torch.nn.Module ):
     r""" Maintains chain state as a torch.nn.Module.
@@ -50,7 +54,10 @@ class Metagraph( torch.nn.Module ):
                 Last emission call for each neuron ordered by uid.
 
             weights (:obj:`torch.FloatTensor` of shape :obj:`(metagraph.n, metagraph.n)`):
-                Full weight matrix on chain ordered by uid.
+                Full weight matrix on chain ordered by uid, a sparse COO tensor if the metagraph is sparse.
+
+            bonds (:obj:`torch.FloatTensor` of shape :obj:`(metagraph.n, metagraph.n)`):
+                Normalized bond matrix ordered by uid, a sparse COO tensor if the metagraph is sparse.
 
             neurons (:obj:`torch.LongTensor` of shape :obj:`(metagraph.n, -1)`) 
                 Tokenized endpoint information.
@@ -58,15 +65,33 @@ class Metagraph( torch.nn.Module ):
     """
     network: str
     netuid: int
+    sparse: bool
+    incremental: bool
+    lite: bool
     neurons: Optional[List[Optional['bittensor.Neurons']]]
     info: Optional['bittensor.SubnetInfo']
 
-    def __init__( self, network: str, netuid: int ):
+    def __init__( self, network: str, netuid: int, sparse: bool = False, incremental: bool = False, lite: bool = False ):
         r""" Initializes a new Metagraph torch chain interface object.
+            Args:
+                network (:obj:`str`, `required`):
+                    Name of the network of the metagraph.
+                netuid (:obj:`int`, `required`):
+                    netuid of the subnet of the metagraph.
+                sparse (:obj:`bool`, `optional`):
+                    If true, sync stores the weights and bonds as sparse tensors.
+                incremental (:obj:`bool`, `optional`):
+                    If true, sync only refetches the neurons which changed since the last sync.
+                lite (:obj:`bool`, `optional`):
+                    If true, sync builds the metagraph from the lite neurons, without the weights and bonds.
+                    W and B fetch them on first access.
         """
         super(Metagraph, self).__init__()
         self.network = network
         self.netuid = netuid
+        self.sparse = sparse
+        self.incremental = incremental
+        self.lite = lite
         self._register_state_dict_hook(Metagraph.__info_state_dict_hook__)
         self.clear()
 
@@ -103,6 +128,9 @@ class Metagraph( torch.nn.Module ):
         self.endpoints = torch.nn.Parameter( torch.tensor( [], dtype=torch.int64), requires_grad=False )
         self.uids = torch.nn.Parameter( torch.tensor([], dtype = torch.int64),requires_grad=False )
         self._endpoint_objs = None
+        self._invalidate_index()
+        self._subtensor = None
+        self._snapshot_buffer = None
         self.neurons = None
         self.info = None
         return self
@@ -158,16 +186,75 @@ class Metagraph( torch.nn.Module ):
 
     @property
     def B(self) -> torch.FloatTensor:
-        """ Bonds
+        """ Bonds, a SparseMatrix view if the metagraph is sparse.
         """
+        if self.weights_pending:
+            self.fetch_weights_and_bonds()
+        if self.bonds.is_sparse:
+            return SparseMatrix( self.bonds )
         return self.bonds
     
     @property
     def W(self) -> torch.FloatTensor:
-        """ Weights
+        """ Weights, a SparseMatrix view if the metagraph is sparse.
         """
+        if self.weights_pending:
+            self.fetch_weights_and_bonds()
+        if self.weights.is_sparse:
+            return SparseMatrix( self.weights )
         return self.weights
 
+    @property
+    def weights_pending( self ) -> bool:
+        r""" True if the metagraph was synced lite and its weights and bonds are not fetched yet.
+        """
+        return self.lite and self.n.item() > 0 and self.weights.nelement() == 0
+
+    def fetch_weights_and_bonds( self, subtensor: 'bittensor.Subtensor' = None ) -> 'Metagraph':
+        r""" Fetches the weights and bonds of a lite metagraph, at the latest block, from the full neurons of the subnet.
+            Args:
+                subtensor: (:obj:`bittensor.Subtensor`, optional, defaults to None):
+                    Subtensor to fetch from, defaults to the subtensor which synced the metagraph.
+                    Creates a new subtensor of the metagraph network if None.
+            Returns:
+                self: (:obj:`Metagraph`, required):
+                    Returns self.
+        """
+        if subtensor == None:
+            subtensor = self._subtensor if self._subtensor != None else bittensor.subtensor( network = self.network )
+        n = self.n.item()
+        neurons = [ neuron for neuron in subtensor.neurons( netuid = self.netuid ) if neuron.uid < n ]
+        weights, bonds = Metagraph.weights_and_bonds_from_neurons( n, neurons, sparse = self.sparse )
+        self.weights = torch.nn.Parameter( weights, requires_grad=False )
+        self.bonds = torch.nn.Parameter( bonds, requires_grad=False )
+        return self
+
+    @staticmethod
+    def weights_and_bonds_from_neurons( n: int, neurons: List['bittensor.NeuronInfo'], sparse: bool = False ) -> Tuple[torch.FloatTensor, torch.FloatTensor]:
+        r""" Returns the [n, n] weight matrix and normalized bond matrix of the neurons.
+            Args:
+                n: (:obj:`int`, required):
+                    Number of neurons of the metagraph.
+                neurons: (:obj:`List[NeuronInfo]`, required):
+                    Neurons with their weights and bonds.
+                sparse: (:obj:`bool`, optional):
+                    If true, returns sparse COO tensors.
+            Returns:
+                weights: (:obj:`torch.FloatTensor`, required):
+                    Weights, each row holding the weights set by a neuron.
+                bonds: (:obj:`torch.FloatTensor`, required):
+                    Bonds normalized per column, plus 0.5 on the diagonal.
+        """
+        weight_rows, weight_uids, weight_vals = Metagraph._neuron_pairs( neurons, 'weights' )
+        bond_rows, bond_uids, bond_vals = Metagraph._neuron_pairs( neurons, 'bonds' )
+        if sparse:
+            weights = weight_utils.convert_neuron_uids_and_vals_to_sparse_tensor( n, weight_rows, weight_uids, weight_vals, scale = weight_utils.U16_MAX )
+            bonds = weight_utils.normalize_sparse_bonds( weight_utils.convert_neuron_uids_and_vals_to_sparse_tensor( n, bond_rows, bond_uids, bond_vals ) )
+        else:
+            weights = weight_utils.convert_neuron_uids_and_vals_to_tensor( n, weight_rows, weight_uids, weight_vals, scale = weight_utils.U16_MAX )
+            bonds = weight_utils.normalize_bonds( weight_utils.convert_neuron_uids_and_vals_to_tensor( n, bond_rows, bond_uids, bond_vals ) )
+        return weights, bonds
+
     @property
     def hotkeys( self ) -> List[str]:
         r""" Returns hotkeys for each neuron.
@@ -177,7 +264,9 @@ class Metagraph( torch.nn.Module ):
         """
         if self.n.item() == 0:
             return []
-        return [ neuron.hotkey if neuron != bittensor.endpoint.dummy() else '' for neuron in self.endpoint_objs ]
+        if self._hotkeys == None:
+            self._build_index()
+        return self._hotkeys
 
     @property
     def coldkeys( self ) -> List[str]:
@@ -188,7 +277,9 @@ class Metagraph( torch.nn.Module ):
         """
         if self.n.item() == 0:
             return []
-        return [ neuron.coldkey if neuron != bittensor.endpoint.dummy() else '' for neuron in self.endpoint_objs ]
+        if self._coldkeys == None:
+            self._build_index()
+        return self._coldkeys
 
     @property
     def modalities( self ) -> List[str]:
@@ -230,6 +321,41 @@ class Metagraph( torch.nn.Module ):
                 self._endpoint_objs.append( obj )
             return self._endpoint_objs
 
+    def _invalidate_index( self ):
+        r""" Drops the hotkey and coldkey indices, rebuilt from the endpoints on next use.
+        """
+        self._hotkeys = None
+        self._coldkeys = None
+        self._hotkey_index = None
+        self._coldkey_index = None
+
+    def _build_index( self ):
+        r""" Builds the hotkey and coldkey lists and the hotkey to uid and coldkey to uids indices from the endpoints.
+        """
+        dummy = bittensor.endpoint.dummy()
+        hotkeys = []
+        coldkeys = []
+        for endpoint in self.endpoint_objs:
+            hotkeys.append( endpoint.hotkey if endpoint != dummy else '' )
+            coldkeys.append( endpoint.coldkey if endpoint != dummy else '' )
+        self._set_index( hotkeys, coldkeys )
+
+    def _set_index( self, hotkeys: List[str], coldkeys: List[str] ):
+        r""" Sets the hotkey and coldkey lists, empty for uids without endpoint, and builds their indices.
+        """
+        hotkey_index = {}
+        coldkey_index = {}
+        for uid, ( hotkey, coldkey ) in enumerate( zip( hotkeys, coldkeys ) ):
+            if hotkey == '':
+                continue
+            # The first uid of a hotkey, as hotkeys.index
+            hotkey_index.setdefault( hotkey, uid )
+            coldkey_index.setdefault( coldkey, [] ).append( uid )
+        self._hotkeys = hotkeys
+        self._coldkeys = coldkeys
+        self._hotkey_index = hotkey_index
+        self._coldkey_index = coldkey_index
+
     def hotkey_to_uid( self, hotkey:str ) -> int:
         r""" Fetch uid according to hotkey. 
             Args: 
@@ -240,13 +366,36 @@ class Metagraph( torch.nn.Module ):
                 uid: (`int`):
                     The uid for specified hotkey, -1 if hotkey does not exist.
         """ 
-        if hotkey in self.hotkeys:
-            return self.hotkeys.index(hotkey) 
-        else:
+        if self.n.item() == 0:
             return -1
+        if self._hotkey_index == None:
+            self._build_index()
+        return self._hotkey_index.get( hotkey, -1 )
+
+    def coldkey_to_uids( self, coldkey:str ) -> List[int]:
+        r""" Fetch the uids of the hotkeys owned by coldkey.
+            Args: 
+                coldkey: (`str`, required):
+                    Coldkey to fetch the uids for.
+            
+            Return:
+                uids: (`List[int]`):
+                    The uids for specified coldkey, empty if coldkey does not exist.
+        """ 
+        if self.n.item() == 0:
+            return []
+        if self._coldkey_index == None:
+            self._build_index()
+        return list( self._coldkey_index.get( coldkey, [] ) )
+
+    def filename( self, network: str, netuid: int, extension: str ) -> str:
+        r""" Returns the file name of the metagraph under bittensor root dir. Lite metagraphs use their own
+            files, so that saving one never replaces the weights and bonds of a full metagraph.
+        """
+        return f"{str(network)}_{str(netuid)}{'_lite' if self.lite else ''}.{extension}"
 
     def load( self, network: Optional[str] = None, netuid: Optional[int] = None  ) -> 'Metagraph':
-        r""" Loads this metagraph object's state_dict from bittensor root dir.
+        r""" Loads this metagraph object's state_dict from bittensor root dir, from the lite file if the metagraph is lite.
             Args: 
                 network (:obj:`str`, `optional`, defaults to None):
                     Network of state_dict to load, defaults to the network of the metagraph object.
@@ -258,7 +407,7 @@ class Metagraph( torch.nn.Module ):
                 network = self.network
             if netuid == None:
                 netuid = self.netuid
-            metagraph_path = f"~/.bittensor/{str(network)}_{str(netuid)}.pt"
+            metagraph_path = "~/.bittensor/" + self.filename( network, netuid, 'pt' )
             metagraph_path = os.path.expanduser(metagraph_path)
             if os.path.isfile(metagraph_path):
                 self.load_from_path( path = metagraph_path )
@@ -272,7 +421,7 @@ class Metagraph( torch.nn.Module ):
         return self
 
     def save( self, network: Optional[str] = None, netuid: Optional[int] = None ) -> 'Metagraph':
-        r""" Saves this metagraph object's state_dict under bittensor root dir.
+        r""" Saves this metagraph object's state_dict under bittensor root dir, to the lite file if the metagraph is lite.
             Args: 
                 network (:obj:`str`, `optional`, defaults to None):
                     Network of state_dict to save, defaults to the network of the metagraph object.
@@ -283,7 +432,29 @@ class Metagraph( torch.nn.Module ):
             network = self.network
         if netuid == None:
             netuid = self.netuid
-        return self.save_to_path( path = '~/.bittensor/', filename = f"{str(network)}_{str(netuid)}.pt")
+        return self.save_to_path( path = '~/.bittensor/', filename = self.filename( network, netuid, 'pt' ) )
+
+    def save_snapshot( self, path: Optional[str] = None ) -> 'Metagraph':
+        r""" Saves this metagraph as a columnar snapshot, which load_snapshot memory maps.
+            Args: 
+                path: (:obj:`str`, optional, defaults to None):
+                    Snapshot file, defaults to ~/.bittensor/{network}_{netuid}.snapshot, or {network}_{netuid}_lite.snapshot if lite.
+        """
+        if path == None:
+            path = "~/.bittensor/" + self.filename( self.network, self.netuid, 'snapshot' )
+        snapshot_impl.save_snapshot( self, path )
+        return self
+
+    def load_snapshot( self, path: Optional[str] = None ) -> 'Metagraph':
+        r""" Loads this metagraph from a snapshot saved by save_snapshot. The tensors are views of the memory mapped file,
+            shared by all the processes which load it.
+            Args: 
+                path: (:obj:`str`, optional, defaults to None):
+                    Snapshot file, defaults to ~/.bittensor/{network}_{netuid}.snapshot, or {network}_{netuid}_lite.snapshot if lite.
+        """
+        if path == None:
+            path = "~/.bittensor/" + self.filename( self.network, self.netuid, 'snapshot' )
+        return snapshot_impl.load_snapshot( self, path )
 
     def load_from_path(self, path:str ) -> 'Metagraph':
         r""" Loads this metagraph object with state_dict under the specified path.
@@ -298,7 +469,8 @@ class Metagraph( torch.nn.Module ):
         return self
 
     def save_to_path(self, path:str, filename:str ) -> 'Metagraph':
-        r""" Saves this metagraph object's state_dict to the specified path.
+        r""" Saves this metagraph object's state_dict to the specified path. The file is replaced atomically,
+            processes loading it concurrently read either the previous or the new state_dict.
             Args: 
                 path: (:obj:`str`, required):
                     Path to save state_dict.
@@ -306,7 +478,10 @@ class Metagraph( torch.nn.Module ):
         full_path = os.path.expanduser(path)
         os.makedirs(full_path, exist_ok=True)
         metastate = self.state_dict()
-        torch.save(metastate, full_path + '/' + filename)
+        file_path = os.path.join(full_path, filename)
+        tmp_path = file_path + '.tmp.{}'.format( os.getpid() )
+        torch.save(metastate, tmp_path)
+        os.replace(tmp_path, file_path)
         return self
 
     def load_from_state_dict(self, state_dict: dict ) -> 'Metagraph':
@@ -338,11 +513,15 @@ class Metagraph( torch.nn.Module ):
         self.weights = torch.nn.Parameter( state_dict['weights'], requires_grad=False )
         self.bonds = torch.nn.Parameter( state_dict['bonds'], requires_grad=False )
         self.endpoints = torch.nn.Parameter( state_dict['endpoints'], requires_grad=False )
+        self.sparse = self.weights.is_sparse
         self._endpoint_objs = None
+        self._invalidate_index()
+        # Neurons are not saved, the next sync is a full sync.
+        self.neurons = None
         self.info = bittensor.SubnetInfo.from_parameter_dict( state_dict['info'] ) if 'info' in state_dict else None
         return self
 
-    def sync ( self, netuid: Optional[int] = None, subtensor: 'bittensor.Subtensor' = None, block: Optional[int] = None ) -> 'Metagraph':
+    def sync ( self, netuid: Optional[int] = None, subtensor: 'bittensor.Subtensor' = None, block: Optional[int] = None, incremental: Optional[bool] = None, lite: Optional[bool] = None ) -> 'Metagraph':
         r""" Synchronizes this metagraph with the chain state.
             Args:
                 subtensor: (:obj:`bittensor.Subtensor`, optional, defaults to None):
@@ -353,6 +532,13 @@ class Metagraph( torch.nn.Module ):
                     Defaults to the netuid of the metagraph object.
                 block: (:obj:`int`, optional, defaults to None):
                     block to sync with. If None, syncs with the current block.
+                incremental: (:obj:`bool`, optional, defaults to None):
+                    If true, only refetches the neurons which changed since the last sync, see sync_incremental.
+                    Defaults to the incremental flag of the metagraph object.
+                lite: (:obj:`bool`, optional, defaults to None):
+                    If true, syncs from the lite neurons, without the weights and bonds which W and B fetch on first access.
+                    A lite sync fetches every lite neuron and is not incremental.
+                    Defaults to the lite flag of the metagraph object.
             Returns:
                 self: (:obj:`Metagraph`, required):
                     Returns self.
@@ -364,12 +550,147 @@ class Metagraph( torch.nn.Module ):
             netuid = self.netuid
             if netuid == None:
                 raise ValueError('Metagraph.sync() requires a netuid to sync with.')
+        if incremental == None:
+            incremental = self.incremental
+        if lite == None:
+            lite = self.lite
+        if incremental and not lite and self.sync_incremental( netuid = netuid, subtensor = subtensor, block = block ):
+            return self
         # Pull metagraph from chain using subtensor.
-        metagraph = subtensor.metagraph( netuid = netuid, block = block )
+        metagraph = subtensor.metagraph( netuid = netuid, block = block, sparse = self.sparse, lite = lite )
+        metagraph.incremental = self.incremental
         # Update self with new values.
         self.__dict__.update(metagraph.__dict__)
         return self
 
+    def sync_incremental( self, netuid: int, subtensor: 'bittensor.Subtensor', block: Optional[int] = None ) -> bool:
+        r""" Patches this metagraph with the chain state, refetching only the neurons which changed since the last sync.
+            The lite neurons (without weights and bonds) of the subnet are fetched and compared with the cached neurons:
+            uids whose hotkey or last_update changed are refetched with neuron_for_uid. Bonds move on every epoch,
+            so once an epoch ran, the neurons holding bonds or a validator permit are refetched too.
+            The other neurons keep their cached weights and bonds with the lite values.
+
+            Args:
+                netuid: (:obj:`int`, required):
+                    netuid of the subnet to sync with.
+                subtensor: (:obj:`bittensor.Subtensor`, required):
+                    Subtensor to sync with.
+                block: (:obj:`int`, optional, defaults to None):
+                    block to sync with. If None, syncs with the current block.
+            Returns:
+                patched: (:obj:`bool`, required):
+                    False if a full sync is needed: no cached full neurons, another subnet or network,
+                    a different number of neurons or more than half of the neurons changed.
+        """
+        n = self.n.item()
+        if self.neurons == None or self.lite or n == 0 or netuid != self.netuid or subtensor.network != self.network:
+            return False
+        if block == None:
+            block = subtensor.block
+        lite_neurons = subtensor.neurons_lite( netuid = netuid, block = block )
+        if len( lite_neurons ) != n or len( self.neurons ) != n:
+            return False
+
+        # ==== Detect changed neurons ====
+        changed = set()
+        epoch = False
+        for lite in lite_neurons:
+            cached = self.neurons[ lite.uid ]
+            if cached == None or lite.hotkey != cached.hotkey or lite.last_update != cached.last_update:
+                changed.add( lite.uid )
+            elif lite.emission != cached.emission or lite.rank != cached.rank or lite.dividends != cached.dividends:
+                epoch = True
+        if epoch:
+            changed.update( lite.uid for lite in lite_neurons if lite.validator_permit or len( self.neurons[ lite.uid ].bonds ) > 0 )
+        if len( changed ) > n // 2:
+            return False
+
+        info = subtensor.get_subnet_info( netuid = netuid, block = block )
+        if info == None:
+            raise ValueError('Could not find subnet info for netuid: {}'.format(netuid))
+
+        # ==== Patch neurons ====
+        lite_fields = [ field.name for field in dataclasses.fields( bittensor.NeuronInfoLite ) ]
+        neurons = []
+        endpoint_uids = []
+        for lite in lite_neurons:
+            cached = self.neurons[ lite.uid ]
+            if lite.uid in changed:
+                neuron = subtensor.neuron_for_uid( uid = lite.uid, netuid = netuid, block = block )
+            else:
+                neuron = dataclasses.replace( cached, **{ name: getattr( lite, name ) for name in lite_fields } )
+            if cached == None or neuron.hotkey != cached.hotkey or neuron.coldkey != cached.coldkey or neuron.axon_info != cached.axon_info:
+                endpoint_uids.append( neuron.uid )
+            neurons.append( neuron )
+
+        # ==== Patch columns ====
+        self.stake = [ neuron.stake for neuron in neurons ]
+        self.total_stake.copy_( torch.tensor( [ neuron.total_stake.tao for neuron in neurons ], dtype=torch.float32 ) )
+        self.ranks.copy_( torch.tensor( [ neuron.rank for neuron in neurons ], dtype=torch.float32 ) )
+        self.trust.copy_( torch.tensor( [ neuron.trust for neuron in neurons ], dtype=torch.float32 ) )
+        self.consensus.copy_( torch.tensor( [ neuron.consensus for neuron in neurons ], dtype=torch.float32 ) )
+        self.validator_trust.copy_( torch.tensor( [ neuron.validator_trust for neuron in neurons ], dtype=torch.float32 ) )
+        self.incentive.copy_( torch.tensor( [ neuron.incentive for neuron in neurons ], dtype=torch.float32 ) )
+        self.emission.copy_( torch.tensor( [ neuron.emission for neuron in neurons ], dtype=torch.float32 ) )
+        self.dividends.copy_( torch.tensor( [ neuron.dividends for neuron in neurons ], dtype=torch.float32 ) )
+        self.active.copy_( torch.tensor( [ neuron.active for neuron in neurons ], dtype=torch.int64 ) )
+        self.last_update.copy_( torch.tensor( [ neuron.last_update for neuron in neurons ], dtype=torch.int64 ) )
+        self.validator_permit.copy_( torch.tensor( [ neuron.validator_permit for neuron in neurons ], dtype=torch.bool ) )
+
+        if len( endpoint_uids ) > 0:
+            endpoint_objs = [ bittensor.endpoint.from_neuron( neurons[ uid ] ) for uid in endpoint_uids ]
+            for uid, endpoint in zip( endpoint_uids, endpoint_objs ):
+                self._endpoint_objs[ uid ] = endpoint
+            self.endpoints[ endpoint_uids ] = bittensor.endpoint.to_tensors( endpoint_objs )
+            self._invalidate_index()
+
+        # ==== Patch weight rows and bonds ====
+        if len( changed ) > 0:
+            changed_uids = torch.tensor( sorted( changed ), dtype=torch.int64 )
+            rows, uids, vals = Metagraph._neuron_pairs( [ neurons[ uid ] for uid in changed_uids.tolist() ], 'weights' )
+            if self.weights.is_sparse:
+                weights = self.weights.detach()
+                keep = ~torch.isin( weights.indices()[0], changed_uids )
+                patch = weight_utils.convert_neuron_uids_and_vals_to_sparse_tensor( n, rows, uids, vals, scale = weight_utils.U16_MAX )
+                tweights = torch.sparse_coo_tensor(
+                    torch.cat( [ weights.indices()[ :, keep ], patch.indices() ], dim = 1 ),
+                    torch.cat( [ weights.values()[ keep ], patch.values() ] ),
+                    size = ( n, n )
+                ).coalesce()
+                self.weights = torch.nn.Parameter( tweights, requires_grad=False )
+            else:
+                self.weights[ changed_uids ] = 0
+                if len( rows ) > 0:
+                    values = ( torch.tensor( vals, dtype=torch.float64 ) / weight_utils.U16_MAX ).float()
+                    self.weights.index_put_( ( torch.tensor( rows, dtype=torch.int64 ), torch.tensor( uids, dtype=torch.int64 ) ), values )
+
+            # Bonds are normalized per column, renormalize from the raw bonds of all neurons.
+            rows, uids, vals = Metagraph._neuron_pairs( neurons, 'bonds' )
+            if self.sparse:
+                tbonds = weight_utils.normalize_sparse_bonds( weight_utils.convert_neuron_uids_and_vals_to_sparse_tensor( n, rows, uids, vals ) )
+            else:
+                tbonds = weight_utils.normalize_bonds( weight_utils.convert_neuron_uids_and_vals_to_tensor( n, rows, uids, vals ) )
+            self.bonds = torch.nn.Parameter( tbonds, requires_grad=False )
+
+        self.neurons = neurons
+        self.info = info
+        self.block = torch.nn.Parameter( torch.tensor( block, dtype=torch.int64 ), requires_grad=False )
+        return True
+
+    @staticmethod
+    def _neuron_pairs( neurons: List['bittensor.NeuronInfo'], attribute: str ) -> Tuple[List[int], List[int], List[int]]:
+        r""" Returns the (row, uid, value) triplets of the weights or bonds of the neurons as three lists.
+        """
+        rows, uids, vals = [], [], []
+        for neuron in neurons:
+            pairs = getattr( neuron, attribute )
+            if len( pairs ) > 0:
+                pair_uids, pair_vals = zip( *pairs )
+                rows.extend( [ neuron.uid ] * len( pair_uids ) )
+                uids.extend( pair_uids )
+                vals.extend( pair_vals )
+        return rows, uids, vals
+
     def to_dataframe(self):
         try:
             index = self.uids.tolist()
@@ -405,6 +726,7 @@ class Metagraph( torch.nn.Module ):
             'metagraph_n': self.n.item(),
             'metagraph_tau': self.tau.item(),
             'metagraph_block': self.block.item(),
+            'metagraph_weights_nnz': self.weights._nnz() if self.weights.is_sparse else self.weights.count_nonzero().item(),
         }
         return wandb_info
             
@@ -87,6 +87,7 @@ class Metagraph( torch.nn.Module ):
         self.endpoints = torch.nn.Parameter( torch.tensor( [], dtype=torch.int64), requires_grad=False )
         self.uids = torch.nn.Parameter( torch.tensor([], dtype = torch.int64),requires_grad=False )
         self._endpoint_objs = None
+        self._invalidate_index()
         self.neurons = None
         return self
 
@@ -232,7 +233,9 @@ class Metagraph( torch.nn.Module ):
         """
         if self.n.item() == 0:
             return []
-        return [ neuron.hotkey if neuron != bittensor.endpoint.dummy() else '' for neuron in self.endpoint_objs ]
+        if self._hotkeys == None:
+            self._build_index()
+        return self._hotkeys
 
     @property
     def coldkeys( self ) -> List[str]:
@@ -243,7 +246,9 @@ class Metagraph( torch.nn.Module ):
         """
         if self.n.item() == 0:
             return []
-        return [ neuron.coldkey if neuron != bittensor.endpoint.dummy() else '' for neuron in self.endpoint_objs ]
+        if self._coldkeys == None:
+            self._build_index()
+        return self._coldkeys
 
     @property
     def modalities( self ) -> List[str]:
@@ -285,6 +290,37 @@ class Metagraph( torch.nn.Module ):
                 self._endpoint_objs.append( obj )
             return self._endpoint_objs
 
+    def _invalidate_index( self ):
+        r""" Drops the hotkey and coldkey indices, rebuilt from the endpoints on next use.
+        """
+        self._hotkeys = None
+        self._coldkeys = None
+        self._hotkey_index = None
+        self._coldkey_index = None
+
+    def _build_index( self ):
+        r""" Builds the hotkey and coldkey lists and the hotkey to uid and coldkey to uids indices from the endpoints.
+        """
+        dummy = bittensor.endpoint.dummy()
+        hotkeys = []
+        coldkeys = []
+        hotkey_index = {}
+        coldkey_index = {}
+        for uid, endpoint in enumerate( self.endpoint_objs ):
+            if endpoint == dummy:
+                hotkeys.append( '' )
+                coldkeys.append( '' )
+                continue
+            hotkeys.append( endpoint.hotkey )
+            coldkeys.append( endpoint.coldkey )
+            # The first uid of a hotkey, as hotkeys.index
+            hotkey_index.setdefault( endpoint.hotkey, uid )
+            coldkey_index.setdefault( endpoint.coldkey, [] ).append( uid )
+        self._hotkeys = hotkeys
+        self._coldkeys = coldkeys
+        self._hotkey_index = hotkey_index
+        self._coldkey_index = coldkey_index
+
     def hotkey_to_uid( self, hotkey:str ) -> int:
         r""" Fetch uid according to hotkey. 
             Args: 
@@ -295,10 +331,27 @@ class Metagraph( torch.nn.Module ):
                 uid: (`int`):
                     The uid for specified hotkey, -1 if hotkey does not exist.
         """ 
-        if hotkey in self.hotkeys:
-            return self.hotkeys.index(hotkey) 
-        else:
+        if self.n.item() == 0:
             return -1
+        if self._hotkey_index == None:
+            self._build_index()
+        return self._hotkey_index.get( hotkey, -1 )
+
+    def coldkey_to_uids( self, coldkey:str ) -> List[int]:
+        r""" Fetch the uids of the hotkeys owned by coldkey.
+            Args: 
+                coldkey: (`str`, required):
+                    Coldkey to fetch the uids for.
+            
+            Return:
+                uids: (`List[int]`):
+                    The uids for specified coldkey, empty if coldkey does not exist.
+        """ 
+        if self.n.item() == 0:
+            return []
+        if self._coldkey_index == None:
+            self._build_index()
+        return list( self._coldkey_index.get( coldkey, [] ) )
 
     def load( self, network:str = None  ) -> 'Metagraph':
         r""" Loads this metagraph object's state_dict from bittensor root dir.
@@ -375,6 +428,7 @@ class Metagraph( torch.nn.Module ):
         self.bonds = torch.nn.Parameter( state_dict['bonds'], requires_grad=False )
         self.endpoints = torch.nn.Parameter( state_dict['endpoints'], requires_grad=False )
         self._endpoint_objs = None
+        self._invalidate_index()
         return self
 
     def retrieve_cached_neurons( self, block: int = None ):
@@ -486,6 +540,7 @@ class Metagraph( torch.nn.Module ):
         weights = [ [ 0 for _ in range(n_total) ] for _ in range(n_total) ]
         bonds = [ [0 for _ in range(n_total) ] for _ in range(n_total) ]
         self._endpoint_objs = [ bittensor.endpoint.dummy() for _ in range(n_total) ]
+        self._invalidate_index()
         self.neurons = [None for _ in range(n_total)]
         for n in neurons:
             self.neurons[n.uid] = n
@@ -558,6 +613,7 @@ class Metagraph( torch.nn.Module ):
         self.weights = torch.nn.Parameter( tweights, requires_grad=False )
         self.bonds = torch.nn.Parameter( tbonds, requires_grad=False )
         self.endpoints = torch.nn.Parameter( tendpoints, requires_grad=False )
+        self._build_index()
             
         # For contructor.
         return self
@@ -0,0 +1,189 @@
+""" Memory mapped columnar snapshot of a metagraph, shared by the processes which load it.
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated 
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation 
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of 
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL 
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION 
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
+# DEALINGS IN THE SOFTWARE.
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Tuple
+
+import torch
+
+import bittensor
+
+# File layout: header | directory | padding | columns, each column starting at a multiple of ALIGNMENT.
+# The header is the magic, the format version and the byte length of the json directory,
+# which holds the metagraph metadata and the dtype, shape, offset and length of each column.
+# Column offsets are relative to the first column, at the aligned end of the directory.
+MAGIC = b'BTMGSNAP'
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct( '<8sIQ' )
+ALIGNMENT = 64
+
+# Tensor parameters of the metagraph stored as columns.
+PARAMETERS = [ 'version', 'n', 'tau', 'block', 'uids', 'total_stake', 'ranks', 'trust', 'consensus', 'validator_trust',
+    'incentive', 'emission', 'dividends', 'active', 'last_update', 'validator_permit', 'endpoints' ]
+
+DTYPES = {
+    'float32': torch.float32,
+    'int64': torch.int64,
+    'bool': torch.bool,
+    'uint8': torch.uint8,
+}
+
+def _align( offset: int ) -> int:
+    return ( offset + ALIGNMENT - 1 ) // ALIGNMENT * ALIGNMENT
+
+def _string_table( strings: List[str] ) -> Tuple[torch.Tensor, torch.Tensor]:
+    r""" Returns the [len + 1] int64 offsets and the uint8 utf-8 bytes of the concatenated strings.
+    """
+    encoded = [ string.encode('utf-8') for string in strings ]
+    offsets = torch.zeros( len( encoded ) + 1, dtype=torch.int64 )
+    if len( encoded ) > 0:
+        offsets[1:] = torch.tensor( [ len( string ) for string in encoded ], dtype=torch.int64 ).cumsum( 0 )
+    data = torch.frombuffer( bytearray( b''.join( encoded ) ), dtype=torch.uint8 ) if offsets[-1] > 0 else torch.tensor( [], dtype=torch.uint8 )
+    return offsets, data
+
+def _strings( offsets: torch.Tensor, data: torch.Tensor ) -> List[str]:
+    r""" Returns the strings of a string table.
+    """
+    blob = data.numpy().tobytes()
+    offsets = offsets.tolist()
+    return [ blob[ start:end ].decode('utf-8') for start, end in zip( offsets[:-1], offsets[1:] ) ]
+
+def _info_to_dict( info: 'bittensor.SubnetInfo' ) -> Dict:
+    info = dict( info.__dict__ )
+    info['burn'] = info['burn'].rao
+    return info
+
+def _info_from_dict( info: Dict ) -> 'bittensor.SubnetInfo':
+    info = dict( info )
+    info['burn'] = bittensor.Balance.from_rao( info['burn'] )
+    return bittensor.SubnetInfo( **info )
+
+def save_snapshot( metagraph: 'bittensor.Metagraph', path: str ):
+    r""" Writes the metagraph as a snapshot to path. The file is written next to path and renamed over it,
+        so that processes loading the snapshot never see a partial file.
+
+        Args:
+            metagraph (:obj:`bittensor.Metagraph`, `required`):
+                Metagraph to save.
+            path (:obj:`str`, `required`):
+                Snapshot file.
+    """
+    columns = { name: getattr( metagraph, name ).detach() for name in PARAMETERS }
+    for name in [ 'weights', 'bonds' ]:
+        tensor = getattr( metagraph, name ).detach()
+        if tensor.is_sparse:
+            tensor = tensor.coalesce()
+            columns[ name + '.indices' ] = tensor.indices()
+            columns[ name + '.values' ] = tensor.values()
+        else:
+            columns[ name ] = tensor
+    columns['hotkeys.offsets'], columns['hotkeys.data'] = _string_table( metagraph.hotkeys )
+    columns['coldkeys.offsets'], columns['coldkeys.data'] = _string_table( metagraph.coldkeys )
+
+    directory = {
+        'network': metagraph.network,
+        'netuid': metagraph.netuid,
+        'sparse': metagraph.weights.is_sparse,
+        'info': _info_to_dict( metagraph.info ) if metagraph.info != None else None,
+        'columns': {},
+    }
+    offset = 0
+    for name, tensor in columns.items():
+        nbytes = tensor.nelement() * tensor.element_size()
+        directory['columns'][ name ] = { 'dtype': str( tensor.dtype ).replace( 'torch.', '' ), 'shape': list( tensor.shape ), 'offset': offset, 'nbytes': nbytes }
+        offset = _align( offset + nbytes )
+    encoded_directory = json.dumps( directory ).encode('utf-8')
+    data_start = _align( HEADER.size + len( encoded_directory ) )
+
+    full_path = os.path.expanduser( path )
+    os.makedirs( os.path.dirname( os.path.abspath( full_path ) ), exist_ok = True )
+    tmp_path = full_path + '.tmp.{}'.format( os.getpid() )
+    with open( tmp_path, 'wb' ) as f:
+        f.write( HEADER.pack( MAGIC, SNAPSHOT_VERSION, len( encoded_directory ) ) )
+        f.write( encoded_directory )
+        for name, tensor in columns.items():
+            f.seek( data_start + directory['columns'][ name ]['offset'] )
+            f.write( tensor.contiguous().numpy().tobytes() )
+        f.truncate( data_start + offset )
+    os.replace( tmp_path, full_path )
+
+def load_snapshot( metagraph: 'bittensor.Metagraph', path: str ) -> 'bittensor.Metagraph':
+    r""" Loads the snapshot at path into the metagraph. The file is memory mapped copy on write and the tensors are
+        views of the mapping, so that the processes loading the same snapshot share its pages until they modify them.
+
+        Args:
+            metagraph (:obj:`bittensor.Metagraph`, `required`):
+                Metagraph to load into.
+            path (:obj:`str`, `required`):
+                Snapshot file.
+
+        Returns:
+            metagraph (:obj:`bittensor.Metagraph`, `required`):
+                The loaded metagraph.
+
+        Raises:
+            ValueError:
+                If the file is not a snapshot or was written by a newer format version.
+    """
+    full_path = os.path.expanduser( path )
+    with open( full_path, 'rb' ) as f:
+        buffer = mmap.mmap( f.fileno(), 0, access = mmap.ACCESS_COPY )
+    if len( buffer ) < HEADER.size:
+        raise ValueError('{} is not a metagraph snapshot'.format( full_path ))
+    magic, version, directory_size = HEADER.unpack_from( buffer, 0 )
+    if magic != MAGIC:
+        raise ValueError('{} is not a metagraph snapshot'.format( full_path ))
+    if version > SNAPSHOT_VERSION:
+        raise ValueError('Metagraph snapshot {} has format version {}, this version of bittensor reads up to {}'.format( full_path, version, SNAPSHOT_VERSION ))
+    directory = json.loads( buffer[ HEADER.size : HEADER.size + directory_size ].decode('utf-8') )
+    data_start = _align( HEADER.size + directory_size )
+
+    columns = {}
+    for name, column in directory['columns'].items():
+        dtype = DTYPES[ column['dtype'] ]
+        if column['nbytes'] == 0:
+            columns[ name ] = torch.empty( column['shape'], dtype = dtype )
+            continue
+        count = column['nbytes'] // torch.tensor( [], dtype = dtype ).element_size()
+        columns[ name ] = torch.frombuffer( buffer, dtype = dtype, count = count, offset = data_start + column['offset'] ).reshape( column['shape'] )
+
+    for name in PARAMETERS:
+        setattr( metagraph, name, torch.nn.Parameter( columns[ name ], requires_grad=False ) )
+    n = metagraph.n.item()
+    for name in [ 'weights', 'bonds' ]:
+        if directory['sparse']:
+            tensor = torch.sparse_coo_tensor( columns[ name + '.indices' ], columns[ name + '.values' ], size = ( n, n ) )._coalesced_( True )
+        else:
+            tensor = columns[ name ]
+        setattr( metagraph, name, torch.nn.Parameter( tensor, requires_grad=False ) )
+
+    metagraph.network = directory['network']
+    metagraph.netuid = directory['netuid']
+    metagraph.sparse = directory['sparse']
+    metagraph.info = _info_from_dict( directory['info'] ) if directory['info'] != None else None
+    # Stake and neurons are not saved, as with load_from_state_dict.
+    metagraph.stake = None
+    metagraph.neurons = None
+    metagraph._endpoint_objs = None
+    metagraph._set_index( _strings( columns['hotkeys.offsets'], columns['hotkeys.data'] ), _strings( columns['coldkeys.offsets'], columns['coldkeys.data'] ) )
+    metagraph._snapshot_buffer = buffer
+    return metagraph
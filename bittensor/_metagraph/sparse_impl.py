@@ -0,0 +1,76 @@
+""" Read only view of a sparse metagraph matrix, indexed as its dense counterpart.
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated 
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation 
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of 
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL 
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION 
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
+# DEALINGS IN THE SOFTWARE.
+
+from typing import Any, List
+
+import torch
+
+class SparseMatrix:
+    r""" Wraps a sparse COO [n, n] tensor of the metagraph, i.e. the weights or bonds, so that it is indexed like
+        the dense matrix without materializing it: rows, columns and elements are returned as dense tensors.
+        Other indices go through to_dense().
+
+        Args:
+            tensor (:obj:`torch.Tensor`, `required`):
+                Coalesced sparse COO tensor.
+    """
+    def __init__( self, tensor: torch.Tensor ):
+        self.tensor = tensor
+
+    def __str__( self ):
+        return "SparseMatrix({}, nnz={})".format( list( self.tensor.shape ), self.nnz )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def __len__( self ):
+        return self.tensor.shape[0]
+
+    @property
+    def shape( self ) -> torch.Size:
+        return self.tensor.shape
+
+    @property
+    def dtype( self ) -> torch.dtype:
+        return self.tensor.dtype
+
+    @property
+    def nnz( self ) -> int:
+        r""" Number of stored values.
+        """
+        return self.tensor._nnz()
+
+    def size( self, dim: int = None ):
+        return self.tensor.size() if dim == None else self.tensor.size( dim )
+
+    def to_dense( self ) -> torch.Tensor:
+        r""" Returns the dense [n, n] matrix, allocated on each call.
+        """
+        return self.tensor.to_dense()
+
+    def tolist( self ) -> List[List[float]]:
+        return self.to_dense().tolist()
+
+    def __getitem__( self, key: Any ) -> torch.Tensor:
+        # Integers and full slices are supported by sparse indexing, anything else densifies.
+        keys = key if isinstance( key, tuple ) else ( key, )
+        if all( isinstance( k, int ) or ( isinstance( k, slice ) and k == slice( None ) ) for k in keys ):
+            result = self.tensor[ key ]
+            return result.to_dense() if result.is_sparse else result
+        return self.to_dense()[ key ]
@@ -23,12 +23,14 @@ Example:
 """
 
 import bittensor
+import copy
 import os
 import sys
 
 from .nucleus_impl import server
+from .callbacks_impl import AxonCallbacks
 from prometheus_client import Counter, Gauge, Histogram, Summary, Info, CollectorRegistry
-from threading import Lock
+from threading import Thread
 from loguru import logger; logger = logger.opt(colors=True)
 import time
 
@@ -146,30 +148,34 @@ class neuron:
             subtensor = bittensor.subtensor(config = config) if subtensor == None else subtensor
             self.config.netuid = subtensor.get_subnets()[0]
 
-        self.mutex = Lock()
         self.model = server(config = config).to(config.neuron.device) if model == None else model
         self.subtensor = bittensor.subtensor(config = config) if subtensor == None else subtensor
         self.wallet = bittensor.wallet( config = config ) if wallet == None else wallet
         self.metagraph = bittensor.metagraph ( config = config, netuid = self.config.netuid) if metagraph == None else metagraph
-        self.timecheck_dicts = {bittensor.proto.RequestType.FORWARD:{}, bittensor.proto.RequestType.BACKWARD:{}}
 
         self.config.neuron.max_batch_size = self.subtensor.validator_batch_size(netuid=self.config.netuid) if self.config.neuron.max_batch_size == -1 else self.config.neuron.max_batch_size
         self.config.neuron.max_sequence_len = self.subtensor.validator_sequence_length(netuid=self.config.netuid) if self.config.neuron.max_sequence_len == -1 else self.config.neuron.max_sequence_len
 
+        self.callbacks = AxonCallbacks( 
+            config = self.config, 
+            model = self.model, 
+            wallet = self.wallet, 
+            metagraph = self.metagraph, 
+            prometheus_counters = self.prometheus_counters 
+        )
+        # Local training and the synapse calls share the model.
+        self.mutex = self.callbacks.mutex
         if axon == None:
-            axon = bittensor.axon(
-                config = config,
-                wallet = wallet,
-                netuid = self.config.netuid,
-                synapse_checks=self.synapse_check,
-                synapse_last_hidden = self.forward_hidden_state if self.model.config.neuron.lasthidden else None,
-                synapse_causal_lm = self.forward_casual_lm if self.model.config.neuron.causallm else None,
-                synapse_causal_lm_next = self.forward_casual_lm_next if self.model.config.neuron.causallmnext else None,
-                synapse_seq_2_seq = self.forward_generate if self.model.config.neuron.seq2seq else None ,
-                blacklist = self.blacklist if not self.model.config.neuron.disable_blacklist else None,
-                priority = self.priority if not self.model.config.neuron.disable_priority else None,
-            )
-        self.axon = axon
+            axon = self.callbacks.create_axon()
+            if self.config.axon.workers > 1:
+                # Extra axon processes serve the model weights from shared memory on the same port.
+                self.model.share_memory()
+                axon.attach_workers( bittensor._axon.AxonWorkers( 
+                    workers = self.config.axon.workers - 1, 
+                    target = neuron.serve_worker, 
+                    args = ( self.config, self.model, self.wallet, self.metagraph ),
+                ) )
+        self.axon = self.callbacks.axon = axon
         self.query_data = {}
         
         # Init prometheus.
@@ -186,6 +192,26 @@ class neuron:
             bittensor.__console__.print(f"[red]Subnet {self.config.netuid} does not exist[/red]")
             sys.exit(1)
 
+    @staticmethod
+    def serve_worker( config: 'bittensor.Config', model: 'server', wallet: 'bittensor.wallet', metagraph: 'bittensor.Metagraph' ) -> 'bittensor.Axon':
+        r""" Creates the axon of an axon worker process, see bittensor._axon.AxonWorkers.
+            The worker serves the model shared by the main neuron through its own AxonCallbacks, and reloads
+            the metagraph when the main neuron saves it. It neither trains nor connects to the chain.
+        """
+        config = copy.deepcopy( config )
+        # The stats of the workers are served by the main axon.
+        config.axon.stats.port = 0
+        callbacks = AxonCallbacks( 
+            config = config, 
+            model = model, 
+            wallet = wallet, 
+            metagraph = metagraph, 
+            prometheus_counters = Counter('neuron_counters', 'Counter sumamries for the running server-miner.', ['neuron_counters_name'], registry=CollectorRegistry()),
+        )
+        axon = callbacks.create_axon()
+        Thread( target = callbacks.reload_metagraph_forever, args = ( bittensor.__blocktime__, ), name = 'bittensor-metagraph-reload', daemon = True ).start()
+        return axon
+
     @classmethod
     def config(cls):
         return server.config()
@@ -236,7 +262,7 @@ class neuron:
 
         # Create our axon server and subscribe it to the network.
         self.axon.start().serve(subtensor=self.subtensor)
-        self.axon.attach_backward_callback(self.backward_callback)
+        self.axon.attach_backward_callback(self.callbacks.backward_callback)
 
 
         # Training Data
@@ -344,7 +370,7 @@ class neuron:
 
                 df = pandas.concat( [
                     bittensor.utils.indexed_values_to_dataframe( prefix = 'w_i_{}'.format(nn.uid), index = self.metagraph.uids, values = self.metagraph.W[:, uid] ),
-                    self.axonaxon.to_dataframe( metagraph = self.metagraph ),
+                    self.axon.to_dataframe( metagraph = self.metagraph ),
                 ], axis = 1)
                 df['uid'] = df.index
                 wandb_info_axon = self.axon.to_wandb()                
@@ -380,6 +406,9 @@ class neuron:
 
             if current_block - last_set_block > blocks_per_set_weights:
                 self.metagraph.sync(netuid=self.config.netuid, subtensor = self.subtensor)
+                if self.axon.workers != None:
+                    # Reloaded by the axon workers.
+                    self.metagraph.save()
                 last_set_block = current_block
                 epoch_starting_successes = self.axon.stats.total_successes
                 epoch_starting_requests = self.axon.stats.total_requests
@@ -411,243 +440,6 @@ class neuron:
                     except Exception as e:
                         logger.error('Failure setting weights on chain with error: {}', e)
 
-    def synapse_check(self, synapse, hotkey, inputs_x=None):
-        """
-            Custom synapse function to protect certain synapse functions depending on the stake and weight.
-            Certain synapses require more compute than others. For instance, TEXT_SEQ_2_SEQ requires a significantly
-            more commitment by the server than a requeset for TEXT_CAUSAL_LM_NEXT.
-
-            Args:
-                synapse (:obj:`bittensor.proto.SynapseArgs`, `required`): 
-                    The proto message that contains additional args for individual synapse functions
-                hotkey (:obj:`torch.FloatTensor`, `required`):
-                    The hotkey that sent the request
-
-        """
-        ## Uid that sent the request
-        incoming_uid = self.metagraph.hotkeys.index(hotkey)
-        batch_size, sequence_len  =  inputs_x[0].size()
-        if synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE:
-            if self.metagraph.S[incoming_uid] < self.config.neuron.lasthidden_stake \
-                or (batch_size > self.config.neuron.max_batch_size) \
-                or (sequence_len > self.config.neuron.max_sequence_len):
-                return False
-            
-        elif synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_CAUSAL_LM:
-            if (self.metagraph.S[incoming_uid] < self.config.neuron.causallm_stake) \
-                or (batch_size > self.config.neuron.max_batch_size) \
-                or (sequence_len > self.config.neuron.max_sequence_len):
-                return False
-
-        elif synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_CAUSAL_LM_NEXT:
-            if (self.metagraph.S[incoming_uid] < self.config.neuron.causallmnext_stake) \
-                or (batch_size > self.config.neuron.max_batch_size) \
-                or (sequence_len > self.config.neuron.max_sequence_len):
-                return False
-
-        elif synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_SEQ_2_SEQ:
-            if (self.metagraph.S[incoming_uid] < self.config.neuron.seq2seq_stake) \
-                or (batch_size > self.config.neuron.max_batch_size) \
-                or (sequence_len > self.config.neuron.max_sequence_len) \
-                or (self.metagraph.W[incoming_uid,  self.uid]):
-                return False     
-        else:
-            raise Exception('Unknown Synapse')
-
-        return True
-
-    def backward_callback(self, inputs_x:torch.FloatTensor, grads_dy:torch.FloatTensor, synapses=[] ):
-        """
-            The default backward callback when no callback is attached: Is used to call specific synapse functions
-
-            Args:
-                inputs_x (:obj:`torch.FloatTensor`, `required`): 
-                    The inputs that will be passed to the synapse functions
-                grads_dy (:obj:`torch.FloatTensor`, `required`):
-                    The gradients that will be passed to the synapse functions
-                synapses (:obj: list of bittensor.proto.SynapseArgs, 'Optional')
-                    The proto message that contains additional args for individual synapse functions
-
-            Returns:
-                response_tensors: (:obj: list of bittensor.proto.Tensor, `required`): 
-                    serialized tensor response from the nucleus call or None.
-                response_codes: (:obj: list of bittensor.proto.ReturnCode, `required`)
-                    return code associated with forward call i.e. Success of Timeout.
-                response_messages: (:obj: list of strings, `required`)
-                    return message associated with synapse call
-        """
-        # --- initialize response variables --- 
-        response_tensors = []
-        response_codes = []
-        response_messages = []
-        
-        if not self.config.neuron.remote_train:
-            return response_tensors, response_codes, response_messages
-
-        # --- calling attached synapses ---
-        with self.mutex and torch.enable_grad() and torch.autograd.set_detect_anomaly(True):
-            for index, synapse in enumerate(synapses):
-                try:
-                    if synapse.synapse_type in self.axon.synapse_callbacks and self.axon.synapse_callbacks[synapse.synapse_type] != None:
-                        message, model_output, response_tensor = self.axon.synapse_callbacks[synapse.synapse_type](inputs_x[index], synapse)
-                        grads_dy_norm = grads_dy[index]/(grads_dy[index].sum() + 0.00001)
-                        torch.autograd.backward (
-                            tensors = [ response_tensor ],
-                            grad_tensors = [ grads_dy_norm ],
-                            retain_graph=True
-                        )
-                        # Only consider loss from causal LM next.
-                        if synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_CAUSAL_LM_NEXT:
-                            self.model.remote_losses.append(model_output.loss)
-                            self.model.remote_losses = self.model.remote_losses[-self.config.neuron.num_remote_loss:] if len(self.model.remote_losses) > self.config.neuron.num_remote_loss else self.model.remote_losses
-                        self.model.backward_gradients_count += inputs_x[index].size(0)
-                        response_tensors.append(None)
-                        response_codes.append(bittensor.proto.ReturnCode.Success)
-                        response_messages.append('Success')
-                        
-                    else:
-                        response_tensors.append(None)
-                        response_codes.append(bittensor.proto.ReturnCode.NotImplemented)
-                        response_messages.append('Not Implemented')
-                except Exception as e:
-                    # --- Exception Hit in Synapse ---
-                    response_tensors.append(None)
-                    response_codes.append(bittensor.proto.ReturnCode.UnknownException)
-                    response_messages.append(str(e))
-
-        return response_tensors, response_codes, response_messages
-
-
-    def priority(self, pubkey:str, request_type:bittensor.proto.RequestType, inputs_x) -> float:
-        r"""Calculates the priority on requests based on stake and size of input
-            Args:
-                pubkey ( str, `required`):
-                    The public key of the caller.
-                inputs_x ( :obj:`torch.Tensor`, `required`):
-                    torch inputs to be forward processed.
-                request_type ( bittensor.proto.RequestType, `required`):
-                    the request type ('FORWARD' or 'BACKWARD').
-        """
-        try:        
-            uid = self.metagraph.hotkeys.index(pubkey)
-            priority = self.metagraph.S[uid].item()
-        
-        except:
-            # zero priority for those who are not registered.
-            priority =  0
-
-        return priority
-
-    def forward_generate(self, inputs_x:torch.FloatTensor, synapse, model_output = None):
-        tokens = self.model.token_remap(inputs_x.to(self.model.device))
-        output = self.model.pre_model.generate(
-            input_ids=tokens['input_ids'],
-            attention_mask=tokens['attention_mask'],
-            max_length=max(tokens['input_ids'].shape[1] + 1, synapse.num_to_generate),
-            num_beams=synapse.num_beams,
-            no_repeat_ngram_size=synapse.no_repeat_ngram_size,
-            early_stopping = synapse.early_stopping,
-            do_sample=synapse.do_sample,
-            top_p=synapse.top_p,
-            num_return_sequences=synapse.num_return_sequences,
-            temperature = synapse.temperature,
-            repetition_penalty = synapse.repetition_penalty,
-            length_penalty = synapse.length_penalty,
-            max_time = synapse.max_time,
-            num_beam_groups = synapse.num_beam_groups,
-        )
-        raw_texts = [self.model.tokenizer.decode(out) for out in output]
-        tokens = [self.model.std_tokenizer.encode(raw_text, return_tensors="pt")[:,:synapse.num_to_generate].view(-1) for raw_text in raw_texts]
-        bittensor_output = pad_sequence(tokens, batch_first=True)
-        return None, model_output, bittensor_output
-
-    def forward_hidden_state(self, inputs_x:torch.FloatTensor, synapse, model_output = None):
-        with self.mutex:
-            message, model_output, hidden = self.model.encode_forward(inputs_x.to(self.model.device), model_output=model_output)
-        return message, model_output, hidden
-
-    def forward_casual_lm(self, inputs_x:torch.FloatTensor, synapse, model_output = None):
-        with self.mutex:
-            message, model_output, logits = self.model.encode_forward_causallm(inputs_x.to(self.model.device), model_output=model_output)
-        return message, model_output, logits
-
-    def forward_casual_lm_next(self,inputs_x: torch.FloatTensor, synapse, model_output=None):
-        with self.mutex:
-            message, model_output, topk_token_phrases = self.model.encode_forward_causallmnext(inputs_x.to(self.model.device),
-                                                                                        topk=synapse.topk,
-                                                                                        model_output=model_output)
-        # topk_token_phrases: [sum_b(sum_k(len(phrase_k) + 1)_b)] contains topk token phrases and probabilities
-        #   Compacted 1-D tensor >= batch_size * (2 * topk + 1)
-        return message, model_output, topk_token_phrases
-
-
-    def blacklist(self, pubkey:str, request_type:bittensor.proto.RequestType) -> bool:
-        r"""Axon security blacklisting, used to blacklist message from low stake members
-            Args:
-                pubkey ( str, `required`):
-                    The public key of the caller.
-                request_type ( bittensor.proto.RequestType, `required`):
-                    the request type ('FORWARD' or 'BACKWARD').
-        """
-        # Check for registrations
-        def registration_check():
-            # If we allow non-registered requests return False = not blacklisted.
-            is_registered = pubkey in self.metagraph.hotkeys
-            if not is_registered:
-                if self.config.neuron.blacklist_allow_non_registered:
-                    return False
-
-                self.prometheus_counters.labels("blacklisted.registration").inc()
-
-                raise Exception('Registration blacklist')
-
-        # Check for stake
-        def stake_check() -> bool:
-            # Check stake.
-            uid = self.metagraph.hotkeys.index(pubkey)
-            if self.metagraph.S[uid].item() < self.config.neuron.blacklist.stake:
-                self.prometheus_counters.labels("blacklisted.stake").inc()
-
-                raise Exception('Stake blacklist')
-            return False
-
-        # Check for time
-        def time_check():
-            current_time = datetime.now()
-            # Only check if the request are forward requests
-            timecheck = self.timecheck_dicts[request_type]
-            if pubkey in timecheck.keys():
-                prev_time = timecheck[pubkey]
-                if current_time - prev_time >= timedelta(seconds=self.config.neuron.blacklist.time):
-                    timecheck[pubkey] = current_time
-                else:
-                    timecheck[pubkey] = current_time
-                    self.prometheus_counters.labels("blacklisted.time").inc()
-
-                    raise Exception('Time blacklist')
-            else:
-                timecheck[pubkey] = current_time
-        
-            return False
-
-        # Check for hotkeys
-        def hotkey_check():
-            # Only check if the request are forward requests
-            if (pubkey in self.config.neuron.blacklist.hotkeys):
-                raise Exception('Hotkey blacklist')
-            return False
-        
-        # Black list or not
-        try:
-            registration_check()
-            time_check()
-            stake_check()      
-            hotkey_check()      
-            return False
-        except Exception as e:
-            self.prometheus_counters.labels("blacklisted").inc()
-            return True
-
     def get_neuron(self):
         if self.subtensor.network == 'nakamoto':
             nn = self.subtensor.neuron_for_pubkey(self.wallet.hotkey.ss58_address)
@@ -0,0 +1,378 @@
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated 
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation 
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of 
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL 
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION 
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
+# DEALINGS IN THE SOFTWARE.
+
+""" State and callbacks of the axon serving the model of a core_server neuron.
+"""
+
+import bittensor
+import os
+import time
+
+from threading import Lock
+from datetime import datetime,timedelta
+from loguru import logger; logger = logger.opt(colors=True)
+
+import torch
+from torch.nn.utils.rnn import pad_sequence
+
+class AxonCallbacks:
+    r""" State and callbacks of the axon serving the model of a core_server neuron: synapse checks, synapse forward
+        and backward calls, priority and blacklist. The main neuron and each of its axon worker processes build 
+        their own AxonCallbacks the same way, around the model the main neuron shares with the workers.
+
+        Args:
+            config (:obj:`bittensor.Config`, `required`):
+                Config of the neuron.
+            model (:obj:`bittensor.neurons.text.core_server.server`, `required`):
+                Model served by the axon.
+            wallet (:obj:`bittensor.wallet`, `required`):
+                Wallet of the neuron.
+            metagraph (:obj:`bittensor.Metagraph`, `required`):
+                Metagraph of the subnet, see reload_metagraph.
+            prometheus_counters (:obj:`prometheus_client.Counter`, `required`):
+                Counters of the blacklisted requests.
+    """
+    def __init__( 
+        self, 
+        config: 'bittensor.Config', 
+        model: 'bittensor.neurons.text.core_server.server', 
+        wallet: 'bittensor.wallet', 
+        metagraph: 'bittensor.Metagraph', 
+        prometheus_counters: 'prometheus_client.Counter',
+    ):
+        self.config = config
+        self.model = model
+        self.wallet = wallet
+        # Replaced, not mutated, by reload_metagraph: the callbacks read the reference once per request.
+        self.metagraph = metagraph
+        self.prometheus_counters = prometheus_counters
+        self.mutex = Lock()
+        self.timecheck_dicts = {bittensor.proto.RequestType.FORWARD:{}, bittensor.proto.RequestType.BACKWARD:{}}
+        self.axon = None
+        # Inode and modification time of the metagraph file last loaded by reload_metagraph.
+        self.metagraph_file = None
+
+    def create_axon( self ) -> 'bittensor.Axon':
+        r""" Creates the axon serving the model through these callbacks.
+        """
+        self.axon = bittensor.axon(
+            config = self.config,
+            wallet = self.wallet,
+            netuid = self.config.netuid,
+            synapse_checks=self.synapse_check,
+            synapse_last_hidden = self.forward_hidden_state if self.model.config.neuron.lasthidden else None,
+            synapse_causal_lm = self.forward_casual_lm if self.model.config.neuron.causallm else None,
+            synapse_causal_lm_next = self.forward_casual_lm_next if self.model.config.neuron.causallmnext else None,
+            synapse_seq_2_seq = self.forward_generate if self.model.config.neuron.seq2seq else None ,
+            blacklist = self.blacklist if not self.model.config.neuron.disable_blacklist else None,
+            priority = self.priority if not self.model.config.neuron.disable_priority else None,
+            # Unregistered hotkeys are blacklisted anyway, they are rejected before verifying their signature.
+            metagraph = self if not ( self.model.config.neuron.disable_blacklist or self.config.neuron.blacklist_allow_non_registered ) else None,
+        )
+        return self.axon
+
+    def hotkey_to_uid( self, hotkey: str ) -> int:
+        r""" Returns the uid of the hotkey in the current metagraph, -1 if not registered. 
+            The axon checks registrations through this method so that it follows reload_metagraph.
+        """
+        return self.metagraph.hotkey_to_uid( hotkey )
+
+    def reload_metagraph( self ) -> bool:
+        r""" Replaces the metagraph by a new one loaded from the file saved by the main neuron, 
+            if the file was replaced or modified since the last reload.
+
+            Returns:
+                reloaded (:obj:`bool`):
+                    True if the metagraph was replaced.
+        """
+        metagraph = self.metagraph
+        path = os.path.expanduser( os.path.join( '~/.bittensor', metagraph.filename( metagraph.network, metagraph.netuid, 'pt' ) ) )
+        try:
+            stat = os.stat( path )
+        except FileNotFoundError:
+            return False
+        # Metagraph.save replaces the file, the inode changes even within the timestamp granularity.
+        metagraph_file = ( stat.st_ino, stat.st_mtime_ns )
+        if metagraph_file == self.metagraph_file:
+            return False
+        reloaded = bittensor.Metagraph( network = metagraph.network, netuid = metagraph.netuid, sparse = metagraph.sparse, incremental = metagraph.incremental, lite = metagraph.lite )
+        self.metagraph = reloaded.load_from_path( path )
+        self.metagraph_file = metagraph_file
+        return True
+
+    def reload_metagraph_forever( self, interval: float ):
+        r""" Calls reload_metagraph every interval seconds.
+        """
+        while True:
+            time.sleep( interval )
+            try:
+                self.reload_metagraph()
+            except Exception as e:
+                logger.exception( e )
+
+    def synapse_check(self, synapse, hotkey, inputs_x=None):
+        """
+            Custom synapse function to protect certain synapse functions depending on the stake and weight.
+            Certain synapses require more compute than others. For instance, TEXT_SEQ_2_SEQ requires a significantly
+            more commitment by the server than a requeset for TEXT_CAUSAL_LM_NEXT.
+
+            Args:
+                synapse (:obj:`bittensor.proto.SynapseArgs`, `required`): 
+                    The proto message that contains additional args for individual synapse functions
+                hotkey (:obj:`torch.FloatTensor`, `required`):
+                    The hotkey that sent the request
+
+        """
+        metagraph = self.metagraph
+        ## Uid that sent the request
+        incoming_uid = metagraph.hotkey_to_uid(hotkey)
+        if incoming_uid == -1:
+            raise ValueError('Hotkey is not registered')
+        batch_size, sequence_len  =  inputs_x[0].size()
+        if synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE:
+            if metagraph.S[incoming_uid] < self.config.neuron.lasthidden_stake \
+                or (batch_size > self.config.neuron.max_batch_size) \
+                or (sequence_len > self.config.neuron.max_sequence_len):
+                return False
+            
+        elif synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_CAUSAL_LM:
+            if (metagraph.S[incoming_uid] < self.config.neuron.causallm_stake) \
+                or (batch_size > self.config.neuron.max_batch_size) \
+                or (sequence_len > self.config.neuron.max_sequence_len):
+                return False
+
+        elif synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_CAUSAL_LM_NEXT:
+            if (metagraph.S[incoming_uid] < self.config.neuron.causallmnext_stake) \
+                or (batch_size > self.config.neuron.max_batch_size) \
+                or (sequence_len > self.config.neuron.max_sequence_len):
+                return False
+
+        elif synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_SEQ_2_SEQ:
+            if (metagraph.S[incoming_uid] < self.config.neuron.seq2seq_stake) \
+                or (batch_size > self.config.neuron.max_batch_size) \
+                or (sequence_len > self.config.neuron.max_sequence_len) \
+                or (metagraph.W[incoming_uid, metagraph.hotkey_to_uid( self.wallet.hotkey.ss58_address )]):
+                return False     
+        else:
+            raise Exception('Unknown Synapse')
+
+        return True
+
+    def backward_callback(self, inputs_x:torch.FloatTensor, grads_dy:torch.FloatTensor, synapses=[] ):
+        """
+            The default backward callback when no callback is attached: Is used to call specific synapse functions
+
+            Args:
+                inputs_x (:obj:`torch.FloatTensor`, `required`): 
+                    The inputs that will be passed to the synapse functions
+                grads_dy (:obj:`torch.FloatTensor`, `required`):
+                    The gradients that will be passed to the synapse functions
+                synapses (:obj: list of bittensor.proto.SynapseArgs, 'Optional')
+                    The proto message that contains additional args for individual synapse functions
+
+            Returns:
+                response_tensors: (:obj: list of bittensor.proto.Tensor, `required`): 
+                    serialized tensor response from the nucleus call or None.
+                response_codes: (:obj: list of bittensor.proto.ReturnCode, `required`)
+                    return code associated with forward call i.e. Success of Timeout.
+                response_messages: (:obj: list of strings, `required`)
+                    return message associated with synapse call
+        """
+        # --- initialize response variables --- 
+        response_tensors = []
+        response_codes = []
+        response_messages = []
+        
+        if not self.config.neuron.remote_train:
+            return response_tensors, response_codes, response_messages
+
+        # --- calling attached synapses ---
+        with self.mutex and torch.enable_grad() and torch.autograd.set_detect_anomaly(True):
+            for index, synapse in enumerate(synapses):
+                try:
+                    if synapse.synapse_type in self.axon.synapse_callbacks and self.axon.synapse_callbacks[synapse.synapse_type] != None:
+                        message, model_output, response_tensor = self.axon.synapse_callbacks[synapse.synapse_type](inputs_x[index], synapse)
+                        grads_dy_norm = grads_dy[index]/(grads_dy[index].sum() + 0.00001)
+                        torch.autograd.backward (
+                            tensors = [ response_tensor ],
+                            grad_tensors = [ grads_dy_norm ],
+                            retain_graph=True
+                        )
+                        # Only consider loss from causal LM next.
+                        if synapse.synapse_type == bittensor.proto.Synapse.SynapseType.TEXT_CAUSAL_LM_NEXT:
+                            self.model.remote_losses.append(model_output.loss)
+                            self.model.remote_losses = self.model.remote_losses[-self.config.neuron.num_remote_loss:] if len(self.model.remote_losses) > self.config.neuron.num_remote_loss else self.model.remote_losses
+                        self.model.backward_gradients_count += inputs_x[index].size(0)
+                        response_tensors.append(None)
+                        response_codes.append(bittensor.proto.ReturnCode.Success)
+                        response_messages.append('Success')
+                        
+                    else:
+                        response_tensors.append(None)
+                        response_codes.append(bittensor.proto.ReturnCode.NotImplemented)
+                        response_messages.append('Not Implemented')
+                except Exception as e:
+                    # --- Exception Hit in Synapse ---
+                    response_tensors.append(None)
+                    response_codes.append(bittensor.proto.ReturnCode.UnknownException)
+                    response_messages.append(str(e))
+
+        return response_tensors, response_codes, response_messages
+
+
+    def priority(self, pubkey:str, request_type:bittensor.proto.RequestType, inputs_x) -> float:
+        r"""Calculates the priority on requests based on stake and size of input
+            Args:
+                pubkey ( str, `required`):
+                    The public key of the caller.
+                inputs_x ( :obj:`torch.Tensor`, `required`):
+                    torch inputs to be forward processed.
+                request_type ( bittensor.proto.RequestType, `required`):
+                    the request type ('FORWARD' or 'BACKWARD').
+        """
+        metagraph = self.metagraph
+        try:        
+            uid = metagraph.hotkey_to_uid(pubkey)
+            if uid == -1:
+                raise ValueError('Hotkey is not registered')
+            priority = metagraph.S[uid].item()
+        
+        except:
+            # zero priority for those who are not registered.
+            priority =  0
+
+        # Optionally the stake is shared between the requests the hotkey already has in the queue,
+        # fair scheduling weights hotkeys by stake itself.
+        priority_threadpool = self.axon.priority_threadpool
+        if self.config.neuron.priority_share_stake and priority_threadpool != None and priority_threadpool.scheduling == 'priority':
+            priority = priority / (1 + priority_threadpool.hotkey_stats(pubkey).depth)
+
+        return priority
+
+    def forward_generate(self, inputs_x:torch.FloatTensor, synapse, model_output = None):
+        tokens = self.model.token_remap(inputs_x.to(self.model.device))
+        output = self.model.pre_model.generate(
+            input_ids=tokens['input_ids'],
+            attention_mask=tokens['attention_mask'],
+            max_length=max(tokens['input_ids'].shape[1] + 1, synapse.num_to_generate),
+            num_beams=synapse.num_beams,
+            no_repeat_ngram_size=synapse.no_repeat_ngram_size,
+            early_stopping = synapse.early_stopping,
+            do_sample=synapse.do_sample,
+            top_p=synapse.top_p,
+            num_return_sequences=synapse.num_return_sequences,
+            temperature = synapse.temperature,
+            repetition_penalty = synapse.repetition_penalty,
+            length_penalty = synapse.length_penalty,
+            max_time = synapse.max_time,
+            num_beam_groups = synapse.num_beam_groups,
+        )
+        raw_texts = [self.model.tokenizer.decode(out) for out in output]
+        tokens = [self.model.std_tokenizer.encode(raw_text, return_tensors="pt")[:,:synapse.num_to_generate].view(-1) for raw_text in raw_texts]
+        bittensor_output = pad_sequence(tokens, batch_first=True)
+        return None, model_output, bittensor_output
+
+    def forward_hidden_state(self, inputs_x:torch.FloatTensor, synapse, model_output = None):
+        with self.mutex:
+            message, model_output, hidden = self.model.encode_forward(inputs_x.to(self.model.device), model_output=model_output)
+        return message, model_output, hidden
+
+    def forward_casual_lm(self, inputs_x:torch.FloatTensor, synapse, model_output = None):
+        with self.mutex:
+            message, model_output, logits = self.model.encode_forward_causallm(inputs_x.to(self.model.device), model_output=model_output)
+        return message, model_output, logits
+
+    def forward_casual_lm_next(self,inputs_x: torch.FloatTensor, synapse, model_output=None):
+        with self.mutex:
+            message, model_output, topk_token_phrases = self.model.encode_forward_causallmnext(inputs_x.to(self.model.device),
+                                                                                        topk=synapse.topk,
+                                                                                        model_output=model_output)
+        # topk_token_phrases: [sum_b(sum_k(len(phrase_k) + 1)_b)] contains topk token phrases and probabilities
+        #   Compacted 1-D tensor >= batch_size * (2 * topk + 1)
+        return message, model_output, topk_token_phrases
+
+
+    def blacklist(self, pubkey:str, request_type:bittensor.proto.RequestType) -> bool:
+        r"""Axon security blacklisting, used to blacklist message from low stake members
+            Args:
+                pubkey ( str, `required`):
+                    The public key of the caller.
+                request_type ( bittensor.proto.RequestType, `required`):
+                    the request type ('FORWARD' or 'BACKWARD').
+        """
+        metagraph = self.metagraph
+
+        # Check for registrations
+        def registration_check():
+            # If we allow non-registered requests return False = not blacklisted.
+            is_registered = metagraph.hotkey_to_uid(pubkey) != -1
+            if not is_registered:
+                if self.config.neuron.blacklist_allow_non_registered:
+                    return False
+
+                self.prometheus_counters.labels("blacklisted.registration").inc()
+
+                raise Exception('Registration blacklist')
+
+        # Check for stake
+        def stake_check() -> bool:
+            # Check stake.
+            uid = metagraph.hotkey_to_uid(pubkey)
+            if uid == -1:
+                raise Exception('Hotkey is not registered')
+            if metagraph.S[uid].item() < self.config.neuron.blacklist.stake:
+                self.prometheus_counters.labels("blacklisted.stake").inc()
+
+                raise Exception('Stake blacklist')
+            return False
+
+        # Check for time
+        def time_check():
+            current_time = datetime.now()
+            # Only check if the request are forward requests
+            timecheck = self.timecheck_dicts[request_type]
+            if pubkey in timecheck.keys():
+                prev_time = timecheck[pubkey]
+                if current_time - prev_time >= timedelta(seconds=self.config.neuron.blacklist.time):
+                    timecheck[pubkey] = current_time
+                else:
+                    timecheck[pubkey] = current_time
+                    self.prometheus_counters.labels("blacklisted.time").inc()
+
+                    raise Exception('Time blacklist')
+            else:
+                timecheck[pubkey] = current_time
+        
+            return False
+
+        # Check for hotkeys
+        def hotkey_check():
+            # Only check if the request are forward requests
+            if (pubkey in self.config.neuron.blacklist.hotkeys):
+                raise Exception('Hotkey blacklist')
+            return False
+        
+        # Black list or not
+        try:
+            registration_check()
+            time_check()
+            stake_check()      
+            hotkey_check()      
+            return False
+        except Exception as e:
+            self.prometheus_counters.labels("blacklisted").inc()
+            return True
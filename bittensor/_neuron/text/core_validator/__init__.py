@@ -231,6 +231,8 @@ class neuron:
 
         bittensor.wallet.add_args( parser )
         bittensor.dendrite.add_args( parser )
+        # Stop dialing endpoints which failed on the last steps, they are probed again after the backoff.
+        parser.set_defaults( **{ 'dendrite.circuit_breaker.threshold': 5 } )
         bittensor.subtensor.add_args( parser )
         bittensor.metagraph.add_args( parser )
         bittensor.logging.add_args( parser )
@@ -845,6 +847,7 @@ class nucleus( torch.nn.Module ):
         parser.add_argument('--nucleus.importance', type=float, help='hyperparameter for the importance loss', default=3)
         parser.add_argument('--nucleus.noise_multiplier', type=float, help='Standard deviation multipler on weights', default=2 )
         parser.add_argument('--nucleus.no_dendrite_backward', action='store_true', help='Pass backward request to the server side or not', default=False )
+        parser.add_argument('--nucleus.sparse_textcausallm', action='store_true', help='Score TextCausalLM responses on their topk form without densifying to vocab size, responses are not passed backward.', default=False )
         parser.add_argument('--nucleus.scaling_law_power', type=float, help='Power for modified scaling law, powered down to improve dynamic range, e.g. 3 → 6 nats for 0.5. (default value: -1, pulling from subtensor directly)', default=-1)
         parser.add_argument('--nucleus.synergy_scaling_law_power', type=float, help='Power for synergy modified scaling law, powered down to improve dynamic range, e.g. 3 → 6 nats for 0.5. (default value: -1, pulling from subtensor directly)', default=-1)
         parser.add_argument('--nucleus.logits_divergence', type=float, help=' the divergence value for logit anomaly detection (default value: -1, pulling from subtensor directly)', default=-1)
@@ -966,10 +969,12 @@ class nucleus( torch.nn.Module ):
         # The synapse defines the task we are sending to the neurons
         # synapses: List[bittensor.synapse]: synapse information
         # TODO: WORK IN PROGRESS, prototype
+        sparse_response = False
         if self.config.neuron.validation_synapse == 'TextCausalLMNext':
             synapses = [(bittensor.synapse.TextCausalLMNext(), textcausallmnext)]
         else: 
-            synapses = [(bittensor.synapse.TextCausalLM(), textcausallm)]
+            sparse_response = self.config.nucleus.sparse_textcausallm
+            synapses = [(bittensor.synapse.TextCausalLM( sparse_response = sparse_response ), textcausallm)]
 
         # === Query the endpoints ===
         # Makes the dendrite call into the network returning the representations
@@ -985,7 +990,7 @@ class nucleus( torch.nn.Module ):
             timeout=bittensor.__blocktime__
         )
 
-        if self.config.nucleus.no_dendrite_backward:
+        if self.config.nucleus.no_dendrite_backward or sparse_response:
             query_responses = [[syn.detach().to(self.device) for syn in res] for res in query_responses]
             return_ops = [ops.detach().to(self.device) for ops in return_ops]
             times = [t.detach().to(self.device) for t in times]
@@ -1090,12 +1095,25 @@ def textcausallm(uids: torch.Tensor, query_responses: List[List[torch.FloatTenso
     inputs_seq = inputs[..., :-validation_len]  # input sequence without last token [batch_size, sequence_len]
     inputs_val = inputs[..., -validation_len]  # input validation with next token [batch_size]
 
+    # Sparse responses are [batch_size, sequence_len, topk + topk + 1] topk probs, topk token ids and floor prob,
+    # the loss is computed on the target probabilities directly instead of on densified logits.
+    sparse_response = synapse is not None and getattr(synapse, 'sparse_response', False)
+
+    def _target_probs(logits, target):
+        return synapse.target_probs(logits, target.reshape(logits.shape[:-1]))  # [batch_size, sequence_len]
+
+    def _target_log_probs(logits, target):
+        return synapse.target_log_probs(logits, target.reshape(logits.shape[:-1]))  # [batch_size, sequence_len]
+
     def _base_params(_stats, query_response):
         _stats.update({'logits': query_response[:, :-1, :],
                        'logits_val': query_response[:, -1:, :]})
 
         for target, _ext in [(inputs_seq[:, 1:], ''), (inputs_val, '_val')]:
-            _loss = calc_loss_fct(loss_fct, _stats['logits' + _ext], target)  # CausalLM loss
+            if sparse_response:
+                _loss = -_target_log_probs(_stats['logits' + _ext], target).mean()  # CausalLM loss
+            else:
+                _loss = calc_loss_fct(loss_fct, _stats['logits' + _ext], target)  # CausalLM loss
             if _loss.isnan() or _loss.isinf():
                 _loss = 20  # assign large loss
 
@@ -1110,6 +1128,11 @@ def textcausallm(uids: torch.Tensor, query_responses: List[List[torch.FloatTenso
                            'synergy' + _ext: 0, 'synergy_loss_diff' + _ext: 0})
 
     def _synergy(first, second, target, _ext):
+        if sparse_response:
+            # Average target probabilities between responses
+            combined_probs = (_target_probs(first['logits' + _ext], target) + _target_probs(second['logits' + _ext], target)) / 2
+            return -torch.log(combined_probs + 1e-40).mean()  # actual measured loss
+
         # Combined logits: log of average probabilities per token between responses
         combined_logits = torch.log((torch.softmax(first['logits' + _ext], dim=-1) +
                                      torch.softmax(second['logits' + _ext], dim=-1)) / 2 + 1e-40)
@@ -23,6 +23,7 @@ import grpc
 import json
 import bittensor
 from . import receptor_impl
+from .event_loop_thread_impl import EventLoopThread
 
 class receptor:
     """ Create and init the receptor object, which encapsulates a grpc connection to an axon endpoint
@@ -34,11 +35,23 @@ class receptor:
             wallet: 'bittensor.Wallet' = None,
             external_ip: 'str' = None,
             compression: str = None,
+            event_loop_thread: 'EventLoopThread' = None,
+            coalesce_window: float = 0,
+            forward_latency: 'bittensor.utils.stats.LatencyHistogram' = None,
+            lossless_response_hotkeys: set = None,
         ) -> 'bittensor.Receptor':
         r""" Initializes a receptor grpc connection.
             Args:
                 endpoint (:obj:`bittensor.Endpoint`, `required`):
                     neuron endpoint descriptor.
+                event_loop_thread (:obj:`EventLoopThread`, `optional`):
+                    If set, the channel is created on and used from this loop thread.
+                coalesce_window (:obj:`float`, `optional`):
+                    Seconds during which forward requests to the endpoint with identical inputs are merged into one request.
+                forward_latency (:obj:`bittensor.utils.stats.LatencyHistogram`, `optional`):
+                    Forward latencies of the endpoint to share with the receptor, a new histogram if None.
+                lossless_response_hotkeys (:obj:`set`, `optional`):
+                    Hotkeys known to fail lossy responses to share with the receptor, a new set if None.
         """        
 
         if wallet == None:
@@ -59,18 +72,31 @@ class receptor:
         else:
             compress_alg = grpc.Compression.NoCompression
 
-        channel = grpc.aio.insecure_channel(
-            endpoint_str,
-            options=[('grpc.max_send_message_length', -1),
-                     ('grpc.max_receive_message_length', -1),
-                     ('grpc.keepalive_time_ms', 100000)])
+        def create_channel():
+            return grpc.aio.insecure_channel(
+                endpoint_str,
+                options=[('grpc.max_send_message_length', -1),
+                         ('grpc.max_receive_message_length', -1),
+                         ('grpc.keepalive_time_ms', 100000)])
+
+        # grpc.aio channels are bound to the event loop they are created on.
+        if event_loop_thread != None and not event_loop_thread.is_current():
+            async def create_channel_on_loop():
+                return create_channel()
+            channel = event_loop_thread.run( create_channel_on_loop() )
+        else:
+            channel = create_channel()
         stub = bittensor.grpc.BittensorStub( channel )
         return receptor_impl.Receptor( 
             endpoint = endpoint,
             channel = channel, 
             wallet = wallet,
             stub = stub,
-            max_processes=max_processes
+            max_processes=max_processes,
+            event_loop_thread = event_loop_thread,
+            coalesce_window = coalesce_window,
+            forward_latency = forward_latency,
+            lossless_response_hotkeys = lossless_response_hotkeys,
         )
 
         
@@ -83,6 +109,10 @@ class receptor_pool:
             wallet: 'bittensor.Wallet',
             max_active_receptors: int = 4096,
             compression: str = None,
+            circuit_breaker_threshold: int = 0,
+            circuit_breaker_backoff: float = 60,
+            io_thread: bool = False,
+            coalesce_window: float = 0,
         ) -> 'bittensor.ReceptorPool':
         r""" Initializes a receptor grpc connection.
             Args:
@@ -90,9 +120,24 @@ class receptor_pool:
                     bittensor wallet with hotkey and coldkeypub.
                 max_active_receptors (:type:`int`, `optional`):
                     Maximum allowed active allocated TCP connections.
+                circuit_breaker_threshold (:type:`int`, `optional`):
+                    Number of consecutive Unavailable, Timeout or BadEndpoint calls after which an endpoint is not called 
+                    and returns Backoff. 0 disables circuit breaking.
+                circuit_breaker_backoff (:type:`float`, `optional`):
+                    Seconds before an endpoint with an open circuit is probed again.
+                io_thread (:type:`bool`, `optional`):
+                    If true, the pool runs its calls on a long-lived event loop thread, which the synchronous
+                    forward and backward calls of several threads share.
+                coalesce_window (:type:`float`, `optional`):
+                    Seconds, typically 0.001 to 0.005, during which forward requests with identical inputs to the same 
+                    endpoint are merged into one request. 0 disables coalescing.
         """        
         return bittensor.ReceptorPool ( 
             wallet = wallet,
             max_active_receptors = max_active_receptors,
-            compression = compression
+            compression = compression,
+            circuit_breaker_threshold = circuit_breaker_threshold,
+            circuit_breaker_backoff = circuit_breaker_backoff,
+            io_thread = io_thread,
+            coalesce_window = coalesce_window,
         )
\ No newline at end of file
@@ -0,0 +1,100 @@
+""" Circuit breaker which stops requests to chronically failing endpoints
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time as clock
+from typing import List
+
+import bittensor
+
+class CircuitBreaker:
+    r""" Circuit breaker of a single endpoint.
+
+        The circuit is closed while the endpoint answers. It opens after threshold consecutive failed calls,
+        i.e. calls where every synapse returned one of the failure codes, and requests are then refused for backoff seconds.
+        After the backoff the circuit is half-open and lets a single probe request through, another one if the probe did not
+        finish within the backoff. A successful probe closes the circuit, a failed probe opens it again for twice the previous 
+        backoff, up to max_backoff seconds.
+
+        Args:
+            threshold (:obj:`int`, `required`):
+                Number of consecutive failed calls which open the circuit.
+            backoff (:obj:`float`, `required`):
+                Seconds the circuit stays open before the first probe.
+            max_backoff (:obj:`float`, `optional`):
+                Maximum seconds the circuit stays open.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    failure_codes = [
+        bittensor.proto.ReturnCode.Unavailable,
+        bittensor.proto.ReturnCode.Timeout,
+        bittensor.proto.ReturnCode.BadEndpoint,
+    ]
+
+    def __init__( self, threshold: int, backoff: float, max_backoff: float = None ):
+        self.threshold = threshold
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff if max_backoff != None else 10 * backoff
+        self.backoff = backoff
+        self.state = CircuitBreaker.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def __str__( self ):
+        return "CircuitBreaker({}, {})".format( self.state, self.consecutive_failures )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def allow_request( self ) -> bool:
+        r""" Returns true if a request can be sent to the endpoint.
+            An open circuit whose backoff passed turns half-open and allows this request as its probe.
+        """
+        if self.state == CircuitBreaker.CLOSED:
+            return True
+        if clock.time() - self.opened_at >= self.backoff:
+            self.state = CircuitBreaker.HALF_OPEN
+            # The backoff restarts with the probe.
+            self.opened_at = clock.time()
+            return True
+        return False
+
+    def record( self, codes: List['bittensor.proto.ReturnCode'] ):
+        r""" Updates the circuit with the return codes of a finished call to the endpoint.
+        """
+        failed = len( codes ) > 0 and all( code in self.failure_codes for code in codes )
+        if not failed:
+            self.state = CircuitBreaker.CLOSED
+            self.consecutive_failures = 0
+            self.backoff = self.base_backoff
+            return
+
+        self.consecutive_failures += 1
+        if self.state == CircuitBreaker.HALF_OPEN:
+            # The probe failed.
+            self.backoff = min( 2 * self.backoff, self.max_backoff )
+            self._open()
+        elif self.state == CircuitBreaker.CLOSED and self.consecutive_failures >= self.threshold:
+            self._open()
+
+    def _open( self ):
+        self.state = CircuitBreaker.OPEN
+        self.opened_at = clock.time()
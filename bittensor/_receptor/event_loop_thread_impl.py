@@ -0,0 +1,86 @@
+""" Long-lived asyncio event loop on a background thread, which runs the receptor I/O
+"""
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any, AsyncIterator, Coroutine
+
+class EventLoopThread:
+    r""" Owns an asyncio event loop running forever on a daemon thread.
+        Coroutines are submitted from any thread with run_coroutine_threadsafe, so that several threads
+        can wait on their own calls while the I/O of all of them shares the loop.
+    """
+    def __init__( self, name: str = 'bittensor-io' ):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread( target = self._run_loop, name = name, daemon = True )
+        self.thread.start()
+
+    def __str__( self ):
+        return "EventLoopThread({})".format( self.thread.name )
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def _run_loop( self ):
+        asyncio.set_event_loop( self.loop )
+        self.loop.run_forever()
+
+    def is_current( self ) -> bool:
+        r""" Returns true if called from the loop thread.
+        """
+        return threading.current_thread() is self.thread
+
+    def submit( self, coroutine: Coroutine ) -> concurrent.futures.Future:
+        r""" Schedules the coroutine on the loop and returns its future without waiting.
+        """
+        return asyncio.run_coroutine_threadsafe( coroutine, self.loop )
+
+    def run( self, coroutine: Coroutine ) -> Any:
+        r""" Runs the coroutine on the loop and blocks the calling thread until it returns.
+        """
+        if self.is_current():
+            coroutine.close()
+            raise RuntimeError('EventLoopThread.run would block its own loop, await the coroutine instead.')
+        return self.submit( coroutine ).result()
+
+    async def wrap( self, coroutine: Coroutine ) -> Any:
+        r""" Awaits, from another event loop, the coroutine running on this loop.
+        """
+        return await asyncio.wrap_future( self.submit( coroutine ) )
+
+    async def wrap_iterator( self, iterator: AsyncIterator ) -> AsyncIterator:
+        r""" Iterates, from another event loop, the async iterator running on this loop.
+        """
+        try:
+            while True:
+                try:
+                    item = await self.wrap( iterator.__anext__() )
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            await self.wrap( iterator.aclose() )
+
+    def stop( self ):
+        r""" Stops the loop and joins the thread.
+        """
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe( self.loop.stop )
+            self.thread.join()
@@ -26,13 +26,14 @@ import torch
 import asyncio
 import threading
 import uuid
+import copy
 import sys
 import torch.nn as nn
 import grpc
 import time as clock
 
 from types import SimpleNamespace
-from typing import Tuple, List, Union
+from typing import Tuple, List, Optional, Union
 from loguru import logger
 from grpc import _common
 
@@ -47,6 +48,10 @@ class Receptor(nn.Module):
             channel: 'grpc._Channel',
             stub: 'bittensor.grpc.BittensorStub',
             max_processes: int,
+            event_loop_thread: 'EventLoopThread' = None,
+            coalesce_window: float = 0,
+            forward_latency: 'stat_utils.LatencyHistogram' = None,
+            lossless_response_hotkeys: set = None,
         ):
         r""" Initializes a receptor grpc connection.
 
@@ -59,12 +64,28 @@ class Receptor(nn.Module):
                     grpc TCP channel.
                 endpoint (:obj:`bittensor.grpc.BittensorStub`, `required`):
                     bittensor protocol stub created from channel.
+                event_loop_thread (:obj:`EventLoopThread`, `optional`):
+                    Loop thread the channel was created on, synchronous calls are run on it.
+                coalesce_window (:obj:`float`, `optional`):
+                    Seconds during which forward requests to the endpoint are collected and sent as one request.
+                    0 sends every request on its own.
+                forward_latency (:obj:`bittensor.utils.stats.LatencyHistogram`, `optional`):
+                    Forward latencies of the endpoint, kept by the receptor pool across the receptors of the endpoint.
+                    A new histogram if None.
+                lossless_response_hotkeys (:obj:`set`, `optional`):
+                    Hotkeys of the endpoints which failed to serialize lossy responses, i.e. which predate the quantized
+                    serializers, kept by the receptor pool across the receptors of the endpoint. A new set if None.
         """
         super().__init__()
         self.wallet = wallet # Keypair information
         self.endpoint = endpoint # Endpoint information.
         self.channel = channel
         self.stub = stub
+        self.event_loop_thread = event_loop_thread
+        self.coalesce_window = coalesce_window
+        # Forward requests waiting for the end of the coalescing window, per event loop and inputs.
+        self.coalesce_batches = {}
+        self.lossless_response_hotkeys = lossless_response_hotkeys if lossless_response_hotkeys != None else set()
         self.receptor_uid = str(uuid.uuid1())
         self.semaphore = threading.Semaphore(max_processes)
         self.state_dict = _common.CYGRPC_CONNECTIVITY_STATE_TO_CHANNEL_CONNECTIVITY
@@ -72,8 +93,10 @@ class Receptor(nn.Module):
             forward_qps = stat_utils.timed_rolling_avg(0.0, 0.01),
             backward_qps = stat_utils.timed_rolling_avg(0.0, 0.01),
             forward_elapsed_time = stat_utils.timed_rolling_avg(0.0, 0.01),
+            forward_latency = forward_latency if forward_latency != None else stat_utils.LatencyHistogram(),
             forward_bytes_out = stat_utils.timed_rolling_avg(0.0, 0.01),
             forward_bytes_in = stat_utils.timed_rolling_avg(0.0, 0.01),
+            forward_coalesced = stat_utils.timed_rolling_avg(0.0, 0.01),
             backward_bytes_out = stat_utils.timed_rolling_avg(0.0, 0.01),
             backward_bytes_in = stat_utils.timed_rolling_avg(0.0, 0.01),
             codes = {
@@ -108,6 +131,12 @@ class Receptor(nn.Module):
     def __str__ ( self ):
         return "Receptor({})".format(self.endpoint) 
 
+    @property
+    def lossy_responses_supported ( self ) -> bool:
+        r""" False once the endpoint failed to serialize a lossy response, i.e. it predates the quantized serializers.
+        """
+        return self.endpoint.hotkey not in self.lossless_response_hotkeys
+
     def __repr__ ( self ):
         return self.__str__()
 
@@ -115,6 +144,10 @@ class Receptor(nn.Module):
         try:
             result = self.channel._channel.check_connectivity_state(True)
             if self.state_dict[result] != self.state_dict[result].SHUTDOWN: 
+                if self.event_loop_thread != None:
+                    # Closed on the channel loop, without waiting.
+                    self.event_loop_thread.submit( self.channel.close() )
+                    return
                 loop = asyncio.get_event_loop()
                 loop.run_until_complete ( self.channel.close() )
         except:
@@ -194,6 +227,8 @@ class Receptor(nn.Module):
                     Success responses all get the same time.
 
         """
+        if self.event_loop_thread != None:
+            return self.event_loop_thread.run( self.async_forward ( synapses = synapses,inputs = inputs, timeout = timeout ) )
         loop = asyncio.get_event_loop()
         return loop.run_until_complete( self.async_forward ( synapses = synapses,inputs = inputs, timeout = timeout ) )
 
@@ -237,14 +272,101 @@ class Receptor(nn.Module):
                     List of times for each call associated with each passed synapse enum. 
                     Success responses all get the same time.
         """
+        if self.event_loop_thread != None:
+            return self.event_loop_thread.run( self.async_backward ( synapses = synapses, inputs = inputs, grads = grads, timeout = timeout ) )
         loop = asyncio.get_event_loop()
         return loop.run_until_complete ( self.async_backward ( synapses = synapses, inputs = inputs, grads = grads, timeout = timeout ) )
 
+    def adaptive_timeout ( 
+        self, 
+        max_timeout: float, 
+        quantile: float = 0.95, 
+        margin: float = 1.0, 
+        min_samples: int = 10 
+    ) -> float:
+        r""" Returns a forward timeout from the observed latencies of forward calls to this endpoint. Calls which timed out
+            count as latencies of their timeout, so that the timeout of an endpoint which slowed down rises again.
+
+            Args:
+                max_timeout (:obj:`float`, `required`):
+                    Upper bound of the timeout, returned as is until enough latencies were observed.
+
+                quantile (:obj:`float`, `optional`):
+                    Latency quantile the timeout is based on.
+
+                margin (:obj:`float`, `optional`):
+                    Seconds added to the latency quantile.
+
+                min_samples (:obj:`int`, `optional`):
+                    Number of observed latencies required before adapting the timeout.
+
+            Returns:
+                timeout (:obj:`float`, `required`):
+                    The latency quantile plus margin, capped by max_timeout.
+        """
+        if self.stats.forward_latency.count < min_samples:
+            return max_timeout
+        return min( max_timeout, self.stats.forward_latency.quantile( quantile ) + margin )
+
+    @staticmethod
+    def serialize_forward_request (
+        wallet: 'bittensor.wallet',
+        synapses: List[ 'bittensor.Synapse' ],
+        inputs: torch.Tensor, 
+    ) -> SimpleNamespace:
+        r""" Serializes the forward request tensors and synapses into a TensorMessage.
+            The message carries no signature, it is signed per call through the grpc metadata, 
+            which allows a single request to be shared between all receptors sending the same inputs.
+
+            Args:
+                wallet (:obj:`bittensor.Wallet`, `required`):
+                    bittensor wallet with the hotkey sending the request.
+
+                synapses (:obj:`List[ 'bittensor.Synapse' ]` of shape :obj:`(num_synapses)`, `required`):
+                    Bittensor synapse objects with arguments.
+
+                inputs (:obj:`torch.Tensor` of shape :obj:`(shape)`, `required`):
+                    Single torch tensor to be sent to the remote endpoints.
+
+            Returns:
+                forward_request (:obj:`SimpleNamespace`, `required`):
+                    grpc_request, the bittensor.proto.TensorMessage or None if it could not be built.
+                    codes and messages, the serialization return code and message per synapse.
+        """
+        codes = [ bittensor.proto.ReturnCode.Success for _ in synapses ]
+        messages = [ "Success" for _ in synapses ]
+        serialized_forward_tensors = []
+        serialized_synapses = []
+        for index, synapse in enumerate( synapses ):
+            try:
+                serialized_forward_tensors.append( synapse.serialize_forward_request_tensor ( inputs ))
+                serialized_synapses.append(synapse.serialize_to_wire_proto())
+            except Exception as e:
+                codes [index] = bittensor.proto.ReturnCode.RequestSerializationException
+                messages [index] = 'Input serialization exception with error:{}'.format(str(e))
+
+        grpc_request = None
+        if bittensor.proto.ReturnCode.Success in codes:
+            try: 
+                grpc_request = bittensor.proto.TensorMessage (
+                    version = bittensor.__version_as_int__,
+                    hotkey = wallet.hotkey.ss58_address,
+                    tensors = serialized_forward_tensors,
+                    synapses = serialized_synapses,
+                    requires_grad = True,
+                )
+            except Exception as e:
+                # Synapse request creation failed.
+                codes = [ bittensor.proto.ReturnCode.UnknownException for _ in synapses ]
+                messages = [ 'Request proto creation failed with error:{}'.format(str(e)) for _ in synapses ]
+        return SimpleNamespace( grpc_request = grpc_request, codes = codes, messages = messages )
+
     async def async_forward (
         self, 
         synapses: List[ 'bittensor.Synapse' ],
         inputs: torch.Tensor, 
         timeout: int,
+        forward_request: SimpleNamespace = None,
     ) -> Tuple[ List[ torch.FloatTensor ], List['bittensor.proto.ReturnCode'], List[float] ]:
         r""" Triggers the grpc call to the remote endpoint.
             This triggers the synapse calls with arguments.
@@ -261,6 +383,10 @@ class Receptor(nn.Module):
 
                 timeout (:obj:`int`, `required`):
                     Request max timeout
+
+                forward_request (:obj:`SimpleNamespace`, `optional`):
+                    Request built by Receptor.serialize_forward_request for these synapses and inputs. 
+                    If passed, the inputs are not serialized again.
             Returns:
                 outputs (:obj:`List[ Union[torch.FloatTensor, torch.LongTensor] ]`, `required`):
                     outputs.shape = [batch_size, synapse_length, response] 
@@ -303,19 +429,20 @@ class Receptor(nn.Module):
             self.stats.forward_elapsed_time.update( clock.time() - start_time )
             for index, synapse in enumerate( synapses ):
                 self.stats.codes[ synapse_codes[ index ] ] += 1
-                bittensor.logging.rpc_log ( 
-                    axon = False, 
-                    forward = True, 
-                    is_response = synapse_is_response [index], 
-                    code = synapse_codes[ index ], 
-                    call_time = synapse_call_times[ index ], 
-                    pubkey = self.endpoint.hotkey, 
-                    uid = self.endpoint.uid, 
-                    inputs = list(inputs.shape), 
-                    outputs = None if synapse_codes[ index ] != bittensor.proto.ReturnCode.Success else list( synapse_responses[index].shape ), 
-                    message = synapse_messages[ index ],
-                    synapse = synapse.synapse_type
-                )
+                if bittensor.logging.rpc_log_on():
+                    bittensor.logging.rpc_log ( 
+                        axon = False, 
+                        forward = True, 
+                        is_response = synapse_is_response [index], 
+                        code = synapse_codes[ index ], 
+                        call_time = synapse_call_times[ index ], 
+                        pubkey = self.endpoint.hotkey, 
+                        uid = self.endpoint.uid, 
+                        inputs = list(inputs.shape), 
+                        outputs = None if synapse_codes[ index ] != bittensor.proto.ReturnCode.Success else list( synapse_responses[index].shape ), 
+                        message = synapse_messages[ index ],
+                        synapse = synapse.synapse_type
+                    )
 
         # ===========================
         # ==== Check inputs size ====
@@ -345,46 +472,24 @@ class Receptor(nn.Module):
             finalize_stats_and_logs()
             return synapse_responses, synapse_codes, synapse_call_times
 
-        # ==========================
-        # ==== Serialize inputs ====
-        # ==========================
-        serialized_forward_tensors = []
-        serialized_synapses = []
-        for index, synapse in enumerate( synapses ):
-            try:
-                serialized_forward_tensors.append( synapse.serialize_forward_request_tensor ( inputs ))
-                serialized_synapses.append(synapse.serialize_to_wire_proto())
-            except Exception as e:
-                synapse_codes [index] = bittensor.proto.ReturnCode.RequestSerializationException
+        # ===========================================
+        # ==== Serialize inputs and build request ====
+        # ===========================================
+        if forward_request == None:
+            forward_request = self.serialize_forward_request( wallet = self.wallet, synapses = synapses, inputs = inputs )
+        for index, _ in enumerate( synapses ):
+            if forward_request.codes[index] != bittensor.proto.ReturnCode.Success:
+                synapse_codes [index] = forward_request.codes[index]
                 synapse_call_times [index] = clock.time() - start_time
-                synapse_messages [index] = 'Input serialization exception with error:{}'.format(str(e))
+                synapse_messages [index] = forward_request.messages[index]
         # Check if the call can stop here.
         if check_if_should_return():
             finalize_stats_and_logs()
             return synapse_responses, synapse_codes, synapse_call_times
-            
-        # ============================
-        # ==== Build proto request ====
-        # ============================
-        try: 
-            grpc_request = bittensor.proto.TensorMessage (
-                version = bittensor.__version_as_int__,
-                hotkey = self.wallet.hotkey.ss58_address,
-                tensors = serialized_forward_tensors,
-                synapses = serialized_synapses,
-                requires_grad = True,
-            )
-        except Exception as e:
-            # Synapse request creation failed.
-            code = bittensor.proto.ReturnCode.UnknownException
-            call_time = clock.time() - start_time
-            message = 'Request proto creation failed with error:{}'.format(str(e)) 
-            synapse_codes = [code for _ in synapses ]
-            synapse_call_times = [call_time for _ in synapses ]
-            synapse_messages = [ message for _ in synapses ]
-            finalize_stats_and_logs()
-            return synapse_responses, synapse_codes, synapse_call_times
-
+        grpc_request = forward_request.grpc_request
+        lossless_synapses = Receptor.lossless_response_synapses( synapses )
+        if lossless_synapses != None and not self.lossy_responses_supported:
+            grpc_request = self.serialize_forward_request( wallet = self.wallet, synapses = lossless_synapses, inputs = inputs ).grpc_request
 
         # ===============================
         # ==== Fire Asyncio RPC Call ====
@@ -393,16 +498,14 @@ class Receptor(nn.Module):
             self.stats.forward_qps.update(1)
             self.stats.forward_bytes_out.update( sys.getsizeof( grpc_request ) )
             finalize_stats_and_logs()
-            asyncio_future = self.stub.Forward (
-                request = grpc_request, 
-                timeout = timeout,
-                metadata = (
-                    ('rpc-auth-header','Bittensor'),
-                    ('bittensor-signature',self.sign()),
-                    ('bittensor-version',str(bittensor.__version_as_int__)),
-                    ('request_type', str(bittensor.proto.RequestType.FORWARD)),
-                ))
-            grpc_response = await asyncio.wait_for(asyncio_future, timeout=timeout)
+            grpc_response = await self.send_forward( grpc_request, timeout )
+            if lossless_synapses != None and self.lossy_responses_supported and Receptor.lossy_response_failed( synapses, grpc_response ):
+                # The endpoint predates the lossy serializers, ask it again for MSGPACK responses in the remaining time.
+                self.lossless_response_hotkeys.add( self.endpoint.hotkey )
+                remaining_timeout = timeout - ( clock.time() - start_time )
+                if remaining_timeout > 0:
+                    grpc_request = self.serialize_forward_request( wallet = self.wallet, synapses = lossless_synapses, inputs = inputs ).grpc_request
+                    grpc_response = await self.send_forward( grpc_request, remaining_timeout )
             self.stats.forward_bytes_in.update( grpc_response.ByteSize() )
             synapse_is_response = [ True for _ in synapses ]
 
@@ -416,6 +519,8 @@ class Receptor(nn.Module):
             if grpc_code == grpc.StatusCode.DEADLINE_EXCEEDED:
                 code = bittensor.proto.ReturnCode.Timeout
                 message = 'grpc.StatusCode.DEADLINE_EXCEEDED'+': '+ rpc_error_call.details()
+                # The latency is at least the timeout.
+                self.stats.forward_latency.observe( timeout )
             elif grpc_code == grpc.StatusCode.UNAVAILABLE:
                 code = bittensor.proto.ReturnCode.Unavailable
                 message = 'grpc.StatusCode.UNAVAILABLE'+': '+ rpc_error_call.details()
@@ -435,6 +540,22 @@ class Receptor(nn.Module):
             code = bittensor.proto.ReturnCode.Timeout
             call_time = clock.time() - start_time
             message = 'GRPC request timeout after: {}s'.format(timeout)
+            # The latency is at least the timeout.
+            self.stats.forward_latency.observe( timeout )
+            synapse_codes = [code for _ in synapses ]
+            synapse_call_times = [call_time for _ in synapses ]
+            synapse_messages = [ message for _ in synapses ]
+            finalize_stats_and_logs()
+            return synapse_responses, synapse_codes, synapse_call_times
+
+        # ====================================
+        # ==== Handle Cancelled Requests ====
+        # ====================================
+        except asyncio.CancelledError:
+            # The caller stopped waiting, i.e. a quorum was reached without this endpoint.
+            code = bittensor.proto.ReturnCode.Timeout
+            call_time = clock.time() - start_time
+            message = 'GRPC request cancelled after: {}s'.format(call_time)
             synapse_codes = [code for _ in synapses ]
             synapse_call_times = [call_time for _ in synapses ]
             synapse_messages = [ message for _ in synapses ]
@@ -520,9 +641,176 @@ class Receptor(nn.Module):
         for index, _ in enumerate( synapses ):
             if synapse_codes[index] == bittensor.proto.ReturnCode.Success:
                 synapse_call_times[index] = clock.time() - start_time
+        if bittensor.proto.ReturnCode.Success in synapse_codes:
+            self.stats.forward_latency.observe( clock.time() - start_time )
         finalize_stats_and_logs()
         return synapse_responses, synapse_codes, synapse_call_times  
 
+    @staticmethod
+    def lossless_response_synapses( synapses: List[ 'bittensor.Synapse' ] ) -> Optional[ List[ 'bittensor.Synapse' ] ]:
+        r""" Returns copies of the synapses asking for MSGPACK responses instead of lossy ones,
+            or None if no synapse asks for a lossy response serializer.
+        """
+        if not any( synapse.forward_response_serializer_type in bittensor.serializer.lossy_serializer_types for synapse in synapses ):
+            return None
+        lossless_synapses = []
+        for synapse in synapses:
+            if synapse.forward_response_serializer_type in bittensor.serializer.lossy_serializer_types:
+                synapse = copy.copy( synapse )
+                synapse.forward_response_serializer_type = bittensor.proto.Serializer.MSGPACK
+            lossless_synapses.append( synapse )
+        return lossless_synapses
+
+    @staticmethod
+    def lossy_response_failed( synapses: List[ 'bittensor.Synapse' ], grpc_response: 'bittensor.proto.TensorMessage' ) -> bool:
+        r""" Returns true if the endpoint failed to serialize the response of a synapse asking for a lossy serializer.
+        """
+        if len( grpc_response.synapses ) != len( synapses ):
+            return False
+        for synapse, wire_synapse in zip( synapses, grpc_response.synapses ):
+            if wire_synapse.return_code == bittensor.proto.ReturnCode.ResponseSerializationException and \
+                    synapse.forward_response_serializer_type in bittensor.serializer.lossy_serializer_types:
+                return True
+        return False
+
+    async def send_forward (
+        self,
+        grpc_request: 'bittensor.proto.TensorMessage',
+        timeout: int,
+    ) -> 'bittensor.proto.TensorMessage':
+        r""" Sends the forward request on its own or in the coalescing window of the endpoint.
+        """
+        if self.coalesce_window > 0:
+            return await self.coalesced_forward_call( grpc_request, timeout )
+        return await self.forward_call( grpc_request, timeout )
+
+    async def forward_call (
+        self,
+        grpc_request: 'bittensor.proto.TensorMessage',
+        timeout: int,
+    ) -> 'bittensor.proto.TensorMessage':
+        r""" Signs and sends the forward request to the endpoint and waits for its response.
+            Raises the grpc and timeout errors.
+        """
+        asyncio_future = self.stub.Forward (
+            request = grpc_request, 
+            timeout = timeout,
+            metadata = (
+                ('rpc-auth-header','Bittensor'),
+                ('bittensor-signature',self.sign()),
+                ('bittensor-version',str(bittensor.__version_as_int__)),
+                ('request_type', str(bittensor.proto.RequestType.FORWARD)),
+            ))
+        return await asyncio.wait_for(asyncio_future, timeout=timeout)
+
+    async def coalesced_forward_call (
+        self,
+        grpc_request: 'bittensor.proto.TensorMessage',
+        timeout: int,
+    ) -> 'bittensor.proto.TensorMessage':
+        r""" Sends the forward request together with the other requests made to the endpoint during the coalescing window.
+            The requests are merged into a single TensorMessage by concatenating their synapses and tensors,
+            the response is then split back into the part of each request. Only requests made on the same event loop
+            are merged, i.e. concurrent async calls or the calls of a pool with an io thread, and only requests with
+            byte-identical input tensors: the axon shares the model output between the synapses of a message.
+
+            Args:
+                grpc_request (:obj:`bittensor.proto.TensorMessage`, `required`):
+                    Forward request of this call.
+
+                timeout (:obj:`int`, `required`):
+                    Request max timeout, the merged request uses the longest timeout of its requests.
+
+            Returns:
+                grpc_response (:obj:`bittensor.proto.TensorMessage`, `required`):
+                    Response to the synapses of grpc_request.
+        """
+        loop = asyncio.get_running_loop()
+        key = ( loop, frozenset( tensor.SerializeToString() for tensor in grpc_request.tensors ) )
+        batch = self.coalesce_batches.get( key )
+        if batch == None:
+            batch = SimpleNamespace( key = key, requests = [], timeout = 0 )
+            self.coalesce_batches[ key ] = batch
+            loop.create_task( self._send_coalesced_batch( batch ) )
+        future = loop.create_future()
+        batch.requests.append( ( grpc_request, future ) )
+        batch.timeout = max( batch.timeout, timeout )
+        try:
+            # The shield keeps the merged call running for the other requests if this caller stops waiting.
+            return await asyncio.wait_for( asyncio.shield( future ), timeout = timeout )
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def _send_coalesced_batch( self, batch: SimpleNamespace ):
+        r""" Waits for the coalescing window then sends the batch requests as one TensorMessage 
+            and resolves the future of each request with its part of the response.
+        """
+        await asyncio.sleep( self.coalesce_window )
+        if self.coalesce_batches.get( batch.key ) is batch:
+            del self.coalesce_batches[ batch.key ]
+        requests = [ ( grpc_request, future ) for grpc_request, future in batch.requests if not future.done() ]
+        if len( requests ) == 0:
+            return
+
+        if len( requests ) == 1:
+            grpc_request = requests[0][0]
+        else:
+            grpc_request = bittensor.proto.TensorMessage (
+                version = bittensor.__version_as_int__,
+                hotkey = self.wallet.hotkey.ss58_address,
+                tensors = [ tensor for request, _ in requests for tensor in request.tensors ],
+                synapses = [ synapse for request, _ in requests for synapse in request.synapses ],
+                requires_grad = True,
+            )
+        self.stats.forward_coalesced.update( len( requests ) )
+
+        try:
+            grpc_response = await self.forward_call( grpc_request, batch.timeout )
+        except asyncio.CancelledError:
+            for _, future in requests:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception( e )
+            return
+
+        n_synapses = len( grpc_request.synapses )
+        start = 0
+        for request, future in requests:
+            end = start + len( request.synapses )
+            if not future.done():
+                if len( requests ) == 1:
+                    future.set_result( grpc_response )
+                else:
+                    future.set_result( self._split_forward_response( grpc_response, start, end, n_synapses ) )
+            start = end
+
+    @staticmethod
+    def _split_forward_response( 
+        grpc_response: 'bittensor.proto.TensorMessage', 
+        start: int, 
+        end: int, 
+        n_synapses: int 
+    ) -> 'bittensor.proto.TensorMessage':
+        r""" Returns the part of a merged forward response for the synapses start to end of the merged request.
+            Tensors and synapses which do not match the merged request length are copied whole,
+            so that the length checks of the caller still apply.
+        """
+        def split( items ):
+            return items[ start:end ] if len( items ) == n_synapses else items
+        return bittensor.proto.TensorMessage (
+            version = grpc_response.version,
+            hotkey = grpc_response.hotkey,
+            tensors = split( grpc_response.tensors ),
+            synapses = split( grpc_response.synapses ),
+            return_code = grpc_response.return_code,
+            message = grpc_response.message,
+            requires_grad = grpc_response.requires_grad,
+        )
+
     async def async_backward (
         self, 
         synapses: List[ 'bittensor.Synapse' ],
@@ -589,19 +877,20 @@ class Receptor(nn.Module):
         def finalize_stats_and_logs():
             for index, synapse in enumerate( synapses ):
                 self.stats.codes[ synapse_codes[ index ] ] += 1
-                bittensor.logging.rpc_log ( 
-                    axon = False, 
-                    forward = False, 
-                    is_response = synapse_is_response [index], 
-                    code = synapse_codes[ index ], 
-                    call_time = synapse_call_times[ index ], 
-                    pubkey = self.endpoint.hotkey, 
-                    uid = self.endpoint.uid, 
-                    inputs = list(grads[index].shape), 
-                    outputs = None, 
-                    message = synapse_messages[ index ],
-                    synapse = synapse.synapse_type
-                )
+                if bittensor.logging.rpc_log_on():
+                    bittensor.logging.rpc_log ( 
+                        axon = False, 
+                        forward = False, 
+                        is_response = synapse_is_response [index], 
+                        code = synapse_codes[ index ], 
+                        call_time = synapse_call_times[ index ], 
+                        pubkey = self.endpoint.hotkey, 
+                        uid = self.endpoint.uid, 
+                        inputs = list(grads[index].shape), 
+                        outputs = None, 
+                        message = synapse_messages[ index ],
+                        synapse = synapse.synapse_type
+                    )
 
         # ========================
         # ==== Check endpoint ====
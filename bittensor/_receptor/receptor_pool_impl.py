@@ -18,7 +18,8 @@
 # DEALINGS IN THE SOFTWARE.
 
 import math
-from typing import Tuple, List, Union
+import time as clock
+from typing import Tuple, List, Union, AsyncIterator, Coroutine
 from threading import Lock
 
 import torch
@@ -28,7 +29,12 @@ import concurrent
 import bittensor
 from bittensor._endpoint import endpoint
 import bittensor.utils.networking as net
+import bittensor.utils.stats as stat_utils
+from bittensor._receptor.circuit_breaker_impl import CircuitBreaker
+from bittensor._receptor.event_loop_thread_impl import EventLoopThread
 from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from collections import OrderedDict
 
 logger = logger.opt(colors=True)
 
@@ -40,11 +46,27 @@ class ReceptorPool ( torch.nn.Module ):
         wallet: 'bittensor.Wallet',
         max_active_receptors: int,
         compression: str,
+        circuit_breaker_threshold: int = 0,
+        circuit_breaker_backoff: float = 60,
+        io_thread: bool = False,
+        coalesce_window: float = 0,
     ):
         super().__init__()
         self.wallet = wallet
         self.max_active_receptors = max_active_receptors
-        self.receptors = {}
+        # Receptors per hotkey, ordered from least to most recently used.
+        self.receptors = OrderedDict()
+        self.circuit_breaker_threshold = circuit_breaker_threshold
+        self.circuit_breaker_backoff = circuit_breaker_backoff
+        # Circuit breakers per hotkey, they outlive the receptors.
+        self.circuit_breakers = {}
+        # Forward latency histograms per hotkey, they outlive the receptors.
+        self.forward_latencies = {}
+        # Hotkeys of the endpoints which fail lossy responses and are asked for MSGPACK ones, they outlive the receptors.
+        self.lossless_response_hotkeys = set()
+        # If set, the receptor channels and calls live on this loop thread.
+        self.event_loop_thread = EventLoopThread() if io_thread else None
+        self.coalesce_window = coalesce_window
         self.cull_mutex = Lock()
         self.max_processes = 10
         self.compression = compression
@@ -67,20 +89,35 @@ class ReceptorPool ( torch.nn.Module ):
 
     def get_total_requests(self):
         return self.total_requests
-    def get_receptors_state(self):
+    def get_receptors_state(self, with_circuit_state: bool = False):
         r""" Return the state of each receptor.
+            Args:
+                with_circuit_state (:obj:`bool`, `optional`):
+                    If true, returns the channel and circuit breaker state per hotkey, including hotkeys without an active receptor.
+
             Returns:
-                states (:obj:`List[grpc.channel.state]`)
-                    The state of receptor.
+                states (:obj:`Dict[str, grpc.channel.state]`)
+                    The state of receptor, or a SimpleNamespace with channel and circuit states if with_circuit_state.
         """
-        return {hotkey: v.state() for hotkey, v in self.receptors.items()}
+        if not with_circuit_state:
+            return {hotkey: v.state() for hotkey, v in self.receptors.items()}
+        states = {}
+        for hotkey in set( self.receptors.keys() ) | set( self.circuit_breakers.keys() ):
+            states[ hotkey ] = SimpleNamespace(
+                channel = self.receptors[ hotkey ].state() if hotkey in self.receptors else None,
+                circuit = self.circuit_breakers[ hotkey ].state if hotkey in self.circuit_breakers else CircuitBreaker.CLOSED,
+            )
+        return states
 
     def forward (
             self, 
             endpoints: List [ 'bittensor.Endpoint' ],
             synapses: List[ 'bittensor.Synapse' ],
             inputs: List [ torch.Tensor ],
-            timeout: int,
+            timeout: Union[ int, str ],
+            quorum: Union[ int, float ] = None,
+            soft_timeout: float = None,
+            max_timeout: int = None,
         ) -> Tuple[List[torch.Tensor], List[int], List[float]]:
         r""" Forward tensor inputs to endpoints.
 
@@ -97,8 +134,18 @@ class ReceptorPool ( torch.nn.Module ):
                     List of tensors to send to corresponsing endpoints. Tensors are of arbitrary type and shape depending on the
                     modality.
 
-                timeout (int):
-                    Request timeout.
+                timeout (:obj:`Union[int, str]`, `required`):
+                    Request timeout. If 'adaptive', each endpoint gets a timeout from its observed latencies, see Receptor.adaptive_timeout.
+
+                quorum (:obj:`Union[int, float]`, `optional`):
+                    If set, the call returns once this many endpoints (int) or this fraction of the endpoints (float) 
+                    responded with a success. The remaining calls are cancelled and returned as Timeout.
+
+                soft_timeout (float, `optional`):
+                    If set, the call returns after this many seconds. The remaining calls are cancelled and returned as Timeout.
+
+                max_timeout (int, `optional`):
+                    Upper bound of the adaptive timeouts, defaults to bittensor.__blocktime__.
 
             Returns:
                 forward_outputs (:obj:`List[ List[ torch.FloatTensor ]]` of shape :obj:`(num_endpoints * (num_synapses * (shape)))`, `required`):
@@ -113,19 +160,24 @@ class ReceptorPool ( torch.nn.Module ):
         if len(endpoints) != len(inputs):
             raise ValueError('Endpoints must have the same length as passed inputs. Got {} and {}'.format(len(endpoints), len(inputs)))
         
+        forward_call = self.async_forward(
+            endpoints = endpoints,
+            synapses = synapses,
+            inputs = inputs,
+            timeout = timeout,
+            quorum = quorum,
+            soft_timeout = soft_timeout,
+            max_timeout = max_timeout
+        ) 
+        if self.event_loop_thread != None:
+            return self.event_loop_thread.run( forward_call )
+
         try:
             loop = asyncio.get_event_loop()
         except RuntimeError:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-        return loop.run_until_complete ( 
-            self.async_forward(
-                endpoints = endpoints,
-                synapses = synapses,
-                inputs = inputs,
-                timeout = timeout
-            ) 
-        )
+        return loop.run_until_complete ( forward_call )
 
 
     def backward(
@@ -173,27 +225,32 @@ class ReceptorPool ( torch.nn.Module ):
         for grads_per_synapse in grads:
             if len(grads_per_synapse) != len(synapses):
                 raise ValueError('Gradients must have the same length as passed synapses. Got {} and {}'.format(len(grads_per_synapse), len(synapses)))
+        backward_call = self.async_backward(
+            endpoints = endpoints,
+            synapses = synapses,
+            inputs = inputs,
+            grads = grads,
+            timeout = timeout
+        ) 
+        if self.event_loop_thread != None:
+            return self.event_loop_thread.run( backward_call )
+
         try:
             loop = asyncio.get_event_loop()
         except RuntimeError:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-        return loop.run_until_complete (
-            self.async_backward(
-                endpoints = endpoints,
-                synapses = synapses,
-                inputs = inputs,
-                grads = grads,
-                timeout = timeout
-            ) 
-        )
+        return loop.run_until_complete ( backward_call )
 
     async def async_forward (
             self, 
             endpoints: List [ 'bittensor.Endpoint' ],
             synapses: List[ 'bittensor.Synapse' ],
             inputs: List [ torch.Tensor ],
-            timeout: int,
+            timeout: Union[ int, str ],
+            quorum: Union[ int, float ] = None,
+            soft_timeout: float = None,
+            max_timeout: int = None,
         ) -> Tuple[List[torch.Tensor], List[int], List[float]]:
         r""" Forward tensor inputs to endpoints.
 
@@ -210,8 +267,18 @@ class ReceptorPool ( torch.nn.Module ):
                     List of tensors to send to corresponsing endpoints. Tensors are of arbitrary type and shape depending on the
                     modality.
 
-                timeout (int):
-                    Request timeout.
+                timeout (:obj:`Union[int, str]`, `required`):
+                    Request timeout. If 'adaptive', each endpoint gets a timeout from its observed latencies, see Receptor.adaptive_timeout.
+
+                quorum (:obj:`Union[int, float]`, `optional`):
+                    If set, the call returns once this many endpoints (int) or this fraction of the endpoints (float) 
+                    responded with a success. The remaining calls are cancelled and returned as Timeout.
+
+                soft_timeout (float, `optional`):
+                    If set, the call returns after this many seconds. The remaining calls are cancelled and returned as Timeout.
+
+                max_timeout (int, `optional`):
+                    Upper bound of the adaptive timeouts, defaults to bittensor.__blocktime__.
 
             Returns:
                 forward_outputs (:obj:`List[ List[ torch.FloatTensor ]]` of shape :obj:`(num_endpoints * (num_synapses * (shape)))`, `required`):
@@ -223,21 +290,54 @@ class ReceptorPool ( torch.nn.Module ):
                 forward_times (:obj:`List[ List [float] ]` of shape :obj:`(num_endpoints * ( num_synapses ))`, `required`):
                     dendrite backward call times
         """
-        # Init receptors.
-        receptors = [ self._get_or_create_receptor_for_endpoint( endpoint ) for endpoint in endpoints ]
+        # The receptor channels live on the I/O loop, calls from other loops are run there.
+        if self.event_loop_thread != None and not self.event_loop_thread.is_current():
+            return await self.event_loop_thread.wrap( 
+                self.async_forward( endpoints, synapses, inputs, timeout, quorum, soft_timeout, max_timeout ) 
+            )
+
+        # Init receptors, endpoints with an open circuit are not called.
+        is_allowed = [ self._allow_request_to_endpoint( endpoint ) for endpoint in endpoints ]
+        receptors = [ self._get_or_create_receptor_for_endpoint( endpoint ) if allowed else None for endpoint, allowed in zip( endpoints, is_allowed ) ]
+
+        # Serialize requests, once per distinct input tensor.
+        # Receptors sending the same tensor share the request and only sign their own call metadata.
+        # The inputs are listed first, so that their ids stay valid while they are used as keys.
+        inputs = list( inputs )
+        forward_requests = {}
+        for index, receptor in enumerate(receptors):
+            if receptor != None and id( inputs[index] ) not in forward_requests:
+                forward_requests[ id( inputs[index] ) ] = bittensor.Receptor.serialize_forward_request(
+                    wallet = self.wallet,
+                    synapses = synapses,
+                    inputs = inputs[index]
+                )
 
         # Make calls.
         calls = []
         for index, receptor in enumerate(receptors):
+            if receptor == None:
+                calls.append( self._backoff_forward( synapses, inputs[index] ) )
+                continue
             calls.append( 
                 receptor.async_forward(
                     synapses = synapses,
                     inputs = inputs[index], 
-                    timeout = timeout
+                    timeout = self._get_timeout_for_receptor( receptor, timeout, max_timeout ),
+                    forward_request = forward_requests[ id( inputs[index] ) ]
                 )
             )
 
-        responses = await asyncio.gather( *calls )
+        if quorum == None and soft_timeout == None:
+            responses = await asyncio.gather( *calls )
+            is_cancelled = [ False for _ in calls ]
+        else:
+            responses, is_cancelled = await self._gather_until_quorum( calls, synapses, inputs, quorum, soft_timeout )
+
+        # Update the circuits of the called endpoints, cancelled calls say nothing about the endpoint.
+        for index, endpoint in enumerate( endpoints ):
+            if is_allowed[index] and not is_cancelled[index]:
+                self._record_endpoint_codes( endpoint, responses[index][1] )
 
         # Unpack responses
         forward_outputs = []
@@ -253,6 +353,196 @@ class ReceptorPool ( torch.nn.Module ):
         # ---- Return ----
         return forward_outputs, forward_codes, forward_times
 
+    async def async_forward_stream (
+            self, 
+            endpoints: List [ 'bittensor.Endpoint' ],
+            synapses: List[ 'bittensor.Synapse' ],
+            inputs: List [ torch.Tensor ],
+            timeout: Union[ int, str ],
+            max_timeout: int = None,
+        ) -> AsyncIterator[ Tuple[int, List[torch.Tensor], List[int], List[float]] ]:
+        r""" Forward tensor inputs to endpoints and yields the responses as they complete.
+            Calls still in flight are cancelled if the iteration is stopped early.
+
+            Args:
+                endpoints (:obj:`List[ bittensor.Endpoint ]` of shape :obj:`(num_endpoints)`, `required`):
+                    List of remote endpoints which match length of inputs. Tensors from x are sent forward to these endpoints.
+
+                synapses (:obj:`List[ 'bittensor.Synapse' ]` of shape :obj:`(num_synapses)`, `required`):
+                    Bittensor synapse objects with arguments. Each corresponds to a synapse function on the axon.
+                    Responses are packed in this ordering. 
+
+                inputs (:obj:`List[torch.Tensor]` of shape :obj:`(num_endpoints * [shape])`, `required`):
+                    List of tensors to send to corresponsing endpoints. Tensors are of arbitrary type and shape depending on the
+                    modality.
+
+                timeout (:obj:`Union[int, str]`, `required`):
+                    Request timeout. If 'adaptive', each endpoint gets a timeout from its observed latencies, see Receptor.adaptive_timeout.
+
+                max_timeout (int, `optional`):
+                    Upper bound of the adaptive timeouts, defaults to bittensor.__blocktime__.
+
+            Yields:
+                index (int):
+                    Index of the endpoint in the passed endpoints.
+
+                forward_outputs (:obj:`List[ torch.FloatTensor ]` of shape :obj:`(num_synapses * (shape))`, `required`):
+                    Output encodings of the endpoint. Non-responses are zeroes of common shape.
+
+                forward_codes (:obj:`List[bittensor.proto.ReturnCodes]` of shape :obj:`(num_synapses)`, `required`):
+                    dendrite call return ops.
+
+                forward_times (:obj:`List[float]` of shape :obj:`(num_synapses)`, `required`):
+                    dendrite call times
+        """
+        # The receptor channels live on the I/O loop, streams from other loops are run there.
+        if self.event_loop_thread != None and not self.event_loop_thread.is_current():
+            async for response in self.event_loop_thread.wrap_iterator( 
+                self.async_forward_stream( endpoints, synapses, inputs, timeout, max_timeout ) 
+            ):
+                yield response
+            return
+
+        # Init receptors, endpoints with an open circuit are not called.
+        is_allowed = [ self._allow_request_to_endpoint( endpoint ) for endpoint in endpoints ]
+        receptors = [ self._get_or_create_receptor_for_endpoint( endpoint ) if allowed else None for endpoint, allowed in zip( endpoints, is_allowed ) ]
+
+        # Serialize requests, once per distinct input tensor.
+        inputs = list( inputs )
+        forward_requests = {}
+        for index, receptor in enumerate(receptors):
+            if receptor != None and id( inputs[index] ) not in forward_requests:
+                forward_requests[ id( inputs[index] ) ] = bittensor.Receptor.serialize_forward_request(
+                    wallet = self.wallet,
+                    synapses = synapses,
+                    inputs = inputs[index]
+                )
+
+        # Make calls.
+        tasks = {}
+        for index, receptor in enumerate(receptors):
+            if receptor == None:
+                task = asyncio.ensure_future( self._backoff_forward( synapses, inputs[index] ) )
+            else:
+                task = asyncio.ensure_future(
+                    receptor.async_forward(
+                        synapses = synapses,
+                        inputs = inputs[index], 
+                        timeout = self._get_timeout_for_receptor( receptor, timeout, max_timeout ),
+                        forward_request = forward_requests[ id( inputs[index] ) ]
+                    )
+                )
+            tasks[ task ] = index
+
+        # Yield responses as they complete.
+        pending = set( tasks.keys() )
+        try:
+            while len( pending ) > 0:
+                done, pending = await asyncio.wait( pending, return_when = asyncio.FIRST_COMPLETED )
+                for task in done:
+                    forward_outputs, forward_codes, forward_times = task.result()
+                    if is_allowed[ tasks[ task ] ]:
+                        self._record_endpoint_codes( endpoints[ tasks[ task ] ], forward_codes )
+                    yield tasks[ task ], forward_outputs, forward_codes, forward_times
+        finally:
+            for task in pending:
+                task.cancel()
+            # ---- Kill receptors ----
+            self._destroy_receptors_over_max_allowed()
+
+    async def _gather_until_quorum( 
+            self, 
+            calls: List[ Coroutine ], 
+            synapses: List[ 'bittensor.Synapse' ],
+            inputs: List [ torch.Tensor ],
+            quorum: Union[ int, float ],
+            soft_timeout: float,
+        ) -> Tuple[ List[ Tuple[ List[torch.Tensor], List[int], List[float] ] ], List[bool] ]:
+        r""" Awaits the forward calls until a quorum of them succeeded or the soft timeout passed.
+            The remaining calls are cancelled and their responses are filled as Timeout.
+
+            Args:
+                calls (:obj:`List[ Coroutine ]` of shape :obj:`(num_endpoints)`, `required`):
+                    Receptor forward calls.
+
+                synapses (:obj:`List[ 'bittensor.Synapse' ]` of shape :obj:`(num_synapses)`, `required`):
+                    Bittensor synapse objects of the calls.
+
+                inputs (:obj:`List[torch.Tensor]` of shape :obj:`(num_endpoints * [shape])`, `required`):
+                    Inputs of the calls.
+
+                quorum (:obj:`Union[int, float]`, `optional`):
+                    Number (int) or fraction (float) of calls with a success response to wait for.
+                    All calls are awaited if None.
+
+                soft_timeout (float, `optional`):
+                    Seconds after which the remaining calls are cancelled.
+
+            Returns:
+                responses (:obj:`List[ Tuple[ List[torch.Tensor], List[int], List[float] ] ]` of shape :obj:`(num_endpoints)`, `required`):
+                    Outputs, codes and times per call.
+
+                is_cancelled (:obj:`List[bool]` of shape :obj:`(num_endpoints)`, `required`):
+                    True for the calls which were cancelled.
+        """
+        if quorum == None:
+            required_successes = len( calls )
+        elif isinstance( quorum, float ):
+            if quorum <= 0 or quorum > 1:
+                raise ValueError('Quorum fraction must be in (0, 1]. Got {}'.format( quorum ))
+            required_successes = math.ceil( quorum * len( calls ) )
+        else:
+            if quorum < 1:
+                raise ValueError('Quorum count must be at least 1. Got {}'.format( quorum ))
+            required_successes = min( quorum, len( calls ) )
+
+        start_time = clock.time()
+        tasks = [ asyncio.ensure_future( call ) for call in calls ]
+        pending = set( tasks )
+        n_successes = 0
+        while len( pending ) > 0 and n_successes < required_successes:
+            remaining_time = None if soft_timeout == None else soft_timeout - ( clock.time() - start_time )
+            if remaining_time != None and remaining_time <= 0:
+                break
+            done, pending = await asyncio.wait( pending, timeout = remaining_time, return_when = asyncio.FIRST_COMPLETED )
+            for task in done:
+                if bittensor.proto.ReturnCode.Success in task.result()[1]:
+                    n_successes += 1
+
+        # Cancel the stragglers, the receptors return them as Timeout.
+        is_cancelled = [ task in pending for task in tasks ]
+        for task in pending:
+            task.cancel()
+        if len( pending ) > 0:
+            await asyncio.wait( pending )
+
+        responses = []
+        for index, task in enumerate( tasks ):
+            if task.cancelled():
+                # Cancelled before the call started.
+                call_time = clock.time() - start_time
+                responses.append((
+                    [ synapse.nill_forward_response_tensor( inputs[index] ) for synapse in synapses ],
+                    [ bittensor.proto.ReturnCode.Timeout for _ in synapses ],
+                    [ call_time for _ in synapses ]
+                ))
+            else:
+                responses.append( task.result() )
+        return responses, is_cancelled
+
+    async def _backoff_forward( 
+            self, 
+            synapses: List[ 'bittensor.Synapse' ],
+            inputs: torch.Tensor,
+        ) -> Tuple[ List[torch.Tensor], List[int], List[float] ]:
+        r""" Returns Backoff responses, without any network call, for an endpoint with an open circuit.
+        """
+        return (
+            [ synapse.nill_forward_response_tensor( inputs ) for synapse in synapses ],
+            [ bittensor.proto.ReturnCode.Backoff for _ in synapses ],
+            [ 0.0 for _ in synapses ]
+        )
+
     async def async_backward(
                 self, 
                 endpoints: List [ 'bittensor.Endpoint' ],
@@ -291,6 +581,12 @@ class ReceptorPool ( torch.nn.Module ):
                 backward_times (:obj:`List[float]` of shape :obj:`(num_endpoints)`, `required`):
                     List of list of Backward call times one per endpoint and synapse.
         """
+        # The receptor channels live on the I/O loop, calls from other loops are run there.
+        if self.event_loop_thread != None and not self.event_loop_thread.is_current():
+            return await self.event_loop_thread.wrap( 
+                self.async_backward( endpoints, synapses, inputs, grads, timeout ) 
+            )
+
         # Init receptors.
         receptors = [ self._get_or_create_receptor_for_endpoint( endpoint ) for endpoint in endpoints ]
 
@@ -322,29 +618,64 @@ class ReceptorPool ( torch.nn.Module ):
         return backward_outputs, backward_codes, backward_times
 
     def _destroy_receptors_over_max_allowed( self ):
-        r""" Destroys receptors based on QPS until there are no more than max_active_receptors.
+        r""" Destroys the least recently used receptors until there are no more than max_active_receptors.
+            Receptors with calls in flight are kept.
         """
         with self.cull_mutex:
             # ---- Finally: Kill receptors over max allowed ----
-            while len(self.receptors) > self.max_active_receptors:
-                min_receptor_qps = math.inf
-                receptor_to_remove = None
-                for next_receptor in self.receptors.values():
-                    next_qps = next_receptor.stats.forward_qps.value
-                    sema_value = next_receptor.semaphore._value
-                    if (min_receptor_qps > next_qps) and (sema_value == self.max_processes):
-                        receptor_to_remove = next_receptor
-                        min_receptor_qps = next_receptor.stats.forward_qps.value
-                        
-                if receptor_to_remove != None:
-                    try:
-                        bittensor.logging.destroy_receptor_log(receptor_to_remove.endpoint)
-                        self.receptors[ receptor_to_remove.endpoint.hotkey ].close()
-                        del self.receptors[ receptor_to_remove.endpoint.hotkey ]
-                    except KeyError:
-                        pass
-                elif receptor_to_remove == None:
+            n_to_remove = len(self.receptors) - self.max_active_receptors
+            if n_to_remove <= 0:
+                return
+            receptors_to_remove = []
+            for receptor in self.receptors.values():
+                if len(receptors_to_remove) >= n_to_remove:
                     break
+                if receptor.semaphore._value == self.max_processes:
+                    receptors_to_remove.append( receptor )
+
+            for receptor_to_remove in receptors_to_remove:
+                try:
+                    bittensor.logging.destroy_receptor_log(receptor_to_remove.endpoint)
+                    self.receptors[ receptor_to_remove.endpoint.hotkey ].close()
+                    del self.receptors[ receptor_to_remove.endpoint.hotkey ]
+                except KeyError:
+                    pass
+
+    def _allow_request_to_endpoint( self, endpoint: 'bittensor.Endpoint' ) -> bool:
+        r""" Returns false if the circuit of the endpoint hotkey is open. Always true if circuit breaking is disabled.
+        """
+        if self.circuit_breaker_threshold <= 0:
+            return True
+        if endpoint.hotkey not in self.circuit_breakers:
+            return True
+        return self.circuit_breakers[ endpoint.hotkey ].allow_request()
+
+    def _record_endpoint_codes( self, endpoint: 'bittensor.Endpoint', codes: List[ 'bittensor.proto.ReturnCode' ] ):
+        r""" Updates the circuit of the endpoint hotkey with the codes of a finished forward call.
+        """
+        if self.circuit_breaker_threshold <= 0:
+            return
+        if endpoint.hotkey not in self.circuit_breakers:
+            self.circuit_breakers[ endpoint.hotkey ] = CircuitBreaker( 
+                threshold = self.circuit_breaker_threshold, 
+                backoff = self.circuit_breaker_backoff 
+            )
+        self.circuit_breakers[ endpoint.hotkey ].record( codes )
+
+    def _get_forward_latency( self, endpoint: 'bittensor.Endpoint' ) -> 'stat_utils.LatencyHistogram':
+        r""" Returns the forward latency histogram of the endpoint hotkey, shared by its successive receptors.
+        """
+        if endpoint.hotkey not in self.forward_latencies:
+            self.forward_latencies[ endpoint.hotkey ] = stat_utils.LatencyHistogram()
+        return self.forward_latencies[ endpoint.hotkey ]
+
+    def _get_timeout_for_receptor( self, receptor: 'bittensor.Receptor', timeout: Union[ int, str ], max_timeout: int ) -> float:
+        r""" Returns the forward timeout of the receptor, adapted to its observed latencies if timeout is 'adaptive'.
+        """
+        if timeout != 'adaptive':
+            return timeout
+        max_timeout = max_timeout if max_timeout != None else bittensor.__blocktime__
+        return receptor.adaptive_timeout( max_timeout )
 
     def _get_or_create_receptor_for_endpoint( self, endpoint: 'bittensor.Endpoint' ) -> 'bittensor.Receptor':
         r""" Finds or creates a receptor TCP connection associated with the passed Neuron Endpoint
@@ -352,32 +683,43 @@ class ReceptorPool ( torch.nn.Module ):
                 receptor: (`bittensor.Receptor`):
                     receptor with tcp connection endpoint at endpoint.ip:endpoint.port
         """
-        # ---- Find the active receptor for this endpoint ----
-        if endpoint.hotkey in self.receptors:
-            receptor = self.receptors[ endpoint.hotkey ]
-
-            # Change receptor address.
-            if receptor.endpoint.ip != endpoint.ip or receptor.endpoint.port != endpoint.port:
-                #receptor.close()
-                bittensor.logging.update_receptor_log( endpoint )
+        # The mutex guards the use order against a concurrent cull.
+        with self.cull_mutex:
+            # ---- Find the active receptor for this endpoint ----
+            if endpoint.hotkey in self.receptors:
+                receptor = self.receptors[ endpoint.hotkey ]
+                self.receptors.move_to_end( endpoint.hotkey )
+
+                # Change receptor address.
+                if receptor.endpoint.ip != endpoint.ip or receptor.endpoint.port != endpoint.port:
+                    #receptor.close()
+                    bittensor.logging.update_receptor_log( endpoint )
+                    receptor = bittensor.receptor (
+                        endpoint = endpoint, 
+                        wallet = self.wallet,
+                        external_ip = self.external_ip,
+                        max_processes = self.max_processes,
+                        event_loop_thread = self.event_loop_thread,
+                        coalesce_window = self.coalesce_window,
+                        forward_latency = self._get_forward_latency( endpoint ),
+                        lossless_response_hotkeys = self.lossless_response_hotkeys
+                    )            
+                    self.receptors[ receptor.endpoint.hotkey ] = receptor
+
+            # ---- Or: Create a new receptor ----
+            else:
+                bittensor.logging.create_receptor_log( endpoint )
                 receptor = bittensor.receptor (
-                    endpoint = endpoint, 
-                    wallet = self.wallet,
-                    external_ip = self.external_ip,
-                    max_processes = self.max_processes
-                )            
+                        endpoint = endpoint, 
+                        wallet = self.wallet,
+                        external_ip = self.external_ip,
+                        max_processes = self.max_processes,
+                        compression = self.compression,
+                        event_loop_thread = self.event_loop_thread,
+                        coalesce_window = self.coalesce_window,
+                        forward_latency = self._get_forward_latency( endpoint ),
+                        lossless_response_hotkeys = self.lossless_response_hotkeys
+                )
                 self.receptors[ receptor.endpoint.hotkey ] = receptor
 
-        # ---- Or: Create a new receptor ----
-        else:
-            bittensor.logging.create_receptor_log( endpoint )
-            receptor = bittensor.receptor (
-                    endpoint = endpoint, 
-                    wallet = self.wallet,
-                    external_ip = self.external_ip,
-                    max_processes = self.max_processes,
-                    compression = self.compression
-            )
-            self.receptors[ receptor.endpoint.hotkey ] = receptor
-            
         return receptor
\ No newline at end of file
@@ -17,6 +17,7 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
 # DEALINGS IN THE SOFTWARE.
 
+import os
 import torch
 import numpy as np
 import bittensor
@@ -38,14 +39,24 @@ class serializer:
 
     class SerializationTypeNotImplementedException (Exception):
         """ Raised if serialization/deserialization is not implemented for the passed object type """
+
+    # Serializers which do not reproduce the tensor exactly, only valid for float activations and gradients.
+    lossy_serializer_types = [ bittensor.proto.Serializer.QINT8, bittensor.proto.Serializer.QINT4 ]
+
+    # Number of elements sharing a scale in the quantized serializers, 0 means one scale per row.
+    default_block_size = int(os.getenv('BT_SERIALIZER_BLOCK_SIZE')) if os.getenv('BT_SERIALIZER_BLOCK_SIZE') != None else 64
     
-    def __new__(cls, serializer_type: bittensor.proto.Serializer = bittensor.proto.Serializer.MSGPACK ) -> 'bittensor.Serializer':
+    def __new__(cls, serializer_type: bittensor.proto.Serializer = bittensor.proto.Serializer.MSGPACK, block_size: int = None ) -> 'bittensor.Serializer':
         r"""Returns the correct serializer object for the passed Serializer enum. 
 
             Args:
                 serializer_type (:obj:`bittensor.proto.Serializer`, `required`): 
                     The serializer_type ENUM from bittensor.proto.
 
+                block_size (:obj:`int`, `optional`, default: bittensor.serializer.default_block_size): 
+                    Number of elements sharing a scale for the QINT8 and QINT4 serializers, 0 for one scale per row. 
+                    The block size travels with the buffer, receivers do not need to know it.
+
             Returns:
                 Serializer: (obj: `bittensor.Serializer`, `required`): 
                     The bittensor serializer/deserialzer for the passed type.
@@ -61,6 +72,12 @@ class serializer:
             return serializer_impl.MSGPackSerializer()
         elif serializer_type == bittensor.proto.Serializer.CMPPACK:
             return serializer_impl.CMPPackSerializer()
+        elif serializer_type == bittensor.proto.Serializer.RAW:
+            return serializer_impl.RawSerializer()
+        elif serializer_type == bittensor.proto.Serializer.QINT8:
+            return serializer_impl.QuantizedSerializer( bits = 8, block_size = block_size if block_size != None else serializer.default_block_size )
+        elif serializer_type == bittensor.proto.Serializer.QINT4:
+            return serializer_impl.QuantizedSerializer( bits = 4, block_size = block_size if block_size != None else serializer.default_block_size )
         else:
             raise bittensor.serializer.NoSerializerForEnum("No known serialzier for proto type {}".format(serializer_type))
 
@@ -17,6 +17,8 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
 # DEALINGS IN THE SOFTWARE.
 
+import math
+import struct
 import torch
 import msgpack
 import msgpack_numpy
@@ -232,3 +234,190 @@ class CMPPackSerializer( Serializer ):
         torch_object = torch.as_tensor(numpy_object).view(shape).requires_grad_(torch_proto.requires_grad)
         return torch_object.type(dtype)
 
+
+
+class RawSerializer( Serializer ):
+    """ Make conversion between torch and bittensor.proto.torch by shipping the contiguous tensor bytes as is.
+    """
+    def serialize_from_torch(self, torch_tensor: torch.Tensor, modality: bittensor.proto.Modality) -> bittensor.proto.Tensor:
+        """ Serializes a torch.Tensor to an bittensor Tensor proto by copying its raw bytes into the buffer.
+
+        Args:
+            torch_tensor (torch.Tensor): 
+                Torch tensor to serialize.
+
+            modality (bittensor.proto.Modality): 
+                Datatype modality. i.e. TENSOR, TEXT, IMAGE
+
+        Returns:
+            bittensor.proto.Tensor: 
+                The serialized torch tensor as bittensor.proto.proto. 
+
+        Raises:
+            SerializationException: (Exception): 
+                Raised if the tensor dtype has no bittensor.proto.DataType equivalent.
+        """
+        dtype = bittensor.serializer.torch_dtype_to_bittensor_dtype(torch_tensor.dtype)
+        if dtype == bittensor.proto.DataType.UNKNOWN:
+            raise bittensor.serializer.SerializationException('RAW serializer does not support torch.dtype = {}'.format(torch_tensor.dtype))
+        shape = list(torch_tensor.shape)
+        # Single copy: contiguous tensor memory -> proto bytes.
+        data_buffer = torch_tensor.detach().cpu().contiguous().numpy().tobytes()
+        torch_proto = bittensor.proto.Tensor (
+                                    version = bittensor.__version_as_int__,
+                                    buffer = data_buffer,
+                                    shape = shape,
+                                    dtype = dtype,
+                                    serializer = bittensor.proto.Serializer.RAW,
+                                    tensor_type = bittensor.proto.TensorType.TORCH,
+                                    modality = modality,
+                                    requires_grad = torch_tensor.requires_grad
+                                )
+        return torch_proto
+
+    def deserialize_to_torch(self, torch_proto: bittensor.proto.Tensor) -> torch.Tensor:
+        """Deserializes an bittensor.proto.Tensor to a torch.Tensor object.
+
+        Args:
+            torch_proto (bittensor.proto.Tensor): 
+                Proto containing torch tensor to derserialize.
+
+        Returns:
+            torch.Tensor: 
+                Deserialized torch tensor.
+
+        Raises:
+            DeserializationException: (Exception): 
+                Raised if the buffer size does not match the proto shape and dtype.
+        """
+        dtype = bittensor.serializer.bittensor_dtype_to_torch_dtype(torch_proto.dtype)
+        shape = tuple(torch_proto.shape)
+        numel = 1
+        for dim in shape:
+            numel *= dim
+        if len(torch_proto.buffer) != numel * torch.empty((), dtype = dtype).element_size():
+            raise bittensor.serializer.DeserializationException(
+                'RAW buffer of {} bytes does not match shape = {} and dtype = {}'.format(len(torch_proto.buffer), list(shape), dtype))
+        if numel == 0:
+            return torch.empty(shape, dtype = dtype).requires_grad_(torch_proto.requires_grad)
+        # The proto buffer is immutable bytes, wrap a writable bytearray so the tensor can be modified in place.
+        torch_object = torch.frombuffer(bytearray(torch_proto.buffer), dtype = dtype).view(shape)
+        return torch_object.requires_grad_(torch_proto.requires_grad)
+
+
+class QuantizedSerializer( Serializer ):
+    """ Make conversion between float torch tensors and bittensor.proto.torch using blockwise int8 or 4-bit quantization.
+
+    The flattened tensor is split into blocks of block_size elements (or rows when block_size is 0), each block is
+    scaled by its absolute maximum and rounded to a signed integer. The buffer holds the block size, the float32
+    scales and the quantized values (two 4-bit values per byte for QINT4).
+    """
+    header = struct.Struct('<I')
+
+    def __init__(self, bits: int = 8, block_size: int = 64):
+        if bits not in (4, 8):
+            raise ValueError('QuantizedSerializer supports 4 or 8 bits, got: {}'.format(bits))
+        if block_size < 0:
+            raise ValueError('block_size must be larger or eq to 0, got: {}'.format(block_size))
+        self.bits = bits
+        self.block_size = block_size
+        self.qmax = 2 ** (bits - 1) - 1
+        self.serializer_type = bittensor.proto.Serializer.QINT8 if bits == 8 else bittensor.proto.Serializer.QINT4
+
+    def serialize_from_torch(self, torch_tensor: torch.Tensor, modality: bittensor.proto.Modality) -> bittensor.proto.Tensor:
+        """ Serializes a float torch.Tensor to an bittensor Tensor proto with blockwise quantization.
+
+        Args:
+            torch_tensor (torch.Tensor): 
+                Torch tensor to serialize.
+
+            modality (bittensor.proto.Modality): 
+                Datatype modality. i.e. TENSOR, TEXT, IMAGE
+
+        Returns:
+            bittensor.proto.Tensor: 
+                The serialized torch tensor as bittensor.proto.proto. 
+
+        Raises:
+            SerializationException: (Exception): 
+                Raised if the tensor is not a float tensor.
+        """
+        if not torch_tensor.is_floating_point():
+            raise bittensor.serializer.SerializationException('QINT serializers only support float tensors, got torch.dtype = {}'.format(torch_tensor.dtype))
+        dtype = bittensor.serializer.torch_dtype_to_bittensor_dtype(torch_tensor.dtype)
+        shape = list(torch_tensor.shape)
+        block_size = self.block_size if self.block_size > 0 else (shape[-1] if len(shape) > 0 else 1)
+        block_size = max(block_size, 1)
+
+        values = torch_tensor.detach().cpu().float().reshape(-1)
+        n_blocks = math.ceil(values.numel() / block_size)
+        values = torch.nn.functional.pad(values, (0, n_blocks * block_size - values.numel())).view(n_blocks, block_size)
+
+        scales = values.abs().amax(dim = 1) / self.qmax  # [n_blocks]
+        scales[scales == 0] = 1
+        quantized = torch.round(values / scales[:, None]).clamp(-self.qmax, self.qmax).view(-1)
+        if self.bits == 8:
+            quantized = quantized.to(torch.int8)
+        else:
+            # Shift into [1, 15] and pack two values per byte.
+            quantized = (quantized + self.qmax + 1).to(torch.uint8)
+            if quantized.numel() % 2 == 1:
+                quantized = torch.nn.functional.pad(quantized, (0, 1))
+            quantized = quantized[0::2] | (quantized[1::2] << 4)
+
+        data_buffer = self.header.pack(block_size) + scales.numpy().tobytes() + quantized.numpy().tobytes()
+        torch_proto = bittensor.proto.Tensor (
+                                    version = bittensor.__version_as_int__,
+                                    buffer = data_buffer,
+                                    shape = shape,
+                                    dtype = dtype,
+                                    serializer = self.serializer_type,
+                                    tensor_type = bittensor.proto.TensorType.TORCH,
+                                    modality = modality,
+                                    requires_grad = torch_tensor.requires_grad
+                                )
+        return torch_proto
+
+    def deserialize_to_torch(self, torch_proto: bittensor.proto.Tensor) -> torch.Tensor:
+        """Deserializes an bittensor.proto.Tensor to a torch.Tensor object, dequantizing to the proto dtype.
+
+        Args:
+            torch_proto (bittensor.proto.Tensor): 
+                Proto containing torch tensor to derserialize.
+
+        Returns:
+            torch.Tensor: 
+                Deserialized torch tensor.
+
+        Raises:
+            DeserializationException: (Exception): 
+                Raised if the buffer size does not match the proto shape.
+        """
+        dtype = bittensor.serializer.bittensor_dtype_to_torch_dtype(torch_proto.dtype)
+        shape = tuple(torch_proto.shape)
+        numel = 1
+        for dim in shape:
+            numel *= dim
+        buffer = torch_proto.buffer
+        if len(buffer) < self.header.size:
+            raise bittensor.serializer.DeserializationException('QINT buffer of {} bytes is missing its header'.format(len(buffer)))
+        block_size, = self.header.unpack_from(buffer)
+        n_blocks = math.ceil(numel / block_size) if block_size > 0 else 0
+        n_values = n_blocks * block_size
+        n_data_bytes = n_values if self.bits == 8 else math.ceil(n_values / 2)
+        if block_size == 0 or len(buffer) != self.header.size + 4 * n_blocks + n_data_bytes:
+            raise bittensor.serializer.DeserializationException(
+                'QINT buffer of {} bytes does not match shape = {} and block_size = {}'.format(len(buffer), list(shape), block_size))
+        if numel == 0:
+            return torch.empty(shape, dtype = dtype).requires_grad_(torch_proto.requires_grad)
+
+        buffer = bytearray(buffer)
+        scales = torch.frombuffer(buffer, dtype = torch.float32, count = n_blocks, offset = self.header.size)
+        if self.bits == 8:
+            quantized = torch.frombuffer(buffer, dtype = torch.int8, count = n_data_bytes, offset = self.header.size + 4 * n_blocks).float()
+        else:
+            packed = torch.frombuffer(buffer, dtype = torch.uint8, count = n_data_bytes, offset = self.header.size + 4 * n_blocks)
+            quantized = torch.stack((packed & 0x0F, packed >> 4), dim = 1).view(-1)[:n_values].float() - (self.qmax + 1)
+        values = quantized.view(n_blocks, block_size) * scales[:, None]
+        torch_object = values.view(-1)[:numel].view(shape).to(dtype)
+        return torch_object.requires_grad_(torch_proto.requires_grad)
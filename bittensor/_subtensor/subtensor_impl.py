@@ -910,7 +910,7 @@ class Subtensor:
         
         return NeuronInfoLite.list_from_vec_u8( result )
 
-    def metagraph( self, netuid: int, block: Optional[int] = None ) -> 'bittensor.Metagraph':
+    def metagraph( self, netuid: int, block: Optional[int] = None, sparse: bool = False, lite: bool = False ) -> 'bittensor.Metagraph':
         r""" Returns the metagraph for the subnet.
         Args:
             netuid ( int ):
@@ -918,6 +918,11 @@ class Subtensor:
             block (Optional[int]):
                 The block to create the metagraph for.
                 Defaults to latest.
+            sparse (bool):
+                If true, the weights and bonds are stored as sparse tensors.
+            lite (bool):
+                If true, the metagraph is built from the lite neurons, without the weights and bonds.
+                They are fetched with this subtensor on first access of metagraph.W or metagraph.B.
         Returns:
             metagraph ( `bittensor.Metagraph` ):
                 The metagraph for the subnet at the block.
@@ -928,7 +933,10 @@ class Subtensor:
             status.start()
         
         # Get neurons.
-        neurons = self.neurons( netuid = netuid, block = block )
+        if lite:
+            neurons = self.neurons_lite( netuid = netuid, block = block )
+        else:
+            neurons = self.neurons( netuid = netuid, block = block )
         # Get subnet info.
         subnet_info: Optional[bittensor.SubnetInfo] = self.get_subnet_info( netuid = netuid, block = block )
         if subnet_info == None:
@@ -940,7 +948,9 @@ class Subtensor:
         # Create metagraph.
         block_number = self.block
 
-        metagraph = bittensor.metagraph.from_neurons( network = self.network, netuid = netuid, info = subnet_info, neurons = neurons, block = block_number )
+        metagraph = bittensor.metagraph.from_neurons( network = self.network, netuid = netuid, info = subnet_info, neurons = neurons, block = block_number, sparse = sparse, lite = lite )
+        if lite:
+            metagraph._subtensor = self
         print("Metagraph subtensor: ", self.network)
         return metagraph
 
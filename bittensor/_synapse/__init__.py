@@ -79,6 +79,7 @@ class synapse:
         forward_response_serializer_type: 'bittensor.proto.Serializer.Type' = bittensor.proto.Serializer.MSGPACK,
         backward_request_serializer_type: 'bittensor.proto.Serializer.Type' = bittensor.proto.Serializer.MSGPACK,
         backward_response_serializer_type: 'bittensor.proto.Serializer.Type' = bittensor.proto.Serializer.MSGPACK,
+        sparse_response: bool = False,
     ) -> TextCausalLM:
         """ Factory function which returns a TextCausalLM synapse adapter given arguments.
             Args:
@@ -90,6 +91,9 @@ class synapse:
                     Serializer used to pack torch tensors on forward request.
                 backward_response_serializer_type (:obj:`bittensor.proto.Serializer.Type` of shape :obj:`(1)`, `optional`, :default: `bittensor.proto.Serializer.MSGPACK`):
                     Serialzer used to pack torch tensors on backward response.
+                sparse_response (:obj:`bool`, `optional`, :default: `False`):
+                    If true, responses are returned as [batch_size, sequence_len, topk + topk + 1] topk probabilities, 
+                    topk token ids and floor probability instead of full vocabulary logits.
             Returns:
                 TextCausalLM (:obj:`TextCausalLM`, `required`):
                     TextCausalLM instance adapter class.
@@ -100,6 +104,7 @@ class synapse:
             forward_response_serializer_type = forward_response_serializer_type,
             backward_request_serializer_type = backward_request_serializer_type,
             backward_response_serializer_type = backward_response_serializer_type,
+            sparse_response = sparse_response,
         )
 
     @staticmethod
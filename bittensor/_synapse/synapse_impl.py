@@ -27,6 +27,10 @@ class Synapse:
     # Unique proto enum.
     synapse_type: bittensor.proto.Synapse.SynapseType = None
 
+    # True if forward responses and gradients are plain float activations which survive lossy serializers.
+    # Synapses carrying token ids or topk indices fall back to MSGPACK when a lossy serializer is requested.
+    allows_lossy_serialization: bool = False
+
     def __init__(
         self, 
         forward_request_serializer_type: 'bittensor.proto.Serializer.Type' = bittensor.proto.Serializer.MSGPACK,
@@ -131,15 +135,23 @@ class Synapse:
     def encode_backward_response_gradient ( self, backward_response_gradient: torch.Tensor ) -> torch.Tensor: return backward_response_gradient
     def decode_backward_response_gradient ( self, backward_response_gradient: torch.Tensor ) -> torch.Tensor: return backward_response_gradient
 
+    def wire_serializer_type( self, serializer_type: 'bittensor.proto.Serializer.Type', lossy: bool = True ) -> 'bittensor.proto.Serializer.Type':
+        """ Returns the serializer used on the wire, falling back to MSGPACK if the requested one is lossy and the tensor can not be quantized. 
+            Deserialization always follows the serializer recorded in the received bittensor.proto.Tensor.
+        """
+        if serializer_type in bittensor.serializer.lossy_serializer_types and not ( lossy and self.allows_lossy_serialization ):
+            return bittensor.proto.Serializer.MSGPACK
+        return serializer_type
+
     def serialize_forward_request_tensor( self, forward_request_tensor: torch.Tensor ) -> Tuple[ 'bittensor.proto.Tensor', 'bittensor.proto.ReturnCode',  str ]:        
         self.check_forward_request_tensor ( forward_request_tensor )
         forward_request_tensor = self.encode_forward_request_tensor ( forward_request_tensor )
-        tensor_serialzier = bittensor.serializer( serializer_type = self.forward_request_serializer_type )
+        tensor_serialzier = bittensor.serializer( serializer_type = self.wire_serializer_type( self.forward_request_serializer_type, lossy = False ) )
         return tensor_serialzier.serialize( tensor_obj = forward_request_tensor, from_type = bittensor.proto.TensorType.TORCH )
 
     def deserialize_forward_request_tensor( self, forward_request_proto: bittensor.proto.Tensor ) -> Tuple[ 'torch.Tensor', 'bittensor.proto.ReturnCode',  str ]:
         """ Returns a torch.Tensor from wire proto.Tensor after relevant deserialization has been applied. """
-        tensor_deserialzier = bittensor.serializer( serializer_type = self.forward_request_serializer_type )
+        tensor_deserialzier = bittensor.serializer( serializer_type = forward_request_proto.serializer )
         forward_request_tensor = tensor_deserialzier.deserialize( tensor_pb2 = forward_request_proto, to_type = bittensor.proto.TensorType.TORCH )
         forward_request_tensor = self.decode_forward_request_tensor ( forward_request_tensor )
         self.check_forward_request_tensor ( forward_request_tensor )
@@ -149,12 +161,12 @@ class Synapse:
         """ Returns a bittensor.proto.Tensor to be sent on the wire after relevant serialization applied. """  
         encoded_tensor = self.encode_forward_response_tensor ( forward_response_tensor )
         self.check_forward_response_tensor ( forward_request_tensor, encoded_tensor )
-        tensor_serialzier = bittensor.serializer( serializer_type = self.forward_response_serializer_type )
+        tensor_serialzier = bittensor.serializer( serializer_type = self.wire_serializer_type( self.forward_response_serializer_type ) )
         return tensor_serialzier.serialize( tensor_obj = encoded_tensor, from_type = bittensor.proto.TensorType.TORCH )
     
     def deserialize_forward_response_proto( self, forward_request_tensor: torch.Tensor, forward_response_proto: bittensor.proto.Tensor ) -> Tuple[ 'torch.Tensor', 'bittensor.proto.ReturnCode',  str ]:
         """ Returns a torch.Tensor from wire proto.Tensor after relevant deserialization has been applied. """
-        tensor_deserialzier = bittensor.serializer( serializer_type = self.forward_response_serializer_type )
+        tensor_deserialzier = bittensor.serializer( serializer_type = forward_response_proto.serializer )
         forward_response_tensor = tensor_deserialzier.deserialize( tensor_pb2 = forward_response_proto, to_type = bittensor.proto.TensorType.TORCH )
         self.check_forward_response_tensor ( forward_request_tensor, forward_response_tensor )
         forward_response_tensor = self.decode_forward_response_tensor ( forward_request_tensor, forward_response_tensor )
@@ -165,11 +177,11 @@ class Synapse:
         """ Returns a bittensor.proto.Tensor gradient to be sent on the wire after relevant serialization applied. """
         self.check_backward_request_gradient ( forward_request_tensor, backward_request_gradient )
         encoded_tensor = self.encode_backward_request_gradient ( backward_request_gradient )
-        tensor_serialzier = bittensor.serializer( serializer_type = self.forward_request_serializer_type )
+        tensor_serialzier = bittensor.serializer( serializer_type = self.wire_serializer_type( self.forward_request_serializer_type ) )
         return tensor_serialzier.serialize( tensor_obj = encoded_tensor, from_type = bittensor.proto.TensorType.TORCH )
 
     def deserialize_backward_request_gradient( self, forward_request_tensor: torch.Tensor, backward_request_proto: bittensor.proto.Tensor ) -> Tuple[ 'torch.Tensor', 'bittensor.proto.ReturnCode',  str ]:
-        tensor_deserialzier = bittensor.serializer( serializer_type = self.backward_request_serializer_type )
+        tensor_deserialzier = bittensor.serializer( serializer_type = backward_request_proto.serializer )
         backward_request_gradient = tensor_deserialzier.deserialize( tensor_pb2 = backward_request_proto, to_type = bittensor.proto.TensorType.TORCH )
         backward_request_gradient = self.decode_backward_request_gradient ( backward_request_gradient )
         self.check_backward_request_gradient (forward_request_tensor,  backward_request_gradient )
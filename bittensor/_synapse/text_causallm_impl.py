@@ -32,6 +32,7 @@ class TextCausalLM (Synapse):
         forward_response_serializer_type: 'bittensor.proto.Serializer.Type' = bittensor.proto.Serializer.MSGPACK,
         backward_request_serializer_type: 'bittensor.proto.Serializer.Type' = bittensor.proto.Serializer.MSGPACK,
         backward_response_serializer_type: 'bittensor.proto.Serializer.Type' = bittensor.proto.Serializer.MSGPACK,
+        sparse_response: bool = False,
     ):  
         """ TextCausalLM Synapse initializer.
         Args:
@@ -45,6 +46,10 @@ class TextCausalLM (Synapse):
                 Serializer used to pack torch tensors on forward request.
             backward_response_serializer_type (:obj:`bittensor.proto.Serializer.Type` of shape :obj:`(1)`, `optional`, :default: `bittensor.proto.Serializer.MSGPACK`):
                 Serialzer used to pack torch tensors on backward response.
+            sparse_response (:obj:`bool`, `optional`, :default: `False`):
+                Local decoding option, not sent on the wire. If true, forward responses are not densified to vocab size
+                and are returned as [batch_size, sequence_len, topk + topk + 1] topk probabilities, topk token ids and floor probability.
+                Use densify() or target_log_probs() to evaluate them. Sparse responses are not passed backward to the endpoint.
         Returns:
             TextLastHiddenState (:obj:`TextLastHiddenState`, `required`):
                 TextLastHiddenState instance adapter class.
@@ -56,6 +61,7 @@ class TextCausalLM (Synapse):
             backward_response_serializer_type
         )
         self.topk = topk
+        self.sparse_response = sparse_response
         self.synapse_type = TextCausalLM.synapse_type
 
     def __repr__(self) -> str: return self.__str__()
@@ -111,6 +117,8 @@ class TextCausalLM (Synapse):
             raise ValueError( "forward_response_tensor.shape must be in [{}, {}, {}], got: {} for synapse: {}".format( forward_request_tensor.size(0) , forward_request_tensor.size(1), self.topk*2, list(forward_response_tensor.shape), self ) ) 
 
     def check_backward_request_gradient  ( self, forward_request_tensor, backward_request_gradient ):
+        if self.sparse_response:
+            raise ValueError( "sparse responses can not be passed backward for synapse: {}".format( self ) )
         if ( len( backward_request_gradient.shape ) != 3 or
              backward_request_gradient.size(0) != forward_request_tensor.size(0) or
              backward_request_gradient.size(1) != forward_request_tensor.size(1) or 
@@ -130,15 +138,26 @@ class TextCausalLM (Synapse):
         return encoded_probs  # [batch_size, sequence_len, topk + topk]
 
     def decode_forward_response_tensor( self, forward_request_tensor: torch.Tensor, forward_response_tensor: torch.Tensor ) -> torch.Tensor:
-        """ Returns full logits by decoding topk-encoding input. """
-        batch_size, sequence_len, _ = forward_response_tensor.shape
-        encoded_probs = forward_response_tensor  # encoded probabilities: [batch_size, sequence_len, topk + topk]
-        topk_values = encoded_probs[..., :self.topk]  # topk probs: [batch_size, sequence_len, topk]
-        topk_indices = encoded_probs[..., self.topk:].long()  # topk probs indices: [batch_size, sequence_len, topk]
-
+        """ Returns full logits by decoding topk-encoding input, or the sparse topk-encoding with floor probability if sparse_response is set. """
+        sparse_tensor = self.sparse_floor( forward_response_tensor )  # [batch_size, sequence_len, topk + topk + 1]
+        if self.sparse_response:
+            return sparse_tensor
+        return self.densify( sparse_tensor )  # [batch_size, sequence_len, vocab_size]
+
+    def sparse_floor( self, forward_response_tensor: torch.Tensor ) -> torch.Tensor:
+        """ Appends the floor probability of tokens outside the topk to the topk-encoding. """
+        topk_values = forward_response_tensor[..., :self.topk]  # topk probs: [batch_size, sequence_len, topk]
         topk_pmass = topk_values.sum(dim=-1)  # topk probability mass: [batch_size, sequence_len]
         remainder_pmass = torch.clamp(1 - topk_pmass, 1e-40, 1)  # remainder probability mass: [batch_size, sequence_len]
         remainder_floor = remainder_pmass / (bittensor.__vocab_size__ - self.topk)  # divide remainder: [batch_size, sequence_len]
+        return torch.cat((forward_response_tensor[..., :2 * self.topk], remainder_floor[..., None]), dim=-1)  # [batch_size, sequence_len, topk + topk + 1]
+
+    def densify( self, sparse_tensor: torch.Tensor ) -> torch.Tensor:
+        """ Returns full logits [batch_size, sequence_len, vocab_size] from a sparse [batch_size, sequence_len, topk + topk + 1] response. """
+        batch_size, sequence_len, _ = sparse_tensor.shape
+        topk_values = sparse_tensor[..., :self.topk]  # topk probs: [batch_size, sequence_len, topk]
+        topk_indices = sparse_tensor[..., self.topk:2 * self.topk].long()  # topk probs indices: [batch_size, sequence_len, topk]
+        remainder_floor = sparse_tensor[..., -1]  # floor prob: [batch_size, sequence_len]
 
         logits = torch.ones((batch_size, sequence_len, bittensor.__vocab_size__)).to(topk_values.device)
         logits *= torch.log(remainder_floor)[:, :, None]  # set probability floor: [batch_size, sequence_len, vocab_size]
@@ -146,6 +165,24 @@ class TextCausalLM (Synapse):
 
         return logits  # [batch_size, sequence_len, vocab_size]
 
+    def target_probs( self, sparse_tensor: torch.Tensor, target: torch.Tensor ) -> torch.Tensor:
+        """ Returns the probability of each target token [batch_size, sequence_len] from a sparse [batch_size, sequence_len, topk + topk + 1] response,
+            without densifying to vocab size.
+        """
+        topk_values = sparse_tensor[..., :self.topk]  # topk probs: [batch_size, sequence_len, topk]
+        topk_indices = sparse_tensor[..., self.topk:2 * self.topk].long()  # topk probs indices: [batch_size, sequence_len, topk]
+        remainder_floor = sparse_tensor[..., -1]  # floor prob: [batch_size, sequence_len]
+
+        matches = topk_indices == target[..., None]  # [batch_size, sequence_len, topk]
+        matched_probs = (topk_values * matches).sum(dim=-1)  # [batch_size, sequence_len]
+        return torch.where(matches.any(dim=-1), matched_probs, remainder_floor)  # [batch_size, sequence_len]
+
+    def target_log_probs( self, sparse_tensor: torch.Tensor, target: torch.Tensor ) -> torch.Tensor:
+        """ Returns the log probability of each target token [batch_size, sequence_len] from a sparse response. 
+            The negative mean equals the cross entropy of the densified logits.
+        """
+        return torch.log( self.target_probs( sparse_tensor, target ) + 1e-40 )
+
     def encode_backward_response_gradient( self, backward_request_gradient: torch.Tensor ) -> torch.Tensor: return backward_request_gradient
     def decode_backward_response_gradient ( self, backward_request_gradient: torch.Tensor ) -> torch.Tensor: return backward_request_gradient
 
@@ -169,7 +206,8 @@ class TextCausalLM (Synapse):
 
     def nill_forward_response_tensor( self, forward_request_tensor: torch.Tensor ) -> torch.Tensor:
         try:
-            return torch.zeros( ( forward_request_tensor.size(0), forward_request_tensor.size(1), bittensor.__vocab_size__ ), dtype=torch.float32)
+            last_dim = 2 * self.topk + 1 if self.sparse_response else bittensor.__vocab_size__
+            return torch.zeros( ( forward_request_tensor.size(0), forward_request_tensor.size(1), last_dim ), dtype=torch.float32)
         except:
             return torch.tensor([])
 
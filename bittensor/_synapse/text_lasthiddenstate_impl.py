@@ -26,6 +26,7 @@ class TextLastHiddenState (Synapse):
     """ TastHiddenState Synapse type for getting last hidden layer embeddings from languge models.
     """
     synapse_type: bittensor.proto.Synapse.SynapseType = bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE
+    allows_lossy_serialization: bool = True
 
     @staticmethod
     def shift_mask_based_on_shape ( mask: List[int], batch_size: int, sequence_length: int ) -> List[int]:
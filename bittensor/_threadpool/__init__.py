@@ -31,6 +31,7 @@ class prioritythreadpool:
             config: 'bittensor.config' = None,
             max_workers: int = None,
             maxsize: int = None,
+            scheduling: str = None,
         ):
         r""" Initializes a priority thread pool.
             Args:
@@ -40,15 +41,18 @@ class prioritythreadpool:
 .                   The maximum number of threads in thread pool
                 maxsize (default=-1, type=int)
                     The maximum number of tasks in the priority queue
+                scheduling (default='priority', type=str)
+                    'priority' runs the highest priority first, 'fair' shares the threads between hotkeys weighted by priority
         """        
         if config == None: 
             config = prioritythreadpool.config()
         config = copy.deepcopy( config )
         config.axon.priority.max_workers = max_workers if max_workers != None else config.axon.priority.max_workers
         config.axon.priority.maxsize = maxsize if maxsize != None else config.axon.priority.maxsize
+        config.axon.priority.scheduling = scheduling if scheduling != None else config.axon.priority.scheduling
 
         prioritythreadpool.check_config( config )
-        return priority_thread_pool_impl.PriorityThreadPoolExecutor(maxsize = config.axon.priority.maxsize, max_workers = config.axon.priority.max_workers)
+        return priority_thread_pool_impl.PriorityThreadPoolExecutor(maxsize = config.axon.priority.maxsize, max_workers = config.axon.priority.max_workers, scheduling = config.axon.priority.scheduling)
 
     @classmethod
     def add_args(cls, parser: argparse.ArgumentParser, prefix: str = None ):
@@ -58,6 +62,7 @@ class prioritythreadpool:
         try:
             parser.add_argument('--' + prefix_str + 'axon.priority.max_workers', type = int, help='''maximum number of threads in thread pool''', default = bittensor.defaults.axon.priority.max_workers)
             parser.add_argument('--' + prefix_str + 'axon.priority.maxsize', type=int, help='''maximum size of tasks in priority queue''', default = bittensor.defaults.axon.priority.maxsize)  
+            parser.add_argument('--' + prefix_str + 'axon.priority.scheduling', type=str, choices=['priority', 'fair'], help='''priority: highest priority first, fair: earliest deadline first within a hotkey, weighted fair queueing across hotkeys''', default = bittensor.defaults.axon.priority.scheduling)
         except argparse.ArgumentError:
             # re-parsing arguments.
             pass
@@ -79,6 +84,7 @@ class prioritythreadpool:
         defaults.axon.priority = bittensor.Config()
         defaults.axon.priority.max_workers = os.getenv('BT_AXON_PRIORITY_MAX_WORKERS') if os.getenv('BT_AXON_PRIORITY_MAX_WORKERS') != None else 5
         defaults.axon.priority.maxsize = os.getenv('BT_AXON_PRIORITY_MAXSIZE') if os.getenv('BT_AXON_PRIORITY_MAXSIZE') != None else 10
+        defaults.axon.priority.scheduling = os.getenv('BT_AXON_PRIORITY_SCHEDULING') if os.getenv('BT_AXON_PRIORITY_SCHEDULING') != None else 'priority'
     
     @classmethod   
     def config(cls) -> 'bittensor.Config':
@@ -95,3 +101,4 @@ class prioritythreadpool:
         """
         assert isinstance(config.axon.priority.max_workers, int), 'axon.priority.max_workers must be a int'
         assert isinstance(config.axon.priority.maxsize, int), 'axon.priority.maxsize must be a int'
+        assert config.axon.priority.scheduling in ['priority', 'fair'], 'axon.priority.scheduling must be priority or fair'
@@ -10,7 +10,11 @@ import os
 import sys
 import bittensor
 from concurrent.futures import _base
+from collections import OrderedDict
+from types import SimpleNamespace
+import heapq
 import itertools
+import math
 import queue
 import random
 import threading
@@ -36,18 +40,36 @@ _threads_queues = weakref.WeakKeyDictionary()
 _shutdown = False
 
 class _WorkItem(object):
-    def __init__(self, future, fn, start_time, args, kwargs):
+    def __init__(self, future, fn, start_time, args, kwargs, hotkey=None, deadline=None, on_dequeue=None, priority_level=0):
         self.future = future
         self.fn = fn
         self.start_time = start_time
         self.args = args
         self.kwargs = kwargs
+        self.hotkey = hotkey
+        # Stale after a block unless the caller gives its own deadline.
+        self.deadline = deadline if deadline is not None else start_time + bittensor.__blocktime__
+        self.on_dequeue = on_dequeue
+        # Power of two level of the priority, see PriorityThreadPoolExecutor.queued_ahead.
+        self.priority_level = priority_level
+
+    def expired(self):
+        return time.time() > self.deadline
 
     def run(self):
         """ Run the given work item
         """
-        # Checks if future is canceled or if work item is stale
-        if (not self.future.set_running_or_notify_cancel()) or (time.time()-self.start_time > bittensor.__blocktime__):
+        expired = self.expired()
+        if self.on_dequeue is not None:
+            self.on_dequeue(self, expired)
+
+        # Checks if future is canceled
+        if not self.future.set_running_or_notify_cancel():
+            return
+
+        # Checks if work item is stale, the caller is told instead of waiting until its own timeout.
+        if expired:
+            self.future.set_exception(_base.TimeoutError('Work item is stale after {:.2f}s in queue'.format(time.time()-self.start_time)))
             return
 
         try:
@@ -62,6 +84,83 @@ class _WorkItem(object):
 
 NULL_ENTRY = (sys.maxsize, _WorkItem(None, None, time.time(), (), {}))
 
+
+class _FairQueue(queue.Queue):
+    """ Queue of (weight, work item) entries, served by weighted fair queueing across hotkeys
+        and earliest deadline first within a hotkey.
+
+        Each hotkey with queued items holds a virtual finish tag, advanced by 1/weight every time one
+        of its items is served (self-clocked fair queueing), so that hotkeys share the workers in
+        proportion to their weight (stake) and a heavy hotkey can not starve the others.
+        Cancelled and expired items are not searched for: they are popped when they reach the head
+        of their hotkey, in O(log n), without using the hotkey's turn, and handed to the worker which
+        signals their callers.
+    """
+    # Weight of hotkeys without stake.
+    min_weight = 1e-3
+
+    def _init(self, maxsize):
+        # Hotkey to its queued items (heap by deadline), weight and finish tag.
+        self.flows = {}
+        # Heap of (finish tag, sequence, hotkey) of the hotkeys with queued items.
+        self.active = []
+        self.virtual_time = 0.0
+        self.size = 0
+        # Shutdown entries, served once no work is left.
+        self.sentinels = 0
+        self.sequence = itertools.count()
+
+    def _qsize(self):
+        return self.size + self.sentinels
+
+    def _put(self, entry):
+        weight, item = entry
+        if weight == sys.maxsize:
+            self.sentinels += 1
+            return
+        flow = self.flows.get(item.hotkey)
+        if flow is None:
+            flow = SimpleNamespace(heap = [], weight = self.min_weight, finish = self.virtual_time)
+            self.flows[item.hotkey] = flow
+        flow.weight = max(weight, self.min_weight)
+        if len(flow.heap) == 0:
+            flow.finish = max(self.virtual_time, flow.finish) + 1 / flow.weight
+            heapq.heappush(self.active, (flow.finish, next(self.sequence), item.hotkey))
+        heapq.heappush(flow.heap, (item.deadline, next(self.sequence), item))
+        self.size += 1
+
+    def _get(self):
+        if self.size == 0:
+            self.sentinels -= 1
+            return NULL_ENTRY
+        finish, _, hotkey = heapq.heappop(self.active)
+        flow = self.flows[hotkey]
+        self.virtual_time = finish
+        _, _, item = heapq.heappop(flow.heap)
+        self.size -= 1
+        dropped = item.future.cancelled() or item.expired()
+        if len(flow.heap) > 0:
+            # A dropped item keeps the hotkey's turn for its next item.
+            if not dropped:
+                flow.finish = finish + 1 / flow.weight
+            heapq.heappush(self.active, (flow.finish, next(self.sequence), hotkey))
+        else:
+            del self.flows[hotkey]
+        return (flow.weight, item)
+
+    def queued_ahead(self, weight, hotkey):
+        """ Estimates the number of queued items served before a new item of the hotkey:
+            every other hotkey is served weight/own weight items per item of the hotkey.
+        """
+        weight = max(weight, self.min_weight)
+        flow = self.flows.get(hotkey)
+        turns = (len(flow.heap) if flow is not None else 0) + 1
+        ahead = turns - 1
+        for other_hotkey, other in self.flows.items():
+            if other_hotkey != hotkey:
+                ahead += min(len(other.heap), math.ceil(turns * other.weight / weight))
+        return ahead
+
 def _worker(executor_reference, work_queue, initializer, initargs):
     if initializer is not None:
         try:
@@ -115,9 +214,13 @@ class PriorityThreadPoolExecutor(_base.Executor):
     """
     # Used to assign unique thread names when thread_name_prefix is not supplied.
     _counter = itertools.count().__next__
+    # Hotkeys without queued items whose stats are kept, the least recently active are forgotten.
+    max_idle_hotkey_stats = 4096
+    # Queued items are counted per power of two of their priority, from 2**-32 to 2**31.
+    priority_levels = 64
 
     def __init__(self, maxsize = -1, max_workers=None, thread_name_prefix='',
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), scheduling='priority'):
         """Initializes a new ThreadPoolExecutor instance.
         Args:
             max_workers: The maximum number of threads that can be used to
@@ -125,6 +228,8 @@ class PriorityThreadPoolExecutor(_base.Executor):
             thread_name_prefix: An optional name prefix to give our threads.
             initializer: An callable used to initialize worker threads.
             initargs: A tuple of arguments to pass to the initializer.
+            scheduling: 'priority' runs the highest priority first, 'fair' shares
+                the workers between hotkeys weighted by priority (see _FairQueue).
         """
         if max_workers is None:
             # Use this number because ThreadPoolExecutor is often
@@ -135,9 +240,22 @@ class PriorityThreadPoolExecutor(_base.Executor):
 
         if initializer is not None and not callable(initializer):
             raise TypeError("initializer must be a callable")
+        if scheduling not in ('priority', 'fair'):
+            raise ValueError("scheduling must be 'priority' or 'fair'")
 
         self._max_workers = max_workers
-        self._work_queue = queue.PriorityQueue(maxsize = maxsize)
+        self._scheduling = scheduling
+        if scheduling == 'fair':
+            self._work_queue = _FairQueue(maxsize = maxsize)
+        else:
+            self._work_queue = queue.PriorityQueue(maxsize = maxsize)
+        # Queue depth, wait time and expired items per hotkey.
+        self._hotkey_stats = {}
+        # Hotkeys of _hotkey_stats without queued items, ordered from least to most recently active.
+        self._idle_hotkeys = OrderedDict()
+        # Number of queued items per priority level, in 'priority' scheduling.
+        self._queued_per_level = [0] * self.priority_levels
+        self._stats_lock = threading.Lock()
         self._idle_semaphore = threading.Semaphore(0)
         self._threads = set()
         self._broken = False
@@ -152,6 +270,84 @@ class PriorityThreadPoolExecutor(_base.Executor):
     def is_empty(self):
         return self._work_queue.empty()
 
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    @property
+    def scheduling(self):
+        return self._scheduling
+
+    def queued_ahead(self, priority: float, hotkey: str = None) -> int:
+        """ Returns the number of queued work items which run before a new item with this priority and hotkey.
+            In 'priority' scheduling this counts the items of the same or higher power of two of priority,
+            from counters kept on enqueue and dequeue: an upper bound which does not scan the queue.
+        """
+        if self._scheduling == 'fair':
+            with self._work_queue.mutex:
+                return self._work_queue.queued_ahead(priority, hotkey)
+        with self._stats_lock:
+            return sum(self._queued_per_level[self._priority_level(priority):])
+
+    @classmethod
+    def _priority_level(cls, priority: float) -> int:
+        if priority <= 0:
+            return 0
+        _, exponent = math.frexp(priority)
+        return min(max(exponent + cls.priority_levels // 2, 0), cls.priority_levels - 1)
+
+    def hotkey_stats(self, hotkey: str) -> SimpleNamespace:
+        """ Returns the queue metrics of the hotkey: depth (queued items), wait_time
+            (moving average of seconds in queue) and expired (items dropped past their deadline).
+        """
+        with self._stats_lock:
+            stats = self._hotkey_stats.get(hotkey)
+            if stats is None:
+                return SimpleNamespace(depth = 0, wait_time = 0.0, expired = 0)
+            return SimpleNamespace(**vars(stats))
+
+    def _on_enqueue(self, item):
+        with self._stats_lock:
+            if self._scheduling == 'priority':
+                self._queued_per_level[item.priority_level] += 1
+            if item.hotkey is None:
+                return
+            stats = self._hotkey_stats.get(item.hotkey)
+            if stats is None:
+                stats = SimpleNamespace(depth = 0, wait_time = 0.0, expired = 0)
+                self._hotkey_stats[item.hotkey] = stats
+            stats.depth += 1
+            self._idle_hotkeys.pop(item.hotkey, None)
+
+    def _on_dequeue(self, item, expired):
+        with self._stats_lock:
+            stats = self._unqueue(item)
+            if stats is None:
+                return
+            stats.wait_time = 0.9 * stats.wait_time + 0.1 * (time.time() - item.start_time)
+            if expired:
+                stats.expired += 1
+
+    def _on_rejected(self, item):
+        # Undoes _on_enqueue for an item the full work queue did not take.
+        with self._stats_lock:
+            self._unqueue(item)
+
+    def _unqueue(self, item):
+        # Removes the item from the queued counts, returns its hotkey stats. Called with _stats_lock held.
+        if self._scheduling == 'priority':
+            self._queued_per_level[item.priority_level] -= 1
+        if item.hotkey is None:
+            return None
+        stats = self._hotkey_stats[item.hotkey]
+        stats.depth -= 1
+        if stats.depth == 0:
+            self._idle_hotkeys[item.hotkey] = None
+            while len(self._idle_hotkeys) > self.max_idle_hotkey_stats:
+                idle_hotkey, _ = self._idle_hotkeys.popitem(last = False)
+                del self._hotkey_stats[idle_hotkey]
+        return stats
+
     def submit(self, fn, *args, **kwargs):
         with self._shutdown_lock:
             if self._broken:
@@ -164,17 +360,28 @@ class PriorityThreadPoolExecutor(_base.Executor):
                                    'interpreter shutdown')
 
             priority = kwargs.get('priority', random.randint(0, 1000000))
-            if priority == 0:
+            if priority == 0 and self._scheduling == 'priority':
                 priority = random.randint(1, 100)
             eplison = random.uniform(0,0.01) * priority
             start_time = time.time()
             if 'priority' in kwargs:
                 del kwargs['priority']
-            
+            # Scheduling arguments, not passed to fn.
+            hotkey = kwargs.pop('priority_hotkey', None)
+            deadline = kwargs.pop('priority_deadline', None)
 
             f = _base.Future()
-            w = _WorkItem(f, fn, start_time, args, kwargs)
-            self._work_queue.put((-float(priority + eplison), w), block=False)
+            w = _WorkItem(f, fn, start_time, args, kwargs, hotkey = hotkey, deadline = deadline, on_dequeue = self._on_dequeue, priority_level = self._priority_level(priority))
+            # Counted before the put, a worker may dequeue the item as soon as it is queued.
+            self._on_enqueue(w)
+            try:
+                if self._scheduling == 'fair':
+                    self._work_queue.put((float(priority), w), block=False)
+                else:
+                    self._work_queue.put((-float(priority + eplison), w), block=False)
+            except queue.Full:
+                self._on_rejected(w)
+                raise
             self._adjust_thread_count()
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
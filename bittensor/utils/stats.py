@@ -18,6 +18,8 @@
 # DEALINGS IN THE SOFTWARE.
 
 import time
+import bisect
+from typing import List, Tuple
 
 class timed_rolling_avg():
     """ A exponential moving average that updates values based on time since last update.
@@ -82,3 +84,71 @@ class EventsPerSecondRollingAverage():
     
     def get(self) -> float:
         return float(self.value)
+
+def geometric_bounds(min_value: float, max_value: float, growth: float) -> List[float]:
+    """ Returns the bucket bounds from min_value, each growth times the previous one, up to max_value included.
+    """
+    bounds = []
+    bound = min_value
+    while bound < max_value:
+        bounds.append( bound )
+        bound *= growth
+    bounds.append( max_value )
+    return bounds
+
+class LatencyHistogram():
+    """ A fixed bucket histogram of latencies with geometric bucket bounds. Each bucket counts the latencies up to
+        its bound, the last bucket also counts the larger ones.
+        Counts are halved once max_count observations are reached, so that old latencies fade out. 
+        A max_count of None keeps all observations.
+    """
+    def __init__(self, min_value: float = 0.001, max_value: float = 120.0, growth: float = 1.2, max_count: int = 1000, bounds: List[float] = None):
+        self.bounds = list( bounds ) if bounds != None else geometric_bounds( min_value, max_value, growth )
+        self.counts = [ 0 for _ in self.bounds ]
+        self.count = 0
+        self.sum = 0.0
+        self.max_count = max_count
+
+    def observe(self, value: float):
+        """ Adds value to the bucket with the smallest bound larger or equal to value.
+        """
+        index = min( bisect.bisect_left( self.bounds, value ), len( self.bounds ) - 1 )
+        self.counts[ index ] += 1
+        self.count += 1
+        self.sum += value
+        self.decay()
+
+    def decay(self):
+        """ Halves the counts and the sum once max_count observations are reached.
+        """
+        if self.max_count != None and self.count >= self.max_count:
+            self.counts = [ count / 2 for count in self.counts ]
+            self.count = sum( self.counts )
+            self.sum = self.sum / 2
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """ Returns the counts, sum and count of the observations, see merge.
+        """
+        return list( self.counts ), self.sum, self.count
+
+    def merge(self, snapshot: Tuple[List[float], float, float]):
+        """ Adds the observations of a snapshot of a histogram with the same bounds.
+        """
+        counts, total, count = snapshot
+        self.counts = [ a + b for a, b in zip( self.counts, counts ) ]
+        self.count += count
+        self.sum += total
+        self.decay()
+
+    def quantile(self, q: float) -> float:
+        """ Returns the bucket bound under which a fraction q of the observations fall, None if there are no observations.
+        """
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip( self.bounds, self.counts ):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return self.bounds[-1]
@@ -101,6 +101,86 @@ def convert_bond_uids_and_vals_to_tensor( n: int, uids: List[int], bonds: List[i
         row_bonds[ uid_j ] = int( bij ) 
     return row_bonds
 
+def convert_neuron_uids_and_vals_to_tensor( n: int, rows: List[int], uids: List[int], vals: List[int], scale: float = 1.0 ) -> 'torch.FloatTensor':
+    r""" Converts the (uid, value) pairs of many neurons from chain representation into a [n, n] torch tensor with a single scatter,
+        row i holds the pairs of neuron i as convert_weight_uids_and_vals_to_tensor or convert_bond_uids_and_vals_to_tensor would.
+        Args:
+            n: int:
+                number of neurons on network.
+            rows (:obj:`List[int],`):
+                Uid of the neuron owning each pair.
+            uids (:obj:`List[int],`):
+                Destination uid of each pair.
+            vals (:obj:`List[int],`):
+                Value of each pair.
+            scale (:obj:`float`):
+                Values are divided by scale, i.e. U16_MAX for weights and 1 for bonds.
+        Returns:
+            matrix ( torch.FloatTensor ):
+                Converted rows.
+    """
+    matrix = torch.zeros( [ n, n ], dtype=torch.float32 )
+    if len( rows ) > 0:
+        values = torch.tensor( vals, dtype=torch.float64 ) / float( scale )
+        matrix.index_put_( ( torch.tensor( rows, dtype=torch.int64 ), torch.tensor( uids, dtype=torch.int64 ) ), values.float() )
+    return matrix
+
+def convert_neuron_uids_and_vals_to_sparse_tensor( n: int, rows: List[int], uids: List[int], vals: List[int], scale: float = 1.0 ) -> 'torch.FloatTensor':
+    r""" Converts the (uid, value) pairs of many neurons from chain representation into a sparse [n, n] torch tensor,
+        which holds the same values as convert_neuron_uids_and_vals_to_tensor without storing the zeros.
+        Args:
+            n: int:
+                number of neurons on network.
+            rows (:obj:`List[int],`):
+                Uid of the neuron owning each pair.
+            uids (:obj:`List[int],`):
+                Destination uid of each pair.
+            vals (:obj:`List[int],`):
+                Value of each pair.
+            scale (:obj:`float`):
+                Values are divided by scale, i.e. U16_MAX for weights and 1 for bonds.
+        Returns:
+            matrix ( torch.FloatTensor ):
+                Coalesced sparse COO tensor of the rows.
+    """
+    indices = torch.tensor( [ rows, uids ], dtype=torch.int64 ).reshape( 2, -1 )
+    values = ( torch.tensor( vals, dtype=torch.float64 ) / float( scale ) ).float()
+    return torch.sparse_coo_tensor( indices, values, size = ( n, n ) ).coalesce()
+
+def normalize_bonds( bonds: torch.FloatTensor ) -> 'torch.FloatTensor':
+    r""" Normalizes the bond ownership of a dense [n, n] bond tensor in place, as
+        normalize( bonds, p=1, dim=0 ) * 0.5 + eye( n ) * 0.5 without allocating the identity.
+        Args:
+            bonds (:obj:`torch.FloatTensor`):
+                Tensor of bonds.
+        Returns:
+            bonds ( torch.FloatTensor ):
+                Normalized bonds.
+    """
+    bonds = torch.nn.functional.normalize( bonds, p=1, dim=0, eps=1e-12 ).mul_( 0.5 )
+    bonds.diagonal().add_( 0.5 )
+    return bonds
+
+def normalize_sparse_bonds( bonds: torch.Tensor ) -> 'torch.FloatTensor':
+    r""" Normalizes the bond ownership of a sparse [n, n] bond tensor, as the dense
+        normalize( bonds, p=1, dim=0 ) * 0.5 + eye( n ) * 0.5 without storing zeros.
+        Args:
+            bonds (:obj:`torch.Tensor`):
+                Coalesced sparse COO tensor of bonds.
+        Returns:
+            bonds ( torch.FloatTensor ):
+                Coalesced sparse COO tensor of normalized bonds.
+    """
+    n = bonds.shape[0]
+    indices = bonds.indices()
+    values = bonds.values().float()
+    column_sums = torch.zeros( n, dtype=torch.float32 ).index_add_( 0, indices[1], values.abs() )
+    values = values / column_sums[ indices[1] ].clamp( min = 1e-12 ) * 0.5
+    diagonal = torch.arange( n, dtype=torch.int64 )
+    indices = torch.cat( [ indices, torch.stack( [ diagonal, diagonal ] ) ], dim = 1 )
+    values = torch.cat( [ values, torch.full( [ n ], 0.5, dtype=torch.float32 ) ] )
+    return torch.sparse_coo_tensor( indices, values, size = ( n, n ) ).coalesce()
+
 def convert_weights_and_uids_for_emit( uids: torch.LongTensor, weights: torch.FloatTensor ) -> Tuple[List[int], List[int]]:
     r""" Converts weights into integer u32 representation that sum to MAX_INT_WEIGHT.
         Args:
@@ -16,10 +16,13 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
 # DEALINGS IN THE SOFTWARE.
 
+import queue
+import threading
 import time
 import unittest
 import unittest.mock as mock
 import uuid
+from types import SimpleNamespace
 
 import grpc
 import pytest
@@ -574,6 +577,122 @@ def test_forward_unknown_error():
         response, code, synapses = axon._forward( request )
         assert code == bittensor.proto.ReturnCode.UnknownException
 
+def test_forward_micro_batching():
+    config = bittensor.axon.config()
+    config.axon.batching.max_delay = 1
+    config.axon.batching.max_batch_size = 5
+    axon = bittensor.axon( netuid = -1, wallet = wallet, config = config, synapse_checks = lambda synapse, hotkey, inputs_x: True )
+
+    batch_sizes = []
+    def forward( inputs_x: torch.FloatTensor, synapse, model_output = None):
+        batch_sizes.append( inputs_x.shape[0] )
+        # Each row answers its first token, to check the rows go back to their request.
+        return None, None, inputs_x[:, :1, None].float().expand( -1, inputs_x.shape[1], bittensor.__network_dim__ )
+    axon.attach_synapse_callback( forward, synapse_type = bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE)
+
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    def make_request( batch_size, value ):
+        inputs_raw = torch.full( (batch_size, 3), value )
+        return inputs_raw, bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__,
+            tensors = [ synapses[0].serialize_forward_request_tensor( inputs_raw ) ],
+            synapses = [ syn.serialize_to_wire_proto() for syn in synapses ],
+            hotkey = axon.wallet.hotkey.ss58_address,
+        )
+    requests = [ make_request( 2, 7 ), make_request( 3, 11 ) ]
+
+    # The batch reaches max_batch_size rows and runs once for both requests.
+    with ThreadPoolExecutor( max_workers = 2 ) as executor:
+        results = list( executor.map( lambda request: axon._forward( request[1] ), requests ) )
+    assert batch_sizes == [5]
+    for ( inputs_raw, _ ), ( response, code, _ ) in zip( requests, results ):
+        assert code == bittensor.proto.ReturnCode.Success
+        outputs = synapses[0].deserialize_forward_response_proto( inputs_raw, response[0] )
+        assert list( outputs.shape ) == [ inputs_raw.shape[0], 3, bittensor.__network_dim__ ]
+        assert torch.all( outputs == inputs_raw[0, 0] )
+
+    # Requests with another sequence length are not batched together.
+    requests = [ make_request( 2, 7 ), ( None, make_request( 2, 7 )[1] ) ]
+    requests[1][1].tensors[0].CopyFrom( synapses[0].serialize_forward_request_tensor( torch.full( (2, 4), 7 ) ) )
+    with ThreadPoolExecutor( max_workers = 2 ) as executor:
+        results = list( executor.map( lambda request: axon._forward( request[1] ), requests ) )
+    assert batch_sizes == [5, 2, 2]
+    assert [ code for _, code, _ in results ] == [ bittensor.proto.ReturnCode.Success ] * 2
+
+def test_micro_batcher_splits_topk_token_phrases():
+    from bittensor._axon.micro_batcher_impl import split_topk_token_phrases
+    from bittensor.utils.tokenizer_utils import compact_topk_token_phrases
+    topk = 4
+    topk_tensor = torch.full( (5, topk + 1, 3), -100. )
+    topk_tensor[:, :, 0] = torch.rand( 5, topk + 1 ) / ( topk + 1 )
+    topk_tensor[:, :topk, 1] = torch.randint( 0, 50000, (5, topk) ).float()
+    topk_tensor[:, :2, 2] = torch.randint( 0, 50000, (5, 2) ).float()
+
+    parts = split_topk_token_phrases( compact_topk_token_phrases( topk_tensor ), [2, 3], bittensor.synapse.TextCausalLMNext( topk = topk ) )
+    assert torch.equal( parts[0], compact_topk_token_phrases( topk_tensor[:2] ) )
+    assert torch.equal( parts[1], compact_topk_token_phrases( topk_tensor[2:] ) )
+
+def test_forward_response_cache():
+    config = bittensor.axon.config()
+    config.axon.cache.max_bytes = 10 * 1024 * 1024
+    allowed = { 'value': True }
+    axon = bittensor.axon( netuid = -1, wallet = wallet, config = config, synapse_checks = lambda synapse, hotkey, inputs_x: allowed['value'] )
+
+    calls = []
+    def forward( inputs_x: torch.FloatTensor, synapse, model_output = None):
+        calls.append( inputs_x )
+        return None, None, torch.rand( inputs_x.shape[0], inputs_x.shape[1], bittensor.__network_dim__ )
+    axon.attach_synapse_callback( forward, synapse_type = bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE)
+
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    def make_request( inputs_raw ):
+        return bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__,
+            tensors = [ synapses[0].serialize_forward_request_tensor( inputs_raw ) ],
+            synapses = [ syn.serialize_to_wire_proto() for syn in synapses ],
+            hotkey = axon.wallet.hotkey.ss58_address,
+        )
+    inputs_raw = torch.randint( 0, 100, (2, 3) )
+    response, code, _ = axon._forward( make_request( inputs_raw ) )
+    assert code == bittensor.proto.ReturnCode.Success
+    cached_response, code, _ = axon._forward( make_request( inputs_raw ) )
+    assert code == bittensor.proto.ReturnCode.Success
+    # The hit skips the callback and returns the same response.
+    assert len( calls ) == 1
+    assert cached_response[0] == response[0]
+    assert ( axon.response_cache.hits, axon.response_cache.misses ) == (1, 1)
+
+    # Other inputs miss.
+    axon._forward( make_request( inputs_raw + 1 ) )
+    assert len( calls ) == 2
+
+    # Requests failing the synapse checks are not served from the cache.
+    allowed['value'] = False
+    _, code, synapses_response = axon._forward( make_request( inputs_raw ) )
+    assert len( calls ) == 2
+    assert synapses_response[0].return_code == bittensor.proto.ReturnCode.UnknownException
+
+def test_response_cache_evicts_and_expires():
+    from bittensor._axon.response_cache_impl import ResponseCache
+    cache = ResponseCache( max_bytes = 10, ttl = 60 )
+    cache.put( 'a', b'1234' )
+    cache.put( 'b', b'1234' )
+    assert cache.get( 'a' ) == b'1234'
+    # 'b' is the least recently used entry.
+    cache.put( 'c', b'1234' )
+    assert cache.get( 'b' ) == None
+    assert cache.get( 'a' ) == b'1234' and cache.get( 'c' ) == b'1234'
+    assert cache.nbytes == 8
+    # Responses larger than the cache are not cached.
+    cache.put( 'd', b'12345678901' )
+    assert cache.get( 'd' ) == None and len( cache ) == 2
+
+    cache = ResponseCache( max_bytes = 10, ttl = 0.1 )
+    cache.put( 'a', b'1234' )
+    time.sleep( 0.2 )
+    assert cache.get( 'a' ) == None
+    assert cache.nbytes == 0
+
 #--- backwards ---
 
 def test_backward_invalid_request():
@@ -998,6 +1117,69 @@ def test_grpc_backward_works():
     for receiver_version in [341, bittensor.__new_signature_version__, bittensor.__version_as_int__]:
         run_test_grpc_backward_works(receiver_version)
 
+def test_grpc_async_server_works():
+    def forward( inputs_x: torch.FloatTensor, synapses, hotkey):
+        return [ torch.zeros( [3, 3, bittensor.__network_dim__] ) for _ in synapses ], [ bittensor.proto.ReturnCode.Success for _ in synapses ], [ 'Success' for _ in synapses ]
+    def backward( inputs_x:torch.FloatTensor, grads_dy:torch.FloatTensor, synapses):
+        return [], [1], ['success']
+
+    axon = bittensor.axon (
+        netuid = -1,
+        port = 7088,
+        ip = '127.0.0.1',
+        wallet = wallet,
+        async_server = True,
+    )
+    axon.attach_forward_callback( forward )
+    axon.attach_backward_callback( backward )
+    axon.start()
+
+    channel = grpc.insecure_channel(
+            '127.0.0.1:7088',
+            options=[('grpc.max_send_message_length', -1),
+                     ('grpc.max_receive_message_length', -1)])
+    stub = bittensor.grpc.BittensorStub( channel )
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    inputs_raw = torch.rand(3, 3)
+    grads_raw = torch.rand(3, 3, bittensor.__network_dim__)
+    inputs_serialized = synapses[0].serialize_forward_request_tensor(inputs_raw)
+    grads_serialized = synapses[0].serialize_backward_request_gradient(inputs_raw, grads_raw)
+    def metadata():
+        return (
+            ('rpc-auth-header','Bittensor'),
+            ('bittensor-signature',sign(sender_wallet, wallet, bittensor.__version_as_int__)),
+            ('bittensor-version',str(bittensor.__version_as_int__)),
+        )
+
+    request = bittensor.proto.TensorMessage(
+        version = bittensor.__version_as_int__,
+        hotkey = sender_wallet.hotkey.ss58_address,
+        tensors = [inputs_serialized],
+        synapses = [ syn.serialize_to_wire_proto() for syn in synapses ]
+    )
+    # Concurrent requests wait on the event loop.
+    with ThreadPoolExecutor( max_workers = 4 ) as executor:
+        responses = list( executor.map( lambda _: stub.Forward( request, metadata = metadata() ), range(4) ) )
+    for response in responses:
+        assert response.return_code == bittensor.proto.ReturnCode.Success
+        outputs = synapses[0].deserialize_forward_response_proto (inputs_raw, response.tensors[0])
+        assert outputs.size(2) ==  bittensor.__network_dim__
+
+    request = bittensor.proto.TensorMessage(
+        version = bittensor.__version_as_int__,
+        hotkey = sender_wallet.hotkey.ss58_address,
+        tensors = [inputs_serialized, grads_serialized],
+        synapses = [ syn.serialize_to_wire_proto() for syn in synapses ]
+    )
+    response = stub.Backward( request, metadata = metadata() )
+    assert response.return_code == bittensor.proto.ReturnCode.Success
+
+    # Requests failing authentication are aborted by the interceptor.
+    with pytest.raises( grpc.RpcError ) as error:
+        stub.Forward( request, metadata = (('rpc-auth-header','Bittensor'), ('bittensor-signature', 'mock')) )
+    assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+    axon.stop()
+
 def test_grpc_forward_fails():
     def forward( inputs_x:torch.FloatTensor, synapse, model_output = None):
         return None, dict(), torch.zeros( [3, 3, bittensor.__network_dim__])
@@ -1276,10 +1458,296 @@ class TestExternalAxon(unittest.TestCase):
         assert f'{external_ip}:{external_port}' != full_address1, f'{external_ip}:{external_port} is eq to {full_address1}'
 
 
+def test_forward_admission_control():
+    config = bittensor.axon.config()
+    config.axon.admission_control = True
+    axon = bittensor.axon( netuid = -1, wallet = wallet, config = config, priority = lambda hotkey, inputs_x, request_type: 1.0,
+        synapse_checks = lambda synapse, hotkey, inputs_x: True )
+
+    def forward( inputs_x: torch.FloatTensor, synapse, model_output = None):
+        return None, None, torch.rand( inputs_x.shape[0], inputs_x.shape[1], bittensor.__network_dim__ )
+    axon.attach_synapse_callback( forward, synapse_type = bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE)
+
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    request = bittensor.proto.TensorMessage(
+        version = bittensor.__version_as_int__,
+        tensors = [ synapses[0].serialize_forward_request_tensor( torch.randint( 0, 100, (2, 3) ) ) ],
+        synapses = [ syn.serialize_to_wire_proto() for syn in synapses ],
+        hotkey = axon.wallet.hotkey.ss58_address,
+    )
+    # Requests are admitted until the service time is known and measured by the callback.
+    for _ in range( axon.admission_control.min_samples ):
+        _, code, _ = axon._forward( request )
+        assert code == bittensor.proto.ReturnCode.Success
+    key = axon.admission_control.key( synapses )
+    assert axon.admission_control.service_times[ key ].count == axon.admission_control.min_samples
+    _, code, _ = axon._forward( request )
+    assert code == bittensor.proto.ReturnCode.Success
+
+    # A service time over the synapse timeout rejects the request before it is queued.
+    for _ in range( 100 ):
+        axon.admission_control.observe( key, 2 * bittensor.__blocktime__ )
+    _, code, synapses_response = axon._forward( request )
+    assert code == bittensor.proto.ReturnCode.NucleusFull
+    assert synapses_response[0].return_code == bittensor.proto.ReturnCode.NucleusFull
+
+def test_priority_threadpool_signals_stale_work_items():
+    pool = bittensor.prioritythreadpool( max_workers = 1 )
+    # Every queued item is older than a negative block time.
+    with mock.patch( 'bittensor.__blocktime__', -1 ):
+        future = pool.submit( lambda: 1, priority = 1 )
+        with pytest.raises( concurrent.futures.TimeoutError ):
+            future.result( timeout = 5 )
+    assert pool.submit( lambda: 1, priority = 1 ).result( timeout = 5 ) == 1
+    assert pool.queued_ahead( 1 ) == 0
+
+def test_priority_threadpool_queued_ahead():
+    pool = bittensor.prioritythreadpool( max_workers = 1 )
+    started, release = threading.Event(), threading.Event()
+    def block():
+        started.set()
+        release.wait()
+    pool.submit( block, priority = 1 )
+    started.wait( 5 )
+
+    futures = [ pool.submit( lambda: 1, priority = priority ) for priority in [ 1, 2, 4, 100 ] ]
+    assert pool.queued_ahead( 1000 ) == 0
+    assert pool.queued_ahead( 50 ) == 1
+    # Items within the same power of two are counted ahead.
+    assert pool.queued_ahead( 3 ) == 3
+    assert pool.queued_ahead( 0.5 ) == 4
+    release.set()
+    for future in futures:
+        future.result( timeout = 5 )
+    assert pool.queued_ahead( 0 ) == 0
+
+def test_priority_threadpool_full_queue_rejects_without_counting():
+    pool = bittensor.prioritythreadpool( max_workers = 1, maxsize = 2 )
+    started, release = threading.Event(), threading.Event()
+    def block():
+        started.set()
+        release.wait()
+    pool.submit( block, priority = 1 )
+    started.wait( 5 )
+
+    futures = [ pool.submit( lambda: 1, priority = 1 ) for _ in range( 2 ) ]
+    for _ in range( 8 ):
+        with pytest.raises( queue.Full ):
+            pool.submit( lambda: 1, priority = 1 )
+    assert pool.queued_ahead( 1 ) == 2
+    release.set()
+    for future in futures:
+        future.result( timeout = 5 )
+    assert pool.queued_ahead( 0 ) == 0
+
+@pytest.mark.parametrize( 'scheduling', [ 'priority', 'fair' ] )
+def test_priority_threadpool_full_queue_rejects_without_hotkey_depth( scheduling ):
+    pool = bittensor.prioritythreadpool( max_workers = 1, maxsize = 2, scheduling = scheduling )
+    pool.max_idle_hotkey_stats = 0
+    started, release = threading.Event(), threading.Event()
+    def block():
+        started.set()
+        release.wait()
+    pool.submit( block, priority = 1 )
+    started.wait( 5 )
+
+    futures = [ pool.submit( lambda: 1, priority = 1, priority_hotkey = 'A' ) for _ in range( 2 ) ]
+    for _ in range( 8 ):
+        with pytest.raises( queue.Full ):
+            pool.submit( lambda: 1, priority = 1, priority_hotkey = 'A' )
+    assert pool.hotkey_stats( 'A' ).depth == 2
+    release.set()
+    for future in futures:
+        future.result( timeout = 5 )
+    assert pool.hotkey_stats( 'A' ).depth == 0
+    # Idle again, so the stats of the hotkey are evicted.
+    assert 'A' not in pool._hotkey_stats
+
+def test_priority_threadpool_fair_scheduling():
+    pool = bittensor.prioritythreadpool( max_workers = 1, scheduling = 'fair' )
+    started, release = threading.Event(), threading.Event()
+    def block():
+        started.set()
+        release.wait()
+    pool.submit( block, priority = 1 )
+    started.wait( 5 )
+
+    order = []
+    futures = []
+    for _ in range( 4 ):
+        futures.append( pool.submit( order.append, 'heavy', priority = 2, priority_hotkey = 'heavy' ) )
+    for _ in range( 4 ):
+        futures.append( pool.submit( order.append, 'light', priority = 1, priority_hotkey = 'light' ) )
+    expired = pool.submit( order.append, 'expired', priority = 2, priority_hotkey = 'heavy', priority_deadline = time.time() - 1 )
+    assert pool.hotkey_stats( 'heavy' ).depth == 5
+    assert pool.queued_ahead( 1, 'light' ) == 9
+
+    release.set()
+    for future in futures:
+        future.result( timeout = 5 )
+    with pytest.raises( concurrent.futures.TimeoutError ):
+        expired.result( timeout = 5 )
+    # The heavy hotkey is served twice as often, without starving the light one.
+    assert order[:3] == [ 'heavy', 'light', 'heavy' ]
+    assert 'expired' not in order
+    stats = pool.hotkey_stats( 'heavy' )
+    assert stats.depth == 0 and stats.expired == 1 and stats.wait_time > 0
+
+def test_priority_threadpool_bounds_idle_hotkey_stats():
+    pool = bittensor.prioritythreadpool( max_workers = 1 )
+    pool.max_idle_hotkey_stats = 2
+    for hotkey in [ 'a', 'b', 'c', 'a' ]:
+        pool.submit( lambda: 1, priority = 1, priority_hotkey = hotkey ).result( timeout = 5 )
+    # The least recently active idle hotkey is forgotten.
+    assert sorted( pool._hotkey_stats.keys() ) == [ 'a', 'c' ]
+    assert pool.hotkey_stats( 'b' ).wait_time == 0.0
+    assert pool.hotkey_stats( 'a' ).wait_time > 0
+
+def test_auth_interceptor_caches_keypairs_and_nonces():
+    from bittensor._axon import AuthInterceptor
+    interceptor = AuthInterceptor( receiver_hotkey = wallet.hotkey.ss58_address, keypair_cache_size = 1, max_endpoints_per_hotkey = 2 )
+    signature = interceptor.parse_signature( { 'bittensor-signature': sign_v2( sender_wallet, wallet ) } )
+    interceptor.check_signature( *signature )
+    keypair = interceptor.get_keypair( sender_wallet.hotkey.ss58_address )
+    interceptor.check_signature( *interceptor.parse_signature( { 'bittensor-signature': sign_v2( sender_wallet, wallet ) } ) )
+    assert interceptor.get_keypair( sender_wallet.hotkey.ss58_address ) is keypair
+    # Replays are rejected.
+    with pytest.raises( Exception, match = 'Nonce is too small' ):
+        interceptor.check_signature( *signature )
+
+    # The least recently used keypairs are evicted.
+    interceptor.get_keypair( wallet.hotkey.ss58_address )
+    assert list( interceptor.keypairs.keys() ) == [ wallet.hotkey.ss58_address ]
+
+    # New endpoints of a hotkey at its cap are rejected, without forgetting the nonces of its endpoints.
+    with pytest.raises( Exception, match = 'Too many endpoints for hotkey' ):
+        interceptor.check_signature( *interceptor.parse_signature( { 'bittensor-signature': sign_v2( sender_wallet, wallet ) } ) )
+    assert len( interceptor.nonces ) == 2
+    with pytest.raises( Exception, match = 'Nonce is too small' ):
+        interceptor.check_signature( *signature )
+    # Other hotkeys are not affected.
+    other_wallet = SimpleNamespace( hotkey = bittensor.Keypair.create_from_mnemonic( bittensor.Keypair.generate_mnemonic() ) )
+    interceptor.check_signature( *interceptor.parse_signature( { 'bittensor-signature': sign_v2( other_wallet, wallet ) } ) )
+    assert len( interceptor.nonces ) == 3
+
+def test_auth_interceptor_rejects_unregistered_and_verifies_on_pool():
+    from bittensor._axon import AuthInterceptor
+    registered = { sender_wallet.hotkey.ss58_address: 0 }
+    metagraph = mock.MagicMock( hotkey_to_uid = lambda hotkey: registered.get( hotkey, -1 ) )
+    interceptor = AuthInterceptor( receiver_hotkey = wallet.hotkey.ss58_address, metagraph = metagraph, verify_workers = 1 )
+    continuation = mock.MagicMock( return_value = 'handler' )
+    def call( signature ):
+        details = mock.MagicMock( method = '/Bittensor/Forward', invocation_metadata = [ ( 'bittensor-signature', signature ) ] )
+        return interceptor.intercept_service( continuation, details )
+
+    assert call( sign_v2( sender_wallet, wallet ) ) == 'handler'
+    # Bad signatures and unknown hotkeys are aborted, the unknown hotkey without a verify.
+    assert call( sign_v2( sender_wallet, wallet )[:-2] + 'xx' ) != 'handler'
+    registered.clear()
+    with mock.patch.object( interceptor, 'check_signature' ) as check_signature:
+        assert call( sign_v2( sender_wallet, wallet ) ) != 'handler'
+        check_signature.assert_not_called()
+    assert continuation.call_count == 1
+
+def test_forward_latency_histograms_and_stats_endpoint():
+    import json
+    import urllib.request
+    config = bittensor.axon.config()
+    config.axon.prometheus.level = bittensor.prometheus.level.INFO.name
+    config.axon.stats.port = get_random_unused_port()
+    axon = bittensor.axon( netuid = -1, wallet = wallet, config = config, priority = lambda hotkey, inputs_x, request_type: 1.0,
+        synapse_checks = lambda synapse, hotkey, inputs_x: True )
+
+    def forward( inputs_x: torch.FloatTensor, synapse, model_output = None):
+        return None, None, torch.rand( inputs_x.shape[0], inputs_x.shape[1], bittensor.__network_dim__ )
+    axon.attach_synapse_callback( forward, synapse_type = bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE)
+
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    request = bittensor.proto.TensorMessage(
+        version = bittensor.__version_as_int__,
+        tensors = [ synapses[0].serialize_forward_request_tensor( torch.randint( 0, 100, (2, 3) ) ) ],
+        synapses = [ syn.serialize_to_wire_proto() for syn in synapses ],
+        hotkey = axon.wallet.hotkey.ss58_address,
+    )
+    for _ in range( 3 ):
+        _, code, _ = axon._forward( request )
+        assert code == bittensor.proto.ReturnCode.Success
+    bad_request = bittensor.proto.TensorMessage(
+        version = bittensor.__version_as_int__,
+        tensors = [ bittensor.serializer().serialize( torch.rand( 2, 3, 4 ), from_type = bittensor.proto.TensorType.TORCH ) ],
+        synapses = request.synapses,
+        hotkey = request.hotkey,
+    )
+    _, code, _ = axon._forward( bad_request )
+    assert code == bittensor.proto.ReturnCode.RequestShapeException
+
+    # Each stage is recorded once per request, requests stopped early only record the stages they reached.
+    latency = axon.latency_histograms.to_dict()['forward']['TEXT_LAST_HIDDEN_STATE']
+    assert set( latency['Success'].keys() ) == { 'deserialize', 'priority', 'queue', 'model', 'serialize', 'total' }
+    assert latency['Success']['total']['count'] == 3
+    assert latency['Success']['total']['buckets']['+Inf'] == 3
+    assert latency['Success']['queue']['sum'] <= latency['Success']['total']['sum']
+    assert set( latency['RequestShapeException'].keys() ) == { 'deserialize', 'total' }
+
+    axon.start()
+    try:
+        with urllib.request.urlopen( 'http://127.0.0.1:{}/stats'.format( config.axon.stats.port ), timeout = 5 ) as response:
+            stats = json.loads( response.read() )
+    finally:
+        axon.stop()
+    assert stats['total_requests'] == 3
+    assert stats['latency']['forward']['TEXT_LAST_HIDDEN_STATE']['Success']['model']['count'] == 3
+    assert axon.stats_server == None
+
+    # Nothing is timed while prometheus is off.
+    config.axon.prometheus.level = bittensor.prometheus.level.OFF.name
+    config.axon.stats.port = 0
+    axon = bittensor.axon( netuid = -1, wallet = wallet, config = config, synapse_checks = lambda synapse, hotkey, inputs_x: True )
+    axon.attach_synapse_callback( forward, synapse_type = bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE)
+    _, code, _ = axon._forward( request )
+    assert code == bittensor.proto.ReturnCode.Success
+    assert axon.latency_histograms == None
+    assert axon.stats_to_dict()['latency'] == {}
+
+def test_axon_workers_aggregate_stats():
+    from bittensor._axon import AxonWorkers
+    from bittensor._axon.workers_impl import merge_stats
+    assert merge_stats( { 'n': 1, 'codes': { 'Success': 1 }, 'latency': { 'key': ( [1, 0], 0.5, 1 ) } }, { 'n': 2, 'codes': { 'Timeout': 1 }, 'latency': { 'key': ( [0, 1], 1.5, 1 ) } } ) \
+        == { 'n': 3, 'codes': { 'Success': 1, 'Timeout': 1 }, 'latency': { 'key': ( [1, 1], 2.0, 2 ) } }
+
+    config = bittensor.axon.config()
+    config.axon.port = get_random_unused_port()
+    config.axon.workers = 2
+    main_axon = bittensor.axon( netuid = -1, wallet = wallet, config = config )
+    main_axon.attach_workers( AxonWorkers( workers = 1, target = bittensor.axon, args = ( -1, config, wallet ), interval = 0.1 ) )
+    main_axon.update_stats_for_request( SimpleNamespace( hotkey = 'A' ), bittensor.proto.ReturnCode.Success )
+
+    main_axon.start()
+    try:
+        # The worker binds the same port and sends its stats.
+        for _ in range( 600 ):
+            if len( main_axon.workers.snapshots() ) > 0:
+                break
+            time.sleep( 0.1 )
+        assert main_axon.workers.alive() == 1
+        assert main_axon.stats_to_dict()['workers'] == 2
+        assert main_axon.to_wandb()['axon/workers'] == 2
+    finally:
+        main_axon.stop()
+    assert main_axon.workers.alive() == 0
+
+    # Worker stats are summed with the stats of the main axon.
+    main_axon.workers.latest[1] = main_axon.stats_snapshot()
+    stats = main_axon.stats_to_dict()
+    assert stats['total_requests'] == 2
+    assert stats['requests_per_pubkey'] == { 'A': 2 }
+    assert main_axon.to_wandb()['axon/total_successes'] == 2
+
+
 if __name__ == "__main__":
     unittest.main()
     # test_forward_joint_success()
     # test_forward_joint_missing_synapse()
     # test_forward_priority_timeout()
     #test_forward_priority_2nd_request_timeout()
-    # test_forward_joint_faulty_synapse()
\ No newline at end of file
+    # test_forward_joint_faulty_synapse()
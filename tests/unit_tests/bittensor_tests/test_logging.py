@@ -0,0 +1,78 @@
+# The MIT License (MIT)
+# Copyright © 2021 Yuma Rao
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated 
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation 
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, 
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of 
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL 
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION 
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import unittest.mock as mock
+
+import bittensor
+
+def rpc_log( code = bittensor.proto.ReturnCode.Success, pubkey = 'A' ):
+    bittensor.logging.rpc_log( axon = True, forward = True, is_response = True, code = code, call_time = 0.5, pubkey = pubkey,
+        inputs = [2, 3], outputs = [2, 3, 1024], message = 'Success', synapse = bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE )
+
+def test_rpc_log_modes():
+    debug_on = bittensor.logging.__debug_on__
+    try:
+        with mock.patch( 'bittensor._logging.logger' ) as logger:
+            # Nothing is done with debug off.
+            bittensor.logging.set_debug( False )
+            assert not bittensor.logging.rpc_log_on()
+            with mock.patch( 'bittensor._logging.codes' ) as codes:
+                rpc_log()
+                codes.assert_not_called()
+            logger.debug.assert_not_called()
+
+            # The call values are logged and formatted by the sinks.
+            bittensor.logging.set_debug( True )
+            bittensor.logging.set_rpc_mode( 'all' )
+            rpc_log()
+            extra = dict( logger.debug.call_args.kwargs )
+            assert extra['rpc_shape'] == [2, 3, 1024] and 'code_str' not in extra
+            log_format = bittensor.logging.log_formatter( { 'extra': extra } )
+            assert 'Success' in log_format
+            assert extra['inputs'].strip() == '[2, 3, 1024]'
+            assert extra['key_str'] == 'A'
+
+            logger.reset_mock()
+            bittensor.logging.set_rpc_mode( 'sample', sample_rate = 0 )
+            rpc_log()
+            logger.debug.assert_not_called()
+            bittensor.logging.set_rpc_mode( 'sample' )
+            assert bittensor.logging.__rpc_sample_rate__ == bittensor.defaults.logging.rpc.sample_rate
+
+            # One summary line per interval, direction, code and synapse, logged at the end of the interval.
+            bittensor.logging.set_rpc_mode( 'aggregate', interval = 0.1 )
+            rpc_log( pubkey = 'A' )
+            rpc_log( pubkey = 'B' )
+            rpc_log( pubkey = 'A' )
+            rpc_log( code = bittensor.proto.ReturnCode.Timeout )
+            logger.debug.assert_not_called()
+            time.sleep( 0.5 )
+            assert logger.debug.call_count == 2
+            messages = sorted( call.kwargs['rpc_message'] for call in logger.debug.call_args_list )
+            assert messages == [ '1 calls from 1 hotkeys', '3 calls from 2 hotkeys' ]
+
+            # Changing the mode logs the pending summaries.
+            logger.reset_mock()
+            bittensor.logging.set_rpc_mode( 'aggregate', interval = 60 )
+            rpc_log()
+            logger.debug.assert_not_called()
+            bittensor.logging.set_rpc_mode( 'all' )
+            assert logger.debug.call_args.kwargs['rpc_message'] == '1 calls from 1 hotkeys'
+    finally:
+        bittensor.logging.set_debug( debug_on )
+        bittensor.logging.set_rpc_mode( 'all' )
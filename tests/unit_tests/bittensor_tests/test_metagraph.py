@@ -15,10 +15,27 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
 # DEALINGS IN THE SOFTWARE.
 
+import dataclasses
+import os
+import tempfile
 import unittest
+from types import SimpleNamespace
+from typing import List
+import torch
 import bittensor
+import bittensor.utils.weight_utils as weight_utils
 from tests.helpers import get_mock_neuron, get_mock_hotkey, get_mock_coldkey
 
+def get_neuron( uid: int, hotkey: str, coldkey: str ) -> bittensor.NeuronInfo:
+    return dataclasses.replace(
+        bittensor.NeuronInfo._null_neuron(),
+        uid = uid,
+        hotkey = hotkey,
+        coldkey = coldkey,
+        axon_info = bittensor.AxonInfo( block = 0, version = 1, ip = 0, port = 0, ip_type = 4, protocol = 0, placeholder1 = 0, placeholder2 = 0 ),
+        is_null = False,
+    )
+
 class TestMetagraph(unittest.TestCase):
     """
     Tests metagraph class methods.
@@ -45,3 +62,199 @@ class TestMetagraph(unittest.TestCase):
         self.assertEqual(len(metagraph.hotkeys), 2000)
         self.assertEqual(len(metagraph.coldkeys), 2000)
         self.assertEqual(len(metagraph.uids), 2000)
+
+    def test_hotkey_and_coldkey_index(self):
+        metagraph = bittensor.metagraph.from_neurons(
+            network = "mock",
+            netuid = -1, 
+            info = None,
+            block = 0,
+            neurons = [
+                # Two hotkeys per coldkey.
+                get_neuron( uid = i, hotkey = get_mock_hotkey(i + 1), coldkey = get_mock_coldkey(i // 2 + 1) )
+            for i in range(8)]
+        )
+        for uid in range(8):
+            self.assertEqual(metagraph.hotkey_to_uid(get_mock_hotkey(uid + 1)), uid)
+            self.assertEqual(metagraph.hotkeys.index(get_mock_hotkey(uid + 1)), uid)
+        self.assertEqual(metagraph.hotkey_to_uid(get_mock_hotkey(100)), -1)
+        self.assertEqual(metagraph.coldkey_to_uids(get_mock_coldkey(2)), [2, 3])
+        self.assertEqual(metagraph.coldkey_to_uids(get_mock_coldkey(100)), [])
+
+        # The index is rebuilt from the endpoints of a loaded state dict.
+        loaded = bittensor.metagraph.from_neurons( network = "mock", netuid = -1, info = None, block = 0, neurons = [] )
+        self.assertEqual(loaded.hotkey_to_uid(get_mock_hotkey(1)), -1)
+        loaded.load_from_state_dict(metagraph.state_dict())
+        self.assertEqual(loaded.hotkey_to_uid(get_mock_hotkey(8)), 7)
+        self.assertEqual(loaded.coldkey_to_uids(get_mock_coldkey(4)), [6, 7])
+
+    @staticmethod
+    def get_weighted_neurons( n: int ) -> List[bittensor.NeuronInfo]:
+        generator = torch.Generator().manual_seed(0)
+        neurons = []
+        for i in range(n):
+            w_uids = torch.randperm(n, generator = generator)[:4].tolist()
+            b_uids = torch.randperm(n, generator = generator)[:3].tolist()
+            neurons.append( dataclasses.replace(
+                get_neuron( uid = i, hotkey = get_mock_hotkey(i + 1), coldkey = get_mock_coldkey(i + 1) ),
+                weights = [ [ uid, int(v) ] for uid, v in zip( w_uids, torch.randint(0, 65535, (4,), generator = generator) ) ],
+                bonds = [ [ uid, int(v) ] for uid, v in zip( b_uids, torch.randint(0, 1000, (3,), generator = generator) ) ],
+            ) )
+        return neurons
+
+    def test_from_neurons_scatters_weights_bonds_and_endpoints(self):
+        n = 16
+        neurons = self.get_weighted_neurons( n )
+        metagraph = bittensor.metagraph.from_neurons( network = "mock", netuid = -1, info = None, block = 0, neurons = neurons )
+
+        # Rows match the per neuron conversions.
+        weights = torch.zeros( n, n )
+        bonds = torch.zeros( n, n, dtype = torch.int64 )
+        for neuron in neurons:
+            weights[neuron.uid] = weight_utils.convert_weight_uids_and_vals_to_tensor( n, *zip(*neuron.weights) )
+            bonds[neuron.uid] = weight_utils.convert_bond_uids_and_vals_to_tensor( n, *zip(*neuron.bonds) )
+            self.assertTrue(torch.equal(metagraph.endpoints[neuron.uid], metagraph.endpoint_objs[neuron.uid].to_tensor()))
+        self.assertTrue(torch.equal(metagraph.W, weights))
+        bonds = torch.nn.functional.normalize( bonds.float(), p=1, dim=0, eps=1e-12 ) * 0.5 + torch.eye( n ) * 0.5
+        self.assertTrue(torch.allclose(metagraph.B, bonds))
+
+    def test_sparse_weights_and_bonds(self):
+        n = 16
+        neurons = self.get_weighted_neurons( n )
+        dense = bittensor.metagraph.from_neurons( network = "mock", netuid = -1, info = None, block = 0, neurons = neurons )
+        sparse = bittensor.metagraph.from_neurons( network = "mock", netuid = -1, info = None, block = 0, neurons = neurons, sparse = True )
+        self.assertTrue(sparse.sparse)
+        self.assertTrue(sparse.weights.is_sparse and sparse.bonds.is_sparse)
+        self.assertEqual(sparse.W.nnz, 4 * n)
+
+        # The views index as the dense matrices.
+        self.assertTrue(torch.equal(sparse.W.to_dense(), dense.W))
+        self.assertTrue(torch.allclose(sparse.B.to_dense(), dense.B))
+        self.assertTrue(torch.equal(sparse.W[:, 3], dense.W[:, 3]))
+        self.assertTrue(torch.equal(sparse.W[5], dense.W[5]))
+        self.assertEqual(sparse.W[5].tolist(), dense.W[5].tolist())
+        self.assertEqual(sparse.W[2, 7].item(), dense.W[2, 7].item())
+        self.assertTrue(torch.allclose(sparse.B[:, 3], dense.B[:, 3]))
+        self.assertTrue(torch.equal(sparse.W[ [1, 2] ], dense.W[ [1, 2] ]))
+
+        # The state dict keeps the compact form.
+        loaded = bittensor.metagraph.from_neurons( network = "mock", netuid = -1, info = None, block = 0, neurons = [] )
+        loaded.load_from_state_dict(sparse.state_dict())
+        self.assertTrue(loaded.sparse)
+        self.assertTrue(loaded.weights.is_sparse)
+        self.assertTrue(torch.equal(loaded.W[:, 3], dense.W[:, 3]))
+
+    def test_sync_incremental(self):
+        n = 16
+        chain = self.get_weighted_neurons( n )
+        lite_fields = [ field.name for field in dataclasses.fields( bittensor.NeuronInfoLite ) ]
+        refetched = []
+        subtensor = SimpleNamespace(
+            network = "mock",
+            block = 10,
+            neurons_lite = lambda netuid, block: [ bittensor.NeuronInfoLite( **{ name: getattr( neuron, name ) for name in lite_fields } ) for neuron in chain ],
+            neuron_for_uid = lambda uid, netuid, block: refetched.append( uid ) or chain[ uid ],
+            get_subnet_info = lambda netuid, block: SimpleNamespace( netuid = netuid ),
+        )
+
+        for sparse in [ False, True ]:
+            metagraph = bittensor.metagraph.from_neurons( network = "mock", netuid = -1, info = None, block = 0, neurons = list( chain ), sparse = sparse )
+            # uid 3 set weights, uid 5 was replaced by a new hotkey and uid 7 was staked to.
+            chain[3] = dataclasses.replace( chain[3], last_update = chain[3].last_update + 1, weights = [ [ 0, 65535 ] ], bonds = [ [ 1, 10 ] ] )
+            chain[5] = dataclasses.replace( chain[5], hotkey = get_mock_hotkey( 100 + sparse ), weights = [], bonds = [] )
+            chain[7] = dataclasses.replace( chain[7], total_stake = chain[7].total_stake + bittensor.Balance.from_tao( 7 ) )
+            refetched.clear()
+
+            self.assertTrue( metagraph.sync_incremental( netuid = -1, subtensor = subtensor ) )
+            self.assertEqual( sorted( refetched ), [3, 5] )
+            expected = bittensor.metagraph.from_neurons( network = "mock", netuid = -1, info = None, block = 10, neurons = chain, sparse = sparse )
+            self.assertEqual( metagraph.block.item(), 10 )
+            self.assertEqual( metagraph.hotkeys, expected.hotkeys )
+            self.assertEqual( metagraph.hotkey_to_uid( get_mock_hotkey( 100 + sparse ) ), 5 )
+            self.assertTrue( torch.equal( metagraph.total_stake, expected.total_stake ) )
+            self.assertTrue( torch.equal( metagraph.last_update, expected.last_update ) )
+            self.assertTrue( torch.equal( metagraph.endpoints, expected.endpoints ) )
+            self.assertTrue( torch.equal( metagraph.W[:, 0], expected.W[:, 0] ) )
+            self.assertTrue( torch.equal( metagraph.W[3], expected.W[3] ) )
+            self.assertTrue( torch.allclose( metagraph.B[:, 1], expected.B[:, 1] ) )
+            self.assertEqual( metagraph.weights.is_sparse, sparse )
+
+            # A different number of neurons needs a full sync.
+            chain.append( dataclasses.replace( chain[0], uid = n ) )
+            self.assertFalse( metagraph.sync_incremental( netuid = -1, subtensor = subtensor ) )
+            chain.pop()
+
+    def test_lite_metagraph_fetches_weights_on_first_access(self):
+        n = 16
+        chain = self.get_weighted_neurons( n )
+        lite_fields = [ field.name for field in dataclasses.fields( bittensor.NeuronInfoLite ) ]
+        calls = []
+        subtensor = SimpleNamespace(
+            network = "mock",
+            block = 10,
+            neurons = lambda netuid, block = None: calls.append( 'neurons' ) or chain,
+            neurons_lite = lambda netuid, block = None: calls.append( 'neurons_lite' ) or [ bittensor.NeuronInfoLite( **{ name: getattr( neuron, name ) for name in lite_fields } ) for neuron in chain ],
+            get_subnet_info = lambda netuid, block = None: SimpleNamespace( netuid = netuid ),
+        )
+        metagraph = bittensor.Subtensor.metagraph( subtensor, netuid = -1, lite = True )
+        full = bittensor.metagraph.from_neurons( network = "mock", netuid = -1, info = None, block = 10, neurons = chain )
+        self.assertEqual( calls, [ 'neurons_lite' ] )
+        self.assertTrue( metagraph.lite )
+        self.assertTrue( metagraph.weights_pending )
+        self.assertEqual( metagraph.hotkeys, full.hotkeys )
+        self.assertTrue( torch.equal( metagraph.total_stake, full.total_stake ) )
+        self.assertTrue( torch.equal( metagraph.endpoints, full.endpoints ) )
+        self.assertEqual( calls, [ 'neurons_lite' ] )
+
+        # Lite is a choice of the metagraph object, not of the state it loads, and lite metagraphs save to their own files.
+        metagraph.info = full.info
+        self.assertFalse( bittensor.Metagraph( network = "mock", netuid = -1 ).load_from_state_dict( metagraph.state_dict() ).lite )
+        with tempfile.TemporaryDirectory() as directory:
+            saved = []
+            for saving in [ metagraph, full ]:
+                saving.save_to_path = lambda path, filename: saved.append( filename )
+                saving.save()
+                saving.save_snapshot( os.path.join( directory, 'mock.snapshot' ) )
+                self.assertEqual( bittensor.Metagraph( network = "mock", netuid = -1, lite = saving.lite ).load_snapshot( os.path.join( directory, 'mock.snapshot' ) ).lite, saving.lite )
+            self.assertEqual( saved, [ 'mock_-1_lite.pt', 'mock_-1.pt' ] )
+        self.assertTrue( metagraph.weights_pending )
+
+        # Weights and bonds are fetched once, on first access.
+        self.assertTrue( torch.equal( metagraph.W[:, 3], full.W[:, 3] ) )
+        self.assertTrue( torch.allclose( metagraph.B, full.B ) )
+        self.assertFalse( metagraph.weights_pending )
+        self.assertEqual( calls, [ 'neurons_lite', 'neurons' ] )
+
+        # A lite metagraph is not synced incrementally.
+        self.assertFalse( metagraph.sync_incremental( netuid = -1, subtensor = subtensor ) )
+
+    def test_snapshot_round_trip(self):
+        n = 16
+        neurons = self.get_weighted_neurons( n )
+        info = bittensor.SubnetInfo( netuid = 3, rho = 10, kappa = 32767, difficulty = 1000, immunity_period = 10, validator_batch_size = 8,
+            validator_sequence_length = 256, validator_epochs_per_reset = 60, validator_epoch_length = 100, max_allowed_validators = 64,
+            min_allowed_weights = 1, max_weight_limit = 0.5, scaling_law_power = 0.5, synergy_scaling_law_power = 0.5, subnetwork_n = n,
+            max_n = 4096, blocks_since_epoch = 5, tempo = 99, modality = 0, connection_requirements = {}, emission_value = 0.5, burn = bittensor.Balance.from_rao( 10 ) )
+        with tempfile.TemporaryDirectory() as directory:
+            for sparse in [ False, True ]:
+                metagraph = bittensor.metagraph.from_neurons( network = "mock", netuid = 3, info = info, block = 7, neurons = neurons, sparse = sparse )
+                path = os.path.join( directory, 'mock_3_{}.snapshot'.format( sparse ) )
+                metagraph.save_snapshot( path )
+
+                loaded = bittensor.Metagraph( network = "other", netuid = 0 ).load_snapshot( path )
+                self.assertEqual( ( loaded.network, loaded.netuid, loaded.sparse ), ( "mock", 3, sparse ) )
+                self.assertEqual( loaded.block.item(), 7 )
+                self.assertEqual( loaded.n.item(), n )
+                self.assertEqual( loaded.info, info )
+                for name in [ 'uids', 'total_stake', 'ranks', 'trust', 'last_update', 'validator_permit', 'endpoints' ]:
+                    self.assertTrue( torch.equal( getattr( loaded, name ), getattr( metagraph, name ) ), name )
+                self.assertTrue( torch.equal( loaded.W[:, 3], metagraph.W[:, 3] ) )
+                self.assertTrue( torch.equal( loaded.B[5], metagraph.B[5] ) )
+                self.assertEqual( loaded.hotkeys, metagraph.hotkeys )
+                self.assertEqual( loaded.coldkeys, metagraph.coldkeys )
+                self.assertEqual( loaded.hotkey_to_uid( get_mock_hotkey( 5 ) ), 4 )
+
+            with open( os.path.join( directory, 'bad.snapshot' ), 'wb' ) as f:
+                f.write( b'0' * 64 )
+            with self.assertRaises( ValueError ):
+                bittensor.Metagraph( network = "mock", netuid = 0 ).load_snapshot( os.path.join( directory, 'bad.snapshot' ) )
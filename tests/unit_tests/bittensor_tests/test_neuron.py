@@ -1,5 +1,7 @@
 from atexit import register
 from types import SimpleNamespace
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 from more_itertools import side_effect
@@ -287,6 +289,41 @@ class TestCoreValidator(unittest.TestCase):
             # Should try to register the neuron
             mock_register.assert_called_once()
 
+class TestAxonCallbacks(unittest.TestCase):
+    def test_reload_metagraph_when_saved(self):
+        from bittensor._neuron.text.core_server.callbacks_impl import AxonCallbacks
+        with tempfile.TemporaryDirectory() as home, patch.dict( os.environ, { 'HOME': home } ):
+            metagraph = bittensor.Metagraph( network = 'mock', netuid = -1 )
+            callbacks = AxonCallbacks( config = None, model = None, wallet = None, metagraph = metagraph, prometheus_counters = None )
+            assert not callbacks.reload_metagraph()
+
+            saved = bittensor.Metagraph( network = 'mock', netuid = -1 )
+            for block in [ 7, 8 ]:
+                saved.block = torch.nn.Parameter( torch.tensor( [ block ] ), requires_grad = False )
+                saved.save()
+                previous, previous_block = callbacks.metagraph, callbacks.metagraph.block.item()
+                assert callbacks.reload_metagraph()
+                # The metagraph is replaced, not mutated under the running requests.
+                assert callbacks.metagraph is not previous
+                assert callbacks.metagraph.block.item() == block
+                assert previous.block.item() == previous_block
+                # Unchanged files are not loaded again.
+                assert not callbacks.reload_metagraph()
+            assert os.listdir( os.path.join( home, '.bittensor' ) ) == [ 'mock_-1.pt' ]
+
+    def test_priority_shares_stake_only_if_set(self):
+        from bittensor._neuron.text.core_server.callbacks_impl import AxonCallbacks
+        config = bittensor.Config()
+        config.neuron = bittensor.Config()
+        config.neuron.priority_share_stake = False
+        metagraph = MagicMock( hotkey_to_uid = MagicMock( return_value = 0 ), S = torch.tensor( [ 10.0 ] ) )
+        callbacks = AxonCallbacks( config = config, model = None, wallet = None, metagraph = metagraph, prometheus_counters = None )
+        callbacks.axon = SimpleNamespace( priority_threadpool = SimpleNamespace( scheduling = 'priority', hotkey_stats = lambda hotkey: SimpleNamespace( depth = 4 ) ) )
+        assert callbacks.priority( 'hotkey', bittensor.proto.RequestType.FORWARD, None ) == 10.0
+        # The stake is divided between the 4 queued requests and the new one.
+        config.neuron.priority_share_stake = True
+        assert callbacks.priority( 'hotkey', bittensor.proto.RequestType.FORWARD, None ) == 2.0
+
 class MockException(Exception):
     pass
 
@@ -153,6 +153,44 @@ def test_receptor_neuron_mock_server():
                                             [3, (bittensor.synapse.TextCausalLMNext().topk + 1), 1 + 1],
                                             [3, 70]]
 
+def test_receptor_neuron_mock_server_lossy_response_fallback():
+    # The endpoint predates the lossy serializers and fails to serialize QINT8 responses.
+    old_receptor = bittensor.receptor ( endpoint = endpoint, wallet = wallet )
+    serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.MSGPACK )
+    y_hidden_serialized = serializer.serialize( torch.rand(3, 3, bittensor.__network_dim__), from_type = bittensor.proto.TensorType.TORCH )
+
+    def old_forward( request, **kwargs ):
+        request_synapse = bittensor.synapse.deserialize( request.synapses[0] )
+        if request_synapse.forward_response_serializer_type == bittensor.proto.Serializer.MSGPACK:
+            code, tensors = bittensor.proto.ReturnCode.Success, [y_hidden_serialized]
+        else:
+            code, tensors = bittensor.proto.ReturnCode.ResponseSerializationException, []
+        mock_result = asyncio.Future()
+        mock_result.set_result( bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__,
+            hotkey = wallet.hotkey.ss58_address,
+            synapses = [ request_synapse.serialize_to_wire_proto( code = code, message = '' ) ],
+            return_code = code,
+            tensors = tensors
+        ))
+        return mock_result
+    old_stub = bittensor.grpc.BittensorStub(channel)
+    old_stub.Forward = MagicMock( side_effect = old_forward )
+    old_receptor.stub = old_stub
+
+    lossy_synapses = [ bittensor.synapse.TextLastHiddenState( forward_response_serializer_type = bittensor.proto.Serializer.QINT8 ) ]
+    x = torch.rand(3, 3)
+    out, ops, time = old_receptor.forward( lossy_synapses, x, timeout=1 )
+    assert ops == [bittensor.proto.ReturnCode.Success]
+    assert list(out[0].shape) == [3, 3, bittensor.__network_dim__]
+    assert old_stub.Forward.call_count == 2
+    assert lossy_synapses[0].forward_response_serializer_type == bittensor.proto.Serializer.QINT8
+
+    # Later calls ask the endpoint for MSGPACK responses up front.
+    out, ops, time = old_receptor.forward( lossy_synapses, x, timeout=1 )
+    assert ops == [bittensor.proto.ReturnCode.Success]
+    assert old_stub.Forward.call_count == 3
+
 def test_receptor_neuron_serve_timeout():
     y_hidden = torch.rand(3, 3, bittensor.__network_dim__)
     y_causallm = torch.rand(3, 3, bittensor.__network_dim__)
@@ -20,6 +20,9 @@ import grpc
 import torch
 import bittensor
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from bittensor._receptor.circuit_breaker_impl import CircuitBreaker
 
 from unittest.mock import MagicMock
 import unittest.mock as mock
@@ -316,6 +319,327 @@ def test_receptor_pool_backward_hang():
     receptor_pool.backward(endpoints, synapses, x, [[hidden_grads, causal_grads, causallmnext_grads, seq_2_seq_grads],
                                                     [hidden_grads, causal_grads, causallmnext_grads, seq_2_seq_grads]], timeout=1)
 
+def test_receptor_pool_forward_shares_serialized_request():
+    neuron_obj2 = bittensor.endpoint(
+        version = bittensor.__version_as_int__,
+        uid = 1,
+        ip = '0.0.0.1',
+        ip_type = 4,
+        port = 12346,
+        hotkey = wallet2.hotkey.ss58_address,
+        coldkey = wallet2.coldkey.ss58_address,
+        protocol =0
+    )
+    endpoints = [neuron_obj, neuron_obj2]
+    x = torch.ones( (3, 3) )
+    inputs = [x, x]
+    mock_return_val = bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__,
+            hotkey = wallet.hotkey.ss58_address,
+            return_code = bittensor.proto.ReturnCode.Timeout,
+            tensors = [])
+    mock_result = asyncio.Future()
+    mock_result.set_result( mock_return_val )
+
+    receptor_pool = bittensor.receptor_pool(wallet=wallet,max_active_receptors=2)
+    for endpoint in endpoints:
+        receptor_pool._get_or_create_receptor_for_endpoint(endpoint)
+        receptor_pool.receptors[endpoint.hotkey].stub.Forward = MagicMock( return_value = mock_result )
+
+    synapse = bittensor.synapse.TextLastHiddenState()
+    with mock.patch.object( synapse, 'serialize_forward_request_tensor', wraps = synapse.serialize_forward_request_tensor ) as serialize:
+        receptor_pool.forward( endpoints, [synapse], inputs, timeout=1)
+        assert serialize.call_count == 1
+
+    requests = [ receptor_pool.receptors[endpoint.hotkey].stub.Forward.call_args.kwargs['request'] for endpoint in endpoints ]
+    assert requests[0] is requests[1]
+    signatures = [ dict(receptor_pool.receptors[endpoint.hotkey].stub.Forward.call_args.kwargs['metadata'])['bittensor-signature'] for endpoint in endpoints ]
+    assert signatures[0] != None and signatures[1] != None
+
+def _mock_straggler_receptor_pool():
+    neuron_obj2 = bittensor.endpoint(
+        version = bittensor.__version_as_int__,
+        uid = 1,
+        ip = '0.0.0.1',
+        ip_type = 4,
+        port = 12346,
+        hotkey = wallet2.hotkey.ss58_address,
+        coldkey = wallet2.coldkey.ss58_address,
+        protocol =0
+    )
+    synapse = bittensor.synapse.TextLastHiddenState()
+    serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.MSGPACK )
+    y_hidden_serialized = serializer.serialize(torch.rand(3, 3, bittensor.__network_dim__), from_type = bittensor.proto.TensorType.TORCH)
+    mock_return_val = bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__,
+            hotkey = wallet.hotkey.ss58_address,
+            synapses = [synapse.serialize_to_wire_proto(code = bittensor.proto.ReturnCode.Success, message= 'Success' )],
+            return_code = bittensor.proto.ReturnCode.Success,
+            tensors = [y_hidden_serialized]
+        )
+    mock_result = asyncio.Future()
+    mock_result.set_result( mock_return_val )
+    # The straggler never answers.
+    mock_straggler = asyncio.Future()
+
+    receptor_pool = bittensor.receptor_pool(wallet=wallet,max_active_receptors=2)
+    receptor_pool._get_or_create_receptor_for_endpoint(neuron_obj)
+    receptor_pool._get_or_create_receptor_for_endpoint(neuron_obj2)
+    receptor_pool.receptors[neuron_obj.hotkey].stub.Forward = MagicMock( return_value = mock_result )
+    receptor_pool.receptors[neuron_obj2.hotkey].stub.Forward = MagicMock( return_value = mock_straggler )
+    return receptor_pool, [neuron_obj, neuron_obj2], [synapse]
+
+def test_receptor_pool_forward_quorum():
+    receptor_pool, endpoints, synapses = _mock_straggler_receptor_pool()
+    x = torch.ones( (3, 3) )
+    start_time = time.time()
+    resp1, codes, _ = receptor_pool.forward( endpoints, synapses, [x, x], timeout=10, quorum=1)
+    assert time.time() - start_time < 5
+    assert codes == [[bittensor.proto.ReturnCode.Success], [bittensor.proto.ReturnCode.Timeout]]
+    assert list(resp1[1][0].shape) == [3, 3, bittensor.__network_dim__]
+
+    receptor_pool, endpoints, synapses = _mock_straggler_receptor_pool()
+    resp1, codes, _ = receptor_pool.forward( endpoints, synapses, [x, x], timeout=10, quorum=1.0, soft_timeout=0.5)
+    assert codes == [[bittensor.proto.ReturnCode.Success], [bittensor.proto.ReturnCode.Timeout]]
+
+def test_receptor_pool_forward_stream():
+    receptor_pool, endpoints, synapses = _mock_straggler_receptor_pool()
+    x = torch.ones( (3, 3) )
+    async def first_response():
+        async for index, outputs, codes, times in receptor_pool.async_forward_stream( endpoints, synapses, [x, x], timeout=10 ):
+            return index, outputs, codes
+    index, outputs, codes = asyncio.get_event_loop().run_until_complete( first_response() )
+    assert index == 0
+    assert codes == [bittensor.proto.ReturnCode.Success]
+    assert list(outputs[0].shape) == [3, 3, bittensor.__network_dim__]
+
+def test_receptor_pool_forward_adaptive_timeout():
+    receptor_pool, endpoints, synapses = _mock_straggler_receptor_pool()
+    x = torch.ones( (3, 3) )
+    # The first endpoint always answers in 300ms, the second one has no latency history.
+    for _ in range(100):
+        receptor_pool.receptors[endpoints[0].hotkey].stats.forward_latency.observe( 0.3 )
+    receptor_pool.forward( endpoints, synapses, [x, x], timeout='adaptive', max_timeout=2)
+    fast_timeout = receptor_pool.receptors[endpoints[0].hotkey].stub.Forward.call_args.kwargs['timeout']
+    slow_timeout = receptor_pool.receptors[endpoints[1].hotkey].stub.Forward.call_args.kwargs['timeout']
+    assert fast_timeout < 2
+    assert fast_timeout >= 0.3
+    assert slow_timeout == 2
+
+def test_receptor_pool_adaptive_timeout_rises_after_timeouts():
+    receptor_pool, endpoints, synapses = _mock_straggler_receptor_pool()
+    # Receptors are destroyed after each call, as in the validator.
+    receptor_pool.max_active_receptors = 0
+    x = torch.ones( (3, 3) )
+    for _ in range(10):
+        receptor_pool.receptors[endpoints[1].hotkey].stats.forward_latency.observe( 0.1 )
+
+    timeouts = []
+    for _ in range(2):
+        receptor = receptor_pool._get_or_create_receptor_for_endpoint( endpoints[1] )
+        receptor.stub.Forward = MagicMock( return_value = asyncio.Future() )
+        _, codes, _ = receptor_pool.forward( endpoints[1:], synapses, [x], timeout='adaptive', max_timeout=5 )
+        assert codes == [[bittensor.proto.ReturnCode.Timeout]]
+        assert endpoints[1].hotkey not in receptor_pool.receptors
+        timeouts.append( receptor.stub.Forward.call_args.kwargs['timeout'] )
+    # The latencies outlive the receptor, and the timed out call counts as a latency of its timeout.
+    assert timeouts[0] < 2
+    assert timeouts[0] < timeouts[1] < 5
+
+def test_receptor_pool_lossy_response_fallback_outlives_receptors():
+    # The endpoint predates the lossy serializers and fails to serialize QINT8 responses.
+    serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.MSGPACK )
+    y_hidden_serialized = serializer.serialize( torch.rand(3, 3, bittensor.__network_dim__), from_type = bittensor.proto.TensorType.TORCH )
+    def old_forward( request, **kwargs ):
+        request_synapse = bittensor.synapse.deserialize( request.synapses[0] )
+        if request_synapse.forward_response_serializer_type == bittensor.proto.Serializer.MSGPACK:
+            code, tensors = bittensor.proto.ReturnCode.Success, [y_hidden_serialized]
+        else:
+            code, tensors = bittensor.proto.ReturnCode.ResponseSerializationException, []
+        mock_result = asyncio.Future()
+        mock_result.set_result( bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__,
+            hotkey = wallet.hotkey.ss58_address,
+            synapses = [ request_synapse.serialize_to_wire_proto( code = code, message = '' ) ],
+            return_code = code,
+            tensors = tensors
+        ))
+        return mock_result
+
+    # Receptors are destroyed after each call, as in the validator.
+    receptor_pool = bittensor.receptor_pool( wallet = wallet, max_active_receptors = 0 )
+    lossy_synapses = [ bittensor.synapse.TextLastHiddenState( forward_response_serializer_type = bittensor.proto.Serializer.QINT8 ) ]
+    x = torch.ones( (3, 3) )
+    call_counts = []
+    for _ in range(2):
+        receptor = receptor_pool._get_or_create_receptor_for_endpoint( neuron_obj )
+        receptor.stub.Forward = MagicMock( side_effect = old_forward )
+        _, codes, _ = receptor_pool.forward( [neuron_obj], lossy_synapses, [x], timeout = 1 )
+        assert codes == [[bittensor.proto.ReturnCode.Success]]
+        assert neuron_obj.hotkey not in receptor_pool.receptors
+        call_counts.append( receptor.stub.Forward.call_count )
+    # Only the first receptor pays the failed lossy request.
+    assert call_counts == [2, 1]
+
+def test_receptor_pool_circuit_breaker():
+    bad_endpoint = bittensor.endpoint(
+        version = bittensor.__version_as_int__,
+        uid = 2,
+        ip = '0.0.0.0',
+        ip_type = 4,
+        port = 12347,
+        hotkey = 'XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX',
+        coldkey = wallet.coldkey.ss58_address,
+        protocol =0
+    )
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    x = torch.ones( (3, 3) )
+    receptor_pool = bittensor.receptor_pool(wallet=wallet, circuit_breaker_threshold=2, circuit_breaker_backoff=60)
+    for _ in range(2):
+        _, codes, _ = receptor_pool.forward( [bad_endpoint], synapses, [x], timeout=1)
+        assert codes == [[bittensor.proto.ReturnCode.BadEndpoint]]
+    assert receptor_pool.get_receptors_state( with_circuit_state = True )[bad_endpoint.hotkey].circuit == 'open'
+
+    # Open circuits return Backoff without creating a receptor.
+    receptor_pool.receptors = {}
+    _, codes, _ = receptor_pool.forward( [bad_endpoint], synapses, [x], timeout=1)
+    assert codes == [[bittensor.proto.ReturnCode.Backoff]]
+    assert bad_endpoint.hotkey not in receptor_pool.receptors
+
+    # After the backoff a failing probe opens the circuit for twice the backoff.
+    receptor_pool.circuit_breakers[bad_endpoint.hotkey].opened_at -= 60
+    _, codes, _ = receptor_pool.forward( [bad_endpoint], synapses, [x], timeout=1)
+    assert codes == [[bittensor.proto.ReturnCode.BadEndpoint]]
+    assert receptor_pool.circuit_breakers[bad_endpoint.hotkey].state == 'open'
+    assert receptor_pool.circuit_breakers[bad_endpoint.hotkey].backoff == 120
+
+def test_circuit_breaker_closes_on_success():
+    circuit_breaker = CircuitBreaker( threshold = 1, backoff = 0 )
+    circuit_breaker.record( [bittensor.proto.ReturnCode.Timeout, bittensor.proto.ReturnCode.Unavailable] )
+    assert circuit_breaker.state == CircuitBreaker.OPEN
+    # The backoff passed, the next request is the probe.
+    assert circuit_breaker.allow_request()
+    assert circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    circuit_breaker.record( [bittensor.proto.ReturnCode.Timeout, bittensor.proto.ReturnCode.Success] )
+    assert circuit_breaker.state == CircuitBreaker.CLOSED
+    assert circuit_breaker.consecutive_failures == 0
+    # Other failures mean the endpoint is alive.
+    circuit_breaker.record( [bittensor.proto.ReturnCode.NotImplemented] )
+    assert circuit_breaker.state == CircuitBreaker.CLOSED
+
+def test_receptor_pool_destroys_least_recently_used():
+    endpoints = [ 
+        bittensor.endpoint(
+            version = bittensor.__version_as_int__,
+            uid = uid,
+            ip = '0.0.0.0',
+            ip_type = 4,
+            port = 12345 + uid,
+            hotkey = str( uid ).rjust( 48, 'X' ),
+            coldkey = wallet.coldkey.ss58_address,
+            protocol = 0
+        ) for uid in range(3) 
+    ]
+    receptor_pool = bittensor.receptor_pool(wallet=wallet,max_active_receptors=2)
+    for endpoint in endpoints:
+        receptor_pool._get_or_create_receptor_for_endpoint(endpoint)
+    receptor_pool._get_or_create_receptor_for_endpoint(endpoints[0])
+    receptor_pool._destroy_receptors_over_max_allowed()
+    assert list(receptor_pool.receptors.keys()) == [endpoints[2].hotkey, endpoints[0].hotkey]
+
+def test_receptor_pool_coalesced_forward():
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.MSGPACK )
+    async def mock_forward( request, **kwargs ):
+        # One hidden state per request tensor, with the batch and sequence shape of that tensor.
+        return bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__,
+            hotkey = wallet.hotkey.ss58_address,
+            synapses = [synapse.serialize_to_wire_proto(code = bittensor.proto.ReturnCode.Success, message= 'Success' ) for synapse in synapses for _ in request.tensors],
+            return_code = bittensor.proto.ReturnCode.Success,
+            tensors = [serializer.serialize(torch.rand(list(tensor.shape) + [bittensor.__network_dim__]), from_type = bittensor.proto.TensorType.TORCH) for tensor in request.tensors]
+        )
+
+    receptor_pool = bittensor.receptor_pool(wallet=wallet, coalesce_window=0.005)
+    receptor_pool._get_or_create_receptor_for_endpoint(neuron_obj)
+    receptor_pool.receptors[neuron_obj.hotkey].stub.Forward = MagicMock( side_effect = mock_forward )
+
+    async def concurrent_forwards():
+        return await asyncio.gather(
+            receptor_pool.async_forward( [neuron_obj], synapses, [torch.ones( (2, 3) )], timeout=1 ),
+            receptor_pool.async_forward( [neuron_obj], synapses, [torch.ones( (2, 3) )], timeout=1 ),
+            receptor_pool.async_forward( [neuron_obj], synapses, [torch.ones( (4, 3) )], timeout=1 ),
+        )
+    results = asyncio.new_event_loop().run_until_complete( concurrent_forwards() )
+
+    # The calls with identical inputs shared a request, the other call was sent on its own.
+    forward_calls = receptor_pool.receptors[neuron_obj.hotkey].stub.Forward.call_args_list
+    assert sorted( len( call.kwargs['request'].synapses ) for call in forward_calls ) == [1, 2]
+    for (outputs, codes, _), batch_size in zip( results, [2, 2, 4] ):
+        assert codes == [[bittensor.proto.ReturnCode.Success]]
+        assert list( outputs[0][0].shape ) == [batch_size, 3, bittensor.__network_dim__]
+
+def test_receptor_pool_coalesced_forward_axon():
+    # The axon callback computes the model output once per message and reuses it for the other synapses.
+    axon = bittensor.axon( netuid = -1, wallet = wallet, synapse_checks = lambda synapse, hotkey, inputs_x: True )
+    def forward( inputs_x: torch.FloatTensor, synapse, model_output = None ):
+        if model_output == None:
+            model_output = inputs_x.float().unsqueeze( -1 ).expand( -1, -1, bittensor.__network_dim__ )
+        return None, model_output, model_output
+    axon.attach_synapse_callback( forward, synapse_type = bittensor.proto.Synapse.SynapseType.TEXT_LAST_HIDDEN_STATE )
+    async def axon_forward( request, **kwargs ):
+        return axon._forward_response( request, *axon._forward( request ) )
+
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    receptor_pool = bittensor.receptor_pool(wallet=wallet, coalesce_window=0.005)
+    receptor_pool._get_or_create_receptor_for_endpoint(neuron_obj)
+    receptor_pool.receptors[neuron_obj.hotkey].stub.Forward = MagicMock( side_effect = axon_forward )
+
+    inputs = [ torch.ones( (2, 3), dtype = torch.long ), torch.ones( (2, 3), dtype = torch.long ), 2 * torch.ones( (2, 3), dtype = torch.long ) ]
+    async def concurrent_forwards():
+        return await asyncio.gather( *[ receptor_pool.async_forward( [neuron_obj], synapses, [x], timeout=1 ) for x in inputs ] )
+    results = asyncio.new_event_loop().run_until_complete( concurrent_forwards() )
+
+    # Each call gets the hidden state of its own inputs.
+    assert receptor_pool.receptors[neuron_obj.hotkey].stub.Forward.call_count == 2
+    for (outputs, codes, _), x in zip( results, inputs ):
+        assert codes == [[bittensor.proto.ReturnCode.Success]]
+        assert torch.equal( outputs[0][0], x.float().unsqueeze( -1 ).expand( -1, -1, bittensor.__network_dim__ ) )
+
+def test_receptor_pool_io_thread_forward():
+    synapses = [bittensor.synapse.TextLastHiddenState()]
+    serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.MSGPACK )
+    mock_return_val = bittensor.proto.TensorMessage(
+            version = bittensor.__version_as_int__,
+            hotkey = wallet.hotkey.ss58_address,
+            synapses = [synapse.serialize_to_wire_proto(code = bittensor.proto.ReturnCode.Success, message= 'Success' ) for synapse in synapses],
+            return_code = bittensor.proto.ReturnCode.Success,
+            tensors = [serializer.serialize(torch.rand(3, 3, bittensor.__network_dim__), from_type = bittensor.proto.TensorType.TORCH)]
+        )
+    call_threads = []
+    async def mock_forward( **kwargs ):
+        call_threads.append( threading.current_thread() )
+        await asyncio.sleep( 0.1 )
+        return mock_return_val
+
+    receptor_pool = bittensor.receptor_pool(wallet=wallet, io_thread=True)
+    receptor_pool._get_or_create_receptor_for_endpoint(neuron_obj)
+    receptor_pool.receptors[neuron_obj.hotkey].stub.Forward = MagicMock( side_effect = mock_forward )
+
+    # Several threads query concurrently through the pool loop thread.
+    x = torch.ones( (3, 3) )
+    with ThreadPoolExecutor( max_workers = 4 ) as executor:
+        results = list( executor.map( lambda _: receptor_pool.forward( [neuron_obj], synapses, [x], timeout=1 ), range(4) ) )
+    for _, codes, _ in results:
+        assert codes == [[bittensor.proto.ReturnCode.Success]]
+    assert call_threads == [ receptor_pool.event_loop_thread.thread for _ in range(4) ]
+
+    # Coroutines awaited from another loop are run on the pool loop thread.
+    _, codes, _ = asyncio.new_event_loop().run_until_complete( receptor_pool.async_forward( [neuron_obj], synapses, [x], timeout=1 ) )
+    assert codes == [[bittensor.proto.ReturnCode.Success]]
+    assert call_threads[-1] == receptor_pool.event_loop_thread.thread
+    receptor_pool.event_loop_thread.stop()
+
 if __name__ == "__main__":
     #test_receptor_pool_forward()
     test_receptor_pool_backward_hang()
@@ -226,4 +226,127 @@ class TestCMPSerialization(unittest.TestCase):
     
     def test_bittensor_dtype_to_torch_dtype(self):
         with pytest.raises(bittensor.serializer.DeserializationException):
-            bittensor.serializer.bittensor_dtype_to_torch_dtype(11)
\ No newline at end of file
+            bittensor.serializer.bittensor_dtype_to_torch_dtype(11)
+
+class TestRAWSerialization(unittest.TestCase):
+
+    def test_serialize(self):
+        for _ in range(10):
+            tensor_a = torch.rand([12, 23])
+            serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.RAW )
+            content = serializer.serialize(tensor_a, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+            tensor_b = serializer.deserialize(content, to_type = bittensor.proto.TensorType.TORCH)
+            assert torch.all(torch.eq(tensor_a, tensor_b))
+
+    def test_serialize_deserialize_tensor(self):
+        data = torch.rand([12, 23])
+        data_size = data.element_size()*data.nelement()
+
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.RAW )
+        serialized_tensor_message = serializer.serialize(data, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+
+        assert serialized_tensor_message.serializer == bittensor.proto.Serializer.RAW
+        assert list(data.shape) == serialized_tensor_message.shape
+        assert serialized_tensor_message.dtype == bittensor.proto.DataType.FLOAT32
+        assert len(serialized_tensor_message.buffer) == data_size
+
+        deserialized_tensor_message = serializer.deserialize(serialized_tensor_message, to_type = bittensor.proto.TensorType.TORCH)
+        assert serialized_tensor_message.requires_grad == deserialized_tensor_message.requires_grad
+        assert deserialized_tensor_message.dtype == torch.float32
+        assert torch.all(torch.eq(deserialized_tensor_message, data))
+
+        # Deserialized tensors are writable.
+        deserialized_tensor_message += 1
+        assert torch.all(torch.eq(deserialized_tensor_message, data + 1))
+
+    def test_serialize_deserialize_dtypes(self):
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.RAW )
+        for dtype in [torch.float16, torch.float64, torch.int32, torch.int64]:
+            data = (torch.rand([3, 4, 5]) * 100).to(dtype)
+            message = serializer.serialize(data, modality = bittensor.proto.Modality.TEXT, from_type = bittensor.proto.TensorType.TORCH)
+            deserialized = serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH)
+            assert deserialized.dtype == dtype
+            assert torch.all(torch.eq(deserialized, data))
+
+    def test_serialize_non_contiguous(self):
+        data = torch.rand([12, 23]).t()
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.RAW )
+        message = serializer.serialize(data, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        assert torch.all(torch.eq(serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH), data))
+
+    def test_serialize_empty(self):
+        data = torch.zeros([0, 5])
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.RAW )
+        message = serializer.serialize(data, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        assert list(serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH).shape) == [0, 5]
+
+    def test_serialize_unknown_dtype(self):
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.RAW )
+        with pytest.raises(bittensor.serializer.SerializationException):
+            serializer.serialize(torch.ones([2, 2], dtype=torch.uint8), modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+
+    def test_deserialize_truncated_buffer(self):
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.RAW )
+        message = serializer.serialize(torch.rand([4, 4]), modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        message.buffer = message.buffer[:-1]
+        with pytest.raises(bittensor.serializer.DeserializationException):
+            serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH)
+
+
+class TestQuantizedSerialization(unittest.TestCase):
+
+    def test_serialize_deserialize_qint8(self):
+        data = torch.randn([4, 12, 23])
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.QINT8 )
+        message = serializer.serialize(data, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        assert message.serializer == bittensor.proto.Serializer.QINT8
+        assert list(data.shape) == message.shape
+        assert len(message.buffer) < data.element_size() * data.nelement() / 3
+
+        deserialized = serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH)
+        assert deserialized.dtype == torch.float32
+        assert list(deserialized.shape) == list(data.shape)
+        assert torch.allclose(deserialized, data, atol = data.abs().max().item() / 127)
+
+    def test_serialize_deserialize_qint4(self):
+        data = torch.randn([3, 7, 5])
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.QINT4, block_size = 16 )
+        message = serializer.serialize(data, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        assert message.serializer == bittensor.proto.Serializer.QINT4
+
+        # The block size is read from the buffer, not from the receiving serializer.
+        deserialized = bittensor.serializer( serializer_type = bittensor.proto.Serializer.QINT4 ).deserialize(message, to_type = bittensor.proto.TensorType.TORCH)
+        assert list(deserialized.shape) == list(data.shape)
+        assert torch.allclose(deserialized, data, atol = data.abs().max().item() / 7)
+
+    def test_per_row_scales(self):
+        data = torch.randn([5, 9]) * torch.arange(1, 6)[:, None]
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.QINT8, block_size = 0 )
+        message = serializer.serialize(data, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        deserialized = serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH)
+        row_atol = data.abs().amax(dim = 1, keepdim = True) / 127
+        assert ((deserialized - data).abs() <= row_atol + 1e-6).all()
+
+    def test_dequantize_to_dtype(self):
+        data = torch.randn([4, 8]).to(torch.float16)
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.QINT8 )
+        message = serializer.serialize(data, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        assert serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH).dtype == torch.float16
+
+    def test_zeros(self):
+        data = torch.zeros([2, 3])
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.QINT4 )
+        message = serializer.serialize(data, modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        assert torch.all(torch.eq(serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH), data))
+
+    def test_serialize_int_tensor_exception(self):
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.QINT8 )
+        with pytest.raises(bittensor.serializer.SerializationException):
+            serializer.serialize(torch.ones([2, 2], dtype = torch.int64), modality = bittensor.proto.Modality.TEXT, from_type = bittensor.proto.TensorType.TORCH)
+
+    def test_deserialize_truncated_buffer(self):
+        serializer = bittensor.serializer( serializer_type = bittensor.proto.Serializer.QINT8 )
+        message = serializer.serialize(torch.rand([4, 4]), modality = bittensor.proto.Modality.TENSOR, from_type = bittensor.proto.TensorType.TORCH)
+        message.buffer = message.buffer[:-1]
+        with pytest.raises(bittensor.serializer.DeserializationException):
+            serializer.deserialize(message, to_type = bittensor.proto.TensorType.TORCH)
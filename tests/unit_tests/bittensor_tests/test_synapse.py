@@ -202,6 +202,51 @@ def test_last_hidden_state_encode_forward_response_tensor_mask_multiple():
                 )
 
 
+def test_last_hidden_state_quantized_forward_response():
+    synapse = bittensor.synapse.TextLastHiddenState( forward_response_serializer_type = bittensor.proto.Serializer.QINT8 )
+    forward_request_tensor = torch.randint(0, 100, (2, 8))
+    forward_response_tensor = torch.randn(2, 8, bittensor.__network_dim__)
+    forward_response_proto = synapse.serialize_forward_response_tensor( forward_request_tensor, forward_response_tensor )
+    assert forward_response_proto.serializer == bittensor.proto.Serializer.QINT8
+
+    # The requesting side decodes with the serializer recorded on the wire.
+    decoded = bittensor.synapse.TextLastHiddenState().deserialize_forward_response_proto( forward_request_tensor, forward_response_proto )
+    assert torch.allclose( decoded, forward_response_tensor, atol = forward_response_tensor.abs().max().item() / 127 )
+
+
+def test_casuallm_quantized_forward_response_falls_back():
+    synapse = bittensor.synapse.TextCausalLM( topk = 8, forward_response_serializer_type = bittensor.proto.Serializer.QINT8 )
+    forward_request_tensor = torch.randint(0, 100, (2, 4))
+    forward_response_tensor = torch.randn(2, 4, bittensor.__vocab_size__)
+    forward_response_proto = synapse.serialize_forward_response_tensor( forward_request_tensor, forward_response_tensor )
+    # Topk indices must survive exactly, the lossy serializer is not used.
+    assert forward_response_proto.serializer == bittensor.proto.Serializer.MSGPACK
+    decoded = synapse.deserialize_forward_response_proto( forward_request_tensor, forward_response_proto )
+    assert torch.all( torch.eq( decoded.argmax(-1), forward_response_tensor.argmax(-1) ) )
+
+
+def test_casuallm_sparse_response():
+    dense_synapse = bittensor.synapse.TextCausalLM( topk = 16 )
+    sparse_synapse = bittensor.synapse.TextCausalLM( topk = 16, sparse_response = True )
+    forward_request_tensor = torch.randint(0, 100, (2, 4))
+    forward_response_tensor = torch.randn(2, 4, bittensor.__vocab_size__)
+    forward_response_proto = dense_synapse.serialize_forward_response_tensor( forward_request_tensor, forward_response_tensor )
+
+    dense = dense_synapse.deserialize_forward_response_proto( forward_request_tensor, forward_response_proto )
+    sparse = sparse_synapse.deserialize_forward_response_proto( forward_request_tensor, forward_response_proto )
+    assert list(sparse.shape) == [2, 4, 2 * 16 + 1]
+    assert torch.allclose( sparse_synapse.densify( sparse ), dense )
+
+    # Loss on the sparse form matches the cross entropy of the dense logits.
+    target = torch.randint(0, bittensor.__vocab_size__, (2, 4))
+    target[0] = dense[0].argmax(-1)  # targets inside the topk
+    dense_loss = torch.nn.CrossEntropyLoss()( dense.view(-1, bittensor.__vocab_size__), target.view(-1) )
+    sparse_loss = -sparse_synapse.target_log_probs( sparse, target ).mean()
+    assert torch.isclose( dense_loss, sparse_loss, rtol = 1e-4 )
+
+    assert list(sparse_synapse.nill_forward_response_tensor( forward_request_tensor ).shape) == [2, 4, 2 * 16 + 1]
+
+
 if __name__ == "__main__":
     test_create_last_hidden_state()
     test_create_casuallm()
@@ -211,3 +256,6 @@ if __name__ == "__main__":
     test_last_hidden_state_encode_forward_response_tensor_mask_first()
     test_last_hidden_state_encode_forward_response_tensor_mask_last()
     test_last_hidden_state_encode_forward_response_tensor_mask_multiple()
+    test_last_hidden_state_quantized_forward_response()
+    test_casuallm_quantized_forward_response_falls_back()
+    test_casuallm_sparse_response()
@@ -584,5 +584,54 @@ class TestExplorerURL(unittest.TestCase):
         self.assertEqual(bittensor.utils.get_explorer_url_for_network(network, block_hash, self.network_map), expected)
 
 
+class TestLatencyHistogram(unittest.TestCase):
+    def test_quantile_empty(self):
+        histogram = bittensor.utils.stats.LatencyHistogram()
+        assert histogram.quantile( 0.95 ) == None
+
+    def test_quantile(self):
+        histogram = bittensor.utils.stats.LatencyHistogram()
+        for _ in range(95):
+            histogram.observe( 0.3 )
+        for _ in range(5):
+            histogram.observe( 10.0 )
+        # Quantiles are bucket bounds, within one bucket growth of the observed latency.
+        assert 0.3 <= histogram.quantile( 0.95 ) < 0.3 * 1.2
+        assert 10.0 <= histogram.quantile( 0.99 ) < 10.0 * 1.2
+
+    def test_observe_out_of_range(self):
+        histogram = bittensor.utils.stats.LatencyHistogram( max_value = 12.0 )
+        histogram.observe( 0.0 )
+        histogram.observe( 100.0 )
+        assert histogram.quantile( 0.5 ) == histogram.bounds[0]
+        assert histogram.quantile( 1.0 ) == 12.0
+
+    def test_decay(self):
+        histogram = bittensor.utils.stats.LatencyHistogram( max_count = 100 )
+        for _ in range(1000):
+            histogram.observe( 10.0 )
+        for _ in range(90):
+            histogram.observe( 0.3 )
+        # Old latencies fade out.
+        assert histogram.count < 100
+        assert histogram.quantile( 0.5 ) < 1.0
+
+    def test_bounds_and_merge(self):
+        histogram = bittensor.utils.stats.LatencyHistogram( bounds = [ 0.1, 1.0, 10.0 ], max_count = None )
+        other = bittensor.utils.stats.LatencyHistogram( bounds = [ 0.1, 1.0, 10.0 ], max_count = None )
+        for _ in range(2000):
+            histogram.observe( 0.05 )
+        other.observe( 0.5 )
+        other.observe( 100.0 )
+        histogram.merge( other.snapshot() )
+        # Nothing fades out without max_count, larger latencies count in the last bucket.
+        counts, total, count = histogram.snapshot()
+        assert counts == [ 2000, 1, 1 ]
+        assert count == 2002
+        assert abs( total - 200.5 ) < 1e-6
+        assert histogram.quantile( 0.5 ) == 0.1
+        assert histogram.quantile( 1.0 ) == 10.0
+
+
 if __name__ == "__main__":
     unittest.main()